@@ -0,0 +1,122 @@
+"""
+定时任务触发计划分析基准测试
+
+模拟5000个在用任务在24小时内的触发计划，对比逐个任务计算触发时间与JobPlanService按触发计划分组计算的耗时，
+并输出同一秒触发的峰值任务数，用于观察错峰窗口对集中触发的削峰效果
+
+运行方式（在flux-backend目录下）：python -m benchmarks.job_plan_benchmark
+"""
+
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import List
+from config.get_scheduler import MyCronTrigger, SchedulerUtil
+from module_admin.entity.do.job_do import SysJob
+from module_admin.entity.vo.job_vo import JobPlanQueryModel
+from module_admin.service.job_plan_service import JobPlanService
+from module_task.job_registry import JobRegistry
+
+
+JOB_COUNT = 5000
+HOURS = 24
+SPREAD_SECONDS = 300
+SPREAD_JOB_KEY = 'benchmarks.job_plan_benchmark.spread_job'
+START_TIME = datetime(2026, 1, 1)
+# 常见的整点、整分Cron表达式及其占比
+CRON_EXPRESSIONS = (
+    ('0 0 * * * ?', 40),
+    ('0 */5 * * * ?', 20),
+    ('0 0/30 * * * ?', 20),
+    ('0 0 2 * * ?', 15),
+    ('0 0 0 1 * ?', 5),
+)
+
+
+@JobRegistry.register(key=SPREAD_JOB_KEY, spread_seconds=SPREAD_SECONDS)
+def spread_job():
+    """
+    设置了错峰窗口的模拟任务
+    """
+
+
+def build_jobs(spread_ratio: float) -> List[SysJob]:
+    """
+    构造模拟任务列表
+
+    :param spread_ratio: 使用错峰窗口的任务占比
+    :return: 任务列表
+    """
+    expressions = [expression for expression, weight in CRON_EXPRESSIONS for _ in range(weight)]
+    spread_count = int(JOB_COUNT * spread_ratio)
+
+    return [
+        SysJob(
+            job_id=job_id,
+            job_name=f'模拟任务{job_id}',
+            cron_expression=expressions[job_id % len(expressions)],
+            invoke_target=SPREAD_JOB_KEY if job_id <= spread_count else 'module_task.scheduler_test.job',
+            status='0',
+        )
+        for job_id in range(1, JOB_COUNT + 1)
+    ]
+
+
+def analyze_per_job(job_list: List[SysJob], plan_query: JobPlanQueryModel):
+    """
+    对照组：逐个任务创建触发器并计算触发时间
+
+    :param job_list: 任务列表
+    :param plan_query: 触发计划分析查询参数对象
+    :return: (触发总次数, 同一秒触发的峰值任务数)
+    """
+    fire_jobs = Counter()
+    for job in job_list:
+        trigger = MyCronTrigger.from_crontab(job.cron_expression, offset=SchedulerUtil.get_job_offset(job))
+        now = START_TIME.astimezone(trigger.timezone)
+        end_time = now + timedelta(hours=plan_query.hours)
+        previous_fire_time = None
+        for _ in range(plan_query.fire_count):
+            fire_time = trigger.get_next_fire_time(previous_fire_time, now)
+            if fire_time is None or fire_time > end_time:
+                break
+            fire_jobs[fire_time] += 1
+            previous_fire_time = fire_time
+            now = fire_time + timedelta(microseconds=1)
+
+    return sum(fire_jobs.values()), max(fire_jobs.values(), default=0)
+
+
+def run(spread_ratio: float):
+    """
+    执行一组基准测试并输出结果
+
+    :param spread_ratio: 使用错峰窗口的任务占比
+    :return:
+    """
+    job_list = build_jobs(spread_ratio)
+    plan_query = JobPlanQueryModel(hours=HOURS, fireCount=JobPlanService.MAX_FIRE_COUNT, minJobCount=2, top=5)
+
+    start = time.perf_counter()
+    per_job_fire_count, per_job_peak = analyze_per_job(job_list, plan_query)
+    per_job_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    job_plan = JobPlanService.analyze_job_plan(job_list, plan_query, START_TIME)
+    grouped_seconds = time.perf_counter() - start
+
+    assert job_plan.fire_count == per_job_fire_count and job_plan.peak_job_count == per_job_peak
+    print(
+        f'错峰任务占比{spread_ratio:.0%}：任务数{job_plan.job_count}，触发计划数{job_plan.schedule_count}，'
+        f'{HOURS}小时内触发{job_plan.fire_count}次，同一秒峰值任务数{job_plan.peak_job_count}，'
+        f'触发冲突{job_plan.collision_count}个'
+    )
+    print(
+        f'  逐个任务计算耗时{per_job_seconds * 1000:.1f}ms，按触发计划分组计算耗时{grouped_seconds * 1000:.1f}ms，'
+        f'加速{per_job_seconds / grouped_seconds:.1f}倍'
+    )
+
+
+if __name__ == '__main__':
+    for ratio in (0, 0.5, 1):
+        run(ratio)
@@ -0,0 +1,94 @@
+"""
+登录密码校验突发负载测试
+
+在单个事件循环（相当于一个uvicorn工作进程）中以每秒200次的速率发起登录密码校验，同时每10毫秒执行一次
+与登录无关的轻量请求，统计其端到端延迟；分别对比在协程中直接调用bcrypt（原有实现）与放入有界线程池执行两种方式，
+并输出线程池的排队等待指标
+
+运行方式（在flux-backend目录下）：python -m benchmarks.pwd_burst_benchmark
+"""
+
+import asyncio
+import statistics
+from utils.pwd_util import PwdUtil
+
+
+LOGIN_RATE = 200
+BURST_SECONDS = 2
+PROBE_INTERVAL = 0.01
+PASSWORD = 'admin123'
+# 与初始化数据中admin用户相同的bcrypt哈希（cost为10）
+HASHED_PASSWORD = '$2a$10$7JB720yubVSZvUI0rEqK/.VqGOZTH.ulu33dHOiBE8ByOhJIrdAu2'
+
+
+async def blocking_login():
+    """
+    对照组：原有实现，在协程中直接执行bcrypt校验
+    """
+    assert PwdUtil.verify_password(PASSWORD, HASHED_PASSWORD)
+
+
+async def pooled_login():
+    """
+    在密码计算线程池中执行bcrypt校验
+    """
+    assert await PwdUtil.async_verify_password(PASSWORD, HASHED_PASSWORD)
+
+
+async def probe(latencies: list, stop: asyncio.Event):
+    """
+    模拟与登录无关的轻量请求，按固定间隔发起并记录从计划发起到处理完成的延迟
+
+    :param latencies: 延迟列表（单位：毫秒）
+    :param stop: 停止事件
+    :return:
+    """
+    loop = asyncio.get_running_loop()
+    next_time = loop.time()
+    while not stop.is_set():
+        next_time += PROBE_INTERVAL
+        await asyncio.sleep(max(next_time - loop.time(), 0))
+        await asyncio.sleep(0)
+        latencies.append((loop.time() - next_time) * 1000)
+
+
+async def run(name: str, login):
+    """
+    执行一轮突发负载并输出结果
+
+    :param name: 测试名称
+    :param login: 登录密码校验协程函数
+    :return:
+    """
+    loop = asyncio.get_running_loop()
+    latencies = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(latencies, stop))
+    login_tasks = []
+    start = loop.time()
+    for index in range(LOGIN_RATE * BURST_SECONDS):
+        await asyncio.sleep(max(start + index / LOGIN_RATE - loop.time(), 0))
+        login_tasks.append(asyncio.create_task(login()))
+    await asyncio.gather(*login_tasks)
+    elapsed = loop.time() - start
+    stop.set()
+    await probe_task
+    print(
+        f'{name}：{len(login_tasks)}次登录耗时{elapsed:.1f}s，无关请求{len(latencies)}次，'
+        f'p50 {statistics.median(latencies):.1f}ms，p99 {statistics.quantiles(latencies, n=100)[-1]:.1f}ms，'
+        f'最大{max(latencies):.1f}ms'
+    )
+
+
+async def main():
+    await run('协程中直接校验', blocking_login)
+    await run('线程池中校验', pooled_login)
+    metrics = PwdUtil.get_pwd_executor_metrics()
+    print(
+        f'线程池（{metrics["max_workers"]}线程）：完成{metrics["completed"]}次，'
+        f'平均排队{metrics["avg_wait_ms"]}ms，最长排队{metrics["max_wait_ms"]:.1f}ms'
+    )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
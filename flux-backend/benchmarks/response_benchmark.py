@@ -0,0 +1,90 @@
+"""
+响应序列化基准测试
+
+构造包含1000条记录的PageResponseModel分页结果，按ResponseUtil.success的方式组装响应信封，
+对比原有的jsonable_encoder + JSONResponse与FastJSONResponse的耗时，并校验两者输出的字节完全一致
+
+运行方式（在flux-backend目录下）：python -m benchmarks.response_benchmark
+"""
+
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from fastapi import status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from config.constant import HttpStatusConstant
+from utils.page_util import PageResponseModel
+from utils.response_util import FastJSONResponse
+
+
+ROW_COUNT = 1000
+ROUNDS = 20
+START_TIME = datetime(2026, 1, 1, 8, 30, 0, 123456)
+
+
+def build_content() -> dict:
+    """
+    构造与ResponseUtil.success(model_content=分页结果)一致的响应信封
+
+    :return: 响应信封
+    """
+    rows = [
+        {
+            'operId': index,
+            'title': f'用户管理{index}',
+            'businessType': index % 10,
+            'method': 'module_admin.controller.user_controller.edit_system_user()',
+            'requestMethod': 'PUT',
+            'operName': 'admin',
+            'deptName': '研发部门',
+            'operUrl': '/system/user',
+            'operIp': '127.0.0.1',
+            'operLocation': '内网IP',
+            'operParam': '{"userId": 1, "nickName": "若依"}',
+            'jsonResult': '{"code": 200, "msg": "操作成功"}',
+            'status': 0,
+            'errorMsg': None,
+            'operTime': START_TIME + timedelta(seconds=index),
+            'costTime': Decimal(index),
+        }
+        for index in range(ROW_COUNT)
+    ]
+    page = PageResponseModel(rows=rows, pageNum=1, pageSize=ROW_COUNT, total=ROW_COUNT * 10, hasNext=True)
+    content = {'code': HttpStatusConstant.SUCCESS, 'msg': '操作成功'}
+    content.update(page.model_dump(by_alias=True))
+    content.update({'success': True, 'time': START_TIME})
+
+    return content
+
+
+def measure(func):
+    """
+    多轮执行取最短耗时
+
+    :param func: 生成响应体的方法
+    :return: (最短耗时, 响应体)
+    """
+    best_seconds = None
+    body = None
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        body = func()
+        elapsed = time.perf_counter() - start
+        best_seconds = elapsed if best_seconds is None else min(best_seconds, elapsed)
+
+    return best_seconds, body
+
+
+if __name__ == '__main__':
+    content = build_content()
+    legacy_seconds, legacy_body = measure(
+        lambda: JSONResponse(status_code=status.HTTP_200_OK, content=jsonable_encoder(content)).body
+    )
+    fast_seconds, fast_body = measure(lambda: FastJSONResponse(status_code=status.HTTP_200_OK, content=content).body)
+    assert legacy_body == fast_body
+    print(
+        f'{ROW_COUNT}条记录的分页响应（{len(fast_body)}字节）：'
+        f'jsonable_encoder + JSONResponse {legacy_seconds * 1000:.2f}ms，'
+        f'FastJSONResponse {fast_seconds * 1000:.2f}ms，加速{legacy_seconds / fast_seconds:.1f}倍'
+    )
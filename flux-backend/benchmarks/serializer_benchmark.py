@@ -0,0 +1,119 @@
+"""
+模型对象序列化基准测试
+
+分别构造10000条SysUser及SysOperLog模型对象，对比原有逐值判断类型、逐键拆分下划线的base_to_dict实现
+与按模型编译序列化函数的CamelCaseUtil.transform_result的耗时，两者输出一致
+
+运行方式（在flux-backend目录下）：python -m benchmarks.serializer_benchmark
+"""
+
+import time
+from datetime import datetime
+from sqlalchemy import DateTime, inspect, Integer
+from typing import List
+from config.database import Base
+from module_admin.entity.do.log_do import SysOperLog
+from module_admin.entity.do.user_do import SysUser
+from utils.common_util import CamelCaseUtil
+
+
+ROW_COUNT = 10000
+ROUNDS = 5
+
+
+def legacy_snake_to_camel(snake_str: str):
+    """
+    对照组：原有的下划线转小驼峰实现，每次调用都重新拆分字符串
+    """
+    words = snake_str.split('_')
+    if len(words) > 1:
+        return words[0].lower() + ''.join(word.capitalize() for word in words[1:])
+    return snake_str
+
+
+def legacy_base_to_dict(obj):
+    """
+    对照组：原有的base_to_dict实现（snake_to_camel形式），复制属性字典后逐值判断类型并转换键名
+    """
+    if isinstance(obj, Base):
+        base_dict = obj.__dict__.copy()
+        base_dict.pop('_sa_instance_state', None)
+    elif isinstance(obj, dict):
+        base_dict = obj.copy()
+    else:
+        return obj
+    temp_dict = {}
+    for k, v in base_dict.items():
+        if isinstance(v, (Base, dict)):
+            temp_dict[legacy_snake_to_camel(k)] = legacy_base_to_dict(v)
+        elif isinstance(v, list):
+            temp_dict[legacy_snake_to_camel(k)] = [legacy_base_to_dict(v_item) for v_item in v]
+        else:
+            temp_dict[legacy_snake_to_camel(k)] = v
+    return temp_dict
+
+
+def build_rows(model: type) -> List[Base]:
+    """
+    按模型的列类型构造模拟数据
+
+    :param model: sqlalchemy模型类
+    :return: 模型对象列表
+    """
+    now = datetime.now()
+    columns = inspect(model).column_attrs
+    rows = []
+    for index in range(ROW_COUNT):
+        values = {}
+        for attr in columns:
+            column_type = attr.columns[0].type
+            if isinstance(column_type, DateTime):
+                values[attr.key] = now
+            elif isinstance(column_type, Integer):
+                values[attr.key] = index
+            else:
+                values[attr.key] = f'{attr.key}_{index}'
+        rows.append(model(**values))
+
+    return rows
+
+
+def measure(func, rows: List[Base]):
+    """
+    多轮执行取最短耗时
+
+    :param func: 序列化方法
+    :param rows: 模型对象列表
+    :return: (最短耗时, 序列化结果)
+    """
+    best_seconds = None
+    result = None
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        result = func(rows)
+        elapsed = time.perf_counter() - start
+        best_seconds = elapsed if best_seconds is None else min(best_seconds, elapsed)
+
+    return best_seconds, result
+
+
+def run(model: type):
+    """
+    执行一组基准测试并输出结果
+
+    :param model: sqlalchemy模型类
+    :return:
+    """
+    rows = build_rows(model)
+    legacy_seconds, legacy_result = measure(lambda items: [legacy_base_to_dict(row) for row in items], rows)
+    compiled_seconds, compiled_result = measure(CamelCaseUtil.transform_result, rows)
+    assert legacy_result == compiled_result
+    print(
+        f'{model.__name__} {ROW_COUNT}条：原有实现{legacy_seconds * 1000:.1f}ms，'
+        f'编译序列化函数{compiled_seconds * 1000:.1f}ms，加速{legacy_seconds / compiled_seconds:.1f}倍'
+    )
+
+
+if __name__ == '__main__':
+    for model_class in (SysUser, SysOperLog):
+        run(model_class)
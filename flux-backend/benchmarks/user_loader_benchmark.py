@@ -0,0 +1,237 @@
+"""
+用户信息加载基准测试
+
+在当前环境配置的数据库中写入1000个用户、50个角色、500个菜单的模拟数据（同一事务内写入，测试结束后回滚），
+对比原有逐项查询用户、部门、角色、岗位、菜单的五次查询实现与UserDao.get_user_by_id的查询次数及耗时
+
+运行方式（在flux-backend目录下）：python -m benchmarks.user_loader_benchmark --env=dev
+"""
+
+import asyncio
+import statistics
+import time
+from sqlalchemy import and_, event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.database import async_engine, AsyncSessionLocal
+from module_admin.dao.user_dao import UserDao
+from module_admin.entity.do.dept_do import SysDept
+from module_admin.entity.do.menu_do import SysMenu
+from module_admin.entity.do.post_do import SysPost
+from module_admin.entity.do.role_do import SysRole, SysRoleMenu
+from module_admin.entity.do.user_do import SysUser, SysUserPost, SysUserRole
+
+
+ID_OFFSET = 900000
+USER_COUNT = 1000
+ROLE_COUNT = 50
+MENU_COUNT = 500
+POST_COUNT = 10
+ROLES_PER_USER = 3
+MENUS_PER_ROLE = 100
+POSTS_PER_USER = 2
+SAMPLE_COUNT = 200
+
+
+class QueryCounter:
+    """
+    统计数据库引擎执行的语句数量
+    """
+
+    count = 0
+
+    @classmethod
+    def on_execute(cls, conn, cursor, statement, parameters, context, executemany):
+        cls.count += 1
+
+
+async def seed(db: AsyncSession):
+    """
+    写入模拟数据
+
+    :param db: orm对象
+    :return:
+    """
+    dept_id = ID_OFFSET + 1
+    db.add(SysDept(dept_id=dept_id, parent_id=0, ancestors='0', dept_name='基准测试部门'))
+    db.add_all(
+        SysPost(post_id=ID_OFFSET + index, post_code=f'bench_{index}', post_name=f'岗位{index}', post_sort=index)
+        for index in range(1, POST_COUNT + 1)
+    )
+    db.add_all(
+        SysRole(role_id=ID_OFFSET + index, role_name=f'角色{index}', role_key=f'bench_{index}', role_sort=index)
+        for index in range(1, ROLE_COUNT + 1)
+    )
+    db.add_all(
+        SysMenu(menu_id=ID_OFFSET + index, menu_name=f'菜单{index}', order_num=index, menu_type='C')
+        for index in range(1, MENU_COUNT + 1)
+    )
+    await db.flush()
+    db.add_all(
+        SysRoleMenu(role_id=ID_OFFSET + role_index, menu_id=ID_OFFSET + (role_index * 7 + offset) % MENU_COUNT + 1)
+        for role_index in range(1, ROLE_COUNT + 1)
+        for offset in range(MENUS_PER_ROLE)
+    )
+    db.add_all(
+        SysUser(user_id=ID_OFFSET + index, dept_id=dept_id, user_name=f'bench_{index}', nick_name=f'用户{index}')
+        for index in range(1, USER_COUNT + 1)
+    )
+    await db.flush()
+    db.add_all(
+        SysUserRole(user_id=ID_OFFSET + index, role_id=ID_OFFSET + (index + offset) % ROLE_COUNT + 1)
+        for index in range(1, USER_COUNT + 1)
+        for offset in range(ROLES_PER_USER)
+    )
+    db.add_all(
+        SysUserPost(user_id=ID_OFFSET + index, post_id=ID_OFFSET + (index + offset) % POST_COUNT + 1)
+        for index in range(1, USER_COUNT + 1)
+        for offset in range(POSTS_PER_USER)
+    )
+    await db.flush()
+
+
+async def legacy_get_user_by_id(db: AsyncSession, user_id: int):
+    """
+    对照组：原有的get_user_by_id实现，用户、部门、角色、岗位、菜单各查询一次且每次都重新关联用户表
+    """
+    user_filter = (SysUser.status == '0', SysUser.del_flag == '0', SysUser.user_id == user_id)
+    query_user_basic_info = (await db.execute(select(SysUser).where(*user_filter).distinct())).scalars().first()
+    query_user_dept_info = (
+        (
+            await db.execute(
+                select(SysDept)
+                .select_from(SysUser)
+                .where(*user_filter)
+                .join(SysDept, and_(SysUser.dept_id == SysDept.dept_id, SysDept.status == '0', SysDept.del_flag == '0'))
+                .distinct()
+            )
+        )
+        .scalars()
+        .first()
+    )
+    query_user_role_info = (
+        (
+            await db.execute(
+                select(SysRole)
+                .select_from(SysUser)
+                .where(*user_filter)
+                .join(SysUserRole, SysUser.user_id == SysUserRole.user_id, isouter=True)
+                .join(
+                    SysRole,
+                    and_(SysUserRole.role_id == SysRole.role_id, SysRole.status == '0', SysRole.del_flag == '0'),
+                )
+                .distinct()
+            )
+        )
+        .scalars()
+        .all()
+    )
+    query_user_post_info = (
+        (
+            await db.execute(
+                select(SysPost)
+                .select_from(SysUser)
+                .where(*user_filter)
+                .join(SysUserPost, SysUser.user_id == SysUserPost.user_id, isouter=True)
+                .join(SysPost, and_(SysUserPost.post_id == SysPost.post_id, SysPost.status == '0'))
+                .distinct()
+            )
+        )
+        .scalars()
+        .all()
+    )
+    query_user_menu_info = (
+        (
+            await db.execute(
+                select(SysMenu)
+                .select_from(SysUser)
+                .where(*user_filter)
+                .join(SysUserRole, SysUser.user_id == SysUserRole.user_id, isouter=True)
+                .join(
+                    SysRole,
+                    and_(SysUserRole.role_id == SysRole.role_id, SysRole.status == '0', SysRole.del_flag == '0'),
+                    isouter=True,
+                )
+                .join(SysRoleMenu, SysRole.role_id == SysRoleMenu.role_id, isouter=True)
+                .join(SysMenu, and_(SysRoleMenu.menu_id == SysMenu.menu_id, SysMenu.status == '0'))
+                .order_by(SysMenu.order_num)
+                .distinct()
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+    return dict(
+        user_basic_info=query_user_basic_info,
+        user_dept_info=query_user_dept_info,
+        user_role_info=query_user_role_info,
+        user_post_info=query_user_post_info,
+        user_menu_info=query_user_menu_info,
+    )
+
+
+def summarize(user_info: dict):
+    """
+    提取用户信息中可比较的主键集合
+
+    :param user_info: 用户信息查询结果
+    :return: 主键摘要
+    """
+    return (
+        user_info['user_basic_info'].user_id,
+        user_info['user_dept_info'].dept_id if user_info['user_dept_info'] else None,
+        sorted(role.role_id for role in user_info['user_role_info']),
+        sorted(post.post_id for post in user_info['user_post_info']),
+        sorted(menu.menu_id for menu in user_info['user_menu_info']),
+    )
+
+
+async def measure(db: AsyncSession, loader, user_ids):
+    """
+    逐个用户调用加载方法并统计查询次数及耗时
+
+    :param db: orm对象
+    :param loader: 用户信息加载方法
+    :param user_ids: 用户id列表
+    :return: (每次调用的平均查询次数, 耗时列表（单位：毫秒）, 主键摘要列表)
+    """
+    query_count = QueryCounter.count
+    latencies = []
+    summaries = []
+    for user_id in user_ids:
+        db.expunge_all()
+        start = time.perf_counter()
+        user_info = await loader(db, user_id)
+        latencies.append((time.perf_counter() - start) * 1000)
+        summaries.append(summarize(user_info))
+
+    return (QueryCounter.count - query_count) / len(user_ids), latencies, summaries
+
+
+async def main():
+    event.listen(async_engine.sync_engine, 'before_cursor_execute', QueryCounter.on_execute)
+    user_ids = [ID_OFFSET + 1 + index * USER_COUNT // SAMPLE_COUNT for index in range(SAMPLE_COUNT)]
+    async with AsyncSessionLocal() as db:
+        try:
+            await seed(db)
+            # 预热连接及语句编译缓存
+            await legacy_get_user_by_id(db, user_ids[0])
+            await UserDao.get_user_by_id(db, user_ids[0])
+            legacy_queries, legacy_latencies, legacy_summaries = await measure(db, legacy_get_user_by_id, user_ids)
+            loader_queries, loader_latencies, loader_summaries = await measure(db, UserDao.get_user_by_id, user_ids)
+            assert legacy_summaries == loader_summaries
+            for name, queries, latencies in (
+                ('原有实现', legacy_queries, legacy_latencies),
+                ('UserDao.get_user_by_id', loader_queries, loader_latencies),
+            ):
+                print(
+                    f'{name}：每次{queries:.1f}条语句，平均{statistics.mean(latencies):.2f}ms，'
+                    f'p95 {statistics.quantiles(latencies, n=20)[-1]:.2f}ms'
+                )
+        finally:
+            await db.rollback()
+    await async_engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
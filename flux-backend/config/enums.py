@@ -42,10 +42,23 @@ class RedisInitKeyConfig(Enum):
     def remark(self):
         return self.value.get('remark')
 
-    ACCESS_TOKEN = {'key': 'access_token', 'remark': '登录令牌信息'}
-    SYS_DICT = {'key': 'sys_dict', 'remark': '数据字典'}
-    SYS_CONFIG = {'key': 'sys_config', 'remark': '配置信息'}
+    @property
+    def indexed(self):
+        return self.value.get('indexed', False)
+
+    ACCESS_TOKEN = {'key': 'access_token', 'remark': '登录令牌信息', 'indexed': True}
+    ONLINE_SESSION = {'key': 'online_session', 'remark': '在线会话信息'}
+    SYS_DICT = {'key': 'sys_dict', 'remark': '数据字典', 'indexed': True}
+    SYS_CONFIG = {'key': 'sys_config', 'remark': '配置信息', 'indexed': True}
     CAPTCHA_CODES = {'key': 'captcha_codes', 'remark': '图片验证码'}
     ACCOUNT_LOCK = {'key': 'account_lock', 'remark': '用户锁定'}
     PASSWORD_ERROR_COUNT = {'key': 'password_error_count', 'remark': '密码错误次数'}
     SMS_CODE = {'key': 'sms_code', 'remark': '短信验证码'}
+    USER_INFO = {'key': 'user_info', 'remark': '当前用户信息'}
+    PERMISSION_EPOCH = {'key': 'permission_epoch', 'remark': '用户权限版本号'}
+    ROUTER_TREE = {'key': 'router_tree', 'remark': '角色路由树'}
+    IP_LOCATION = {'key': 'ip_location', 'remark': 'IP归属区域'}
+    IMPORT_TASK = {'key': 'import_task', 'remark': 'Excel导入任务进度'}
+    SCHEDULER_LEADER = {'key': 'scheduler_leader', 'remark': '定时任务调度主节点租约'}
+    SCHEDULER_LEASE_TOKEN = {'key': 'scheduler_lease_token', 'remark': '定时任务调度主节点租约序号'}
+    SCHEDULER_COMMAND = {'key': 'scheduler_command', 'remark': '定时任务调度命令流'}
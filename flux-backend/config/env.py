@@ -23,6 +23,22 @@ class AppSettings(BaseSettings):
     app_workers: int = 5
     app_ip_location_query: bool = True
     app_same_time_login: bool = True
+    app_user_cache_expire_seconds: int = 600
+    app_user_local_cache_expire_seconds: int = 60
+    app_log_queue_max_size: int = 10000
+    app_log_batch_size: int = 200
+    app_pwd_hash_max_workers: int = 4
+    app_ip_location_offline_path: str = ''
+    app_ip_location_api_url: str = 'https://qifu-api.baidubce.com/ip/geo/v1/district?ip={ip}'
+    app_ip_location_timeout: float = 3
+    app_ip_location_cache_expire_seconds: int = 86400
+    app_page_count_cache_expire_seconds: int = 30
+    app_page_approximate_count_threshold: int = 1000000
+    app_import_batch_size: int = 1000
+    app_import_progress_expire_seconds: int = 86400
+    app_sys_local_cache_expire_seconds: int = 300
+    app_scheduler_lease_seconds: int = 15
+    app_schema_catalog_expire_seconds: int = 600
 
 
 class JwtSettings(BaseSettings):
@@ -1,4 +1,5 @@
 from config.database import async_engine, AsyncSessionLocal, Base
+from module_admin.service.dept_service import DeptService
 from utils.log_util import logger
 
 
@@ -22,3 +23,13 @@ async def init_create_table():
     async with async_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     logger.info('数据库连接成功')
+
+
+async def init_dept_closure():
+    """
+    应用启动时初始化部门闭包表
+
+    :return:
+    """
+    async with AsyncSessionLocal() as session:
+        await DeptService.init_dept_closure_services(session)
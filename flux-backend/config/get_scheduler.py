@@ -1,30 +1,72 @@
+import asyncio
 import json
-from apscheduler.events import EVENT_ALL
+import os
+import socket
+import time
+import uuid
+import zlib
+from apscheduler.events import (
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_SUBMITTED,
+)
 from apscheduler.executors.asyncio import AsyncIOExecutor
 from apscheduler.executors.pool import ProcessPoolExecutor
+from apscheduler.job import Job
 from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.jobstores.redis import RedisJobStore
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.schedulers.base import STATE_PAUSED, STATE_RUNNING, STATE_STOPPED
 from apscheduler.triggers.cron import CronTrigger
-from asyncio import iscoroutinefunction
 from datetime import datetime, timedelta
 from sqlalchemy.engine import create_engine
-from sqlalchemy.orm import sessionmaker
-from typing import Union
+from typing import Dict, Literal, Optional, Union
 from config.database import AsyncSessionLocal, quote_plus
-from config.env import DataBaseConfig, RedisConfig
+from config.enums import RedisInitKeyConfig
+from config.env import AppConfig, DataBaseConfig, RedisConfig
+from exceptions.exception import ServiceException
 from module_admin.dao.job_dao import JobDao
-from module_admin.entity.vo.job_vo import JobLogModel, JobModel
-from module_admin.service.job_log_service import JobLogService
+from module_admin.entity.vo.job_vo import JobModel
+from module_admin.service.log_sink_service import LogSinkService
+from utils.cache_util import LocalCache
 from utils.log_util import logger
+from module_task.job_registry import JobDefinition, JobRegistry
 import module_task  # noqa: F401
 
 
 # 重写Cron定时
 class MyCronTrigger(CronTrigger):
+    def __init__(self, *args, offset: int = 0, **kwargs):
+        super().__init__(*args, **kwargs)
+        # 错峰延后秒数，触发时间在Cron表达式计算结果的基础上固定延后，与随机抖动不同，每次触发的延后量保持一致
+        self.offset = offset
+
+    def get_next_fire_time(self, previous_fire_time, now):
+        if not self.offset:
+            return super().get_next_fire_time(previous_fire_time, now)
+        delta = timedelta(seconds=self.offset)
+        next_fire_time = super().get_next_fire_time(
+            previous_fire_time - delta if previous_fire_time else None, now - delta
+        )
+
+        return next_fire_time + delta if next_fire_time else None
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state['offset'] = self.offset
+
+        return state
+
+    def __setstate__(self, state):
+        state = dict(state)
+        self.offset = state.pop('offset', 0)
+        super().__setstate__(state)
+
     @classmethod
-    def from_crontab(cls, expr: str, timezone=None):
+    def from_crontab(cls, expr: str, timezone=None, offset: int = 0):
         values = expr.split()
         if len(values) != 6 and len(values) != 7:
             raise ValueError('Wrong number of fields; got {}, expected 6 or 7'.format(len(values)))
@@ -62,6 +104,7 @@ class MyCronTrigger(CronTrigger):
             day_of_week=day_of_week,
             year=year,
             timezone=timezone,
+            offset=offset,
         )
 
     @classmethod
@@ -89,18 +132,18 @@ if DataBaseConfig.db_type == 'postgresql':
         f'postgresql+psycopg2://{DataBaseConfig.db_username}:{quote_plus(DataBaseConfig.db_password)}@'
         f'{DataBaseConfig.db_host}:{DataBaseConfig.db_port}/{DataBaseConfig.db_database}'
     )
-engine = create_engine(
+# 同步引擎仅供sqlalchemy任务存储使用，任务日志通过异步引擎写入，无需与业务相同的连接池大小
+job_store_engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     echo=DataBaseConfig.db_echo,
-    max_overflow=DataBaseConfig.db_max_overflow,
-    pool_size=DataBaseConfig.db_pool_size,
+    max_overflow=2,
+    pool_size=2,
     pool_recycle=DataBaseConfig.db_pool_recycle,
     pool_timeout=DataBaseConfig.db_pool_timeout,
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 job_stores = {
     'default': MemoryJobStore(),
-    'sqlalchemy': SQLAlchemyJobStore(url=SQLALCHEMY_DATABASE_URL, engine=engine),
+    'sqlalchemy': SQLAlchemyJobStore(url=SQLALCHEMY_DATABASE_URL, engine=job_store_engine),
     'redis': RedisJobStore(
         **dict(
             host=RedisConfig.redis_host,
@@ -120,25 +163,64 @@ scheduler.configure(jobstores=job_stores, executors=executors, job_defaults=job_
 class SchedulerUtil:
     """
     定时任务相关方法
+
+    任务日志仅记录任务执行成功、执行失败、错过执行及超出最大实例数的事件，开始时间取任务提交时间，
+    日志经由日志异步写入队列批量写入，事件监听中不进行任何数据库操作
     """
 
+    EVENT_NAMES = {
+        EVENT_JOB_EXECUTED: '执行成功',
+        EVENT_JOB_ERROR: '执行失败',
+        EVENT_JOB_MISSED: '错过执行时间',
+        EVENT_JOB_MAX_INSTANCES: '超出最大运行实例数，本次未执行',
+    }
+
+    loop: Optional[asyncio.AbstractEventLoop] = None
+    job_log_info: Dict[str, dict] = {}
+    # 已提交尚未结束的任务的开始时间，键为(任务id, 计划执行时间)
+    running_jobs = LocalCache(max_size=4096, ttl=86400)
+
     @classmethod
     async def init_system_scheduler(cls):
         """
-        应用启动时初始化定时任务
+        当前进程成为调度主节点时启动（或恢复）定时任务并从数据库加载任务
 
         :return:
         """
         logger.info('开始启动定时任务...')
-        scheduler.start()
+        cls.loop = asyncio.get_running_loop()
+        if scheduler.state == STATE_STOPPED:
+            scheduler.add_listener(
+                cls.scheduler_event_listener,
+                EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES,
+            )
+            scheduler.start()
+        # 内存任务存储中可能残留上次担任主节点时的任务，以数据库为准重新加载
+        scheduler.remove_all_jobs(jobstore='default')
         async with AsyncSessionLocal() as session:
             job_list = await JobDao.get_job_list_for_scheduler(session)
             for item in job_list:
                 cls.remove_scheduler_job(job_id=str(item.job_id))
-                cls.add_scheduler_job(item)
-        scheduler.add_listener(cls.scheduler_event_listener, EVENT_ALL)
+                try:
+                    cls.add_scheduler_job(item)
+                except Exception as e:
+                    logger.error(f'定时任务{item.job_name}加载失败，详细错误信息：{e}')
+        if scheduler.state == STATE_PAUSED:
+            scheduler.resume()
         logger.info('系统初始定时任务加载成功')
 
+    @classmethod
+    async def pause_system_scheduler(cls):
+        """
+        当前进程不再是调度主节点时暂停定时任务，执行器保持可用以便再次成为主节点时直接恢复
+
+        :return:
+        """
+        if scheduler.state == STATE_RUNNING:
+            scheduler.pause()
+            scheduler.remove_all_jobs(jobstore='default')
+            logger.info('暂停定时任务成功')
+
     @classmethod
     async def close_system_scheduler(cls):
         """
@@ -146,8 +228,48 @@ class SchedulerUtil:
 
         :return:
         """
-        scheduler.shutdown()
-        logger.info('关闭定时任务成功')
+        if scheduler.state != STATE_STOPPED:
+            scheduler.shutdown()
+            logger.info('关闭定时任务成功')
+
+    @classmethod
+    async def sync_scheduler_job(cls, job_id: Union[str, int]):
+        """
+        以数据库中的任务信息为准同步调度器中的任务，任务不存在或已暂停时移除，否则重新添加
+
+        :param job_id: 任务id
+        :return:
+        """
+        async with AsyncSessionLocal() as session:
+            job_info = await JobDao.get_job_detail_by_id(session, job_id=int(job_id))
+        cls.remove_scheduler_job(job_id=job_id)
+        if job_info and job_info.status == '0':
+            cls.add_scheduler_job(job_info)
+
+    @classmethod
+    async def run_scheduler_job_once(cls, job_id: Union[str, int]):
+        """
+        根据数据库中的任务信息执行一次任务
+
+        :param job_id: 任务id
+        :return:
+        """
+        async with AsyncSessionLocal() as session:
+            job_info = await JobDao.get_job_detail_by_id(session, job_id=int(job_id))
+        cls.remove_scheduler_job(job_id=job_id)
+        if job_info:
+            cls.execute_scheduler_job_once(job_info)
+
+    @classmethod
+    def check_scheduler_job(cls, job_info: JobModel):
+        """
+        校验任务的调用目标及Cron表达式能否被调度器加载，任务实际由调度主节点加载
+
+        :param job_info: 任务对象信息
+        :return:
+        """
+        cls.__get_job_definition(job_info)
+        MyCronTrigger.from_crontab(job_info.cron_expression)
 
     @classmethod
     def get_scheduler_job(cls, job_id: Union[str, int]):
@@ -169,23 +291,25 @@ class SchedulerUtil:
         :param job_info: 任务对象信息
         :return:
         """
-        job_func = eval(job_info.invoke_target)
-        job_executor = job_info.job_executor
-        if iscoroutinefunction(job_func):
-            job_executor = 'default'
-        scheduler.add_job(
-            func=eval(job_info.invoke_target),
-            trigger=MyCronTrigger.from_crontab(job_info.cron_expression),
-            args=job_info.job_args.split(',') if job_info.job_args else None,
-            kwargs=json.loads(job_info.job_kwargs) if job_info.job_kwargs else None,
-            id=str(job_info.job_id),
-            name=job_info.job_name,
-            misfire_grace_time=1000000000000 if job_info.misfire_policy == '3' else None,
-            coalesce=True if job_info.misfire_policy == '2' else False,
-            max_instances=3 if job_info.concurrent == '0' else 1,
-            jobstore=job_info.job_group,
-            executor=job_executor,
+        job = scheduler.add_job(
+            trigger=MyCronTrigger.from_crontab(job_info.cron_expression, offset=cls.get_job_offset(job_info)),
+            **cls.__get_job_options(job_info),
         )
+        cls.__register_job(job, job_info.job_group)
+
+    @classmethod
+    def get_job_offset(cls, job_info: JobModel) -> int:
+        """
+        获取任务的错峰延后秒数，任务定义设置了错峰窗口时按任务id的哈希值在窗口内取值，同一任务每次计算结果相同
+
+        :param job_info: 任务对象信息
+        :return: 错峰延后秒数
+        """
+        job_definition = JobRegistry.get_job(job_info.invoke_target)
+        if job_definition is None or not job_definition.spread_seconds:
+            return 0
+
+        return zlib.crc32(str(job_info.job_id).encode()) % job_definition.spread_seconds
 
     @classmethod
     def execute_scheduler_job_once(cls, job_info: JobModel):
@@ -195,23 +319,46 @@ class SchedulerUtil:
         :param job_info: 任务对象信息
         :return:
         """
-        job_func = eval(job_info.invoke_target)
-        job_executor = job_info.job_executor
-        if iscoroutinefunction(job_func):
-            job_executor = 'default'
-        scheduler.add_job(
-            func=eval(job_info.invoke_target),
-            trigger='date',
-            run_date=datetime.now() + timedelta(seconds=1),
+        job = scheduler.add_job(
+            trigger='date', run_date=datetime.now() + timedelta(seconds=1), **cls.__get_job_options(job_info)
+        )
+        cls.__register_job(job, job_info.job_group)
+
+    @classmethod
+    def __get_job_definition(cls, job_info: JobModel) -> JobDefinition:
+        """
+        工具方法：从任务注册表中获取调用目标字符串对应的任务定义
+
+        :param job_info: 任务对象信息
+        :return: 任务定义
+        """
+        job_definition = JobRegistry.get_job(job_info.invoke_target)
+        if job_definition is None:
+            raise ServiceException(message=f'调用目标{job_info.invoke_target}未在定时任务注册表中注册')
+
+        return job_definition
+
+    @classmethod
+    def __get_job_options(cls, job_info: JobModel):
+        """
+        工具方法：根据任务对象信息及任务定义生成添加任务的参数，任务定义中的执行器及最大运行实例数优先
+
+        :param job_info: 任务对象信息
+        :return: 添加任务的参数字典
+        """
+        job_definition = cls.__get_job_definition(job_info)
+
+        return dict(
+            func=job_definition.func,
             args=job_info.job_args.split(',') if job_info.job_args else None,
             kwargs=json.loads(job_info.job_kwargs) if job_info.job_kwargs else None,
             id=str(job_info.job_id),
             name=job_info.job_name,
             misfire_grace_time=1000000000000 if job_info.misfire_policy == '3' else None,
             coalesce=True if job_info.misfire_policy == '2' else False,
-            max_instances=3 if job_info.concurrent == '0' else 1,
+            max_instances=(job_definition.max_instances or 3) if job_info.concurrent == '0' else 1,
             jobstore=job_info.job_group,
-            executor=job_executor,
+            executor=job_definition.executor or job_info.job_executor,
         )
 
     @classmethod
@@ -228,48 +375,368 @@ class SchedulerUtil:
 
     @classmethod
     def scheduler_event_listener(cls, event):
-        # 获取事件类型和任务ID
-        event_type = event.__class__.__name__
-        # 获取任务执行异常信息
-        status = '0'
+        """
+        定时任务事件监听，进程池执行器的事件在其他线程中触发，统一转交事件循环处理，监听中不进行任何数据库操作
+
+        :param event: 定时任务事件
+        :return:
+        """
+        event_time = datetime.now()
+        if cls.loop is None or cls.loop.is_closed():
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is cls.loop:
+            cls.__handle_scheduler_event(event, event_time)
+        else:
+            cls.loop.call_soon_threadsafe(cls.__handle_scheduler_event, event, event_time)
+
+    @classmethod
+    def __handle_scheduler_event(cls, event, event_time: datetime):
+        """
+        工具方法：任务提交时记录开始时间，任务结束、错过执行或超出最大实例数时生成任务日志并放入日志异步写入队列
+
+        :param event: 定时任务事件
+        :param event_time: 事件发生时间
+        :return:
+        """
+        scheduled_run_times = getattr(event, 'scheduled_run_times', None) or [event.scheduled_run_time]
+        if event.code == EVENT_JOB_SUBMITTED:
+            for scheduled_run_time in scheduled_run_times:
+                cls.running_jobs.set((event.job_id, scheduled_run_time), event_time)
+            return
+        job_log_info = cls.job_log_info.get(event.job_id)
+        if job_log_info is None:
+            query_job = cls.get_scheduler_job(job_id=event.job_id)
+            if query_job is None:
+                return
+            job_log_info = cls.__get_job_log_info(query_job, query_job._jobstore_alias)
+        scheduled_run_time = scheduled_run_times[0]
+        start_time = cls.running_jobs.get((event.job_id, scheduled_run_time))
+        cls.running_jobs.delete((event.job_id, scheduled_run_time))
+        event_name = cls.EVENT_NAMES.get(event.code)
+        job_message = (
+            f"事件类型: {event_name}, 任务ID: {event.job_id}, 任务名称: {job_log_info.get('jobName')}, "
+            f"计划执行于{scheduled_run_time.strftime('%Y-%m-%d %H:%M:%S')}"
+        )
+        if start_time is not None:
+            cost_time = int((event_time - start_time).total_seconds() * 1000)
+            job_message += (
+                f", 开始于{start_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}"
+                f", 结束于{event_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}, 耗时{cost_time}毫秒"
+            )
         exception_info = ''
-        if event_type == 'JobExecutionEvent' and event.exception:
+        if event.code == EVENT_JOB_ERROR:
             exception_info = str(event.exception)
-            status = '1'
-        if hasattr(event, 'job_id'):
-            job_id = event.job_id
-            query_job = cls.get_scheduler_job(job_id=job_id)
-            if query_job:
-                query_job_info = query_job.__getstate__()
-                # 获取任务名称
-                job_name = query_job_info.get('name')
-                # 获取任务组名
-                job_group = query_job._jobstore_alias
-                # 获取任务执行器
-                job_executor = query_job_info.get('executor')
-                # 获取调用目标字符串
-                invoke_target = query_job_info.get('func')
-                # 获取调用函数位置参数
-                job_args = ','.join(query_job_info.get('args'))
-                # 获取调用函数关键字参数
-                job_kwargs = json.dumps(query_job_info.get('kwargs'))
-                # 获取任务触发器
-                job_trigger = str(query_job_info.get('trigger'))
-                # 构造日志消息
-                job_message = f"事件类型: {event_type}, 任务ID: {job_id}, 任务名称: {job_name}, 执行于{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-                job_log = JobLogModel(
-                    jobName=job_name,
-                    jobGroup=job_group,
-                    jobExecutor=job_executor,
-                    invokeTarget=invoke_target,
-                    jobArgs=job_args,
-                    jobKwargs=job_kwargs,
-                    jobTrigger=job_trigger,
-                    jobMessage=job_message,
-                    status=status,
-                    exceptionInfo=exception_info,
-                    createTime=datetime.now(),
+        elif event.code != EVENT_JOB_EXECUTED:
+            exception_info = event_name
+        LogSinkService.put_log_services(
+            'job',
+            dict(
+                **job_log_info,
+                jobMessage=job_message,
+                status='0' if event.code == EVENT_JOB_EXECUTED else '1',
+                exceptionInfo=exception_info,
+                createTime=start_time or event_time,
+            ),
+            None,
+        )
+
+    @classmethod
+    def __register_job(cls, job: Job, job_group: str):
+        """
+        工具方法：添加任务时记录生成任务日志所需的任务信息，事件监听中无需再从任务存储中读取任务
+
+        :param job: 任务对象
+        :param job_group: 任务存储
+        :return:
+        """
+        cls.job_log_info[job.id] = cls.__get_job_log_info(job, job_group)
+
+    @classmethod
+    def __get_job_log_info(cls, job: Job, job_group: str):
+        """
+        工具方法：获取任务日志中的任务信息
+
+        :param job: 任务对象
+        :param job_group: 任务存储
+        :return: 任务信息字典，键名为驼峰形式
+        """
+        return dict(
+            jobName=job.name,
+            jobGroup=job_group,
+            jobExecutor=job.executor,
+            invokeTarget=job.func_ref or str(job.func),
+            jobArgs=','.join(str(arg) for arg in job.args),
+            jobKwargs=json.dumps(job.kwargs),
+            jobTrigger=str(job.trigger),
+        )
+
+
+class SchedulerLeaderUtil:
+    """
+    定时任务调度主节点选举相关方法
+
+    各工作进程通过redis租约竞争调度主节点，仅主节点运行调度器，其余进程待命；主节点每隔租约时间的三分之一续约，
+    每次获取及续约请求的超时时间为距租约到期的剩余时间，另有定时器在租约到期时暂停调度器，不依赖续约请求返回，
+    续约失败或租约到期前未能续约时立即暂停调度器，待命进程在租约过期后接替，故障切换时间不超过租约时间。
+    每次获得租约时递增租约序号并写入租约值，续约及释放时校验完整的租约值，过期的主节点无法续约或删除新主节点的租约；
+    租约序号仅用于区分主节点任期，任务执行时不做校验，任务本身的副作用不受其保护；
+    任务的新增、修改、删除及执行一次以命令形式写入redis流，由主节点按顺序读取并执行
+    """
+
+    ACQUIRE_SCRIPT = """
+    if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then
+        local token = redis.call('INCR', KEYS[2])
+        redis.call('SET', KEYS[1], ARGV[1] .. ':' .. token, 'PX', ARGV[2])
+        return token
+    end
+    return false
+    """
+    RENEW_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    end
+    return 0
+    """
+    RELEASE_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('DEL', KEYS[1])
+    end
+    return 0
+    """
+    COMMAND_STREAM_MAX_LEN = 1000
+
+    redis = None
+    instance_id = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+    lease_token: Optional[int] = None
+    lease_value: Optional[str] = None
+    lease_deadline = 0.0
+    deadline_handle: Optional[asyncio.TimerHandle] = None
+    expire_task: Optional[asyncio.Task] = None
+    election_task: Optional[asyncio.Task] = None
+    command_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def start_leader_election(cls, redis):
+        """
+        应用启动时启动调度主节点选举任务
+
+        :param redis: redis对象
+        :return:
+        """
+        cls.redis = redis
+        if cls.election_task is not None and not cls.election_task.done():
+            return
+        cls.election_task = asyncio.create_task(cls.__run_election())
+
+    @classmethod
+    async def stop_leader_election(cls):
+        """
+        应用关闭时停止选举任务，当前进程为主节点时关闭调度器并释放租约，待命进程可立即接替
+
+        :return:
+        """
+        if cls.election_task is not None:
+            cls.election_task.cancel()
+            try:
+                await cls.election_task
+            except asyncio.CancelledError:
+                pass
+            cls.election_task = None
+        if cls.lease_value is not None:
+            await cls.__step_down('应用关闭')
+            await SchedulerUtil.close_system_scheduler()
+
+    @classmethod
+    def is_leader(cls):
+        """
+        判断当前进程是否为调度主节点
+
+        :return: 是否为调度主节点
+        """
+        return cls.lease_value is not None and time.monotonic() < cls.lease_deadline
+
+    @classmethod
+    async def send_scheduler_command(cls, command: Literal['sync', 'run_once'], job_id: Union[str, int]):
+        """
+        将任务命令写入命令流，由调度主节点执行
+
+        :param command: 命令类型，sync表示以数据库为准同步任务，run_once表示执行一次任务
+        :param job_id: 任务id
+        :return:
+        """
+        await cls.redis.xadd(
+            RedisInitKeyConfig.SCHEDULER_COMMAND.key,
+            dict(command=command, job_id=str(job_id)),
+            maxlen=cls.COMMAND_STREAM_MAX_LEN,
+            approximate=True,
+        )
+
+    @classmethod
+    async def __run_election(cls):
+        """
+        后台任务：未持有租约时尝试获取租约，持有租约时定期续约
+
+        :return:
+        """
+        lease_ms = AppConfig.app_scheduler_lease_seconds * 1000
+        interval = AppConfig.app_scheduler_lease_seconds / 3
+        while True:
+            try:
+                if cls.lease_value is None:
+                    await cls.__try_acquire(lease_ms)
+                else:
+                    renew_start = time.monotonic()
+                    lease_value = cls.lease_value
+                    # 连接阻塞时续约请求可能一直不返回，最多等待至租约到期
+                    renewed = await asyncio.wait_for(
+                        cls.redis.eval(
+                            cls.RENEW_SCRIPT, 1, RedisInitKeyConfig.SCHEDULER_LEADER.key, lease_value, lease_ms
+                        ),
+                        timeout=max(cls.lease_deadline - renew_start, 0),
+                    )
+                    if cls.lease_value != lease_value:
+                        # 等待续约期间租约已到期，主节点身份已放弃
+                        pass
+                    elif renewed:
+                        cls.__set_lease_deadline(renew_start + AppConfig.app_scheduler_lease_seconds)
+                    else:
+                        await cls.__step_down('租约已被其他进程持有')
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f'定时任务调度主节点选举失败，详细错误信息：{e}')
+                # 无法确认租约是否仍然有效时，在租约到期前主动放弃主节点身份
+                if cls.lease_value is not None and time.monotonic() + interval >= cls.lease_deadline:
+                    await cls.__step_down('租约续约失败')
+            await asyncio.sleep(interval)
+
+    @classmethod
+    async def __try_acquire(cls, lease_ms: int):
+        """
+        工具方法：尝试获取租约，获取成功后启动调度器及命令消费任务
+
+        :param lease_ms: 租约时间（单位：毫秒）
+        :return:
+        """
+        acquire_start = time.monotonic()
+        # 获取请求超过租约时间才返回时，即使获取成功租约也已过期
+        token = await asyncio.wait_for(
+            cls.redis.eval(
+                cls.ACQUIRE_SCRIPT,
+                2,
+                RedisInitKeyConfig.SCHEDULER_LEADER.key,
+                RedisInitKeyConfig.SCHEDULER_LEASE_TOKEN.key,
+                cls.instance_id,
+                lease_ms,
+            ),
+            timeout=AppConfig.app_scheduler_lease_seconds,
+        )
+        if not token:
+            return
+        cls.lease_token = int(token)
+        cls.lease_value = f'{cls.instance_id}:{cls.lease_token}'
+        cls.__set_lease_deadline(acquire_start + AppConfig.app_scheduler_lease_seconds)
+        logger.info(f'当前进程{cls.instance_id}成为定时任务调度主节点，租约序号：{cls.lease_token}')
+        try:
+            # 先记录命令流的位置再加载任务，加载期间写入的命令在加载完成后补充执行
+            last_command = await cls.redis.xrevrange(RedisInitKeyConfig.SCHEDULER_COMMAND.key, count=1)
+            last_command_id = last_command[0][0] if last_command else '0-0'
+            await SchedulerUtil.init_system_scheduler()
+        except Exception as e:
+            await cls.__step_down(f'调度器启动失败：{e}')
+            raise e
+        cls.command_task = asyncio.create_task(cls.__consume_commands(cls.lease_token, last_command_id))
+
+    @classmethod
+    def __set_lease_deadline(cls, lease_deadline: float):
+        """
+        工具方法：更新租约到期时间，并重新设置到期时暂停调度器的定时器
+
+        :param lease_deadline: 租约到期时间（time.monotonic时钟）
+        :return:
+        """
+        cls.lease_deadline = lease_deadline
+        if cls.deadline_handle is not None:
+            cls.deadline_handle.cancel()
+        cls.deadline_handle = asyncio.get_running_loop().call_later(
+            max(lease_deadline - time.monotonic(), 0), cls.__on_lease_deadline
+        )
+
+    @classmethod
+    def __on_lease_deadline(cls):
+        """
+        工具方法：租约到期时仍未续约成功，立即暂停调度器并放弃主节点身份，不等待阻塞中的续约请求
+
+        :return:
+        """
+        cls.deadline_handle = None
+        if cls.lease_value is None or time.monotonic() < cls.lease_deadline:
+            return
+        # 放弃主节点身份的任务在下一次事件循环迭代即暂停调度器，期间不会等待任何redis请求
+        cls.expire_task = asyncio.create_task(cls.__step_down('租约到期前未能续约'))
+
+    @classmethod
+    async def __step_down(cls, reason: str):
+        """
+        工具方法：放弃主节点身份，停止命令消费任务、暂停调度器并释放租约
+
+        :param reason: 原因
+        :return:
+        """
+        lease_value = cls.lease_value
+        if lease_value is None:
+            return
+        cls.lease_value = None
+        cls.lease_token = None
+        if cls.deadline_handle is not None:
+            cls.deadline_handle.cancel()
+            cls.deadline_handle = None
+        if cls.command_task is not None:
+            cls.command_task.cancel()
+            cls.command_task = None
+        await SchedulerUtil.pause_system_scheduler()
+        logger.warning(f'当前进程{cls.instance_id}不再是定时任务调度主节点，原因：{reason}')
+        try:
+            await asyncio.wait_for(
+                cls.redis.eval(cls.RELEASE_SCRIPT, 1, RedisInitKeyConfig.SCHEDULER_LEADER.key, lease_value),
+                timeout=AppConfig.app_scheduler_lease_seconds,
+            )
+        except Exception as e:
+            logger.warning(f'定时任务调度主节点租约释放失败，详细错误信息：{e}')
+
+    @classmethod
+    async def __consume_commands(cls, lease_token: int, last_command_id: str):
+        """
+        后台任务：调度主节点按顺序读取并执行命令流中的任务命令
+
+        :param lease_token: 启动时的租约序号，序号变化说明主节点已变更，停止消费
+        :param last_command_id: 开始读取的命令流位置
+        :return:
+        """
+        while cls.lease_token == lease_token:
+            try:
+                result = await cls.redis.xread(
+                    {RedisInitKeyConfig.SCHEDULER_COMMAND.key: last_command_id}, count=100, block=5000
                 )
-                session = SessionLocal()
-                JobLogService.add_job_log_services(session, job_log)
-                session.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f'定时任务命令读取失败，详细错误信息：{e}')
+                await asyncio.sleep(1)
+                continue
+            for _, messages in result or []:
+                for message_id, fields in messages:
+                    last_command_id = message_id
+                    if not cls.is_leader() or cls.lease_token != lease_token:
+                        return
+                    try:
+                        if fields.get('command') == 'run_once':
+                            await SchedulerUtil.run_scheduler_job_once(fields.get('job_id'))
+                        else:
+                            await SchedulerUtil.sync_scheduler_job(fields.get('job_id'))
+                    except Exception as e:
+                        logger.error(f'定时任务命令{fields}执行失败，详细错误信息：{e}')
@@ -1,20 +1,20 @@
 import inspect
 import json
 import os
-import requests
 import time
 from datetime import datetime
 from fastapi import Request
 from fastapi.responses import JSONResponse, ORJSONResponse, UJSONResponse
-from functools import lru_cache, wraps
+from functools import wraps
 from typing import Literal, Optional
 from user_agents import parse
 from config.enums import BusinessType
 from config.env import AppConfig
 from exceptions.exception import LoginException, ServiceException, ServiceWarning
-from module_admin.entity.vo.log_vo import LogininforModel, OperLogModel
-from module_admin.service.log_service import LoginLogService, OperationLogService
+from module_admin.entity.vo.user_vo import CurrentUserModel
+from module_admin.service.log_sink_service import LogSinkService
 from module_admin.service.login_service import LoginService
+from utils.ip_location_util import IpLocationUtil, UNKNOWN_IP_LOCATION
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
 
@@ -69,9 +69,10 @@ class Log:
             oper_url = request.url.path
             # 获取请求的ip及ip归属区域
             oper_ip = request.headers.get('X-Forwarded-For')
+            # 仅查询缓存及离线库，未命中时登录日志记为未知并在后台查询，操作日志交由日志异步写入任务查询
             oper_location = '内网IP'
             if AppConfig.app_ip_location_query:
-                oper_location = get_ip_location(oper_ip)
+                oper_location = await IpLocationUtil.get_ip_location_nowait(request.app.state.redis, oper_ip)
             # 根据不同的请求类型使用不同的方法获取请求参数
             content_type = request.headers.get('Content-Type')
             if content_type and (
@@ -107,7 +108,7 @@ class Log:
                     system_os += f' {user_agent_info.os.version[0]}'
                 login_log = dict(
                     ipaddr=oper_ip,
-                    loginLocation=oper_location,
+                    loginLocation=oper_location or UNKNOWN_IP_LOCATION,
                     browser=browser,
                     os=system_os,
                     loginTime=oper_time.strftime('%Y-%m-%d %H:%M:%S'),
@@ -134,30 +135,22 @@ class Log:
             request_from_redoc = (
                 request.headers.get('referer').endswith('redoc') if request.headers.get('referer') else False
             )
-            # 根据响应结果的类型使用不同的方法获取响应结果参数
+            # 根据响应结果的类型使用不同的方法获取响应结果参数，json响应体的解析交由日志异步写入任务处理
             if (
                 isinstance(result, JSONResponse)
                 or isinstance(result, ORJSONResponse)
                 or isinstance(result, UJSONResponse)
             ):
-                result_dict = json.loads(str(result.body, 'utf-8'))
+                result_content = bytes(result.body)
             else:
                 if request_from_swagger or request_from_redoc:
-                    result_dict = {}
+                    result_content = {}
                 else:
                     if result.status_code == 200:
-                        result_dict = {'code': result.status_code, 'message': '获取成功'}
+                        result_content = {'code': result.status_code, 'message': '获取成功'}
                     else:
-                        result_dict = {'code': result.status_code, 'message': '获取失败'}
-            json_result = json.dumps(result_dict, ensure_ascii=False)
-            # 根据响应结果获取响应状态及异常信息
-            status = 1
-            error_msg = ''
-            if result_dict.get('code') == 200:
-                status = 0
-            else:
-                error_msg = result_dict.get('msg')
-            # 根据日志类型向对应的日志表插入数据
+                        result_content = {'code': result.status_code, 'message': '获取失败'}
+            # 根据日志类型将日志放入对应的异步写入队列
             if self.log_type == 'login':
                 # 登录请求来自于api文档时不记录登录日志，其余情况则记录
                 if request_from_swagger or request_from_redoc:
@@ -167,15 +160,15 @@ class Log:
                     user_name = user.username
                     login_log['loginTime'] = oper_time
                     login_log['userName'] = user_name
-                    login_log['status'] = str(status)
-                    login_log['msg'] = result_dict.get('msg')
 
-                    await LoginLogService.add_login_log_services(query_db, LogininforModel(**login_log))
+                    LogSinkService.put_log_services('login', login_log, result_content)
             else:
-                current_user = await LoginService.get_current_user(request, token, query_db)
+                current_user = kwargs.get('current_user')
+                if not isinstance(current_user, CurrentUserModel):
+                    current_user = await LoginService.get_current_user(request, token, query_db)
                 oper_name = current_user.user.user_name
                 dept_name = current_user.user.dept.dept_name if current_user.user.dept else None
-                operation_log = OperLogModel(
+                operation_log = dict(
                     title=self.title,
                     businessType=self.business_type,
                     method=func_path,
@@ -187,38 +180,12 @@ class Log:
                     operIp=oper_ip,
                     operLocation=oper_location,
                     operParam=oper_param,
-                    jsonResult=json_result,
-                    status=status,
-                    errorMsg=error_msg,
                     operTime=oper_time,
                     costTime=int(cost_time),
                 )
-                await OperationLogService.add_operation_log_services(query_db, operation_log)
+                LogSinkService.put_log_services('operation', operation_log, result_content)
 
             return result
 
         return wrapper
 
-
-@lru_cache()
-def get_ip_location(oper_ip: str):
-    """
-    查询ip归属区域
-
-    :param oper_ip: 需要查询的ip
-    :return: ip归属区域
-    """
-    oper_location = '内网IP'
-    try:
-        if oper_ip != '127.0.0.1' and oper_ip != 'localhost':
-            oper_location = '未知'
-            ip_result = requests.get(f'https://qifu-api.baidubce.com/ip/geo/v1/district?ip={oper_ip}')
-            if ip_result.status_code == 200:
-                prov = ip_result.json().get('data').get('prov')
-                city = ip_result.json().get('data').get('city')
-                if prov or city:
-                    oper_location = f'{prov}-{city}'
-    except Exception as e:
-        oper_location = '未知'
-        print(e)
-    return oper_location
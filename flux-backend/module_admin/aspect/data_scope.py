@@ -1,12 +1,20 @@
 from fastapi import Depends
-from typing import Optional
+from sqlalchemy import ColumnElement, false, or_, select, true
+from typing import Dict, Optional, Tuple
+from config.database import Base
+from module_admin.entity.do.dept_do import SysDeptClosure
+from module_admin.entity.do.role_do import SysRoleDept
 from module_admin.entity.vo.user_vo import CurrentUserModel
 from module_admin.service.login_service import LoginService
+from utils.cache_util import LocalCache
 
 
 class GetDataScope:
     """
-    获取当前用户数据权限对应的查询sql语句
+    获取当前用户数据权限对应的查询条件
+
+    查询条件按(模型, 字段别名, 数据权限范围)编译为sqlalchemy表达式并缓存于进程内，
+    具有相同角色数据权限及部门的用户共享同一表达式，取值以绑定参数传入，便于命中sqlalchemy语句编译缓存
     """
 
     DATA_SCOPE_ALL = '1'
@@ -15,6 +23,9 @@ class GetDataScope:
     DATA_SCOPE_DEPT_AND_CHILD = '4'
     DATA_SCOPE_SELF = '5'
 
+    condition_cache = LocalCache(max_size=4096)
+    model_registry: Dict[str, type] = {}
+
     def __init__(
         self,
         query_alias: Optional[str] = '',
@@ -23,11 +34,11 @@ class GetDataScope:
         dept_alias: Optional[str] = 'dept_id',
     ):
         """
-        获取当前用户数据权限对应的查询sql语句
+        获取当前用户数据权限对应的查询条件
 
         :param query_alias: 所要查询表对应的sqlalchemy模型名称，默认为''
-        :param db_alias: orm对象别名，默认为'db'
-        :param user_alias: 用户id字段别名，默认为'user_id'
+        :param db_alias: orm对象别名，默认为'db'（已不再使用，保留以兼容旧调用）
+        :param user_alias: 用户id字段别名，默认为'create_by'
         :param dept_alias: 部门id字段别名，默认为'dept_id'
         """
         self.query_alias = query_alias
@@ -35,41 +46,88 @@ class GetDataScope:
         self.user_alias = user_alias
         self.dept_alias = dept_alias
 
-    def __call__(self, current_user: CurrentUserModel = Depends(LoginService.get_current_user)):
+    def __call__(self, current_user: CurrentUserModel = Depends(LoginService.get_current_user)) -> ColumnElement:
+        data_scope_key = self.get_data_scope_key(current_user)
+        cache_key = (self.query_alias, self.user_alias, self.dept_alias, data_scope_key)
+        condition = self.condition_cache.get(cache_key)
+        if condition is None:
+            condition = self.compile_data_scope_condition(self.get_query_model(self.query_alias), data_scope_key)
+            self.condition_cache.set(cache_key, condition)
+
+        return condition
+
+    @classmethod
+    def get_data_scope_key(cls, current_user: CurrentUserModel) -> Tuple[Tuple, ...]:
+        """
+        将当前用户的角色数据权限归一化为可哈希的数据权限范围
+
+        :param current_user: 当前用户对象
+        :return: 数据权限范围，每一项为(数据权限类型, 取值)
+        """
         user_id = current_user.user.user_id
         dept_id = current_user.user.dept_id
-        custom_data_scope_role_id_list = [
-            item.role_id for item in current_user.user.role if item.data_scope == self.DATA_SCOPE_CUSTOM
-        ]
-        param_sql_list = []
+        custom_data_scope_role_ids = tuple(
+            item.role_id for item in current_user.user.role if item.data_scope == cls.DATA_SCOPE_CUSTOM
+        )
+        scope_list = []
         for role in current_user.user.role:
-            if current_user.user.admin or role.data_scope == self.DATA_SCOPE_ALL:
-                param_sql_list = ['1 == 1']
-                break
-            elif role.data_scope == self.DATA_SCOPE_CUSTOM:
-                if len(custom_data_scope_role_id_list) > 1:
-                    param_sql_list.append(
-                        f"{self.query_alias}.{self.dept_alias}.in_(select(SysRoleDept.dept_id).where(SysRoleDept.role_id.in_({custom_data_scope_role_id_list}))) if hasattr({self.query_alias}, '{self.dept_alias}') else 1 == 0"
-                    )
-                else:
-                    param_sql_list.append(
-                        f"{self.query_alias}.{self.dept_alias}.in_(select(SysRoleDept.dept_id).where(SysRoleDept.role_id == {role.role_id})) if hasattr({self.query_alias}, '{self.dept_alias}') else 1 == 0"
-                    )
-            elif role.data_scope == self.DATA_SCOPE_DEPT:
-                param_sql_list.append(
-                    f"{self.query_alias}.{self.dept_alias} == {dept_id} if hasattr({self.query_alias}, '{self.dept_alias}') else 1 == 0"
-                )
-            elif role.data_scope == self.DATA_SCOPE_DEPT_AND_CHILD:
-                param_sql_list.append(
-                    f"{self.query_alias}.{self.dept_alias}.in_(select(SysDept.dept_id).where(or_(SysDept.dept_id == {dept_id}, func.find_in_set({dept_id}, SysDept.ancestors)))) if hasattr({self.query_alias}, '{self.dept_alias}') else 1 == 0"
+            if current_user.user.admin or role.data_scope == cls.DATA_SCOPE_ALL:
+                return ((cls.DATA_SCOPE_ALL, None),)
+            elif role.data_scope == cls.DATA_SCOPE_CUSTOM:
+                scope_list.append((cls.DATA_SCOPE_CUSTOM, custom_data_scope_role_ids))
+            elif role.data_scope in (cls.DATA_SCOPE_DEPT, cls.DATA_SCOPE_DEPT_AND_CHILD):
+                scope_list.append((role.data_scope, dept_id))
+            elif role.data_scope == cls.DATA_SCOPE_SELF:
+                scope_list.append((cls.DATA_SCOPE_SELF, user_id))
+            else:
+                scope_list.append((None, None))
+
+        return tuple(dict.fromkeys(scope_list))
+
+    @classmethod
+    def get_query_model(cls, query_alias: str):
+        """
+        根据模型名称获取sqlalchemy模型
+
+        :param query_alias: 模型名称
+        :return: sqlalchemy模型
+        """
+        model = cls.model_registry.get(query_alias)
+        if model is None:
+            cls.model_registry.update({mapper.class_.__name__: mapper.class_ for mapper in Base.registry.mappers})
+            model = cls.model_registry.get(query_alias)
+        if model is None:
+            raise ValueError(f'数据权限查询模型{query_alias}不存在')
+
+        return model
+
+    def compile_data_scope_condition(self, model, data_scope_key: Tuple[Tuple, ...]) -> ColumnElement:
+        """
+        将数据权限范围编译为绑定到目标模型的查询条件
+
+        :param model: 所要查询表对应的sqlalchemy模型
+        :param data_scope_key: 数据权限范围
+        :return: 查询条件
+        """
+        if not data_scope_key or data_scope_key == ((self.DATA_SCOPE_ALL, None),):
+            return true()
+        dept_column = getattr(model, self.dept_alias, None)
+        user_column = getattr(model, self.user_alias, None)
+        condition_list = []
+        for data_scope, value in data_scope_key:
+            if data_scope == self.DATA_SCOPE_CUSTOM and dept_column is not None:
+                condition_list.append(
+                    dept_column.in_(select(SysRoleDept.dept_id).where(SysRoleDept.role_id.in_(value)))
                 )
-            elif role.data_scope == self.DATA_SCOPE_SELF:
-                param_sql_list.append(
-                    f"{self.query_alias}.{self.user_alias} == {user_id} if hasattr({self.query_alias}, '{self.user_alias}') else 1 == 0"
+            elif data_scope == self.DATA_SCOPE_DEPT and dept_column is not None:
+                condition_list.append(dept_column == value)
+            elif data_scope == self.DATA_SCOPE_DEPT_AND_CHILD and dept_column is not None:
+                condition_list.append(
+                    dept_column.in_(select(SysDeptClosure.descendant_id).where(SysDeptClosure.ancestor_id == value))
                 )
+            elif data_scope == self.DATA_SCOPE_SELF and user_column is not None:
+                condition_list.append(user_column == value)
             else:
-                param_sql_list.append('1 == 0')
-        param_sql_list = list(dict.fromkeys(param_sql_list))
-        param_sql = f"or_({', '.join(param_sql_list)})"
+                condition_list.append(false())
 
-        return param_sql
+        return or_(*condition_list)
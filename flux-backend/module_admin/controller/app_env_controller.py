@@ -1,7 +1,8 @@
 from datetime import datetime
-from fastapi import APIRouter, Depends, Form, Request
+from fastapi import APIRouter, Depends, Form, Query, Request
 from pydantic_validation_decorator import ValidateFields
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal
 from config.enums import BusinessType
 from config.get_db import get_db
 from module_admin.annotation.log_annotation import Log
@@ -10,7 +11,7 @@ from module_admin.service.login_service import LoginService
 from module_admin.service.app_env_service import EnvService
 from module_admin.entity.vo.env_vo import DeleteEnvModel, EnvModel, EnvPageQueryModel
 from module_admin.entity.vo.user_vo import CurrentUserModel
-from utils.common_util import bytes2file_response
+from utils.export_util import ExportUtil
 from utils.log_util import logger
 from utils.page_util import PageResponseModel
 from utils.response_util import ResponseUtil
@@ -95,11 +96,10 @@ async def query_detail_app_env(request: Request, env_id: int, query_db: AsyncSes
 async def export_app_env_list(
     request: Request,
     env_page_query: EnvPageQueryModel = Form(),
-    query_db: AsyncSession = Depends(get_db),
+    file_format: Literal['xlsx', 'csv'] = Query('xlsx', alias='fileFormat'),
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
 ):
-    # 获取全量数据
-    env_query_result = await EnvService.get_env_list_services(query_db, env_page_query, is_page=False)
-    env_export_result = await EnvService.export_env_list_services(env_query_result)
+    env_export_result = await EnvService.export_env_list_services(request, env_page_query, file_format)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(env_export_result))
+    return ResponseUtil.streaming(data=env_export_result, media_type=ExportUtil.get_media_type(file_format))
@@ -1,9 +1,10 @@
 # -*- coding:utf-8 -*-
 
-from fastapi import APIRouter, Depends, Form
+from fastapi import APIRouter, Depends, Form, Query
+from sqlalchemy import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.requests import Request
-from typing import List
+from typing import List, Literal
 from config.enums import BusinessType
 from config.get_db import get_db
 from module_admin.entity.vo.import_vo import ImportModel
@@ -14,7 +15,7 @@ from module_admin.aspect.interface_auth import CheckUserInterfaceAuth
 from module_admin.entity.vo.user_vo import CurrentUserModel
 from module_admin.annotation.log_annotation import Log
 from utils.response_util import ResponseUtil
-from utils.common_util import bytes2file_response
+from utils.export_util import ExportUtil
 
 from module_admin.entity.vo.car_driver_vo import CarDriverPageModel, CarDriverModel
 from module_admin.service.car_driver_service import CarDriverService
@@ -27,7 +28,7 @@ async def get_car_driver_list(
         request: Request,
         query_db: AsyncSession = Depends(get_db),
         page_query: CarDriverPageModel = Depends( CarDriverPageModel.as_query),
-        data_scope_sql: str = Depends(GetDataScope('CarDriver'))
+        data_scope_sql: ColumnElement = Depends(GetDataScope('CarDriver'))
 ):
     car_driver_result = await CarDriverService.get_car_driver_list(query_db, page_query, data_scope_sql)
 
@@ -38,7 +39,7 @@ async def get_car_driver_by_id(
         request: Request,
         carDriverId: int,
         query_db: AsyncSession = Depends(get_db),
-        data_scope_sql: str = Depends(GetDataScope('CarDriver'))
+        data_scope_sql: ColumnElement = Depends(GetDataScope('CarDriver'))
 ):
     car_driver = await CarDriverService.get_car_driver_by_id(query_db, carDriverId)
     return ResponseUtil.success(data=car_driver)
@@ -87,14 +88,14 @@ async def del_car_driver(
 async def export_car_driver(
     request: Request,
     car_driver_form: CarDriverPageModel = Form(),
-    query_db: AsyncSession = Depends(get_db),
-    data_scope_sql: str = Depends(GetDataScope('CarDriver')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('CarDriver')),
+    file_format: Literal['xlsx', 'csv'] = Query('xlsx', alias='fileFormat'),
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
 ):
-    # 获取全量数据
     export_result = await CarDriverService.export_car_driver_list(
-        query_db, car_driver_form, data_scope_sql
+        request, car_driver_form, data_scope_sql, file_format
     )
-    return ResponseUtil.streaming(data=bytes2file_response(export_result))
+    return ResponseUtil.streaming(data=export_result, media_type=ExportUtil.get_media_type(file_format))
 
 
 @carDriverController.post('/import', dependencies=[Depends(CheckUserInterfaceAuth('car:driver:import'))])
@@ -103,5 +104,5 @@ async def import_data(request: Request,
                       query_db: AsyncSession = Depends(get_db),
                       current_user: CurrentUserModel = Depends(LoginService.get_current_user)
     ):
-    await ImportService.import_data(query_db, import_model, current_user)
-    return ResponseUtil.success()
+    import_task = await ImportService.import_data(request, import_model, current_user)
+    return ResponseUtil.success(data=import_task)
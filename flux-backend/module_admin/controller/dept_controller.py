@@ -1,6 +1,7 @@
 from datetime import datetime
 from fastapi import APIRouter, Depends, Request
 from pydantic_validation_decorator import ValidateFields
+from sqlalchemy import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from config.enums import BusinessType
@@ -12,6 +13,7 @@ from module_admin.entity.vo.dept_vo import DeleteDeptModel, DeptModel, DeptQuery
 from module_admin.entity.vo.user_vo import CurrentUserModel
 from module_admin.service.dept_service import DeptService
 from module_admin.service.login_service import LoginService
+from module_admin.service.user_cache_service import UserCacheService
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
 
@@ -28,7 +30,7 @@ async def get_system_dept_tree_for_edit_option(
     request: Request,
     dept_id: int,
     query_db: AsyncSession = Depends(get_db),
-    data_scope_sql: str = Depends(GetDataScope('SysDept')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept')),
 ):
     dept_query = DeptModel(deptId=dept_id)
     dept_query_result = await DeptService.get_dept_for_edit_option_services(query_db, dept_query, data_scope_sql)
@@ -44,7 +46,7 @@ async def get_system_dept_list(
     request: Request,
     dept_query: DeptQueryModel = Depends(DeptQueryModel.as_query),
     query_db: AsyncSession = Depends(get_db),
-    data_scope_sql: str = Depends(GetDataScope('SysDept')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept')),
 ):
     dept_query_result = await DeptService.get_dept_list_services(query_db, dept_query, data_scope_sql)
     logger.info('获取成功')
@@ -66,6 +68,7 @@ async def add_system_dept(
     add_dept.update_by = current_user.user.user_name
     add_dept.update_time = datetime.now()
     add_dept_result = await DeptService.add_dept_services(query_db, add_dept)
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(add_dept_result.message)
 
     return ResponseUtil.success(data=add_dept_result)
@@ -79,13 +82,14 @@ async def edit_system_dept(
     edit_dept: DeptModel,
     query_db: AsyncSession = Depends(get_db),
     current_user: CurrentUserModel = Depends(LoginService.get_current_user),
-    data_scope_sql: str = Depends(GetDataScope('SysDept')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept')),
 ):
     if not current_user.user.admin:
         await DeptService.check_dept_data_scope_services(query_db, edit_dept.dept_id, data_scope_sql)
     edit_dept.update_by = current_user.user.user_name
     edit_dept.update_time = datetime.now()
     edit_dept_result = await DeptService.edit_dept_services(query_db, edit_dept)
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(edit_dept_result.message)
 
     return ResponseUtil.success(msg=edit_dept_result.message)
@@ -98,7 +102,7 @@ async def delete_system_dept(
     dept_ids: str,
     query_db: AsyncSession = Depends(get_db),
     current_user: CurrentUserModel = Depends(LoginService.get_current_user),
-    data_scope_sql: str = Depends(GetDataScope('SysDept')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept')),
 ):
     dept_id_list = dept_ids.split(',') if dept_ids else []
     if dept_id_list:
@@ -109,6 +113,7 @@ async def delete_system_dept(
     delete_dept.update_by = current_user.user.user_name
     delete_dept.update_time = datetime.now()
     delete_dept_result = await DeptService.delete_dept_services(query_db, delete_dept)
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(delete_dept_result.message)
 
     return ResponseUtil.success(msg=delete_dept_result.message)
@@ -122,7 +127,7 @@ async def query_detail_system_dept(
     dept_id: int,
     query_db: AsyncSession = Depends(get_db),
     current_user: CurrentUserModel = Depends(LoginService.get_current_user),
-    data_scope_sql: str = Depends(GetDataScope('SysDept')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept')),
 ):
     if not current_user.user.admin:
         await DeptService.check_dept_data_scope_services(query_db, dept_id, data_scope_sql)
@@ -1,8 +1,8 @@
 from datetime import datetime
-from fastapi import APIRouter, Depends, Form, Request
+from fastapi import APIRouter, Depends, Form, Query, Request
 from pydantic_validation_decorator import ValidateFields
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Literal
 from config.enums import BusinessType
 from config.get_db import get_db
 from module_admin.annotation.log_annotation import Log
@@ -18,7 +18,7 @@ from module_admin.entity.vo.dict_vo import (
 from module_admin.entity.vo.user_vo import CurrentUserModel
 from module_admin.service.dict_service import DictDataService, DictTypeService
 from module_admin.service.login_service import LoginService
-from utils.common_util import bytes2file_response
+from utils.export_util import ExportUtil
 from utils.log_util import logger
 from utils.page_util import PageResponseModel
 from utils.response_util import ResponseUtil
@@ -124,16 +124,15 @@ async def query_detail_system_dict_type(request: Request, dict_id: int, query_db
 async def export_system_dict_type_list(
     request: Request,
     dict_type_page_query: DictTypePageQueryModel = Form(),
-    query_db: AsyncSession = Depends(get_db),
+    file_format: Literal['xlsx', 'csv'] = Query('xlsx', alias='fileFormat'),
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
 ):
-    # 获取全量数据
-    dict_type_query_result = await DictTypeService.get_dict_type_list_services(
-        query_db, dict_type_page_query, is_page=False
+    dict_type_export_result = await DictTypeService.export_dict_type_list_services(
+        request, dict_type_page_query, file_format
     )
-    dict_type_export_result = await DictTypeService.export_dict_type_list_services(dict_type_query_result)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(dict_type_export_result))
+    return ResponseUtil.streaming(data=dict_type_export_result, media_type=ExportUtil.get_media_type(file_format))
 
 
 @dictController.get('/data/type/{dict_type}')
@@ -227,13 +226,12 @@ async def query_detail_system_dict_data(request: Request, dict_code: int, query_
 async def export_system_dict_data_list(
     request: Request,
     dict_data_page_query: DictDataPageQueryModel = Form(),
-    query_db: AsyncSession = Depends(get_db),
+    file_format: Literal['xlsx', 'csv'] = Query('xlsx', alias='fileFormat'),
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
 ):
-    # 获取全量数据
-    dict_data_query_result = await DictDataService.get_dict_data_list_services(
-        query_db, dict_data_page_query, is_page=False
+    dict_data_export_result = await DictDataService.export_dict_data_list_services(
+        request, dict_data_page_query, file_format
     )
-    dict_data_export_result = await DictDataService.export_dict_data_list_services(dict_data_query_result)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(dict_data_export_result))
+    return ResponseUtil.streaming(data=dict_data_export_result, media_type=ExportUtil.get_media_type(file_format))
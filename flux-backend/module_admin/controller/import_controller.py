@@ -22,3 +22,24 @@ async def upload_excel(request: Request, tableName:str = Form(), file: UploadFil
 
     return ResponseUtil.success(data=result)
 
+
+
+@importController.get('/task/{task_id}')
+async def get_import_task(request: Request, task_id: str):
+    """
+    查询导入任务进度
+    """
+    import_task_result = await ImportService.get_import_task_services(request, task_id)
+
+    return ResponseUtil.success(data=import_task_result)
+
+
+@importController.put('/task/{task_id}/cancel')
+async def cancel_import_task(request: Request, task_id: str):
+    """
+    取消导入任务
+    """
+    cancel_import_task_result = await ImportService.cancel_import_task_services(request, task_id)
+    logger.info(cancel_import_task_result.message)
+
+    return ResponseUtil.success(msg=cancel_import_task_result.message)
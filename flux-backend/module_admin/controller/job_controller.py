@@ -1,7 +1,8 @@
 from datetime import datetime
-from fastapi import APIRouter, Depends, Form, Request
+from fastapi import APIRouter, Depends, Form, Query, Request
 from pydantic_validation_decorator import ValidateFields
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal
 from config.enums import BusinessType
 from config.get_db import get_db
 from module_admin.annotation.log_annotation import Log
@@ -13,12 +14,15 @@ from module_admin.entity.vo.job_vo import (
     JobLogPageQueryModel,
     JobModel,
     JobPageQueryModel,
+    JobPlanModel,
+    JobPlanQueryModel,
 )
 from module_admin.entity.vo.user_vo import CurrentUserModel
 from module_admin.service.job_log_service import JobLogService
+from module_admin.service.job_plan_service import JobPlanService
 from module_admin.service.job_service import JobService
 from module_admin.service.login_service import LoginService
-from utils.common_util import bytes2file_response
+from utils.export_util import ExportUtil
 from utils.log_util import logger
 from utils.page_util import PageResponseModel
 from utils.response_util import ResponseUtil
@@ -42,6 +46,20 @@ async def get_system_job_list(
     return ResponseUtil.success(model_content=notice_page_query_result)
 
 
+@jobController.get(
+    '/job/plan', response_model=JobPlanModel, dependencies=[Depends(CheckUserInterfaceAuth('monitor:job:list'))]
+)
+async def get_system_job_plan(
+    request: Request,
+    job_plan_query: JobPlanQueryModel = Depends(JobPlanQueryModel.as_query),
+    query_db: AsyncSession = Depends(get_db),
+):
+    job_plan_result = await JobPlanService.get_job_plan_services(query_db, job_plan_query)
+    logger.info('获取成功')
+
+    return ResponseUtil.success(data=job_plan_result)
+
+
 @jobController.post('/job', dependencies=[Depends(CheckUserInterfaceAuth('monitor:job:add'))])
 @ValidateFields(validate_model='add_job')
 @Log(title='定时任务', business_type=BusinessType.INSERT)
@@ -133,14 +151,13 @@ async def query_detail_system_job(request: Request, job_id: int, query_db: Async
 async def export_system_job_list(
     request: Request,
     job_page_query: JobPageQueryModel = Form(),
-    query_db: AsyncSession = Depends(get_db),
+    file_format: Literal['xlsx', 'csv'] = Query('xlsx', alias='fileFormat'),
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
 ):
-    # 获取全量数据
-    job_query_result = await JobService.get_job_list_services(query_db, job_page_query, is_page=False)
-    job_export_result = await JobService.export_job_list_services(request, job_query_result)
+    job_export_result = await JobService.export_job_list_services(request, job_page_query, file_format)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(job_export_result))
+    return ResponseUtil.streaming(data=job_export_result, media_type=ExportUtil.get_media_type(file_format))
 
 
 @jobController.get(
@@ -184,11 +201,10 @@ async def delete_system_job_log(request: Request, job_log_ids: str, query_db: As
 async def export_system_job_log_list(
     request: Request,
     job_log_page_query: JobLogPageQueryModel = Form(),
-    query_db: AsyncSession = Depends(get_db),
+    file_format: Literal['xlsx', 'csv'] = Query('xlsx', alias='fileFormat'),
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
 ):
-    # 获取全量数据
-    job_log_query_result = await JobLogService.get_job_log_list_services(query_db, job_log_page_query, is_page=False)
-    job_log_export_result = await JobLogService.export_job_log_list_services(request, job_log_query_result)
+    job_log_export_result = await JobLogService.export_job_log_list_services(request, job_log_page_query, file_format)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(job_log_export_result))
+    return ResponseUtil.streaming(data=job_log_export_result, media_type=ExportUtil.get_media_type(file_format))
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, Form, Request
+from fastapi import APIRouter, Depends, Form, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal
 from config.enums import BusinessType
 from config.get_db import get_db
 from module_admin.annotation.log_annotation import Log
@@ -11,9 +12,11 @@ from module_admin.entity.vo.log_vo import (
     OperLogPageQueryModel,
     UnlockUser,
 )
+from module_admin.entity.vo.user_vo import CurrentUserModel
 from module_admin.service.log_service import LoginLogService, OperationLogService
+from module_admin.service.log_sink_service import LogSinkService
 from module_admin.service.login_service import LoginService
-from utils.common_util import bytes2file_response
+from utils.export_util import ExportUtil
 from utils.log_util import logger
 from utils.page_util import PageResponseModel
 from utils.response_util import ResponseUtil
@@ -41,6 +44,15 @@ async def get_system_operation_log_list(
     return ResponseUtil.success(model_content=operation_log_page_query_result)
 
 
+@logController.get('/operlog/sinkMetrics', dependencies=[Depends(CheckUserInterfaceAuth('monitor:operlog:list'))])
+async def get_system_log_sink_metrics(request: Request):
+    # 获取日志异步写入队列运行指标
+    log_sink_metrics_result = LogSinkService.get_log_sink_metrics_services()
+    logger.info('获取成功')
+
+    return ResponseUtil.success(data=log_sink_metrics_result)
+
+
 @logController.delete('/operlog/clean', dependencies=[Depends(CheckUserInterfaceAuth('monitor:operlog:remove'))])
 @Log(title='操作日志', business_type=BusinessType.CLEAN)
 async def clear_system_operation_log(request: Request, query_db: AsyncSession = Depends(get_db)):
@@ -67,18 +79,17 @@ async def delete_system_operation_log(request: Request, oper_ids: str, query_db:
 async def export_system_operation_log_list(
     request: Request,
     operation_log_page_query: OperLogPageQueryModel = Form(),
-    query_db: AsyncSession = Depends(get_db),
+    file_format: Literal['xlsx', 'csv'] = Query('xlsx', alias='fileFormat'),
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
 ):
-    # 获取全量数据
-    operation_log_query_result = await OperationLogService.get_operation_log_list_services(
-        query_db, operation_log_page_query, is_page=False
-    )
     operation_log_export_result = await OperationLogService.export_operation_log_list_services(
-        request, operation_log_query_result
+        request, operation_log_page_query, file_format
     )
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(operation_log_export_result))
+    return ResponseUtil.streaming(
+        data=operation_log_export_result, media_type=ExportUtil.get_media_type(file_format)
+    )
 
 
 @logController.get(
@@ -138,13 +149,12 @@ async def unlock_system_user(request: Request, user_name: str, query_db: AsyncSe
 async def export_system_login_log_list(
     request: Request,
     login_log_page_query: LoginLogPageQueryModel = Form(),
-    query_db: AsyncSession = Depends(get_db),
+    file_format: Literal['xlsx', 'csv'] = Query('xlsx', alias='fileFormat'),
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
 ):
-    # 获取全量数据
-    login_log_query_result = await LoginLogService.get_login_log_list_services(
-        query_db, login_log_page_query, is_page=False
+    login_log_export_result = await LoginLogService.export_login_log_list_services(
+        request, login_log_page_query, file_format
     )
-    login_log_export_result = await LoginLogService.export_login_log_list_services(login_log_query_result)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(login_log_export_result))
+    return ResponseUtil.streaming(data=login_log_export_result, media_type=ExportUtil.get_media_type(file_format))
@@ -5,14 +5,16 @@ from fastapi import APIRouter, Depends, Request
 from jwt import InvalidSignatureError
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from config.enums import BusinessType, RedisInitKeyConfig
+from config.enums import BusinessType
 from config.env import AppConfig, JwtConfig
 from config.get_db import get_db
 from module_admin.annotation.log_annotation import Log
 from module_admin.entity.vo.common_vo import CrudResponseModel
 from module_admin.entity.vo.login_vo import UserLogin, UserRegister, Token
 from module_admin.entity.vo.user_vo import CurrentUserModel, EditUserModel
+from module_admin.service.config_service import ConfigService
 from module_admin.service.login_service import CustomOAuth2PasswordRequestForm, LoginService, oauth2_scheme
+from module_admin.service.online_service import OnlineService
 from module_admin.service.user_service import UserService
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
@@ -27,10 +29,8 @@ async def login(
     request: Request, form_data: CustomOAuth2PasswordRequestForm = Depends(), query_db: AsyncSession = Depends(get_db)
 ):
     captcha_enabled = (
-        True
-        if await request.app.state.redis.get(f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.captchaEnabled')
+        await ConfigService.query_config_list_from_cache_services(request.app.state.redis, 'sys.account.captchaEnabled')
         == 'true'
-        else False
     )
     user = UserLogin(
         userName=form_data.username,
@@ -53,19 +53,16 @@ async def login(
         },
         expires_delta=access_token_expires,
     )
-    if AppConfig.app_same_time_login:
-        await request.app.state.redis.set(
-            f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}',
-            access_token,
-            ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
-        )
-    else:
-        # 此方法可实现同一账号同一时间只能登录一次
-        await request.app.state.redis.set(
-            f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{result[0].user_id}',
-            access_token,
-            ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
-        )
+    # 开启同一账号同一时间只能登录一次时以用户id作为会话编号
+    token_id = session_id if AppConfig.app_same_time_login else str(result[0].user_id)
+    await OnlineService.set_online_session_services(
+        request.app.state.redis,
+        token_id,
+        access_token,
+        result[0].user_name,
+        result[1].dept_name if result[1] else None,
+        user.login_info,
+    )
     await UserService.edit_user_services(
         query_db, EditUserModel(userId=result[0].user_id, loginDate=datetime.now(), type='status')
     )
@@ -94,7 +91,7 @@ async def get_login_user_routers(
     query_db: AsyncSession = Depends(get_db),
 ):
     logger.info('获取成功')
-    user_routers = await LoginService.get_current_user_routers(current_user.user.user_id, query_db)
+    user_routers = await LoginService.get_current_user_routers(request, current_user, query_db)
 
     return ResponseUtil.success(data=user_routers)
 
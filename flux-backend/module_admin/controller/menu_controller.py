@@ -11,6 +11,7 @@ from module_admin.entity.vo.menu_vo import DeleteMenuModel, MenuModel, MenuQuery
 from module_admin.entity.vo.user_vo import CurrentUserModel
 from module_admin.service.login_service import LoginService
 from module_admin.service.menu_service import MenuService
+from module_admin.service.user_cache_service import UserCacheService
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
 
@@ -72,6 +73,7 @@ async def add_system_menu(
     add_menu.update_by = current_user.user.user_name
     add_menu.update_time = datetime.now()
     add_menu_result = await MenuService.add_menu_services(query_db, add_menu)
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(add_menu_result.message)
 
     return ResponseUtil.success(msg=add_menu_result.message)
@@ -89,6 +91,7 @@ async def edit_system_menu(
     edit_menu.update_by = current_user.user.user_name
     edit_menu.update_time = datetime.now()
     edit_menu_result = await MenuService.edit_menu_services(query_db, edit_menu)
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(edit_menu_result.message)
 
     return ResponseUtil.success(msg=edit_menu_result.message)
@@ -99,6 +102,7 @@ async def edit_system_menu(
 async def delete_system_menu(request: Request, menu_ids: str, query_db: AsyncSession = Depends(get_db)):
     delete_menu = DeleteMenuModel(menuIds=menu_ids)
     delete_menu_result = await MenuService.delete_menu_services(query_db, delete_menu)
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(delete_menu_result.message)
 
     return ResponseUtil.success(msg=delete_menu_result.message)
@@ -4,7 +4,7 @@ from config.enums import BusinessType
 from config.get_db import get_db
 from module_admin.annotation.log_annotation import Log
 from module_admin.aspect.interface_auth import CheckUserInterfaceAuth
-from module_admin.entity.vo.online_vo import DeleteOnlineModel, OnlineQueryModel
+from module_admin.entity.vo.online_vo import DeleteOnlineModel, OnlinePageQueryModel
 from module_admin.service.login_service import LoginService
 from module_admin.service.online_service import OnlineService
 from utils.log_util import logger
@@ -19,15 +19,13 @@ onlineController = APIRouter(prefix='/monitor/online', dependencies=[Depends(Log
     '/list', response_model=PageResponseModel, dependencies=[Depends(CheckUserInterfaceAuth('monitor:online:list'))]
 )
 async def get_monitor_online_list(
-    request: Request, online_page_query: OnlineQueryModel = Depends(OnlineQueryModel.as_query)
+    request: Request, online_page_query: OnlinePageQueryModel = Depends(OnlinePageQueryModel.as_query)
 ):
-    # 获取全量数据
-    online_query_result = await OnlineService.get_online_list_services(request, online_page_query)
+    # 获取分页数据
+    online_page_query_result = await OnlineService.get_online_list_services(request, online_page_query)
     logger.info('获取成功')
 
-    return ResponseUtil.success(
-        model_content=PageResponseModel(rows=online_query_result, total=len(online_query_result))
-    )
+    return ResponseUtil.success(model_content=online_page_query_result)
 
 
 @onlineController.delete('/{token_ids}', dependencies=[Depends(CheckUserInterfaceAuth('monitor:online:forceLogout'))])
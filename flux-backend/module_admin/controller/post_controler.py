@@ -1,16 +1,18 @@
 from datetime import datetime
-from fastapi import APIRouter, Depends, Form, Request
+from fastapi import APIRouter, Depends, Form, Query, Request
 from pydantic_validation_decorator import ValidateFields
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal
 from config.enums import BusinessType
 from config.get_db import get_db
 from module_admin.annotation.log_annotation import Log
 from module_admin.aspect.interface_auth import CheckUserInterfaceAuth
 from module_admin.service.login_service import LoginService
 from module_admin.service.post_service import PostService
+from module_admin.service.user_cache_service import UserCacheService
 from module_admin.entity.vo.post_vo import DeletePostModel, PostModel, PostPageQueryModel
 from module_admin.entity.vo.user_vo import CurrentUserModel
-from utils.common_util import bytes2file_response
+from utils.export_util import ExportUtil
 from utils.log_util import logger
 from utils.page_util import PageResponseModel
 from utils.response_util import ResponseUtil
@@ -48,6 +50,7 @@ async def add_system_post(
     add_post.update_by = current_user.user.user_name
     add_post.update_time = datetime.now()
     add_post_result = await PostService.add_post_services(query_db, add_post)
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(add_post_result.message)
 
     return ResponseUtil.success(msg=add_post_result.message)
@@ -65,6 +68,7 @@ async def edit_system_post(
     edit_post.update_by = current_user.user.user_name
     edit_post.update_time = datetime.now()
     edit_post_result = await PostService.edit_post_services(query_db, edit_post)
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(edit_post_result.message)
 
     return ResponseUtil.success(msg=edit_post_result.message)
@@ -75,6 +79,7 @@ async def edit_system_post(
 async def delete_system_post(request: Request, post_ids: str, query_db: AsyncSession = Depends(get_db)):
     delete_post = DeletePostModel(postIds=post_ids)
     delete_post_result = await PostService.delete_post_services(query_db, delete_post)
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(delete_post_result.message)
 
     return ResponseUtil.success(msg=delete_post_result.message)
@@ -95,11 +100,10 @@ async def query_detail_system_post(request: Request, post_id: int, query_db: Asy
 async def export_system_post_list(
     request: Request,
     post_page_query: PostPageQueryModel = Form(),
-    query_db: AsyncSession = Depends(get_db),
+    file_format: Literal['xlsx', 'csv'] = Query('xlsx', alias='fileFormat'),
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
 ):
-    # 获取全量数据
-    post_query_result = await PostService.get_post_list_services(query_db, post_page_query, is_page=False)
-    post_export_result = await PostService.export_post_list_services(post_query_result)
+    post_export_result = await PostService.export_post_list_services(request, post_page_query, file_format)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(post_export_result))
+    return ResponseUtil.streaming(data=post_export_result, media_type=ExportUtil.get_media_type(file_format))
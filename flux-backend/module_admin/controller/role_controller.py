@@ -1,7 +1,9 @@
 from datetime import datetime
-from fastapi import APIRouter, Depends, Form, Request
+from fastapi import APIRouter, Depends, Form, Query, Request
 from pydantic_validation_decorator import ValidateFields
+from sqlalchemy import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal
 from config.enums import BusinessType
 from config.get_db import get_db
 from module_admin.annotation.log_annotation import Log
@@ -14,7 +16,8 @@ from module_admin.service.dept_service import DeptService
 from module_admin.service.login_service import LoginService
 from module_admin.service.role_service import RoleService
 from module_admin.service.user_service import UserService
-from utils.common_util import bytes2file_response
+from module_admin.service.user_cache_service import UserCacheService
+from utils.export_util import ExportUtil
 from utils.log_util import logger
 from utils.page_util import PageResponseModel
 from utils.response_util import ResponseUtil
@@ -28,7 +31,7 @@ async def get_system_role_dept_tree(
     request: Request,
     role_id: int,
     query_db: AsyncSession = Depends(get_db),
-    data_scope_sql: str = Depends(GetDataScope('SysDept')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept')),
 ):
     dept_query_result = await DeptService.get_dept_tree_services(query_db, DeptModel(**{}), data_scope_sql)
     role_dept_query_result = await RoleService.get_role_dept_tree_services(query_db, role_id)
@@ -45,7 +48,7 @@ async def get_system_role_list(
     request: Request,
     role_page_query: RolePageQueryModel = Depends(RolePageQueryModel.as_query),
     query_db: AsyncSession = Depends(get_db),
-    data_scope_sql: str = Depends(GetDataScope('SysDept')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept')),
 ):
     role_page_query_result = await RoleService.get_role_list_services(
         query_db, role_page_query, data_scope_sql, is_page=True
@@ -69,6 +72,7 @@ async def add_system_role(
     add_role.update_by = current_user.user.user_name
     add_role.update_time = datetime.now()
     add_role_result = await RoleService.add_role_services(query_db, add_role)
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(add_role_result.message)
 
     return ResponseUtil.success(msg=add_role_result.message)
@@ -82,7 +86,7 @@ async def edit_system_role(
     edit_role: AddRoleModel,
     query_db: AsyncSession = Depends(get_db),
     current_user: CurrentUserModel = Depends(LoginService.get_current_user),
-    data_scope_sql: str = Depends(GetDataScope('SysDept')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept')),
 ):
     await RoleService.check_role_allowed_services(edit_role)
     if not current_user.user.admin:
@@ -90,6 +94,7 @@ async def edit_system_role(
     edit_role.update_by = current_user.user.user_name
     edit_role.update_time = datetime.now()
     edit_role_result = await RoleService.edit_role_services(query_db, edit_role)
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(edit_role_result.message)
 
     return ResponseUtil.success(msg=edit_role_result.message)
@@ -102,7 +107,7 @@ async def edit_system_role_datascope(
     role_data_scope: AddRoleModel,
     query_db: AsyncSession = Depends(get_db),
     current_user: CurrentUserModel = Depends(LoginService.get_current_user),
-    data_scope_sql: str = Depends(GetDataScope('SysDept')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept')),
 ):
     await RoleService.check_role_allowed_services(role_data_scope)
     if not current_user.user.admin:
@@ -116,6 +121,7 @@ async def edit_system_role_datascope(
         updateTime=datetime.now(),
     )
     role_data_scope_result = await RoleService.role_datascope_services(query_db, edit_role)
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(role_data_scope_result.message)
 
     return ResponseUtil.success(msg=role_data_scope_result.message)
@@ -128,7 +134,7 @@ async def delete_system_role(
     role_ids: str,
     query_db: AsyncSession = Depends(get_db),
     current_user: CurrentUserModel = Depends(LoginService.get_current_user),
-    data_scope_sql: str = Depends(GetDataScope('SysDept')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept')),
 ):
     role_id_list = role_ids.split(',') if role_ids else []
     if role_id_list:
@@ -138,6 +144,7 @@ async def delete_system_role(
                 await RoleService.check_role_data_scope_services(query_db, role_id, data_scope_sql)
     delete_role = DeleteRoleModel(roleIds=role_ids, updateBy=current_user.user.user_name, updateTime=datetime.now())
     delete_role_result = await RoleService.delete_role_services(query_db, delete_role)
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(delete_role_result.message)
 
     return ResponseUtil.success(msg=delete_role_result.message)
@@ -151,7 +158,7 @@ async def query_detail_system_role(
     role_id: int,
     query_db: AsyncSession = Depends(get_db),
     current_user: CurrentUserModel = Depends(LoginService.get_current_user),
-    data_scope_sql: str = Depends(GetDataScope('SysDept')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept')),
 ):
     if not current_user.user.admin:
         await RoleService.check_role_data_scope_services(query_db, str(role_id), data_scope_sql)
@@ -166,17 +173,16 @@ async def query_detail_system_role(
 async def export_system_role_list(
     request: Request,
     role_page_query: RolePageQueryModel = Form(),
-    query_db: AsyncSession = Depends(get_db),
-    data_scope_sql: str = Depends(GetDataScope('SysDept')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept')),
+    file_format: Literal['xlsx', 'csv'] = Query('xlsx', alias='fileFormat'),
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
 ):
-    # 获取全量数据
-    role_query_result = await RoleService.get_role_list_services(
-        query_db, role_page_query, data_scope_sql, is_page=False
+    role_export_result = await RoleService.export_role_list_services(
+        request, role_page_query, data_scope_sql, file_format
     )
-    role_export_result = await RoleService.export_role_list_services(role_query_result)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(role_export_result))
+    return ResponseUtil.streaming(data=role_export_result, media_type=ExportUtil.get_media_type(file_format))
 
 
 @roleController.put('/changeStatus', dependencies=[Depends(CheckUserInterfaceAuth('system:role:edit'))])
@@ -186,7 +192,7 @@ async def reset_system_role_status(
     change_role: AddRoleModel,
     query_db: AsyncSession = Depends(get_db),
     current_user: CurrentUserModel = Depends(LoginService.get_current_user),
-    data_scope_sql: str = Depends(GetDataScope('SysDept')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept')),
 ):
     await RoleService.check_role_allowed_services(change_role)
     if not current_user.user.admin:
@@ -199,6 +205,7 @@ async def reset_system_role_status(
         type='status',
     )
     edit_role_result = await RoleService.edit_role_services(query_db, edit_role)
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(edit_role_result.message)
 
     return ResponseUtil.success(msg=edit_role_result.message)
@@ -213,7 +220,7 @@ async def get_system_allocated_user_list(
     request: Request,
     user_role: UserRolePageQueryModel = Depends(UserRolePageQueryModel.as_query),
     query_db: AsyncSession = Depends(get_db),
-    data_scope_sql: str = Depends(GetDataScope('SysUser')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysUser')),
 ):
     role_user_allocated_page_query_result = await RoleService.get_role_user_allocated_list_services(
         query_db, user_role, data_scope_sql, is_page=True
@@ -232,7 +239,7 @@ async def get_system_unallocated_user_list(
     request: Request,
     user_role: UserRolePageQueryModel = Depends(UserRolePageQueryModel.as_query),
     query_db: AsyncSession = Depends(get_db),
-    data_scope_sql: str = Depends(GetDataScope('SysUser')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysUser')),
 ):
     role_user_unallocated_page_query_result = await RoleService.get_role_user_unallocated_list_services(
         query_db, user_role, data_scope_sql, is_page=True
@@ -249,11 +256,12 @@ async def add_system_role_user(
     add_role_user: CrudUserRoleModel = Depends(CrudUserRoleModel.as_query),
     query_db: AsyncSession = Depends(get_db),
     current_user: CurrentUserModel = Depends(LoginService.get_current_user),
-    data_scope_sql: str = Depends(GetDataScope('SysDept')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept')),
 ):
     if not current_user.user.admin:
         await RoleService.check_role_data_scope_services(query_db, str(add_role_user.role_id), data_scope_sql)
     add_role_user_result = await UserService.add_user_role_services(query_db, add_role_user)
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(add_role_user_result.message)
 
     return ResponseUtil.success(msg=add_role_user_result.message)
@@ -265,6 +273,7 @@ async def cancel_system_role_user(
     request: Request, cancel_user_role: CrudUserRoleModel, query_db: AsyncSession = Depends(get_db)
 ):
     cancel_user_role_result = await UserService.delete_user_role_services(query_db, cancel_user_role)
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(cancel_user_role_result.message)
 
     return ResponseUtil.success(msg=cancel_user_role_result.message)
@@ -278,6 +287,7 @@ async def batch_cancel_system_role_user(
     query_db: AsyncSession = Depends(get_db),
 ):
     batch_cancel_user_role_result = await UserService.delete_user_role_services(query_db, batch_cancel_user_role)
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(batch_cancel_user_role_result.message)
 
     return ResponseUtil.success(msg=batch_cancel_user_role_result.message)
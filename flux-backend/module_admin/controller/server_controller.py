@@ -3,6 +3,7 @@ from module_admin.aspect.interface_auth import CheckUserInterfaceAuth
 from module_admin.entity.vo.server_vo import ServerMonitorModel
 from module_admin.service.login_service import LoginService
 from module_admin.service.server_service import ServerService
+from utils.pwd_util import PwdUtil
 from utils.response_util import ResponseUtil
 from utils.log_util import logger
 
@@ -19,3 +20,12 @@ async def get_monitor_server_info(request: Request):
     logger.info('获取成功')
 
     return ResponseUtil.success(data=server_info_query_result)
+
+
+@serverController.get('/pwdMetrics', dependencies=[Depends(CheckUserInterfaceAuth('monitor:server:list'))])
+async def get_monitor_pwd_executor_metrics(request: Request):
+    # 获取密码计算线程池运行指标
+    pwd_executor_metrics_result = PwdUtil.get_pwd_executor_metrics()
+    logger.info('获取成功')
+
+    return ResponseUtil.success(data=pwd_executor_metrics_result)
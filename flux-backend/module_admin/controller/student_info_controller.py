@@ -1,9 +1,10 @@
 # -*- coding:utf-8 -*-
 
-from fastapi import APIRouter, Depends, Form
+from fastapi import APIRouter, Depends, Form, Query
+from sqlalchemy import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.requests import Request
-from typing import List
+from typing import List, Literal
 from config.enums import BusinessType
 from config.get_db import get_db
 from module_admin.entity.vo.import_vo import ImportModel
@@ -14,7 +15,7 @@ from module_admin.aspect.interface_auth import CheckUserInterfaceAuth
 from module_admin.entity.vo.user_vo import CurrentUserModel
 from module_admin.annotation.log_annotation import Log
 from utils.response_util import ResponseUtil
-from utils.common_util import bytes2file_response
+from utils.export_util import ExportUtil
 
 from module_admin.entity.vo.student_info_vo import StudentInfoPageModel, StudentInfoModel
 from module_admin.service.student_info_service import StudentInfoService
@@ -27,7 +28,7 @@ async def get_student_info_list(
         request: Request,
         query_db: AsyncSession = Depends(get_db),
         page_query: StudentInfoPageModel = Depends( StudentInfoPageModel.as_query),
-        data_scope_sql: str = Depends(GetDataScope('StudentInfo'))
+        data_scope_sql: ColumnElement = Depends(GetDataScope('StudentInfo'))
 ):
     student_info_result = await StudentInfoService.get_student_info_list(query_db, page_query, data_scope_sql)
 
@@ -38,7 +39,7 @@ async def get_student_info_by_id(
         request: Request,
         studentInfoId: int,
         query_db: AsyncSession = Depends(get_db),
-        data_scope_sql: str = Depends(GetDataScope('StudentInfo'))
+        data_scope_sql: ColumnElement = Depends(GetDataScope('StudentInfo'))
 ):
     student_info = await StudentInfoService.get_student_info_by_id(query_db, studentInfoId)
     return ResponseUtil.success(data=student_info)
@@ -88,13 +89,13 @@ async def export_student_info(
     request: Request,
     student_info_form: StudentInfoPageModel = Form(),
     query_db: AsyncSession = Depends(get_db),
-    data_scope_sql: str = Depends(GetDataScope('StudentInfo')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('StudentInfo')),
+    file_format: Literal['xlsx', 'csv'] = Query('xlsx', alias='fileFormat'),
 ):
-    # 获取全量数据
     export_result = await StudentInfoService.export_student_info_list(
-        query_db, student_info_form, data_scope_sql
+        request, query_db, student_info_form, data_scope_sql, file_format
     )
-    return ResponseUtil.streaming(data=bytes2file_response(export_result))
+    return ResponseUtil.streaming(data=export_result, media_type=ExportUtil.get_media_type(file_format))
 
 @studentInfoController.post('/import', dependencies=[Depends(CheckUserInterfaceAuth('student:info:import'))])
 async def import_student_info(request: Request,
@@ -105,5 +106,5 @@ async def import_student_info(request: Request,
     """
     导入数据
     """
-    await ImportService.import_data(query_db, import_model, current_user)
-    return ResponseUtil.success()
\ No newline at end of file
+    import_task = await ImportService.import_data(request, import_model, current_user)
+    return ResponseUtil.success(data=import_task)
\ No newline at end of file
@@ -1,6 +1,7 @@
 # -*- coding:utf-8 -*-
 
 from fastapi import APIRouter, Depends, Form
+from sqlalchemy import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.requests import Request
 from typing import List
@@ -25,7 +26,7 @@ async def get_sys_form_list(
         request: Request,
         query_db: AsyncSession = Depends(get_db),
         page_query: SysFormPageModel = Depends( SysFormPageModel.as_query),
-        data_scope_sql: str = Depends(GetDataScope('SysForm'))
+        data_scope_sql: ColumnElement = Depends(GetDataScope('SysForm'))
 ):
     sys_form_result = await SysFormService.get_sys_form_list(query_db, page_query, data_scope_sql)
 
@@ -36,7 +37,7 @@ async def get_sys_form_by_id(
         request: Request,
         sysFormId: int,
         query_db: AsyncSession = Depends(get_db),
-        data_scope_sql: str = Depends(GetDataScope('SysForm'))
+        data_scope_sql: ColumnElement = Depends(GetDataScope('SysForm'))
 ):
     sys_form = await SysFormService.get_sys_form_by_id(query_db, sysFormId)
     return ResponseUtil.success(data=sys_form)
@@ -86,7 +87,7 @@ async def export_sys_form(
     request: Request,
     sys_form_form: SysFormPageModel = Form(),
     query_db: AsyncSession = Depends(get_db),
-    data_scope_sql: str = Depends(GetDataScope('SysForm')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysForm')),
 ):
     # 获取全量数据
     export_result = await SysFormService.export_sys_form_list(
@@ -1,6 +1,7 @@
 # -*- coding:utf-8 -*-
 
 from fastapi import APIRouter, Depends, Form
+from sqlalchemy import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.requests import Request
 from typing import List
@@ -35,7 +36,7 @@ async def get_sys_form_data_by_id(
         request: Request,
         sysFormDataId: int,
         query_db: AsyncSession = Depends(get_db),
-        data_scope_sql: str = Depends(GetDataScope('SysFormData'))
+        data_scope_sql: ColumnElement = Depends(GetDataScope('SysFormData'))
 ):
     sys_form_data = await SysFormDataService.get_sys_form_data_by_id(query_db, sysFormDataId)
     return ResponseUtil.success(data=sys_form_data)
@@ -85,7 +86,7 @@ async def export_sys_form_data(
     request: Request,
     sys_form_data_form: SysFormDataPageModel = Form(),
     query_db: AsyncSession = Depends(get_db),
-    data_scope_sql: str = Depends(GetDataScope('SysFormData')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysFormData')),
 ):
     # 获取全量数据
     export_result = await SysFormDataService.export_sys_form_data_list(
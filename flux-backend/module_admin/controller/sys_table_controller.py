@@ -1,6 +1,7 @@
 # -*- coding:utf-8 -*-
 
 from fastapi import APIRouter, Depends, Form, Query
+from sqlalchemy import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.requests import Request
 from typing import List
@@ -27,7 +28,7 @@ async def get_sys_table_list(
         request: Request,
         query_db: AsyncSession = Depends(get_db),
         page_query: SysTablePageModel = Depends( SysTablePageModel.as_query),
-        data_scope_sql: str = Depends(GetDataScope('SysDept'))
+        data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept'))
 ):
     sys_table_result = await SysTableService.get_sys_table_list(query_db, page_query, data_scope_sql)
 
@@ -46,7 +47,7 @@ async def get_sys_table_list(
 async def gen_db_list(request: Request,
             gen_table: DbTablePageModel = Depends(DbTablePageModel.as_query),
             query_db: AsyncSession = Depends(get_db),
-            data_scope_sql: str = Depends(GetDataScope('SysDept'))):
+            data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept'))):
     """查询数据库列表"""
     db_list = await SysTableService.select_db_table_list(gen_table, query_db, data_scope_sql)
     return ResponseUtil.success(model_content=db_list)
@@ -56,7 +57,7 @@ async def get_sys_table_by_id(
         request: Request,
         sysTableId: int,
         query_db: AsyncSession = Depends(get_db),
-        data_scope_sql: str = Depends(GetDataScope('SysDept'))
+        data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept'))
 ):
     sys_table = await SysTableService.get_sys_table_by_id(query_db, sysTableId)
     return ResponseUtil.success(data=sys_table)
@@ -116,7 +117,7 @@ async def export_sys_table(
     request: Request,
     sys_table_form: SysTablePageModel = Form(),
     query_db: AsyncSession = Depends(get_db),
-    data_scope_sql: str = Depends(GetDataScope('SysDept')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept')),
 ):
     # 获取全量数据
     export_result = await SysTableService.export_sys_table_list(
@@ -1,6 +1,7 @@
 import os
 from datetime import datetime
 from fastapi import APIRouter, Depends, File, Form, Query, Request, UploadFile
+from sqlalchemy import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Literal, Optional, Union
 from pydantic_validation_decorator import ValidateFields
@@ -31,7 +32,10 @@ from module_admin.service.login_service import LoginService
 from module_admin.service.user_service import UserService
 from module_admin.service.role_service import RoleService
 from module_admin.service.dept_service import DeptService
+from module_admin.service.sys_cache_service import SysCacheService
+from module_admin.service.user_cache_service import UserCacheService
 from utils.common_util import bytes2file_response
+from utils.export_util import ExportUtil
 from utils.log_util import logger
 from utils.page_util import PageResponseModel
 from utils.pwd_util import PwdUtil
@@ -44,7 +48,7 @@ userController = APIRouter(prefix='/system/user', dependencies=[Depends(LoginSer
 
 @userController.get('/deptTree', dependencies=[Depends(CheckUserInterfaceAuth('system:user:list'))])
 async def get_system_dept_tree(
-    request: Request, query_db: AsyncSession = Depends(get_db), data_scope_sql: str = Depends(GetDataScope('SysDept'))
+    request: Request, query_db: AsyncSession = Depends(get_db), data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept'))
 ):
     dept_query_result = await DeptService.get_dept_tree_services(query_db, DeptModel(**{}), data_scope_sql)
     logger.info('获取成功')
@@ -59,7 +63,7 @@ async def get_system_user_list(
     request: Request,
     user_page_query: UserPageQueryModel = Depends(UserPageQueryModel.as_query),
     query_db: AsyncSession = Depends(get_db),
-    data_scope_sql: str = Depends(GetDataScope('SysUser')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysUser')),
 ):
     # 获取分页数据
     user_page_query_result = await UserService.get_user_list_services(
@@ -78,20 +82,21 @@ async def add_system_user(
     add_user: AddUserModel,
     query_db: AsyncSession = Depends(get_db),
     current_user: CurrentUserModel = Depends(LoginService.get_current_user),
-    dept_data_scope_sql: str = Depends(GetDataScope('SysDept')),
-    role_data_scope_sql: str = Depends(GetDataScope('SysDept')),
+    dept_data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept')),
+    role_data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept')),
 ):
     if not current_user.user.admin:
         await DeptService.check_dept_data_scope_services(query_db, add_user.dept_id, dept_data_scope_sql)
         await RoleService.check_role_data_scope_services(
             query_db, ','.join([str(item) for item in add_user.role_ids]), role_data_scope_sql
         )
-    add_user.password = PwdUtil.get_password_hash(add_user.password)
+    add_user.password = await PwdUtil.async_get_password_hash(add_user.password)
     add_user.create_by = current_user.user.user_name
     add_user.create_time = datetime.now()
     add_user.update_by = current_user.user.user_name
     add_user.update_time = datetime.now()
     add_user_result = await UserService.add_user_services(query_db, add_user)
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(add_user_result.message)
 
     return ResponseUtil.success(msg=add_user_result.message)
@@ -105,9 +110,9 @@ async def edit_system_user(
     edit_user: EditUserModel,
     query_db: AsyncSession = Depends(get_db),
     current_user: CurrentUserModel = Depends(LoginService.get_current_user),
-    user_data_scope_sql: str = Depends(GetDataScope('SysUser')),
-    dept_data_scope_sql: str = Depends(GetDataScope('SysDept')),
-    role_data_scope_sql: str = Depends(GetDataScope('SysDept')),
+    user_data_scope_sql: ColumnElement = Depends(GetDataScope('SysUser')),
+    dept_data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept')),
+    role_data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept')),
 ):
     await UserService.check_user_allowed_services(edit_user)
     if not current_user.user.admin:
@@ -119,6 +124,7 @@ async def edit_system_user(
     edit_user.update_by = current_user.user.user_name
     edit_user.update_time = datetime.now()
     edit_user_result = await UserService.edit_user_services(query_db, edit_user)
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(edit_user_result.message)
 
     return ResponseUtil.success(msg=edit_user_result.message)
@@ -131,7 +137,7 @@ async def delete_system_user(
     user_ids: str,
     query_db: AsyncSession = Depends(get_db),
     current_user: CurrentUserModel = Depends(LoginService.get_current_user),
-    data_scope_sql: str = Depends(GetDataScope('SysUser')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysUser')),
 ):
     user_id_list = user_ids.split(',') if user_ids else []
     if user_id_list:
@@ -145,6 +151,7 @@ async def delete_system_user(
                 await UserService.check_user_data_scope_services(query_db, int(user_id), data_scope_sql)
     delete_user = DeleteUserModel(userIds=user_ids, updateBy=current_user.user.user_name, updateTime=datetime.now())
     delete_user_result = await UserService.delete_user_services(query_db, delete_user)
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(delete_user_result.message)
 
     return ResponseUtil.success(msg=delete_user_result.message)
@@ -157,19 +164,20 @@ async def reset_system_user_pwd(
     reset_user: EditUserModel,
     query_db: AsyncSession = Depends(get_db),
     current_user: CurrentUserModel = Depends(LoginService.get_current_user),
-    data_scope_sql: str = Depends(GetDataScope('SysUser')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysUser')),
 ):
     await UserService.check_user_allowed_services(reset_user)
     if not current_user.user.admin:
         await UserService.check_user_data_scope_services(query_db, reset_user.user_id, data_scope_sql)
     edit_user = EditUserModel(
         userId=reset_user.user_id,
-        password=PwdUtil.get_password_hash(reset_user.password),
+        password=await PwdUtil.async_get_password_hash(reset_user.password),
         updateBy=current_user.user.user_name,
         updateTime=datetime.now(),
         type='pwd',
     )
     edit_user_result = await UserService.edit_user_services(query_db, edit_user)
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(edit_user_result.message)
 
     return ResponseUtil.success(msg=edit_user_result.message)
@@ -182,7 +190,7 @@ async def change_system_user_status(
     change_user: EditUserModel,
     query_db: AsyncSession = Depends(get_db),
     current_user: CurrentUserModel = Depends(LoginService.get_current_user),
-    data_scope_sql: str = Depends(GetDataScope('SysUser')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysUser')),
 ):
     await UserService.check_user_allowed_services(change_user)
     if not current_user.user.admin:
@@ -195,6 +203,7 @@ async def change_system_user_status(
         type='status',
     )
     edit_user_result = await UserService.edit_user_services(query_db, edit_user)
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(edit_user_result.message)
 
     return ResponseUtil.success(msg=edit_user_result.message)
@@ -223,7 +232,7 @@ async def query_detail_system_user(
     user_id: Optional[Union[int, Literal['']]] = '',
     query_db: AsyncSession = Depends(get_db),
     current_user: CurrentUserModel = Depends(LoginService.get_current_user),
-    data_scope_sql: str = Depends(GetDataScope('SysUser')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysUser')),
 ):
     if user_id and not current_user.user.admin:
         await UserService.check_user_data_scope_services(query_db, user_id, data_scope_sql)
@@ -262,6 +271,10 @@ async def change_system_user_profile_avatar(
             type='avatar',
         )
         edit_user_result = await UserService.edit_user_services(query_db, edit_user)
+        await UserCacheService.evict_current_user_cache_services(request.app.state.redis, current_user.user.user_id)
+        await SysCacheService.publish_invalidate_services(
+            request.app.state.redis, UserCacheService.get_user_info_key(current_user.user.user_id)
+        )
         logger.info(edit_user_result.message)
 
         return ResponseUtil.success(dict_content={'imgUrl': edit_user.avatar}, msg=edit_user_result.message)
@@ -287,6 +300,10 @@ async def change_system_user_profile_info(
         role=current_user.user.role,
     )
     edit_user_result = await UserService.edit_user_services(query_db, edit_user)
+    await UserCacheService.evict_current_user_cache_services(request.app.state.redis, current_user.user.user_id)
+    await SysCacheService.publish_invalidate_services(
+        request.app.state.redis, UserCacheService.get_user_info_key(current_user.user.user_id)
+    )
     logger.info(edit_user_result.message)
 
     return ResponseUtil.success(msg=edit_user_result.message)
@@ -308,6 +325,10 @@ async def reset_system_user_password(
         updateTime=datetime.now(),
     )
     reset_user_result = await UserService.reset_user_services(query_db, reset_user)
+    await UserCacheService.evict_current_user_cache_services(request.app.state.redis, current_user.user.user_id)
+    await SysCacheService.publish_invalidate_services(
+        request.app.state.redis, UserCacheService.get_user_info_key(current_user.user.user_id)
+    )
     logger.info(reset_user_result.message)
 
     return ResponseUtil.success(msg=reset_user_result.message)
@@ -321,15 +342,16 @@ async def batch_import_system_user(
     update_support: bool = Query(alias='updateSupport'),
     query_db: AsyncSession = Depends(get_db),
     current_user: CurrentUserModel = Depends(LoginService.get_current_user),
-    user_data_scope_sql: str = Depends(GetDataScope('SysUser')),
-    dept_data_scope_sql: str = Depends(GetDataScope('SysDept')),
+    user_data_scope_sql: ColumnElement = Depends(GetDataScope('SysUser')),
+    dept_data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept')),
 ):
     batch_import_result = await UserService.batch_import_user_services(
         request, query_db, file, update_support, current_user, user_data_scope_sql, dept_data_scope_sql
     )
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(batch_import_result.message)
 
-    return ResponseUtil.success(msg=batch_import_result.message)
+    return ResponseUtil.success(msg=batch_import_result.message, data=batch_import_result.result)
 
 
 @userController.post('/importTemplate', dependencies=[Depends(CheckUserInterfaceAuth('system:user:import'))])
@@ -345,17 +367,16 @@ async def export_system_user_template(request: Request, query_db: AsyncSession =
 async def export_system_user_list(
     request: Request,
     user_page_query: UserPageQueryModel = Form(),
-    query_db: AsyncSession = Depends(get_db),
-    data_scope_sql: str = Depends(GetDataScope('SysUser')),
+    data_scope_sql: ColumnElement = Depends(GetDataScope('SysUser')),
+    file_format: Literal['xlsx', 'csv'] = Query('xlsx', alias='fileFormat'),
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
 ):
-    # 获取全量数据
-    user_query_result = await UserService.get_user_list_services(
-        query_db, user_page_query, data_scope_sql, is_page=False
+    user_export_result = await UserService.export_user_list_services(
+        request, user_page_query, data_scope_sql, file_format
     )
-    user_export_result = await UserService.export_user_list_services(user_query_result)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(user_export_result))
+    return ResponseUtil.streaming(data=user_export_result, media_type=ExportUtil.get_media_type(file_format))
 
 
 @userController.get(
@@ -385,8 +406,8 @@ async def update_system_role_user(
     role_ids: str = Query(alias='roleIds'),
     query_db: AsyncSession = Depends(get_db),
     current_user: CurrentUserModel = Depends(LoginService.get_current_user),
-    user_data_scope_sql: str = Depends(GetDataScope('SysUser')),
-    role_data_scope_sql: str = Depends(GetDataScope('SysDept')),
+    user_data_scope_sql: ColumnElement = Depends(GetDataScope('SysUser')),
+    role_data_scope_sql: ColumnElement = Depends(GetDataScope('SysDept')),
 ):
     if not current_user.user.admin:
         await UserService.check_user_data_scope_services(query_db, user_id, user_data_scope_sql)
@@ -394,6 +415,7 @@ async def update_system_role_user(
     add_user_role_result = await UserService.add_user_role_services(
         query_db, CrudUserRoleModel(userId=user_id, roleIds=role_ids)
     )
+    await UserCacheService.refresh_permission_epoch_services(request.app.state.redis)
     logger.info(add_user_role_result.message)
 
     return ResponseUtil.success(msg=add_user_role_result.message)
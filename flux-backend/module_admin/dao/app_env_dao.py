@@ -66,14 +66,12 @@ class EnvDao:
         return env_info
 
     @classmethod
-    async def get_env_list(cls, db: AsyncSession, query_object: EnvPageQueryModel, is_page: bool = False):
+    def get_env_list_query(cls, query_object: EnvPageQueryModel):
         """
-        根据查询参数获取环境列表信息
+        根据查询参数构建环境列表信息查询语句
 
-        :param db: orm对象
         :param query_object: 查询参数对象
-        :param is_page: 是否开启分页
-        :return: 环境列表信息对象
+        :return: 环境列表信息查询语句
         """
         query = (
             select(AppEnv)
@@ -85,6 +83,20 @@ class EnvDao:
             .order_by(AppEnv.env_sort)
             .distinct()
         )
+
+        return query
+
+    @classmethod
+    async def get_env_list(cls, db: AsyncSession, query_object: EnvPageQueryModel, is_page: bool = False):
+        """
+        根据查询参数获取环境列表信息
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param is_page: 是否开启分页
+        :return: 环境列表信息对象
+        """
+        query = cls.get_env_list_query(query_object)
         env_list = await PageUtil.paginate(db, query, query_object.page_num, query_object.page_size, is_page)
 
         return env_list
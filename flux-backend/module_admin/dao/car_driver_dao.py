@@ -4,7 +4,7 @@ from typing import List
 from datetime import datetime, time
 
 from module_admin.entity.do.role_do import SysRoleDept
-from sqlalchemy import and_, delete, desc, func, or_, select, update
+from sqlalchemy import ColumnElement, and_, delete, desc, func, or_, select, Select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from module_admin.entity.do.car_driver_do import CarDriver
 from module_admin.entity.vo.car_driver_vo import CarDriverPageModel, CarDriverModel
@@ -27,11 +27,8 @@ class CarDriverDao:
     查询
     """
     @classmethod
-    async def get_car_driver_list(cls, db: AsyncSession,
-                             query_object: CarDriverPageModel,
-                             data_scope_sql: str = None,
-                             is_page: bool = False) -> [list | PageResponseModel]:
-
+    def get_car_driver_list_query(cls, query_object: CarDriverPageModel, data_scope_sql: ColumnElement = None) -> Select:
+        """根据查询参数构建列表查询语句，供分页查询及流式导出共用"""
         query = (
             select(CarDriver)
             .where(
@@ -40,11 +37,20 @@ class CarDriverDao:
                 CarDriver.name.like(f"%{query_object.name}%") if query_object.name else True,
                 CarDriver.price == query_object.price if query_object.price else True,
                 CarDriver.del_flag == '0',
-                eval(data_scope_sql) if data_scope_sql else True,
+                data_scope_sql if data_scope_sql is not None else True,
             )
             .order_by(desc(CarDriver.create_time))
             .distinct()
         )
+        return query
+
+    @classmethod
+    async def get_car_driver_list(cls, db: AsyncSession,
+                             query_object: CarDriverPageModel,
+                             data_scope_sql: ColumnElement = None,
+                             is_page: bool = False) -> [list | PageResponseModel]:
+
+        query = cls.get_car_driver_list_query(query_object, data_scope_sql)
         car_driver_list = await PageUtil.paginate(db, query, query_object.page_num, query_object.page_size, is_page)
         return car_driver_list
 
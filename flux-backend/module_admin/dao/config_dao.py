@@ -49,14 +49,12 @@ class ConfigDao:
         return config_info
 
     @classmethod
-    async def get_config_list(cls, db: AsyncSession, query_object: ConfigPageQueryModel, is_page: bool = False):
+    def get_config_list_query(cls, query_object: ConfigPageQueryModel):
         """
-        根据查询参数获取参数配置列表信息
+        根据查询参数构建参数配置列表信息查询语句
 
-        :param db: orm对象
         :param query_object: 查询参数对象
-        :param is_page: 是否开启分页
-        :return: 参数配置列表信息对象
+        :return: 参数配置列表信息查询语句
         """
         query = (
             select(SysConfig)
@@ -74,6 +72,20 @@ class ConfigDao:
             .order_by(SysConfig.config_id)
             .distinct()
         )
+
+        return query
+
+    @classmethod
+    async def get_config_list(cls, db: AsyncSession, query_object: ConfigPageQueryModel, is_page: bool = False):
+        """
+        根据查询参数获取参数配置列表信息
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param is_page: 是否开启分页
+        :return: 参数配置列表信息对象
+        """
+        query = cls.get_config_list_query(query_object)
         config_list = await PageUtil.paginate(db, query, query_object.page_num, query_object.page_size, is_page)
 
         return config_list
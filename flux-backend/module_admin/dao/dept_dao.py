@@ -1,8 +1,8 @@
-from sqlalchemy import bindparam, func, or_, select, update  # noqa: F401
+from sqlalchemy import ColumnElement, bindparam, delete, func, insert, or_, select, update  # noqa: F401
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.util import immutabledict
 from typing import List
-from module_admin.entity.do.dept_do import SysDept
+from module_admin.entity.do.dept_do import SysDept, SysDeptClosure
 from module_admin.entity.do.role_do import SysRoleDept  # noqa: F401
 from module_admin.entity.do.user_do import SysUser
 from module_admin.entity.vo.dept_vo import DeptModel
@@ -68,7 +68,7 @@ class DeptDao:
         return dept_info
 
     @classmethod
-    async def get_dept_info_for_edit_option(cls, db: AsyncSession, dept_info: DeptModel, data_scope_sql: str):
+    async def get_dept_info_for_edit_option(cls, db: AsyncSession, dept_info: DeptModel, data_scope_sql: ColumnElement):
         """
         获取部门编辑对应的在用部门列表信息
 
@@ -84,11 +84,11 @@ class DeptDao:
                     .where(
                         SysDept.dept_id != dept_info.dept_id,
                         ~SysDept.dept_id.in_(
-                            select(SysDept.dept_id).where(func.find_in_set(dept_info.dept_id, SysDept.ancestors))
+                            select(SysDeptClosure.descendant_id).where(SysDeptClosure.ancestor_id == dept_info.dept_id)
                         ),
                         SysDept.del_flag == '0',
                         SysDept.status == '0',
-                        eval(data_scope_sql),
+                        data_scope_sql,
                     )
                     .order_by(SysDept.order_num)
                     .distinct()
@@ -110,13 +110,21 @@ class DeptDao:
         :return: 子部门信息列表
         """
         dept_result = (
-            (await db.execute(select(SysDept).where(func.find_in_set(dept_id, SysDept.ancestors)))).scalars().all()
+            (
+                await db.execute(
+                    select(SysDept)
+                    .join(SysDeptClosure, SysDeptClosure.descendant_id == SysDept.dept_id)
+                    .where(SysDeptClosure.ancestor_id == dept_id, SysDeptClosure.depth > 0)
+                )
+            )
+            .scalars()
+            .all()
         )
 
         return dept_result
 
     @classmethod
-    async def get_dept_list_for_tree(cls, db: AsyncSession, dept_info: DeptModel, data_scope_sql: str):
+    async def get_dept_list_for_tree(cls, db: AsyncSession, dept_info: DeptModel, data_scope_sql: ColumnElement):
         """
         获取所有在用部门列表信息
 
@@ -133,7 +141,7 @@ class DeptDao:
                         SysDept.status == '0',
                         SysDept.del_flag == '0',
                         SysDept.dept_name.like(f'%{dept_info.dept_name}%') if dept_info.dept_name else True,
-                        eval(data_scope_sql),
+                        data_scope_sql,
                     )
                     .order_by(SysDept.order_num)
                     .distinct()
@@ -146,7 +154,35 @@ class DeptDao:
         return dept_result
 
     @classmethod
-    async def get_dept_list(cls, db: AsyncSession, page_object: DeptModel, data_scope_sql: str):
+    async def get_dept_id_list_by_data_scope(
+        cls, db: AsyncSession, dept_id_list: List[int], data_scope_sql: ColumnElement
+    ) -> List[int]:
+        """
+        根据数据权限筛选有权限访问的部门id
+
+        :param db: orm对象
+        :param dept_id_list: 部门id列表
+        :param data_scope_sql: 数据权限对应的查询sql语句
+        :return: 有权限访问的部门id列表
+        """
+        if not dept_id_list:
+            return []
+        dept_id_result = (
+            (
+                await db.execute(
+                    select(SysDept.dept_id)
+                    .where(SysDept.del_flag == '0', SysDept.dept_id.in_(dept_id_list), data_scope_sql)
+                    .distinct()
+                )
+            )
+            .scalars()
+            .all()
+        )
+
+        return list(dept_id_result)
+
+    @classmethod
+    async def get_dept_list(cls, db: AsyncSession, page_object: DeptModel, data_scope_sql: ColumnElement):
         """
         根据查询参数获取部门列表信息
 
@@ -164,7 +200,7 @@ class DeptDao:
                         SysDept.dept_id == page_object.dept_id if page_object.dept_id is not None else True,
                         SysDept.status == page_object.status if page_object.status else True,
                         SysDept.dept_name.like(f'%{page_object.dept_name}%') if page_object.dept_name else True,
-                        eval(data_scope_sql),
+                        data_scope_sql,
                     )
                     .order_by(SysDept.order_num)
                     .distinct()
@@ -263,7 +299,13 @@ class DeptDao:
             await db.execute(
                 select(func.count('*'))
                 .select_from(SysDept)
-                .where(SysDept.status == '0', SysDept.del_flag == '0', func.find_in_set(dept_id, SysDept.ancestors))
+                .join(SysDeptClosure, SysDeptClosure.descendant_id == SysDept.dept_id)
+                .where(
+                    SysDept.status == '0',
+                    SysDept.del_flag == '0',
+                    SysDeptClosure.ancestor_id == dept_id,
+                    SysDeptClosure.depth > 0,
+                )
             )
         ).scalar()
 
@@ -305,3 +347,102 @@ class DeptDao:
         ).scalar()
 
         return dept_user_count
+
+    @classmethod
+    async def count_dept_closure_dao(cls, db: AsyncSession):
+        """
+        查询部门闭包表的记录数量
+
+        :param db: orm对象
+        :return: 部门闭包表的记录数量
+        """
+        dept_closure_count = (await db.execute(select(func.count('*')).select_from(SysDeptClosure))).scalar()
+
+        return dept_closure_count
+
+    @classmethod
+    async def add_dept_closure_dao(cls, db: AsyncSession, dept_id: int, parent_id: int):
+        """
+        新增部门时写入部门闭包关系
+
+        :param db: orm对象
+        :param dept_id: 新增的部门id
+        :param parent_id: 父部门id
+        :return:
+        """
+        parent_ancestors = (
+            await db.execute(
+                select(SysDeptClosure.ancestor_id, SysDeptClosure.depth).where(
+                    SysDeptClosure.descendant_id == parent_id
+                )
+            )
+        ).all()
+        closure_list = [dict(ancestor_id=dept_id, descendant_id=dept_id, depth=0)] + [
+            dict(ancestor_id=row.ancestor_id, descendant_id=dept_id, depth=row.depth + 1) for row in parent_ancestors
+        ]
+        await db.execute(insert(SysDeptClosure), closure_list)
+
+    @classmethod
+    async def move_dept_closure_dao(cls, db: AsyncSession, dept_id: int, parent_id: int):
+        """
+        移动部门时更新部门及其子部门的闭包关系
+
+        :param db: orm对象
+        :param dept_id: 移动的部门id
+        :param parent_id: 新的父部门id
+        :return:
+        """
+        subtree = (
+            await db.execute(
+                select(SysDeptClosure.descendant_id, SysDeptClosure.depth).where(SysDeptClosure.ancestor_id == dept_id)
+            )
+        ).all()
+        subtree_id_list = [row.descendant_id for row in subtree]
+        parent_ancestors = (
+            await db.execute(
+                select(SysDeptClosure.ancestor_id, SysDeptClosure.depth).where(
+                    SysDeptClosure.descendant_id == parent_id
+                )
+            )
+        ).all()
+        await db.execute(
+            delete(SysDeptClosure).where(
+                SysDeptClosure.descendant_id.in_(subtree_id_list), SysDeptClosure.ancestor_id.not_in(subtree_id_list)
+            )
+        )
+        closure_list = [
+            dict(
+                ancestor_id=ancestor.ancestor_id,
+                descendant_id=node.descendant_id,
+                depth=ancestor.depth + node.depth + 1,
+            )
+            for ancestor in parent_ancestors
+            for node in subtree
+        ]
+        if closure_list:
+            await db.execute(insert(SysDeptClosure), closure_list)
+
+    @classmethod
+    async def rebuild_dept_closure_dao(cls, db: AsyncSession):
+        """
+        根据部门祖级列表重建部门闭包表
+
+        :param db: orm对象
+        :return: 重建的闭包关系数量
+        """
+        dept_list = (await db.execute(select(SysDept.dept_id, SysDept.ancestors))).all()
+        dept_id_set = {dept.dept_id for dept in dept_list}
+        closure_list = []
+        for dept in dept_list:
+            ancestor_id_list = [int(item) for item in (dept.ancestors or '').split(',') if item.strip()]
+            ancestor_id_list = [item for item in ancestor_id_list if item in dept_id_set]
+            closure_list.append(dict(ancestor_id=dept.dept_id, descendant_id=dept.dept_id, depth=0))
+            for index, ancestor_id in enumerate(ancestor_id_list):
+                closure_list.append(
+                    dict(ancestor_id=ancestor_id, descendant_id=dept.dept_id, depth=len(ancestor_id_list) - index)
+                )
+        await db.execute(delete(SysDeptClosure))
+        if closure_list:
+            await db.execute(insert(SysDeptClosure), closure_list)
+
+        return len(closure_list)
@@ -62,14 +62,12 @@ class DictTypeDao:
         return list_format_datetime(dict_type_info)
 
     @classmethod
-    async def get_dict_type_list(cls, db: AsyncSession, query_object: DictTypePageQueryModel, is_page: bool = False):
+    def get_dict_type_list_query(cls, query_object: DictTypePageQueryModel):
         """
-        根据查询参数获取字典类型列表信息
+        根据查询参数构建字典类型列表信息查询语句
 
-        :param db: orm对象
         :param query_object: 查询参数对象
-        :param is_page: 是否开启分页
-        :return: 字典类型列表信息对象
+        :return: 字典类型列表信息查询语句
         """
         query = (
             select(SysDictType)
@@ -87,6 +85,20 @@ class DictTypeDao:
             .order_by(SysDictType.dict_id)
             .distinct()
         )
+
+        return query
+
+    @classmethod
+    async def get_dict_type_list(cls, db: AsyncSession, query_object: DictTypePageQueryModel, is_page: bool = False):
+        """
+        根据查询参数获取字典类型列表信息
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param is_page: 是否开启分页
+        :return: 字典类型列表信息对象
+        """
+        query = cls.get_dict_type_list_query(query_object)
         dict_type_list = await PageUtil.paginate(db, query, query_object.page_num, query_object.page_size, is_page)
 
         return dict_type_list
@@ -175,14 +187,12 @@ class DictDataDao:
         return dict_data_info
 
     @classmethod
-    async def get_dict_data_list(cls, db: AsyncSession, query_object: DictDataPageQueryModel, is_page: bool = False):
+    def get_dict_data_list_query(cls, query_object: DictDataPageQueryModel):
         """
-        根据查询参数获取字典数据列表信息
+        根据查询参数构建字典数据列表信息查询语句
 
-        :param db: orm对象
         :param query_object: 查询参数对象
-        :param is_page: 是否开启分页
-        :return: 字典数据列表信息对象
+        :return: 字典数据列表信息查询语句
         """
         query = (
             select(SysDictData)
@@ -194,6 +204,20 @@ class DictDataDao:
             .order_by(SysDictData.dict_sort)
             .distinct()
         )
+
+        return query
+
+    @classmethod
+    async def get_dict_data_list(cls, db: AsyncSession, query_object: DictDataPageQueryModel, is_page: bool = False):
+        """
+        根据查询参数获取字典数据列表信息
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param is_page: 是否开启分页
+        :return: 字典数据列表信息对象
+        """
+        query = cls.get_dict_data_list_query(query_object)
         dict_data_list = await PageUtil.paginate(db, query, query_object.page_num, query_object.page_size, is_page)
 
         return dict_data_list
@@ -228,6 +252,30 @@ class DictDataDao:
 
         return dict_data_list
 
+    @classmethod
+    async def query_all_dict_data_list(cls, db: AsyncSession):
+        """
+        一次查询获取所有正常状态字典类型及其字典数据，字典数据按字典类型分组、组内按字典排序
+
+        :param db: orm对象
+        :return: (字典类型, 字典数据)列表，没有字典数据的字典类型对应的字典数据为None
+        """
+        dict_data_list = (
+            await db.execute(
+                select(SysDictType.dict_type, SysDictData)
+                .select_from(SysDictType)
+                .where(SysDictType.status == '0')
+                .join(
+                    SysDictData,
+                    and_(SysDictType.dict_type == SysDictData.dict_type, SysDictData.status == '0'),
+                    isouter=True,
+                )
+                .order_by(SysDictType.dict_type, SysDictData.dict_sort)
+            )
+        ).all()
+
+        return dict_data_list
+
     @classmethod
     async def add_dict_data_dao(cls, db: AsyncSession, dict_data: DictDataModel):
         """
@@ -4,7 +4,9 @@ from sqlalchemy import text, Table, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from module_admin.entity.vo.import_vo import ImportFieldModel
+from module_gen.dao.gen_table_column_dao import GenTableColumnDao
 from module_gen.entity.vo.gen_table_column_vo import GenTableColumnModel
+from utils.count_cache_util import mark_tables_written
 
 
 class ImportDao:
@@ -24,36 +26,8 @@ class ImportDao:
         if not table_name:
             raise ValueError("Table name cannot be empty.")
 
-        # 基础查询
-        query = text("""
-                       SELECT column_name,
-                              (CASE WHEN (is_nullable = 'no' AND column_key != 'PRI') THEN '1' ELSE '0' END) AS is_required,
-                              (CASE WHEN column_key = 'PRI' THEN '1' ELSE '0' END) AS is_pk,
-                              ordinal_position AS sort,
-                              column_comment,
-                              (CASE WHEN extra = 'auto_increment' THEN '1' ELSE '0' END) AS is_increment,
-                              column_type
-                       FROM information_schema.columns
-                       WHERE table_schema = (SELECT DATABASE())
-                       AND table_name = :table_name
-                       ORDER BY ordinal_position
-                   """)
-
-        # 执行查询并传递参数
-        result = await session.execute(query, {"table_name": table_name})
-        rows = result.fetchall()
-        # 将结果映射到 GenTableColumnResult 对象
-        return [
-            GenTableColumnModel(
-                columnName=row[0],
-                isRequired=row[1],
-                isPk=row[2],
-                sort=row[3],
-                columnComment=row[4],
-                isIncrement=row[5],
-                columnType=row[6]
-            ) for row in rows
-        ]
+        # 从数据库表结构元数据缓存中读取
+        return await GenTableColumnDao.select_db_table_columns_by_name(session, table_name)
 
     @classmethod
     async def import_data(cls, session: AsyncSession, table_name: str, field_list: list, value_list: list):
@@ -76,5 +50,7 @@ class ImportDao:
         values_dicts = [{field: value for field, value in zip(field_list, values)} for values in value_list]
         # 批量执行 SQL
         await session.execute(text(sql), values_dicts)
+        # 文本SQL不会触发会话的写入版本号钩子，需手动标记写入表，使该表的总记录数缓存在提交后失效
+        mark_tables_written(session.sync_session, [table_name])
         await session.flush()
         await session.commit()
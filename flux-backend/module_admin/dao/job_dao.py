@@ -53,14 +53,12 @@ class JobDao:
         return job_info
 
     @classmethod
-    async def get_job_list(cls, db: AsyncSession, query_object: JobPageQueryModel, is_page: bool = False):
+    def get_job_list_query(cls, query_object: JobPageQueryModel):
         """
-        根据查询参数获取定时任务列表信息
+        根据查询参数构建定时任务列表信息查询语句
 
-        :param db: orm对象
         :param query_object: 查询参数对象
-        :param is_page: 是否开启分页
-        :return: 定时任务列表信息对象
+        :return: 定时任务列表信息查询语句
         """
         query = (
             select(SysJob)
@@ -72,6 +70,20 @@ class JobDao:
             .order_by(SysJob.job_id)
             .distinct()
         )
+
+        return query
+
+    @classmethod
+    async def get_job_list(cls, db: AsyncSession, query_object: JobPageQueryModel, is_page: bool = False):
+        """
+        根据查询参数获取定时任务列表信息
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param is_page: 是否开启分页
+        :return: 定时任务列表信息对象
+        """
+        query = cls.get_job_list_query(query_object)
         job_list = await PageUtil.paginate(db, query, query_object.page_num, query_object.page_size, is_page)
 
         return job_list
@@ -1,7 +1,7 @@
 from datetime import datetime, time
-from sqlalchemy import delete, desc, select
+from sqlalchemy import delete, desc, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Session
+from typing import List
 from module_admin.entity.do.job_do import SysJobLog
 from module_admin.entity.vo.job_vo import JobLogModel, JobLogPageQueryModel
 from utils.page_util import PageUtil
@@ -13,14 +13,12 @@ class JobLogDao:
     """
 
     @classmethod
-    async def get_job_log_list(cls, db: AsyncSession, query_object: JobLogPageQueryModel, is_page: bool = False):
+    def get_job_log_list_query(cls, query_object: JobLogPageQueryModel):
         """
-        根据查询参数获取定时任务日志列表信息
+        根据查询参数构建定时任务日志列表信息查询语句
 
-        :param db: orm对象
         :param query_object: 查询参数对象
-        :param is_page: 是否开启分页
-        :return: 定时任务日志列表信息对象
+        :return: 定时任务日志列表信息查询语句
         """
         query = (
             select(SysJobLog)
@@ -38,24 +36,43 @@ class JobLogDao:
             .order_by(desc(SysJobLog.create_time))
             .distinct()
         )
-        job_log_list = await PageUtil.paginate(db, query, query_object.page_num, query_object.page_size, is_page)
+
+        return query
+
+    @classmethod
+    async def get_job_log_list(cls, db: AsyncSession, query_object: JobLogPageQueryModel, is_page: bool = False):
+        """
+        根据查询参数获取定时任务日志列表信息
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param is_page: 是否开启分页
+        :return: 定时任务日志列表信息对象
+        """
+        query = cls.get_job_log_list_query(query_object)
+        job_log_list = await PageUtil.paginate(
+            db,
+            query,
+            query_object.page_num,
+            query_object.page_size,
+            is_page,
+            cursor=query_object.cursor,
+            skip_total=query_object.skip_total,
+            approximate_total=True,
+        )
 
         return job_log_list
 
     @classmethod
-    def add_job_log_dao(cls, db: Session, job_log: JobLogModel):
+    async def batch_add_job_log_dao(cls, db: AsyncSession, job_log_list: List[dict]):
         """
-        新增定时任务日志数据库操作
+        批量新增定时任务日志数据库操作（多行INSERT）
 
         :param db: orm对象
-        :param job_log: 定时任务日志对象
+        :param job_log_list: 定时任务日志字典列表
         :return:
         """
-        db_job_log = SysJobLog(**job_log.model_dump())
-        db.add(db_job_log)
-        db.flush()
-
-        return db_job_log
+        await db.execute(insert(SysJobLog), job_log_list)
 
     @classmethod
     async def delete_job_log_dao(cls, db: AsyncSession, job_log: JobLogModel):
@@ -1,6 +1,7 @@
 from datetime import datetime, time
-from sqlalchemy import asc, delete, desc, select
+from sqlalchemy import asc, delete, desc, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
 from module_admin.entity.do.log_do import SysLogininfor, SysOperLog
 from module_admin.entity.vo.log_vo import LogininforModel, LoginLogPageQueryModel, OperLogModel, OperLogPageQueryModel
 from utils.common_util import SnakeCaseUtil
@@ -13,14 +14,12 @@ class OperationLogDao:
     """
 
     @classmethod
-    async def get_operation_log_list(cls, db: AsyncSession, query_object: OperLogPageQueryModel, is_page: bool = False):
+    def get_operation_log_list_query(cls, query_object: OperLogPageQueryModel):
         """
-        根据查询参数获取操作日志列表信息
+        根据查询参数构建操作日志列表信息查询语句
 
-        :param db: orm对象
         :param query_object: 查询参数对象
-        :param is_page: 是否开启分页
-        :return: 操作日志列表信息对象
+        :return: 操作日志列表信息查询语句
         """
         if query_object.is_asc == 'ascending':
             order_by_column = asc(getattr(SysOperLog, SnakeCaseUtil.camel_to_snake(query_object.order_by_column), None))
@@ -47,7 +46,30 @@ class OperationLogDao:
             .distinct()
             .order_by(order_by_column)
         )
-        operation_log_list = await PageUtil.paginate(db, query, query_object.page_num, query_object.page_size, is_page)
+
+        return query
+
+    @classmethod
+    async def get_operation_log_list(cls, db: AsyncSession, query_object: OperLogPageQueryModel, is_page: bool = False):
+        """
+        根据查询参数获取操作日志列表信息
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param is_page: 是否开启分页
+        :return: 操作日志列表信息对象
+        """
+        query = cls.get_operation_log_list_query(query_object)
+        operation_log_list = await PageUtil.paginate(
+            db,
+            query,
+            query_object.page_num,
+            query_object.page_size,
+            is_page,
+            cursor=query_object.cursor,
+            skip_total=query_object.skip_total,
+            approximate_total=True,
+        )
 
         return operation_log_list
 
@@ -66,6 +88,17 @@ class OperationLogDao:
 
         return db_operation_log
 
+    @classmethod
+    async def batch_add_operation_log_dao(cls, db: AsyncSession, operation_log_list: List[dict]):
+        """
+        批量新增操作日志数据库操作（多行INSERT）
+
+        :param db: orm对象
+        :param operation_log_list: 操作日志字典列表
+        :return:
+        """
+        await db.execute(insert(SysOperLog), operation_log_list)
+
     @classmethod
     async def delete_operation_log_dao(cls, db: AsyncSession, operation_log: OperLogModel):
         """
@@ -94,14 +127,12 @@ class LoginLogDao:
     """
 
     @classmethod
-    async def get_login_log_list(cls, db: AsyncSession, query_object: LoginLogPageQueryModel, is_page: bool = False):
+    def get_login_log_list_query(cls, query_object: LoginLogPageQueryModel):
         """
-        根据查询参数获取登录日志列表信息
+        根据查询参数构建登录日志列表信息查询语句
 
-        :param db: orm对象
         :param query_object: 查询参数对象
-        :param is_page: 是否开启分页
-        :return: 登录日志列表信息对象
+        :return: 登录日志列表信息查询语句
         """
         if query_object.is_asc == 'ascending':
             order_by_column = asc(
@@ -129,7 +160,30 @@ class LoginLogDao:
             .distinct()
             .order_by(order_by_column)
         )
-        login_log_list = await PageUtil.paginate(db, query, query_object.page_num, query_object.page_size, is_page)
+
+        return query
+
+    @classmethod
+    async def get_login_log_list(cls, db: AsyncSession, query_object: LoginLogPageQueryModel, is_page: bool = False):
+        """
+        根据查询参数获取登录日志列表信息
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param is_page: 是否开启分页
+        :return: 登录日志列表信息对象
+        """
+        query = cls.get_login_log_list_query(query_object)
+        login_log_list = await PageUtil.paginate(
+            db,
+            query,
+            query_object.page_num,
+            query_object.page_size,
+            is_page,
+            cursor=query_object.cursor,
+            skip_total=query_object.skip_total,
+            approximate_total=True,
+        )
 
         return login_log_list
 
@@ -148,6 +202,17 @@ class LoginLogDao:
 
         return db_login_log
 
+    @classmethod
+    async def batch_add_login_log_dao(cls, db: AsyncSession, login_log_list: List[dict]):
+        """
+        批量新增登录日志数据库操作（多行INSERT）
+
+        :param db: orm对象
+        :param login_log_list: 登录日志字典列表
+        :return:
+        """
+        await db.execute(insert(SysLogininfor), login_log_list)
+
     @classmethod
     async def delete_login_log_dao(cls, db: AsyncSession, login_log: LogininforModel):
         """
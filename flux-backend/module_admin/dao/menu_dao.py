@@ -1,5 +1,6 @@
 from sqlalchemy import and_, delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
 from module_admin.entity.do.menu_do import SysMenu
 from module_admin.entity.do.role_do import SysRole, SysRoleMenu
 from module_admin.entity.do.user_do import SysUser, SysUserRole
@@ -93,6 +94,27 @@ class MenuDao:
 
         return menu_query_all
 
+    @classmethod
+    async def get_menu_list_by_role_ids(cls, db: AsyncSession, role_id_list: List[int], menu_type_list: List[str]):
+        """
+        根据角色id列表及菜单类型获取在用菜单列表信息
+
+        :param db: orm对象
+        :param role_id_list: 角色id列表
+        :param menu_type_list: 菜单类型列表
+        :return: 菜单列表信息
+        """
+        if not role_id_list:
+            return []
+        query = select(SysMenu).where(SysMenu.status == '0', SysMenu.menu_type.in_(menu_type_list))
+        if 1 not in role_id_list:
+            query = query.join(SysRoleMenu, SysRoleMenu.menu_id == SysMenu.menu_id).where(
+                SysRoleMenu.role_id.in_(role_id_list)
+            )
+        menu_query_all = (await db.execute(query.order_by(SysMenu.order_num).distinct())).scalars().all()
+
+        return menu_query_all
+
     @classmethod
     async def get_menu_list(cls, db: AsyncSession, page_object: MenuQueryModel, user_id: int, role: list):
         """
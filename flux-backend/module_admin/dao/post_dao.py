@@ -67,14 +67,12 @@ class PostDao:
         return post_info
 
     @classmethod
-    async def get_post_list(cls, db: AsyncSession, query_object: PostPageQueryModel, is_page: bool = False):
+    def get_post_list_query(cls, query_object: PostPageQueryModel):
         """
-        根据查询参数获取岗位列表信息
+        根据查询参数构建岗位列表信息查询语句
 
-        :param db: orm对象
         :param query_object: 查询参数对象
-        :param is_page: 是否开启分页
-        :return: 岗位列表信息对象
+        :return: 岗位列表信息查询语句
         """
         query = (
             select(SysPost)
@@ -86,6 +84,20 @@ class PostDao:
             .order_by(SysPost.post_sort)
             .distinct()
         )
+
+        return query
+
+    @classmethod
+    async def get_post_list(cls, db: AsyncSession, query_object: PostPageQueryModel, is_page: bool = False):
+        """
+        根据查询参数获取岗位列表信息
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param is_page: 是否开启分页
+        :return: 岗位列表信息对象
+        """
+        query = cls.get_post_list_query(query_object)
         post_list = await PageUtil.paginate(db, query, query_object.page_num, query_object.page_size, is_page)
 
         return post_list
@@ -1,5 +1,5 @@
 from datetime import datetime, time
-from sqlalchemy import and_, delete, desc, func, or_, select, update, inspect  # noqa: F401
+from sqlalchemy import ColumnElement, and_, delete, desc, func, or_, select, update, inspect  # noqa: F401
 from sqlalchemy.ext.asyncio import AsyncSession
 from module_admin.entity.do.dept_do import SysDept
 from module_admin.entity.do.menu_do import SysMenu
@@ -7,6 +7,7 @@ from module_admin.entity.do.role_do import SysRole, SysRoleMenu, SysRoleDept
 from module_admin.entity.do.user_do import SysUser, SysUserRole
 from module_admin.entity.vo.role_vo import RoleDeptModel, RoleMenuModel, RoleModel, RolePageQueryModel
 from utils.page_util import PageUtil
+from utils.schema_catalog_util import SchemaCatalogUtil
 
 
 class RoleDao:
@@ -125,17 +126,13 @@ class RoleDao:
         return role_info
 
     @classmethod
-    async def get_role_list(
-        cls, db: AsyncSession, query_object: RolePageQueryModel, data_scope_sql: str, is_page: bool = False
-    ):
+    def get_role_list_query(cls, query_object: RolePageQueryModel, data_scope_sql: ColumnElement):
         """
-        根据查询参数获取角色列表信息
+        根据查询参数构建角色列表信息查询语句
 
-        :param db: orm对象
         :param query_object: 查询参数对象
         :param data_scope_sql: 数据权限对应的查询sql语句
-        :param is_page: 是否开启分页
-        :return: 角色列表信息对象
+        :return: 角色列表信息查询语句
         """
         query = (
             select(SysRole)
@@ -154,11 +151,28 @@ class RoleDao:
                 )
                 if query_object.begin_time and query_object.end_time
                 else True,
-                eval(data_scope_sql),
+                data_scope_sql,
             )
             .order_by(SysRole.role_sort)
             .distinct()
         )
+
+        return query
+
+    @classmethod
+    async def get_role_list(
+        cls, db: AsyncSession, query_object: RolePageQueryModel, data_scope_sql: ColumnElement, is_page: bool = False
+    ):
+        """
+        根据查询参数获取角色列表信息
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param data_scope_sql: 数据权限对应的查询sql语句
+        :param is_page: 是否开启分页
+        :return: 角色列表信息对象
+        """
+        query = cls.get_role_list_query(query_object, data_scope_sql)
         role_list = await PageUtil.paginate(db, query, query_object.page_num, query_object.page_size, is_page)
 
         return role_list
@@ -339,24 +353,15 @@ class RoleDao:
 
     @classmethod
     async def get_table_filed_tree(cls, query_db: AsyncSession):
-        query = f"""
-            SELECT table_name, column_name
-            FROM information_schema.columns
-            WHERE table_schema = :database_name
-            ORDER BY table_name, ordinal_position;
-            """
-
-        result = await query_db.execute(query, {'database_name': 'flux_data'})
-        rows = result.fetchall()
-
-        # 构建树状结构
-        table_structure = {}
-        for row in rows:
-            table_name = row['table_name']
-            column_name = row['column_name']
-
-            if table_name not in table_structure:
-                table_structure[table_name] = []
-            table_structure[table_name].append(column_name)
+        """
+        从数据库表结构元数据缓存中获取当前数据库各表的字段列表
+
+        :param query_db: orm对象
+        :return: 表名与按字段顺序排列的字段名列表的映射
+        """
+        table_columns = await SchemaCatalogUtil.get_table_columns(query_db)
+        table_structure = {
+            table_name: [column['column_name'] for column in columns] for table_name, columns in table_columns.items()
+        }
 
         return table_structure
@@ -3,7 +3,7 @@
 from typing import List
 from datetime import datetime, time
 from module_admin.entity.do.role_do import SysRoleDept
-from sqlalchemy import and_, delete, desc, func, or_, select, update
+from sqlalchemy import ColumnElement, and_, delete, desc, func, or_, select, Select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from module_admin.entity.do.student_info_do import StudentInfo
@@ -28,11 +28,8 @@ class StudentInfoDao:
     查询
     """
     @classmethod
-    async def get_student_info_list(cls, db: AsyncSession,
-                             query_object: StudentInfoPageModel,
-                             data_scope_sql: str = None,
-                             is_page: bool = False) -> [list | PageResponseModel]:
-
+    def get_student_info_list_query(cls, query_object: StudentInfoPageModel, data_scope_sql: ColumnElement = None) -> Select:
+        """根据查询参数构建列表查询语句，供分页查询及流式导出共用"""
         query = (
             select(StudentInfo)
             .where(
@@ -40,11 +37,20 @@ class StudentInfoDao:
                 StudentInfo.name == query_object.name if query_object.name else True,
                 StudentInfo.phone_number == query_object.phone_number if query_object.phone_number else True,
                 StudentInfo.del_flag == '0',
-                eval(data_scope_sql) if data_scope_sql else True,
+                data_scope_sql if data_scope_sql is not None else True,
             )
             .order_by(desc(StudentInfo.create_time))
             .distinct()
         )
+        return query
+
+    @classmethod
+    async def get_student_info_list(cls, db: AsyncSession,
+                             query_object: StudentInfoPageModel,
+                             data_scope_sql: ColumnElement = None,
+                             is_page: bool = False) -> [list | PageResponseModel]:
+
+        query = cls.get_student_info_list_query(query_object, data_scope_sql)
         student_info_list = await PageUtil.paginate(db, query, query_object.page_num, query_object.page_size, is_page)
         return student_info_list
 
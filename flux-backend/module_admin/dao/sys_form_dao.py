@@ -3,7 +3,7 @@
 from typing import List, Sequence
 from datetime import datetime, time
 from module_admin.entity.do.role_do import SysRoleDept
-from sqlalchemy import and_, delete, desc, func, or_, select, update
+from sqlalchemy import ColumnElement, and_, delete, desc, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from module_admin.entity.do.sys_form_data_do import SysFormData
@@ -40,7 +40,7 @@ class SysFormDao:
     @classmethod
     async def get_sys_form_list(cls, db: AsyncSession,
                              query_object: SysFormPageModel,
-                             data_scope_sql: str = None,
+                             data_scope_sql: ColumnElement = None,
                              is_page: bool = False) -> [list | PageResponseModel]:
 
         query = (
@@ -49,7 +49,7 @@ class SysFormDao:
             .where(
                 SysForm.name.like(f"%{query_object.name}%") if query_object.name else True,
                 SysForm.del_flag == '0',
-                eval(data_scope_sql) if data_scope_sql else True,
+                data_scope_sql if data_scope_sql is not None else True,
             )
             .group_by(SysForm.id)
             .order_by(desc(SysForm.create_time))
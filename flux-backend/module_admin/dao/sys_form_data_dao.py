@@ -3,7 +3,7 @@
 from typing import List
 from datetime import datetime, time
 from module_admin.entity.do.role_do import SysRoleDept
-from sqlalchemy import and_, delete, desc, func, or_, select, update
+from sqlalchemy import ColumnElement, and_, delete, desc, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from module_admin.entity.do.sys_form_data_do import SysFormData
@@ -29,7 +29,7 @@ class SysFormDataDao:
     @classmethod
     async def get_sys_form_data_list(cls, db: AsyncSession,
                              query_object: SysFormDataPageModel,
-                             data_scope_sql: str = None,
+                             data_scope_sql: ColumnElement = None,
                              is_page: bool = False) -> [list | PageResponseModel]:
 
         query = (
@@ -39,7 +39,7 @@ class SysFormDataDao:
                 SysFormData.form_id == query_object.form_id if query_object.form_id else True,
                 SysFormData.form_name == query_object.form_name if query_object.form_name else True,
                 SysFormData.del_flag == '0',
-                eval(data_scope_sql) if data_scope_sql else True,
+                data_scope_sql if data_scope_sql is not None else True,
             )
             .order_by(desc(SysFormData.create_time))
             .distinct()
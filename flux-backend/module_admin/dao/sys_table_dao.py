@@ -2,17 +2,22 @@
 
 from typing import List
 from datetime import datetime, time
-from sqlalchemy import and_, delete, desc, func, or_, select, update, text
+from sqlalchemy import delete, desc, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from module_admin.entity.do.dept_do import SysDept
 from module_admin.entity.do.sys_table_do import SysTable
 from module_admin.entity.vo.sys_table_vo import SysTablePageModel, SysTableModel, DbTablePageModel
 from module_gen.entity.vo.gen_table_vo import GenTablePageModel, GenTableModel
+from utils.common_util import CamelCaseUtil
 from utils.page_util import PageUtil, PageResponseModel
+from utils.schema_catalog_util import SchemaCatalogUtil
 
 
 class SysTableDao:
 
+    # 不允许配置表格的系统表前缀
+    EXCLUDE_TABLE_PREFIXES = ('qrtz_', 'apscheduler_', 'gen_', 'sys_')
+
     @classmethod
     async def get_by_id(cls, db: AsyncSession, sys_table_id: int) -> SysTable:
         """根据主键获取单条记录"""
@@ -91,76 +96,36 @@ class SysTableDao:
         """
         查询数据库中的表信息，根据 GenTable 入参动态添加过滤条件。
         """
-        """查询数据库表列表"""
-        query = (
-            select(
-                text("table_name"),
-                text("table_comment"),
-                text("create_time"),
-                text("update_time"),
-            )
-            .select_from(text("information_schema.tables"))
-            .where(
-                and_(
-                    text("table_schema = (select database())"),
-                    text("table_name NOT LIKE 'qrtz\\_%'"),
-                    text("table_name NOT LIKE 'apscheduler\\_%'"),
-                    text("table_name NOT LIKE 'gen\\_%'"),
-                    text("table_name NOT LIKE 'sys\\_%'"),
-                    text("table_name NOT IN (select table_name from sys_table)"),
-                )
-            )
+        """查询数据库表列表，表信息从数据库表结构元数据缓存中读取"""
+        exclude_names = set((await session.execute(select(SysTable.table_name))).scalars().all())
+        tables = await SchemaCatalogUtil.query_tables(
+            session,
+            exclude_prefixes=cls.EXCLUDE_TABLE_PREFIXES,
+            exclude_names=exclude_names,
+            table_name=gen_table.table_name,
+            table_comment=gen_table.table_comment,
         )
-        # 动态条件构造
-        if gen_table.table_name:
-            query = query.where(
-                text("lower(table_name) like lower(:table_name)")
-            )
-        if gen_table.table_comment:
-            query = query.where(
-                text("lower(table_comment) like lower(:table_comment)")
-            )
-        # 排序
-        query = query.order_by(text("create_time DESC"))
-        # 参数绑定
-        params = {}
-        if gen_table.table_name:
-            params["table_name"] = f"%{gen_table.table_name}%"
-        if gen_table.table_comment:
-            params["table_comment"] = f"%{gen_table.table_comment}%"
-
-        rows = await PageUtil.paginate(session, query.params(**params), gen_table.page_num, gen_table.page_size, is_page)
+        rows = CamelCaseUtil.transform_result(tables)
+        if is_page:
+            return PageUtil.get_page_obj(rows, gen_table.page_num, gen_table.page_size)
         return rows
 
 
     @classmethod
     async def select_db_table_list_by_names(cls, session: AsyncSession, table_names: List[str]):
         """根据表名称查询数据库表信息"""
-        table_str = ",".join([f"'{item}'" for item in table_names])
         if not table_names:
             return []
-        query = select(
-            text("table_name"),
-            text("table_comment"),
-            text("create_time"),
-            text("update_time"),
-        ).select_from(text('information_schema.tables')).where(
-            and_(
-                text("table_name NOT LIKE 'qrtz\\_%'"),
-                text("table_name NOT LIKE 'apscheduler\\_%'"),
-                text("table_name NOT LIKE 'gen\\_%'"),
-                text("table_name NOT LIKE 'sys\\_%'"),
-                text("table_name NOT IN (select table_name from sys_table)"),
-                text(f"table_name IN ({ table_str })"),
-                text("table_schema = (select database())")
-            )
+        exclude_names = set((await session.execute(select(SysTable.table_name))).scalars().all())
+        tables = await SchemaCatalogUtil.query_tables(
+            session,
+            exclude_prefixes=cls.EXCLUDE_TABLE_PREFIXES,
+            exclude_names=exclude_names,
+            table_names=set(table_names),
         )
-
-        result = await session.execute(query)
-        rows = result.fetchall()
-        # return CamelCaseUtil.transform_result(rows)
         return [
-            GenTableModel(tableName=row[0], tableComment=row[1], createTime=row[2], updateTime=row[3]) for row in rows
+            GenTableModel(tableName=table['table_name'], tableComment=table['table_comment'],
+                          createTime=table['create_time'], updateTime=table['update_time']) for table in tables
         ]
 
     @classmethod
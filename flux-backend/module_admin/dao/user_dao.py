@@ -1,7 +1,11 @@
 from datetime import datetime, time
-from sqlalchemy import and_, delete, desc, func, or_, select, update
+from sqlalchemy import ColumnElement, and_, delete, desc, insert, or_, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from module_admin.entity.do.dept_do import SysDept
+from typing import List
+from config.env import DataBaseConfig
+from module_admin.entity.do.dept_do import SysDept, SysDeptClosure
 from module_admin.entity.do.menu_do import SysMenu
 from module_admin.entity.do.post_do import SysPost
 from module_admin.entity.do.role_do import SysRole, SysRoleDept, SysRoleMenu  # noqa: F401
@@ -22,6 +26,8 @@ class UserDao:
     用户管理模块数据库操作层
     """
 
+    IN_QUERY_BATCH_SIZE = 1000
+
     @classmethod
     async def get_user_by_name(cls, db: AsyncSession, user_name: str):
         """
@@ -76,95 +82,55 @@ class UserDao:
         return query_user_info
 
     @classmethod
-    async def get_user_by_id(cls, db: AsyncSession, user_id: int):
+    async def get_user_list_by_user_names(cls, db: AsyncSession, user_name_list: List[str]) -> List[SysUser]:
         """
-        根据user_id获取用户信息
+        根据用户账号列表批量获取用户信息，按批次使用IN查询
 
         :param db: orm对象
-        :param user_id: 用户id
-        :return: 当前user_id的用户信息对象
+        :param user_name_list: 用户账号列表
+        :return: 用户信息对象列表
         """
-        query_user_basic_info = (
-            (
-                await db.execute(
-                    select(SysUser)
-                    .where(SysUser.status == '0', SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .distinct()
-                )
-            )
-            .scalars()
-            .first()
-        )
-        query_user_dept_info = (
-            (
-                await db.execute(
-                    select(SysDept)
-                    .select_from(SysUser)
-                    .where(SysUser.status == '0', SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .join(
-                        SysDept,
-                        and_(SysUser.dept_id == SysDept.dept_id, SysDept.status == '0', SysDept.del_flag == '0'),
-                    )
-                    .distinct()
-                )
-            )
-            .scalars()
-            .first()
-        )
-        query_user_role_info = (
-            (
-                await db.execute(
-                    select(SysRole)
-                    .select_from(SysUser)
-                    .where(SysUser.status == '0', SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .join(SysUserRole, SysUser.user_id == SysUserRole.user_id, isouter=True)
-                    .join(
-                        SysRole,
-                        and_(SysUserRole.role_id == SysRole.role_id, SysRole.status == '0', SysRole.del_flag == '0'),
+        user_list = []
+        for index in range(0, len(user_name_list), cls.IN_QUERY_BATCH_SIZE):
+            batch_user_names = user_name_list[index : index + cls.IN_QUERY_BATCH_SIZE]
+            user_list.extend(
+                (
+                    await db.execute(
+                        select(SysUser).where(SysUser.del_flag == '0', SysUser.user_name.in_(batch_user_names))
                     )
-                    .distinct()
-                )
-            )
-            .scalars()
-            .all()
-        )
-        query_user_post_info = (
-            (
-                await db.execute(
-                    select(SysPost)
-                    .select_from(SysUser)
-                    .where(SysUser.status == '0', SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .join(SysUserPost, SysUser.user_id == SysUserPost.user_id, isouter=True)
-                    .join(SysPost, and_(SysUserPost.post_id == SysPost.post_id, SysPost.status == '0'))
-                    .distinct()
                 )
+                .scalars()
+                .all()
             )
-            .scalars()
-            .all()
-        )
-        role_id_list = [item.role_id for item in query_user_role_info]
-        if 1 in role_id_list:
-            query_user_menu_info = (
-                (await db.execute(select(SysMenu).where(SysMenu.status == '0').distinct())).scalars().all()
-            )
-        else:
-            query_user_menu_info = (
+
+        return user_list
+
+    @classmethod
+    async def get_user_id_list_by_data_scope(
+        cls, db: AsyncSession, user_id_list: List[int], data_scope_sql: ColumnElement
+    ) -> List[int]:
+        """
+        根据数据权限筛选有权限访问的用户id
+
+        :param db: orm对象
+        :param user_id_list: 用户id列表
+        :param data_scope_sql: 数据权限对应的查询sql语句
+        :return: 有权限访问的用户id列表
+        """
+        allowed_user_id_list = []
+        for index in range(0, len(user_id_list), cls.IN_QUERY_BATCH_SIZE):
+            batch_user_ids = user_id_list[index : index + cls.IN_QUERY_BATCH_SIZE]
+            allowed_user_id_list.extend(
                 (
                     await db.execute(
-                        select(SysMenu)
+                        select(SysUser.user_id)
                         .select_from(SysUser)
-                        .where(SysUser.status == '0', SysUser.del_flag == '0', SysUser.user_id == user_id)
-                        .join(SysUserRole, SysUser.user_id == SysUserRole.user_id, isouter=True)
                         .join(
-                            SysRole,
-                            and_(
-                                SysUserRole.role_id == SysRole.role_id, SysRole.status == '0', SysRole.del_flag == '0'
-                            ),
+                            SysDept,
+                            and_(SysUser.dept_id == SysDept.dept_id, SysDept.status == '0', SysDept.del_flag == '0'),
                             isouter=True,
                         )
-                        .join(SysRoleMenu, SysRole.role_id == SysRoleMenu.role_id, isouter=True)
-                        .join(SysMenu, and_(SysRoleMenu.menu_id == SysMenu.menu_id, SysMenu.status == '0'))
-                        .order_by(SysMenu.order_num)
+                        .where(SysUser.del_flag == '0', SysUser.user_id.in_(batch_user_ids), data_scope_sql)
                         .distinct()
                     )
                 )
@@ -172,12 +138,19 @@ class UserDao:
                 .all()
             )
 
-        results = dict(
-            user_basic_info=query_user_basic_info,
-            user_dept_info=query_user_dept_info,
-            user_role_info=query_user_role_info,
-            user_post_info=query_user_post_info,
-            user_menu_info=query_user_menu_info,
+        return allowed_user_id_list
+
+    @classmethod
+    async def get_user_by_id(cls, db: AsyncSession, user_id: int):
+        """
+        根据user_id获取用户信息
+
+        :param db: orm对象
+        :param user_id: 用户id
+        :return: 当前user_id的用户信息对象
+        """
+        results = await cls.__get_user_info_with_relations(
+            db, user_id, user_filters=[SysUser.status == '0'], admin_all_menus=True
         )
 
         return results
@@ -191,78 +164,73 @@ class UserDao:
         :param user_id: 用户id
         :return: 当前user_id的用户信息对象
         """
-        query_user_basic_info = (
-            (await db.execute(select(SysUser).where(SysUser.del_flag == '0', SysUser.user_id == user_id).distinct()))
-            .scalars()
-            .first()
-        )
-        query_user_dept_info = (
-            (
-                await db.execute(
-                    select(SysDept)
-                    .select_from(SysUser)
-                    .where(SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .join(
-                        SysDept,
-                        and_(SysUser.dept_id == SysDept.dept_id, SysDept.status == '0', SysDept.del_flag == '0'),
-                    )
-                    .distinct()
+        results = await cls.__get_user_info_with_relations(db, user_id, user_filters=[], admin_all_menus=False)
+
+        return results
+
+    @classmethod
+    async def __get_user_info_with_relations(
+        cls, db: AsyncSession, user_id: int, user_filters: List, admin_all_menus: bool
+    ):
+        """
+        根据user_id通过两次查询获取用户基本信息、部门、角色、岗位及菜单信息
+
+        :param db: orm对象
+        :param user_id: 用户id
+        :param user_filters: 用户表额外的过滤条件
+        :param admin_all_menus: 超级管理员是否直接获取所有正常状态的菜单
+        :return: 当前user_id的用户信息对象
+        """
+        # 第一次查询：用户、部门、角色及岗位通过外连接一次取回，每行为一个角色与岗位的组合
+        user_rows = (
+            await db.execute(
+                select(SysUser, SysDept, SysRole, SysPost)
+                .select_from(SysUser)
+                .where(SysUser.del_flag == '0', SysUser.user_id == user_id, *user_filters)
+                .join(
+                    SysDept,
+                    and_(SysUser.dept_id == SysDept.dept_id, SysDept.status == '0', SysDept.del_flag == '0'),
+                    isouter=True,
                 )
-            )
-            .scalars()
-            .first()
-        )
-        query_user_role_info = (
-            (
-                await db.execute(
-                    select(SysRole)
-                    .select_from(SysUser)
-                    .where(SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .join(SysUserRole, SysUser.user_id == SysUserRole.user_id, isouter=True)
-                    .join(
-                        SysRole,
-                        and_(SysUserRole.role_id == SysRole.role_id, SysRole.status == '0', SysRole.del_flag == '0'),
-                    )
-                    .distinct()
+                .join(SysUserRole, SysUser.user_id == SysUserRole.user_id, isouter=True)
+                .join(
+                    SysRole,
+                    and_(SysUserRole.role_id == SysRole.role_id, SysRole.status == '0', SysRole.del_flag == '0'),
+                    isouter=True,
                 )
+                .join(SysUserPost, SysUser.user_id == SysUserPost.user_id, isouter=True)
+                .join(SysPost, and_(SysUserPost.post_id == SysPost.post_id, SysPost.status == '0'), isouter=True)
             )
-            .scalars()
-            .all()
-        )
-        query_user_post_info = (
-            (
-                await db.execute(
-                    select(SysPost)
-                    .select_from(SysUser)
-                    .where(SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .join(SysUserPost, SysUser.user_id == SysUserPost.user_id, isouter=True)
-                    .join(SysPost, and_(SysUserPost.post_id == SysPost.post_id, SysPost.status == '0'))
-                    .distinct()
-                )
+        ).all()
+        query_user_basic_info = user_rows[0][0] if user_rows else None
+        query_user_dept_info = user_rows[0][1] if user_rows else None
+        query_user_role_info = list({row[2].role_id: row[2] for row in user_rows if row[2] is not None}.values())
+        query_user_post_info = list({row[3].post_id: row[3] for row in user_rows if row[3] is not None}.values())
+        # 第二次查询：根据已取回的角色id直接关联角色菜单表，不再重复关联用户表
+        role_id_list = [item.role_id for item in query_user_role_info]
+        if query_user_basic_info is None:
+            query_user_menu_info = []
+        elif admin_all_menus and 1 in role_id_list:
+            query_user_menu_info = (
+                (await db.execute(select(SysMenu).where(SysMenu.status == '0').distinct())).scalars().all()
             )
-            .scalars()
-            .all()
-        )
-        query_user_menu_info = (
-            (
-                await db.execute(
-                    select(SysMenu)
-                    .select_from(SysUser)
-                    .where(SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .join(SysUserRole, SysUser.user_id == SysUserRole.user_id, isouter=True)
-                    .join(
-                        SysRole,
-                        and_(SysUserRole.role_id == SysRole.role_id, SysRole.status == '0', SysRole.del_flag == '0'),
-                        isouter=True,
+        elif role_id_list:
+            query_user_menu_info = (
+                (
+                    await db.execute(
+                        select(SysMenu)
+                        .join(SysRoleMenu, SysRoleMenu.menu_id == SysMenu.menu_id)
+                        .where(SysRoleMenu.role_id.in_(role_id_list), SysMenu.status == '0')
+                        .order_by(SysMenu.order_num)
+                        .distinct()
                     )
-                    .join(SysRoleMenu, SysRole.role_id == SysRoleMenu.role_id, isouter=True)
-                    .join(SysMenu, and_(SysRoleMenu.menu_id == SysMenu.menu_id, SysMenu.status == '0'))
-                    .distinct()
                 )
+                .scalars()
+                .all()
             )
-            .scalars()
-            .all()
-        )
+        else:
+            query_user_menu_info = []
+
         results = dict(
             user_basic_info=query_user_basic_info,
             user_dept_info=query_user_dept_info,
@@ -274,27 +242,20 @@ class UserDao:
         return results
 
     @classmethod
-    async def get_user_list(
-        cls, db: AsyncSession, query_object: UserPageQueryModel, data_scope_sql: str, is_page: bool = False
-    ):
+    def get_user_list_query(cls, query_object: UserPageQueryModel, data_scope_sql: ColumnElement):
         """
-        根据查询参数获取用户列表信息
+        根据查询参数构建用户列表信息查询语句
 
-        :param db: orm对象
         :param query_object: 查询参数对象
         :param data_scope_sql: 数据权限对应的查询sql语句
-        :param is_page: 是否开启分页
-        :return: 用户列表信息对象
+        :return: 用户列表信息查询语句
         """
         query = (
             select(SysUser, SysDept)
             .where(
                 SysUser.del_flag == '0',
-                or_(
-                    SysUser.dept_id == query_object.dept_id,
-                    SysUser.dept_id.in_(
-                        select(SysDept.dept_id).where(func.find_in_set(query_object.dept_id, SysDept.ancestors))
-                    ),
+                SysUser.dept_id.in_(
+                    select(SysDeptClosure.descendant_id).where(SysDeptClosure.ancestor_id == query_object.dept_id)
                 )
                 if query_object.dept_id
                 else True,
@@ -311,7 +272,7 @@ class UserDao:
                 )
                 if query_object.begin_time and query_object.end_time
                 else True,
-                eval(data_scope_sql),
+                data_scope_sql,
             )
             .join(
                 SysDept,
@@ -321,7 +282,32 @@ class UserDao:
             .order_by(SysUser.user_id)
             .distinct()
         )
-        user_list = await PageUtil.paginate(db, query, query_object.page_num, query_object.page_size, is_page)
+
+        return query
+
+    @classmethod
+    async def get_user_list(
+        cls, db: AsyncSession, query_object: UserPageQueryModel, data_scope_sql: ColumnElement, is_page: bool = False
+    ):
+        """
+        根据查询参数获取用户列表信息
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param data_scope_sql: 数据权限对应的查询sql语句
+        :param is_page: 是否开启分页
+        :return: 用户列表信息对象
+        """
+        query = cls.get_user_list_query(query_object, data_scope_sql)
+        user_list = await PageUtil.paginate(
+            db,
+            query,
+            query_object.page_num,
+            query_object.page_size,
+            is_page,
+            cursor=query_object.cursor,
+            skip_total=query_object.skip_total,
+        )
 
         return user_list
 
@@ -340,6 +326,39 @@ class UserDao:
 
         return db_user
 
+    @classmethod
+    async def batch_add_user_dao(cls, db: AsyncSession, user_list: List[dict]):
+        """
+        批量新增用户数据库操作（多行INSERT）
+
+        :param db: orm对象
+        :param user_list: 用户字典列表，各字典的键需一致
+        :return:
+        """
+        await db.execute(insert(SysUser), user_list)
+
+    @classmethod
+    async def batch_edit_user_dao(cls, db: AsyncSession, user_list: List[dict]):
+        """
+        批量编辑用户数据库操作，mysql使用INSERT ... ON DUPLICATE KEY UPDATE，postgresql使用INSERT ... ON CONFLICT DO UPDATE
+
+        :param db: orm对象
+        :param user_list: 需要更新的用户字典列表，需包含user_id及user_name、nick_name，各字典的键需一致
+        :return:
+        """
+        if not user_list:
+            return
+        update_keys = [key for key in user_list[0].keys() if key != 'user_id']
+        if DataBaseConfig.db_type == 'postgresql':
+            statement = postgresql_insert(SysUser)
+            statement = statement.on_conflict_do_update(
+                index_elements=[SysUser.user_id], set_={key: statement.excluded[key] for key in update_keys}
+            )
+        else:
+            statement = mysql_insert(SysUser)
+            statement = statement.on_duplicate_key_update({key: statement.inserted[key] for key in update_keys})
+        await db.execute(statement, user_list)
+
     @classmethod
     async def edit_user_dao(cls, db: AsyncSession, user: dict):
         """
@@ -399,7 +418,7 @@ class UserDao:
 
     @classmethod
     async def get_user_role_allocated_list_by_role_id(
-        cls, db: AsyncSession, query_object: UserRolePageQueryModel, data_scope_sql: str, is_page: bool = False
+        cls, db: AsyncSession, query_object: UserRolePageQueryModel, data_scope_sql: ColumnElement, is_page: bool = False
     ):
         """
         根据角色id获取已分配的用户列表信息
@@ -420,7 +439,7 @@ class UserDao:
                 SysUser.user_name == query_object.user_name if query_object.user_name else True,
                 SysUser.phonenumber == query_object.phonenumber if query_object.phonenumber else True,
                 SysRole.role_id == query_object.role_id,
-                eval(data_scope_sql),
+                data_scope_sql,
             )
             .distinct()
         )
@@ -430,7 +449,7 @@ class UserDao:
 
     @classmethod
     async def get_user_role_unallocated_list_by_role_id(
-        cls, db: AsyncSession, query_object: UserRolePageQueryModel, data_scope_sql: str, is_page: bool = False
+        cls, db: AsyncSession, query_object: UserRolePageQueryModel, data_scope_sql: ColumnElement, is_page: bool = False
     ):
         """
         根据角色id获取未分配的用户列表信息
@@ -459,7 +478,7 @@ class UserDao:
                         and_(SysUserRole.user_id == SysUser.user_id, SysUserRole.role_id == query_object.role_id),
                     )
                 ),
-                eval(data_scope_sql),
+                data_scope_sql,
             )
             .distinct()
         )
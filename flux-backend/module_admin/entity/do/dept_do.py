@@ -24,3 +24,15 @@ class SysDept(Base):
     create_time = Column(DateTime, nullable=True, default=datetime.now(), comment='创建时间')
     update_by = Column(String(64), nullable=True, default='', comment='更新者')
     update_time = Column(DateTime, nullable=True, default=datetime.now(), comment='更新时间')
+
+
+class SysDeptClosure(Base):
+    """
+    部门祖先关系闭包表
+    """
+
+    __tablename__ = 'sys_dept_closure'
+
+    ancestor_id = Column(Integer, primary_key=True, nullable=False, comment='祖先部门id')
+    descendant_id = Column(Integer, primary_key=True, nullable=False, index=True, comment='后代部门id')
+    depth = Column(Integer, nullable=False, default=0, comment='层级距离（0代表部门自身）')
@@ -18,3 +18,22 @@ class ImportModel(BaseModel):
     filed_info: Optional[list[ImportFieldModel]] = Field(description='字段关联表')
     file_name: Optional[str] = Field(description='文件名')
 
+
+
+class ImportTaskModel(BaseModel):
+    """
+    导入任务进度模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel, from_attributes=True)
+
+    task_id: Optional[str] = Field(default=None, description='导入任务编号')
+    table_name: Optional[str] = Field(default=None, description='表名')
+    status: Optional[Literal['pending', 'running', 'success', 'failed', 'cancelled']] = Field(
+        default=None, description='任务状态（pending等待中 running导入中 success成功 failed失败 cancelled已取消）'
+    )
+    total: Optional[int] = Field(default=None, description='预估总行数，无法获取时为空')
+    processed: Optional[int] = Field(default=0, description='已导入行数')
+    message: Optional[str] = Field(default=None, description='提示信息')
+    create_time: Optional[str] = Field(default=None, description='创建时间')
+    finish_time: Optional[str] = Field(default=None, description='结束时间')
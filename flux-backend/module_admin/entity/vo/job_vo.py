@@ -2,7 +2,7 @@ from datetime import datetime
 from pydantic import BaseModel, ConfigDict, Field
 from pydantic.alias_generators import to_camel
 from pydantic_validation_decorator import NotBlank, Size
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 from module_admin.annotation.pydantic_annotation import as_query
 
 
@@ -122,6 +122,8 @@ class JobLogPageQueryModel(JobLogQueryModel):
 
     page_num: int = Field(default=1, description='当前页码')
     page_size: int = Field(default=10, description='每页记录数')
+    cursor: Optional[str] = Field(default=None, description='游标分页的游标，传入空字符串表示使用游标分页查询第一页')
+    skip_total: bool = Field(default=False, description='是否跳过总记录数查询')
 
 
 class DeleteJobLogModel(BaseModel):
@@ -132,3 +134,45 @@ class DeleteJobLogModel(BaseModel):
     model_config = ConfigDict(alias_generator=to_camel)
 
     job_log_ids: str = Field(description='需要删除的定时任务日志ID')
+
+
+@as_query
+class JobPlanQueryModel(BaseModel):
+    """
+    定时任务触发计划分析查询模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    hours: int = Field(default=24, description='分析的时间范围（单位：小时）')
+    fire_count: int = Field(default=100, description='每个任务最多计算的触发次数')
+    min_job_count: int = Field(default=2, description='同一秒触发的任务数不少于该值时视为触发冲突')
+    top: int = Field(default=20, description='返回的触发冲突数量')
+
+
+class JobCollisionModel(BaseModel):
+    """
+    定时任务触发冲突模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    fire_time: datetime = Field(description='触发时间')
+    job_count: int = Field(description='同时触发的任务数')
+    job_names: List[str] = Field(default=[], description='同时触发的任务名称，最多返回前20个')
+
+
+class JobPlanModel(BaseModel):
+    """
+    定时任务触发计划分析结果模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    job_count: int = Field(description='参与分析的任务数')
+    schedule_count: int = Field(description='不同触发计划的数量')
+    fire_count: int = Field(description='分析范围内的总触发次数')
+    peak_job_count: int = Field(description='同一秒触发的最大任务数')
+    collision_count: int = Field(description='触发冲突的时间点数量')
+    collisions: List[JobCollisionModel] = Field(default=[], description='触发任务数最多的触发冲突列表')
+    invalid_jobs: List[str] = Field(default=[], description='Cron表达式无法解析的任务名称')
@@ -170,6 +170,8 @@ class UserPageQueryModel(UserQueryModel):
 
     page_num: int = Field(default=1, description='当前页码')
     page_size: int = Field(default=10, description='每页记录数')
+    cursor: Optional[str] = Field(default=None, description='游标分页的游标，传入空字符串表示使用游标分页查询第一页')
+    skip_total: bool = Field(default=False, description='是否跳过总记录数查询')
 
 
 class AddUserModel(UserModel):
@@ -1,11 +1,14 @@
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Literal
 from config.constant import CommonConstant
 from exceptions.exception import ServiceException
 from module_admin.dao.app_env_dao import EnvDao
+from module_admin.entity.do.env_do import AppEnv
 from module_admin.entity.vo.common_vo import CrudResponseModel
 from module_admin.entity.vo.env_vo import DeleteEnvModel, EnvModel, EnvPageQueryModel
-from utils.common_util import CamelCaseUtil, export_list2excel
+from utils.common_util import CamelCaseUtil
+from utils.export_util import ExportColumn, ExportUtil
 
 
 class EnvService:
@@ -13,6 +16,19 @@ class EnvService:
     环境管理模块服务层
     """
 
+    EXPORT_COLUMNS = [
+        ExportColumn(AppEnv.env_id, '岗位编号'),
+        ExportColumn(AppEnv.env_code, '岗位编码'),
+        ExportColumn(AppEnv.env_name, '岗位名称'),
+        ExportColumn(AppEnv.env_sort, '显示顺序'),
+        ExportColumn(AppEnv.status, '状态', options={'0': '正常'}, default_label='停用'),
+        ExportColumn(AppEnv.create_by, '创建者'),
+        ExportColumn(AppEnv.create_time, '创建时间'),
+        ExportColumn(AppEnv.update_by, '更新者'),
+        ExportColumn(AppEnv.update_time, '更新时间'),
+        ExportColumn(AppEnv.remark, '备注'),
+    ]
+
     @classmethod
     async def get_env_list_services(
         cls, query_db: AsyncSession, query_object: EnvPageQueryModel, is_page: bool = False
@@ -148,38 +164,18 @@ class EnvService:
 
         return result
 
-    @staticmethod
-    async def export_env_list_services(env_list: List):
+    @classmethod
+    async def export_env_list_services(
+        cls, request: Request, query_object: EnvPageQueryModel, file_format: Literal['xlsx', 'csv'] = 'xlsx'
+    ):
         """
         导出环境信息service
 
-        :param env_list: 环境信息列表
-        :return: 环境信息对应excel的二进制数据
-        """
-        # 创建一个映射字典，将英文键映射到中文键
-        mapping_dict = {
-            'envId': '岗位编号',
-            'envCode': '岗位编码',
-            'envName': '岗位名称',
-            'envSort': '显示顺序',
-            'status': '状态',
-            'createBy': '创建者',
-            'createTime': '创建时间',
-            'updateBy': '更新者',
-            'updateTime': '更新时间',
-            'remark': '备注',
-        }
-
-        data = env_list
-
-        for item in data:
-            if item.get('status') == '0':
-                item['status'] = '正常'
-            else:
-                item['status'] = '停用'
-        new_data = [
-            {mapping_dict.get(key): value for key, value in item.items() if mapping_dict.get(key)} for item in data
-        ]
-        binary_data = export_list2excel(new_data)
-
-        return binary_data
+        :param request: Request对象
+        :param query_object: 查询参数对象
+        :param file_format: 导出文件格式
+        :return: 环境信息对应导出文件的二进制数据流
+        """
+        return await ExportUtil.stream_export(
+            request.app.state.redis, EnvDao.get_env_list_query(query_object), cls.EXPORT_COLUMNS, file_format
+        )
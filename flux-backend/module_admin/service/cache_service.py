@@ -3,6 +3,8 @@ from config.enums import RedisInitKeyConfig
 from config.get_redis import RedisUtil
 from module_admin.entity.vo.cache_vo import CacheInfoModel, CacheMonitorModel
 from module_admin.entity.vo.common_vo import CrudResponseModel
+from module_admin.service.sys_cache_service import SysCacheService
+from utils.redis_key_util import RedisKeyUtil
 
 
 class CacheService:
@@ -57,7 +59,7 @@ class CacheService:
         :param cache_name: 缓存名称
         :return: 缓存键名列表信息
         """
-        cache_keys = await request.app.state.redis.keys(f'{cache_name}*')
+        cache_keys = await RedisKeyUtil.get_keys(request.app.state.redis, cache_name)
         cache_key_list = [key.split(':', 1)[1] for key in cache_keys if key.startswith(f'{cache_name}:')]
 
         return cache_key_list
@@ -85,9 +87,8 @@ class CacheService:
         :param cache_name: 缓存名称
         :return: 操作缓存响应信息
         """
-        cache_keys = await request.app.state.redis.keys(f'{cache_name}*')
-        if cache_keys:
-            await request.app.state.redis.delete(*cache_keys)
+        await RedisKeyUtil.clear_namespace(request.app.state.redis, cache_name)
+        await SysCacheService.publish_invalidate_services(request.app.state.redis, cache_name)
 
         return CrudResponseModel(is_success=True, message=f'{cache_name}对应键值清除成功')
 
@@ -100,9 +101,10 @@ class CacheService:
         :param cache_key: 缓存键名
         :return: 操作缓存响应信息
         """
-        cache_keys = await request.app.state.redis.keys(f'*{cache_key}')
+        cache_keys = await RedisKeyUtil.scan_keys(request.app.state.redis, f'*{cache_key}')
         if cache_keys:
-            await request.app.state.redis.delete(*cache_keys)
+            await RedisKeyUtil.delete(request.app.state.redis, *cache_keys)
+            await SysCacheService.publish_invalidate_services(request.app.state.redis, *cache_keys)
 
         return CrudResponseModel(is_success=True, message=f'{cache_key}清除成功')
 
@@ -114,9 +116,7 @@ class CacheService:
         :param request: Request对象
         :return: 操作缓存响应信息
         """
-        cache_keys = await request.app.state.redis.keys()
-        if cache_keys:
-            await request.app.state.redis.delete(*cache_keys)
+        await request.app.state.redis.flushdb(asynchronous=True)
 
         await RedisUtil.init_sys_dict(request.app.state.redis)
         await RedisUtil.init_sys_config(request.app.state.redis)
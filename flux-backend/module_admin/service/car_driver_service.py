@@ -1,8 +1,11 @@
 # -*- coding:utf-8 -*-
 
-from typing import List
+from fastapi import Request
+from typing import AsyncIterator, List, Literal
+from sqlalchemy import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
-from utils.common_util import CamelCaseUtil, export_list2excel
+from utils.common_util import CamelCaseUtil
+from utils.export_util import ExportColumn, ExportUtil
 from utils.page_util import PageResponseModel
 from module_admin.dao.car_driver_dao import CarDriverDao
 from module_admin.entity.do.car_driver_do import CarDriver
@@ -14,8 +17,19 @@ class CarDriverService:
     用户管理模块服务层
     """
 
+    EXPORT_COLUMNS = [
+        ExportColumn(CarDriver.age, '年龄 '),
+        ExportColumn(CarDriver.car_type, '车辆类型 '),
+        ExportColumn(CarDriver.driver_years, '驾龄 '),
+        ExportColumn(CarDriver.image, '图片 '),
+        ExportColumn(CarDriver.location, '所在位置 '),
+        ExportColumn(CarDriver.name, '司机名称 '),
+        ExportColumn(CarDriver.price, '价格 '),
+        ExportColumn(CarDriver.update_time, '更新时间 '),
+    ]
+
     @classmethod
-    async def get_car_driver_list(cls, query_db: AsyncSession, query_object: CarDriverPageModel, data_scope_sql: str) -> [list | PageResponseModel]:
+    async def get_car_driver_list(cls, query_db: AsyncSession, query_object: CarDriverPageModel, data_scope_sql: ColumnElement) -> [list | PageResponseModel]:
         car_driver_list = await CarDriverDao.get_car_driver_list(query_db, query_object, data_scope_sql, is_page=True)
         return car_driver_list
 
@@ -46,20 +60,6 @@ class CarDriverService:
 
 
     @classmethod
-    async def export_car_driver_list(cls, query_db: AsyncSession, query_object: CarDriverPageModel, data_scope_sql) -> bytes:
-        car_driver_list = await CarDriverDao.get_car_driver_list(query_db, query_object, data_scope_sql, is_page=False)
-        mapping_dict = {
-            'age': '年龄 ',
-            'carType': '车辆类型 ',
-            'driverYears': '驾龄 ',
-            'image': '图片 ',
-            'location': '所在位置 ',
-            'name': '司机名称 ',
-            'price': '价格 ',
-            'updateTime': '更新时间 ',
-        }
-        new_data = [
-            {mapping_dict.get(key): value for key, value in item.items() if mapping_dict.get(key)} for item in car_driver_list
-        ]
-        binary_data = export_list2excel(new_data)
-        return binary_data
\ No newline at end of file
+    async def export_car_driver_list(cls, request: Request, query_object: CarDriverPageModel, data_scope_sql, file_format: Literal['xlsx', 'csv'] = 'xlsx') -> AsyncIterator[bytes]:
+        query = CarDriverDao.get_car_driver_list_query(query_object, data_scope_sql)
+        return await ExportUtil.stream_export(request.app.state.redis, query, cls.EXPORT_COLUMNS, file_format)
\ No newline at end of file
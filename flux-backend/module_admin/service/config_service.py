@@ -1,13 +1,17 @@
 from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Literal
 from config.constant import CommonConstant
 from config.enums import RedisInitKeyConfig
 from exceptions.exception import ServiceException
 from module_admin.dao.config_dao import ConfigDao
+from module_admin.entity.do.config_do import SysConfig
 from module_admin.entity.vo.common_vo import CrudResponseModel
 from module_admin.entity.vo.config_vo import ConfigModel, ConfigPageQueryModel, DeleteConfigModel
-from utils.common_util import CamelCaseUtil, export_list2excel
+from module_admin.service.sys_cache_service import SysCacheService
+from utils.common_util import CamelCaseUtil
+from utils.export_util import ExportColumn, ExportUtil
+from utils.redis_key_util import RedisKeyUtil
 
 
 class ConfigService:
@@ -15,6 +19,19 @@ class ConfigService:
     参数配置管理模块服务层
     """
 
+    EXPORT_COLUMNS = [
+        ExportColumn(SysConfig.config_id, '参数主键'),
+        ExportColumn(SysConfig.config_name, '参数名称'),
+        ExportColumn(SysConfig.config_key, '参数键名'),
+        ExportColumn(SysConfig.config_value, '参数键值'),
+        ExportColumn(SysConfig.config_type, '系统内置', options={'Y': '是'}, default_label='否'),
+        ExportColumn(SysConfig.create_by, '创建者'),
+        ExportColumn(SysConfig.create_time, '创建时间'),
+        ExportColumn(SysConfig.update_by, '更新者'),
+        ExportColumn(SysConfig.update_time, '更新时间'),
+        ExportColumn(SysConfig.remark, '备注'),
+    ]
+
     @classmethod
     async def get_config_list_services(
         cls, query_db: AsyncSession, query_object: ConfigPageQueryModel, is_page: bool = False
@@ -40,28 +57,29 @@ class ConfigService:
         :param redis: redis对象
         :return:
         """
-        # 获取以sys_config:开头的键列表
-        keys = await redis.keys(f'{RedisInitKeyConfig.SYS_CONFIG.key}:*')
-        # 删除匹配的键
-        if keys:
-            await redis.delete(*keys)
+        # 通过键名索引删除以sys_config:开头的键
+        await RedisKeyUtil.clear_namespace(redis, RedisInitKeyConfig.SYS_CONFIG.key)
         config_all = await ConfigDao.get_config_list(query_db, ConfigPageQueryModel(**dict()), is_page=False)
         for config_obj in config_all:
-            await redis.set(
+            await RedisKeyUtil.set(
+                redis,
                 f"{RedisInitKeyConfig.SYS_CONFIG.key}:{config_obj.get('configKey')}",
                 config_obj.get('configValue'),
             )
+        await SysCacheService.publish_invalidate_services(redis, RedisInitKeyConfig.SYS_CONFIG.key)
 
     @classmethod
     async def query_config_list_from_cache_services(cls, redis, config_key: str):
         """
-        从缓存获取参数键名对应值service
+        从缓存获取参数键名对应值service，优先读取进程内缓存
 
         :param redis: redis对象
         :param config_key: 参数键名
         :return: 参数键名对应值
         """
-        result = await redis.get(f'{RedisInitKeyConfig.SYS_CONFIG.key}:{config_key}')
+        result = await SysCacheService.get_cache_value_services(
+            redis, f'{RedisInitKeyConfig.SYS_CONFIG.key}:{config_key}'
+        )
 
         return result
 
@@ -96,9 +114,13 @@ class ConfigService:
             try:
                 await ConfigDao.add_config_dao(query_db, page_object)
                 await query_db.commit()
-                await request.app.state.redis.set(
+                await RedisKeyUtil.set(
+                    request.app.state.redis,
                     f'{RedisInitKeyConfig.SYS_CONFIG.key}:{page_object.config_key}', page_object.config_value
                 )
+                await SysCacheService.publish_invalidate_services(
+                    request.app.state.redis, f'{RedisInitKeyConfig.SYS_CONFIG.key}:{page_object.config_key}'
+                )
                 return CrudResponseModel(is_success=True, message='新增成功')
             except Exception as e:
                 await query_db.rollback()
@@ -124,12 +146,19 @@ class ConfigService:
                     await ConfigDao.edit_config_dao(query_db, edit_config)
                     await query_db.commit()
                     if config_info.config_key != page_object.config_key:
-                        await request.app.state.redis.delete(
+                        await RedisKeyUtil.delete(
+                            request.app.state.redis,
                             f'{RedisInitKeyConfig.SYS_CONFIG.key}:{config_info.config_key}'
                         )
-                    await request.app.state.redis.set(
+                    await RedisKeyUtil.set(
+                        request.app.state.redis,
                         f'{RedisInitKeyConfig.SYS_CONFIG.key}:{page_object.config_key}', page_object.config_value
                     )
+                    await SysCacheService.publish_invalidate_services(
+                        request.app.state.redis,
+                        f'{RedisInitKeyConfig.SYS_CONFIG.key}:{config_info.config_key}',
+                        f'{RedisInitKeyConfig.SYS_CONFIG.key}:{page_object.config_key}',
+                    )
                     return CrudResponseModel(is_success=True, message='更新成功')
                 except Exception as e:
                     await query_db.rollback()
@@ -160,7 +189,8 @@ class ConfigService:
                         delete_config_key_list.append(f'{RedisInitKeyConfig.SYS_CONFIG.key}:{config_info.config_key}')
                 await query_db.commit()
                 if delete_config_key_list:
-                    await request.app.state.redis.delete(*delete_config_key_list)
+                    await RedisKeyUtil.delete(request.app.state.redis, *delete_config_key_list)
+                    await SysCacheService.publish_invalidate_services(request.app.state.redis, *delete_config_key_list)
                 return CrudResponseModel(is_success=True, message='删除成功')
             except Exception as e:
                 await query_db.rollback()
@@ -185,41 +215,21 @@ class ConfigService:
 
         return result
 
-    @staticmethod
-    async def export_config_list_services(config_list: List):
+    @classmethod
+    async def export_config_list_services(
+        cls, request: Request, query_object: ConfigPageQueryModel, file_format: Literal['xlsx', 'csv'] = 'xlsx'
+    ):
         """
         导出参数配置信息service
 
-        :param config_list: 参数配置信息列表
-        :return: 参数配置信息对应excel的二进制数据
-        """
-        # 创建一个映射字典，将英文键映射到中文键
-        mapping_dict = {
-            'configId': '参数主键',
-            'configName': '参数名称',
-            'configKey': '参数键名',
-            'configValue': '参数键值',
-            'configType': '系统内置',
-            'createBy': '创建者',
-            'createTime': '创建时间',
-            'updateBy': '更新者',
-            'updateTime': '更新时间',
-            'remark': '备注',
-        }
-
-        data = config_list
-
-        for item in data:
-            if item.get('configType') == 'Y':
-                item['configType'] = '是'
-            else:
-                item['configType'] = '否'
-        new_data = [
-            {mapping_dict.get(key): value for key, value in item.items() if mapping_dict.get(key)} for item in data
-        ]
-        binary_data = export_list2excel(new_data)
-
-        return binary_data
+        :param request: Request对象
+        :param query_object: 查询参数对象
+        :param file_format: 导出文件格式
+        :return: 参数配置信息对应导出文件的二进制数据流
+        """
+        return await ExportUtil.stream_export(
+            request.app.state.redis, ConfigDao.get_config_list_query(query_object), cls.EXPORT_COLUMNS, file_format
+        )
 
     @classmethod
     async def refresh_sys_config_services(cls, request: Request, query_db: AsyncSession):
@@ -1,3 +1,4 @@
+from sqlalchemy import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 from config.constant import CommonConstant
 from exceptions.exception import ServiceException, ServiceWarning
@@ -5,6 +6,8 @@ from module_admin.dao.dept_dao import DeptDao
 from module_admin.entity.vo.common_vo import CrudResponseModel
 from module_admin.entity.vo.dept_vo import DeleteDeptModel, DeptModel
 from utils.common_util import CamelCaseUtil
+from utils.log_util import logger
+from utils.tree_util import TreeUtil
 
 
 class DeptService:
@@ -13,7 +16,7 @@ class DeptService:
     """
 
     @classmethod
-    async def get_dept_tree_services(cls, query_db: AsyncSession, page_object: DeptModel, data_scope_sql: str):
+    async def get_dept_tree_services(cls, query_db: AsyncSession, page_object: DeptModel, data_scope_sql: ColumnElement):
         """
         获取部门树信息service
 
@@ -29,7 +32,7 @@ class DeptService:
 
     @classmethod
     async def get_dept_for_edit_option_services(
-        cls, query_db: AsyncSession, page_object: DeptModel, data_scope_sql: str
+        cls, query_db: AsyncSession, page_object: DeptModel, data_scope_sql: ColumnElement
     ):
         """
         获取部门编辑部门树信息service
@@ -44,7 +47,7 @@ class DeptService:
         return CamelCaseUtil.transform_result(dept_list_result)
 
     @classmethod
-    async def get_dept_list_services(cls, query_db: AsyncSession, page_object: DeptModel, data_scope_sql: str):
+    async def get_dept_list_services(cls, query_db: AsyncSession, page_object: DeptModel, data_scope_sql: ColumnElement):
         """
         获取部门列表信息service
 
@@ -58,7 +61,7 @@ class DeptService:
         return CamelCaseUtil.transform_result(dept_list_result)
 
     @classmethod
-    async def check_dept_data_scope_services(cls, query_db: AsyncSession, dept_id: int, data_scope_sql: str):
+    async def check_dept_data_scope_services(cls, query_db: AsyncSession, dept_id: int, data_scope_sql: ColumnElement):
         """
         校验部门是否有数据权限service
 
@@ -106,7 +109,8 @@ class DeptService:
             raise ServiceException(message=f'部门{parent_info.dept_name}停用，不允许新增')
         page_object.ancestors = f'{parent_info.ancestors},{page_object.parent_id}'
         try:
-            await DeptDao.add_dept_dao(query_db, page_object)
+            add_dept = await DeptDao.add_dept_dao(query_db, page_object)
+            await DeptDao.add_dept_closure_dao(query_db, add_dept.dept_id, page_object.parent_id)
             await query_db.commit()
             return CrudResponseModel(is_success=True, message='新增成功')
         except Exception as e:
@@ -139,6 +143,8 @@ class DeptService:
                 old_ancestors = old_dept.ancestors
                 page_object.ancestors = new_ancestors
                 await cls.update_dept_children(query_db, page_object.dept_id, new_ancestors, old_ancestors)
+                if old_dept.parent_id != page_object.parent_id:
+                    await DeptDao.move_dept_closure_dao(query_db, page_object.dept_id, page_object.parent_id)
             edit_dept = page_object.model_dump(exclude_unset=True)
             await DeptDao.edit_dept_dao(query_db, edit_dept)
             if (
@@ -153,6 +159,24 @@ class DeptService:
             await query_db.rollback()
             raise e
 
+    @classmethod
+    async def init_dept_closure_services(cls, query_db: AsyncSession):
+        """
+        应用初始化：部门闭包表为空时根据部门祖级列表重建闭包关系service
+
+        :param query_db: orm对象
+        :return:
+        """
+        if await DeptDao.count_dept_closure_dao(query_db):
+            return
+        try:
+            closure_count = await DeptDao.rebuild_dept_closure_dao(query_db)
+            await query_db.commit()
+            logger.info(f'部门闭包表重建成功，共{closure_count}条闭包关系')
+        except Exception as e:
+            await query_db.rollback()
+            logger.warning(f'部门闭包表重建失败，详细错误信息：{e}')
+
     @classmethod
     async def delete_dept_services(cls, query_db: AsyncSession, page_object: DeleteDeptModel):
         """
@@ -208,25 +232,8 @@ class DeptService:
         permission_list = [
             dict(id=item.dept_id, label=item.dept_name, parentId=item.parent_id) for item in permission_list
         ]
-        # 转成id为key的字典
-        mapping: dict = dict(zip([i['id'] for i in permission_list], permission_list))
-
-        # 树容器
-        container: list = []
-
-        for d in permission_list:
-            # 如果找不到父级项，则是根节点
-            parent: dict = mapping.get(d['parentId'])
-            if parent is None:
-                container.append(d)
-            else:
-                children: list = parent.get('children')
-                if not children:
-                    children = []
-                children.append(d)
-                parent.update({'children': children})
-
-        return container
+
+        return TreeUtil.list_to_tree(permission_list)
 
     @classmethod
     async def replace_first(cls, original_str: str, old_str: str, new_str: str):
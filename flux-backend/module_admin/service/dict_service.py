@@ -1,11 +1,12 @@
 import json
 from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Literal, Optional
 from config.constant import CommonConstant
 from config.enums import RedisInitKeyConfig
 from exceptions.exception import ServiceException
 from module_admin.dao.dict_dao import DictDataDao, DictTypeDao
+from module_admin.entity.do.dict_do import SysDictData, SysDictType
 from module_admin.entity.vo.common_vo import CrudResponseModel
 from module_admin.entity.vo.dict_vo import (
     DeleteDictDataModel,
@@ -15,7 +16,10 @@ from module_admin.entity.vo.dict_vo import (
     DictTypeModel,
     DictTypePageQueryModel,
 )
-from utils.common_util import CamelCaseUtil, export_list2excel
+from module_admin.service.sys_cache_service import SysCacheService
+from utils.common_util import CamelCaseUtil
+from utils.export_util import ExportColumn, ExportUtil
+from utils.redis_key_util import RedisKeyUtil
 
 
 class DictTypeService:
@@ -23,6 +27,18 @@ class DictTypeService:
     字典类型管理模块服务层
     """
 
+    EXPORT_COLUMNS = [
+        ExportColumn(SysDictType.dict_id, '字典编号'),
+        ExportColumn(SysDictType.dict_name, '字典名称'),
+        ExportColumn(SysDictType.dict_type, '字典类型'),
+        ExportColumn(SysDictType.status, '状态', options={'0': '正常'}, default_label='停用'),
+        ExportColumn(SysDictType.create_by, '创建者'),
+        ExportColumn(SysDictType.create_time, '创建时间'),
+        ExportColumn(SysDictType.update_by, '更新者'),
+        ExportColumn(SysDictType.update_time, '更新时间'),
+        ExportColumn(SysDictType.remark, '备注'),
+    ]
+
     @classmethod
     async def get_dict_type_list_services(
         cls, query_db: AsyncSession, query_object: DictTypePageQueryModel, is_page: bool = False
@@ -72,7 +88,10 @@ class DictTypeService:
             try:
                 await DictTypeDao.add_dict_type_dao(query_db, page_object)
                 await query_db.commit()
-                await request.app.state.redis.set(f'{RedisInitKeyConfig.SYS_DICT.key}:{page_object.dict_type}', '')
+                await RedisKeyUtil.set(request.app.state.redis, f'{RedisInitKeyConfig.SYS_DICT.key}:{page_object.dict_type}', '')
+                await SysCacheService.publish_invalidate_services(
+                    request.app.state.redis, f'{RedisInitKeyConfig.SYS_DICT.key}:{page_object.dict_type}'
+                )
                 result = dict(is_success=True, message='新增成功')
             except Exception as e:
                 await query_db.rollback()
@@ -111,10 +130,16 @@ class DictTypeService:
                     await query_db.commit()
                     if dict_type_info.dict_type != page_object.dict_type:
                         dict_data = [CamelCaseUtil.transform_result(row) for row in dict_data_list if row]
-                        await request.app.state.redis.set(
+                        await RedisKeyUtil.set(
+                            request.app.state.redis,
                             f'{RedisInitKeyConfig.SYS_DICT.key}:{page_object.dict_type}',
                             json.dumps(dict_data, ensure_ascii=False, default=str),
                         )
+                        await SysCacheService.publish_invalidate_services(
+                            request.app.state.redis,
+                            f'{RedisInitKeyConfig.SYS_DICT.key}:{dict_type_info.dict_type}',
+                            f'{RedisInitKeyConfig.SYS_DICT.key}:{page_object.dict_type}',
+                        )
                     return CrudResponseModel(is_success=True, message='更新成功')
                 except Exception as e:
                     await query_db.rollback()
@@ -146,7 +171,8 @@ class DictTypeService:
                     delete_dict_type_list.append(f'{RedisInitKeyConfig.SYS_DICT.key}:{dict_type_into.dict_type}')
                 await query_db.commit()
                 if delete_dict_type_list:
-                    await request.app.state.redis.delete(*delete_dict_type_list)
+                    await RedisKeyUtil.delete(request.app.state.redis, *delete_dict_type_list)
+                    await SysCacheService.publish_invalidate_services(request.app.state.redis, *delete_dict_type_list)
                 return CrudResponseModel(is_success=True, message='删除成功')
             except Exception as e:
                 await query_db.rollback()
@@ -171,40 +197,24 @@ class DictTypeService:
 
         return result
 
-    @staticmethod
-    async def export_dict_type_list_services(dict_type_list: List):
+    @classmethod
+    async def export_dict_type_list_services(
+        cls, request: Request, query_object: DictTypePageQueryModel, file_format: Literal['xlsx', 'csv'] = 'xlsx'
+    ):
         """
         导出字典类型信息service
 
-        :param dict_type_list: 字典信息列表
-        :return: 字典信息对应excel的二进制数据
-        """
-        # 创建一个映射字典，将英文键映射到中文键
-        mapping_dict = {
-            'dictId': '字典编号',
-            'dictName': '字典名称',
-            'dictType': '字典类型',
-            'status': '状态',
-            'createBy': '创建者',
-            'createTime': '创建时间',
-            'updateBy': '更新者',
-            'updateTime': '更新时间',
-            'remark': '备注',
-        }
-
-        data = dict_type_list
-
-        for item in data:
-            if item.get('status') == '0':
-                item['status'] = '正常'
-            else:
-                item['status'] = '停用'
-        new_data = [
-            {mapping_dict.get(key): value for key, value in item.items() if mapping_dict.get(key)} for item in data
-        ]
-        binary_data = export_list2excel(new_data)
-
-        return binary_data
+        :param request: Request对象
+        :param query_object: 查询参数对象
+        :param file_format: 导出文件格式
+        :return: 字典信息对应导出文件的二进制数据流
+        """
+        return await ExportUtil.stream_export(
+            request.app.state.redis,
+            DictTypeDao.get_dict_type_list_query(query_object),
+            cls.EXPORT_COLUMNS,
+            file_format,
+        )
 
     @classmethod
     async def refresh_sys_dict_services(cls, request: Request, query_db: AsyncSession):
@@ -226,6 +236,23 @@ class DictDataService:
     字典数据管理模块服务层
     """
 
+    EXPORT_COLUMNS = [
+        ExportColumn(SysDictData.dict_code, '字典编码'),
+        ExportColumn(SysDictData.dict_sort, '字典排序'),
+        ExportColumn(SysDictData.dict_label, '字典标签'),
+        ExportColumn(SysDictData.dict_value, '字典键值'),
+        ExportColumn(SysDictData.dict_type, '字典类型'),
+        ExportColumn(SysDictData.css_class, '样式属性'),
+        ExportColumn(SysDictData.list_class, '表格回显样式'),
+        ExportColumn(SysDictData.is_default, '是否默认', options={'Y': '是'}, default_label='否'),
+        ExportColumn(SysDictData.status, '状态', options={'0': '正常'}, default_label='停用'),
+        ExportColumn(SysDictData.create_by, '创建者'),
+        ExportColumn(SysDictData.create_time, '创建时间'),
+        ExportColumn(SysDictData.update_by, '更新者'),
+        ExportColumn(SysDictData.update_time, '更新时间'),
+        ExportColumn(SysDictData.remark, '备注'),
+    ]
+
     @classmethod
     async def get_dict_data_list_services(
         cls, query_db: AsyncSession, query_object: DictDataPageQueryModel, is_page: bool = False
@@ -264,32 +291,46 @@ class DictDataService:
         :param redis: redis对象
         :return:
         """
-        # 获取以sys_dict:开头的键列表
-        keys = await redis.keys(f'{RedisInitKeyConfig.SYS_DICT.key}:*')
-        # 删除匹配的键
-        if keys:
-            await redis.delete(*keys)
-        dict_type_all = await DictTypeDao.get_all_dict_type(query_db)
-        for dict_type_obj in [item for item in dict_type_all if item.status == '0']:
-            dict_type = dict_type_obj.dict_type
-            dict_data_list = await DictDataDao.query_dict_data_list(query_db, dict_type)
-            dict_data = [CamelCaseUtil.transform_result(row) for row in dict_data_list if row]
-            await redis.set(
+        # 通过键名索引删除以sys_dict:开头的键
+        await RedisKeyUtil.clear_namespace(redis, RedisInitKeyConfig.SYS_DICT.key)
+        # 一次查询取回所有字典类型的字典数据后在内存中分组，不再逐个字典类型查询
+        dict_data_mapping = {}
+        for dict_type, dict_data in await DictDataDao.query_all_dict_data_list(query_db):
+            dict_data_group = dict_data_mapping.setdefault(dict_type, [])
+            if dict_data:
+                dict_data_group.append(CamelCaseUtil.transform_result(dict_data))
+        for dict_type, dict_data in dict_data_mapping.items():
+            await RedisKeyUtil.set(
+                redis,
                 f'{RedisInitKeyConfig.SYS_DICT.key}:{dict_type}',
                 json.dumps(dict_data, ensure_ascii=False, default=str),
             )
+        await SysCacheService.publish_invalidate_services(redis, RedisInitKeyConfig.SYS_DICT.key)
 
     @classmethod
     async def query_dict_data_list_from_cache_services(cls, redis, dict_type: str):
         """
-        从缓存获取字典数据列表信息service
+        从缓存获取字典数据列表信息service，优先读取进程内缓存中已解析的字典数据
 
         :param redis: redis对象
         :param dict_type: 字典类型
         :return: 字典数据列表信息对象
         """
+        result = await SysCacheService.get_cache_value_services(
+            redis, f'{RedisInitKeyConfig.SYS_DICT.key}:{dict_type}', cls.__parse_dict_data_list
+        )
+
+        return result
+
+    @classmethod
+    def __parse_dict_data_list(cls, dict_data_list_result: Optional[str]):
+        """
+        工具方法：解析redis中缓存的字典数据列表
+
+        :param dict_data_list_result: redis中缓存的字典数据列表json字符串
+        :return: 字典数据列表信息对象
+        """
         result = []
-        dict_data_list_result = await redis.get(f'{RedisInitKeyConfig.SYS_DICT.key}:{dict_type}')
         if dict_data_list_result:
             result = json.loads(dict_data_list_result)
 
@@ -329,10 +370,14 @@ class DictDataService:
                 await DictDataDao.add_dict_data_dao(query_db, page_object)
                 await query_db.commit()
                 dict_data_list = await cls.query_dict_data_list_services(query_db, page_object.dict_type)
-                await request.app.state.redis.set(
+                await RedisKeyUtil.set(
+                    request.app.state.redis,
                     f'{RedisInitKeyConfig.SYS_DICT.key}:{page_object.dict_type}',
                     json.dumps(CamelCaseUtil.transform_result(dict_data_list), ensure_ascii=False, default=str),
                 )
+                await SysCacheService.publish_invalidate_services(
+                    request.app.state.redis, f'{RedisInitKeyConfig.SYS_DICT.key}:{page_object.dict_type}'
+                )
                 return CrudResponseModel(is_success=True, message='新增成功')
             except Exception as e:
                 await query_db.rollback()
@@ -360,10 +405,14 @@ class DictDataService:
                     await DictDataDao.edit_dict_data_dao(query_db, edit_data_type)
                     await query_db.commit()
                     dict_data_list = await cls.query_dict_data_list_services(query_db, page_object.dict_type)
-                    await request.app.state.redis.set(
+                    await RedisKeyUtil.set(
+                        request.app.state.redis,
                         f'{RedisInitKeyConfig.SYS_DICT.key}:{page_object.dict_type}',
                         json.dumps(CamelCaseUtil.transform_result(dict_data_list), ensure_ascii=False, default=str),
                     )
+                    await SysCacheService.publish_invalidate_services(
+                        request.app.state.redis, f'{RedisInitKeyConfig.SYS_DICT.key}:{page_object.dict_type}'
+                    )
                     return CrudResponseModel(is_success=True, message='更新成功')
                 except Exception as e:
                     await query_db.rollback()
@@ -394,10 +443,15 @@ class DictDataService:
                 await query_db.commit()
                 for dict_type in list(set(delete_dict_type_list)):
                     dict_data_list = await cls.query_dict_data_list_services(query_db, dict_type)
-                    await request.app.state.redis.set(
+                    await RedisKeyUtil.set(
+                        request.app.state.redis,
                         f'{RedisInitKeyConfig.SYS_DICT.key}:{dict_type}',
                         json.dumps(CamelCaseUtil.transform_result(dict_data_list), ensure_ascii=False, default=str),
                     )
+                await SysCacheService.publish_invalidate_services(
+                    request.app.state.redis,
+                    *[f'{RedisInitKeyConfig.SYS_DICT.key}:{dict_type}' for dict_type in set(delete_dict_type_list)],
+                )
                 return CrudResponseModel(is_success=True, message='删除成功')
             except Exception as e:
                 await query_db.rollback()
@@ -422,46 +476,21 @@ class DictDataService:
 
         return result
 
-    @staticmethod
-    async def export_dict_data_list_services(dict_data_list: List):
+    @classmethod
+    async def export_dict_data_list_services(
+        cls, request: Request, query_object: DictDataPageQueryModel, file_format: Literal['xlsx', 'csv'] = 'xlsx'
+    ):
         """
         导出字典数据信息service
 
-        :param dict_data_list: 字典数据信息列表
-        :return: 字典数据信息对应excel的二进制数据
-        """
-        # 创建一个映射字典，将英文键映射到中文键
-        mapping_dict = {
-            'dictCode': '字典编码',
-            'dictSort': '字典标签',
-            'dictLabel': '字典键值',
-            'dictValue': '字典排序',
-            'dictType': '字典类型',
-            'cssClass': '样式属性',
-            'listClass': '表格回显样式',
-            'isDefault': '是否默认',
-            'status': '状态',
-            'createBy': '创建者',
-            'createTime': '创建时间',
-            'updateBy': '更新者',
-            'updateTime': '更新时间',
-            'remark': '备注',
-        }
-
-        data = dict_data_list
-
-        for item in data:
-            if item.get('status') == '0':
-                item['status'] = '正常'
-            else:
-                item['status'] = '停用'
-            if item.get('isDefault') == 'Y':
-                item['isDefault'] = '是'
-            else:
-                item['isDefault'] = '否'
-        new_data = [
-            {mapping_dict.get(key): value for key, value in item.items() if mapping_dict.get(key)} for item in data
-        ]
-        binary_data = export_list2excel(new_data)
-
-        return binary_data
+        :param request: Request对象
+        :param query_object: 查询参数对象
+        :param file_format: 导出文件格式
+        :return: 字典数据信息对应导出文件的二进制数据流
+        """
+        return await ExportUtil.stream_export(
+            request.app.state.redis,
+            DictDataDao.get_dict_data_list_query(query_object),
+            cls.EXPORT_COLUMNS,
+            file_format,
+        )
@@ -1,59 +1,249 @@
-import json
+import asyncio
+import uuid
 from datetime import datetime
-
-import pandas as pd
-from fastapi import UploadFile, File
+from itertools import islice
+from fastapi import Request, UploadFile, File
+from openpyxl import load_workbook
 from sqlalchemy.ext.asyncio import AsyncSession
-
+from typing import Dict
+from config.database import AsyncSessionLocal
+from config.enums import RedisInitKeyConfig
+from config.env import AppConfig
 from exceptions.exception import ServiceException
 from module_admin.dao.import_dao import ImportDao
-from module_admin.entity.vo.import_vo import ImportModel
+from module_admin.entity.vo.common_vo import CrudResponseModel
+from module_admin.entity.vo.import_vo import ImportModel, ImportTaskModel
 from module_admin.entity.vo.user_vo import CurrentUserModel
 from module_admin.service.common_service import CommonService
 from module_gen.constants.gen_constants import GenConstants
 from utils.common_util import CamelCaseUtil
+from utils.log_util import logger
 
 
 class ImportService:
     """
     解析Excel和数据表的Columns
+
+    导入以后台任务执行：使用openpyxl只读模式按批次读取行数据，每批在一个事务中写入，
+    任务进度记录在redis哈希import_task:{任务编号}中，可通过任务编号查询进度及取消任务
     """
 
+    running_tasks: Dict[str, asyncio.Task] = {}
+
+    @classmethod
+    def get_import_task_key(cls, task_id: str):
+        """
+        获取导入任务进度对应的键名
+
+        :param task_id: 导入任务编号
+        :return: 导入任务进度键名
+        """
+        return f'{RedisInitKeyConfig.IMPORT_TASK.key}:{task_id}'
+
     @classmethod
     async def analysis_excel(cls, query_db: AsyncSession, table_name: str, file: UploadFile = File(...)):
         upload_result = await CommonService.upload_local(file)
         table_columns = await ImportDao.select_table_columns_by_name(query_db, table_name)
-        excel_columns = pd.read_excel(upload_result.result.file_name, sheet_name=0, engine="openpyxl").columns
+        excel_columns = await asyncio.to_thread(cls.__read_header_row, upload_result.result.file_name)
 
         edit_columns = [col for col in table_columns if col.column_name not in GenConstants.COLUMN_NAME_NOT_EDIT]
         result = {
-            "excel_columns": list(excel_columns),
+            "excel_columns": excel_columns,
             "table_columns": edit_columns,
             "filename": upload_result.result.file_name
         }
         return CamelCaseUtil.transform_result(result)
 
     @classmethod
-    async def import_data(cls, query_db: AsyncSession, import_model: ImportModel, current_user: CurrentUserModel):
-        field_list = [model.base_column for model in import_model.filed_info if model.selected]
-
-
-        df = pd.read_excel(import_model.file_name, sheet_name=0, dtype=str, engine="openpyxl")
-        df_dict = df.to_dict(orient="records")
-        print(df_dict)
-        value_list = []
-        for excel_item in df_dict:
-            value_item = []
-            for model in import_model.filed_info:
-                if model.selected: # 已勾选的才能添加
-                    if not model.excel_column and not model.default_value:
-                        raise ServiceException(message='勾选的字段，必须设置列或者添加默认值')
-                    if model.excel_column:
-                        value_item.append(excel_item[model.excel_column])
-                    else:
-                        value_item.append(model.default_value)
-            # 额外添加用户ID和部门ID
-            value_item.extend([current_user.user.user_id, current_user.user.dept_id, datetime.now(), datetime.now()])
-            value_list.append(value_item)
+    async def import_data(cls, request: Request, import_model: ImportModel, current_user: CurrentUserModel):
+        """
+        创建Excel导入后台任务service
+
+        :param request: Request对象
+        :param import_model: 导入参数对象
+        :param current_user: 当前用户对象
+        :return: 导入任务进度对象
+        """
+        for model in import_model.filed_info:
+            # 已勾选的才能添加
+            if model.selected and not model.excel_column and not model.default_value:
+                raise ServiceException(message='勾选的字段，必须设置列或者添加默认值')
+        redis = request.app.state.redis
+        task_id = uuid.uuid4().hex
+        import_task = ImportTaskModel(
+            taskId=task_id,
+            tableName=import_model.table_name,
+            status='pending',
+            processed=0,
+            createTime=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        )
+        await cls.__update_import_task(redis, task_id, import_task.model_dump(exclude_none=True))
+        task = asyncio.create_task(cls.__run_import_task(redis, task_id, import_model, current_user))
+        cls.running_tasks[task_id] = task
+        task.add_done_callback(lambda _: cls.running_tasks.pop(task_id, None))
+
+        return import_task
+
+    @classmethod
+    async def get_import_task_services(cls, request: Request, task_id: str):
+        """
+        获取导入任务进度service
+
+        :param request: Request对象
+        :param task_id: 导入任务编号
+        :return: 导入任务进度对象
+        """
+        task_info = await request.app.state.redis.hgetall(cls.get_import_task_key(task_id))
+        if not task_info:
+            raise ServiceException(message='导入任务不存在或已过期')
+        task_info.pop('cancelled', None)
+
+        return ImportTaskModel(
+            **CamelCaseUtil.transform_result({key: value if value != '' else None for key, value in task_info.items()})
+        )
+
+    @classmethod
+    async def cancel_import_task_services(cls, request: Request, task_id: str):
+        """
+        取消导入任务service，任务在写入下一批数据前检查取消标记，已提交的批次不会回滚
+
+        :param request: Request对象
+        :param task_id: 导入任务编号
+        :return: 取消导入任务校验结果
+        """
+        import_task = await cls.get_import_task_services(request, task_id)
+        if import_task.status not in ('pending', 'running'):
+            raise ServiceException(message='导入任务已结束，无法取消')
+        await request.app.state.redis.hset(cls.get_import_task_key(task_id), 'cancelled', '1')
+
+        return CrudResponseModel(is_success=True, message='已提交取消请求')
+
+    @classmethod
+    async def __run_import_task(
+        cls, redis, task_id: str, import_model: ImportModel, current_user: CurrentUserModel
+    ):
+        """
+        后台任务：分批读取Excel并写入数据库，同时更新任务进度
+
+        :param redis: redis对象
+        :param task_id: 导入任务编号
+        :param import_model: 导入参数对象
+        :param current_user: 当前用户对象
+        :return:
+        """
+        selected_fields = [model for model in import_model.filed_info if model.selected]
+        field_list = [model.base_column for model in selected_fields]
         field_list.extend(['create_by', 'dept_id', 'create_time', 'update_time'])
-        await ImportDao.import_data(query_db, import_model.table_name, field_list, value_list)
+        workbook = None
+        processed = 0
+        try:
+            workbook = await asyncio.to_thread(load_workbook, import_model.file_name, read_only=True, data_only=True)
+            worksheet = workbook.worksheets[0]
+            rows = worksheet.iter_rows(values_only=True)
+            header = [str(cell) if cell is not None else None for cell in next(rows, ())]
+            column_index_list = []
+            for model in selected_fields:
+                if model.excel_column and model.excel_column not in header:
+                    raise ServiceException(message=f'Excel中不存在列{model.excel_column}')
+                column_index_list.append(header.index(model.excel_column) if model.excel_column else None)
+            await cls.__update_import_task(
+                redis,
+                task_id,
+                dict(status='running', total=max(worksheet.max_row - 1, 0) if worksheet.max_row else ''),
+            )
+            async with AsyncSessionLocal() as session:
+                while True:
+                    chunk = await asyncio.to_thread(lambda: list(islice(rows, AppConfig.app_import_batch_size)))
+                    if not chunk:
+                        break
+                    if await redis.hget(cls.get_import_task_key(task_id), 'cancelled'):
+                        await cls.__finish_import_task(redis, task_id, 'cancelled', f'已取消，已导入{processed}行')
+                        return
+                    now = datetime.now()
+                    value_list = []
+                    for row in chunk:
+                        if all(cell is None for cell in row):
+                            continue
+                        value_item = [
+                            cls.__cell_to_str(row[index] if index < len(row) else None)
+                            if index is not None
+                            else model.default_value
+                            for model, index in zip(selected_fields, column_index_list)
+                        ]
+                        # 额外添加用户ID和部门ID
+                        value_item.extend([current_user.user.user_id, current_user.user.dept_id, now, now])
+                        value_list.append(value_item)
+                    if value_list:
+                        await ImportDao.import_data(session, import_model.table_name, field_list, value_list)
+                    processed += len(value_list)
+                    await cls.__update_import_task(redis, task_id, dict(processed=processed))
+            await cls.__finish_import_task(redis, task_id, 'success', f'导入成功，共导入{processed}行')
+        except Exception as e:
+            logger.exception(f'导入任务{task_id}执行失败，详细错误信息：{e}')
+            message = e.message if isinstance(e, ServiceException) else str(e)
+            await cls.__finish_import_task(redis, task_id, 'failed', f'导入失败，已导入{processed}行：{message}')
+        finally:
+            if workbook is not None:
+                workbook.close()
+
+    @classmethod
+    async def __update_import_task(cls, redis, task_id: str, mapping: dict):
+        """
+        工具方法：更新导入任务进度
+
+        :param redis: redis对象
+        :param task_id: 导入任务编号
+        :param mapping: 需要更新的进度字段
+        :return:
+        """
+        task_key = cls.get_import_task_key(task_id)
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.hset(task_key, mapping={key: '' if value is None else str(value) for key, value in mapping.items()})
+            pipe.expire(task_key, AppConfig.app_import_progress_expire_seconds)
+            await pipe.execute()
+
+    @classmethod
+    async def __finish_import_task(cls, redis, task_id: str, status: str, message: str):
+        """
+        工具方法：标记导入任务结束
+
+        :param redis: redis对象
+        :param task_id: 导入任务编号
+        :param status: 任务状态
+        :param message: 提示信息
+        :return:
+        """
+        await cls.__update_import_task(
+            redis,
+            task_id,
+            dict(status=status, message=message, finish_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
+        )
+
+    @classmethod
+    def __read_header_row(cls, file_name: str):
+        """
+        工具方法：以只读模式仅读取Excel第一个工作表的表头行
+
+        :param file_name: Excel文件路径
+        :return: 表头列表
+        """
+        workbook = load_workbook(file_name, read_only=True, data_only=True)
+        try:
+            header = next(workbook.worksheets[0].iter_rows(max_row=1, values_only=True), ())
+        finally:
+            workbook.close()
+
+        return [str(cell) for cell in header if cell is not None]
+
+    @classmethod
+    def __cell_to_str(cls, value):
+        """
+        工具方法：将单元格的值转换为字符串，与原pandas以dtype=str读取的结果保持一致
+
+        :param value: 单元格的值
+        :return: 字符串或None
+        """
+        if value is None:
+            return None
+
+        return str(value)
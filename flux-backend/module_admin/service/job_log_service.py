@@ -1,12 +1,11 @@
 from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Session
-from typing import List
+from typing import Literal
 from module_admin.dao.job_log_dao import JobLogDao
+from module_admin.entity.do.job_do import SysJobLog
 from module_admin.entity.vo.common_vo import CrudResponseModel
 from module_admin.entity.vo.job_vo import DeleteJobLogModel, JobLogModel, JobLogPageQueryModel
-from module_admin.service.dict_service import DictDataService
-from utils.common_util import export_list2excel
+from utils.export_util import ExportColumn, ExportUtil
 
 
 class JobLogService:
@@ -14,6 +13,21 @@ class JobLogService:
     定时任务日志管理模块服务层
     """
 
+    EXPORT_COLUMNS = [
+        ExportColumn(SysJobLog.job_log_id, '任务日志编码'),
+        ExportColumn(SysJobLog.job_name, '任务名称'),
+        ExportColumn(SysJobLog.job_group, '任务组名', dict_type='sys_job_group'),
+        ExportColumn(SysJobLog.job_executor, '任务执行器', dict_type='sys_job_executor'),
+        ExportColumn(SysJobLog.invoke_target, '调用目标字符串'),
+        ExportColumn(SysJobLog.job_args, '位置参数'),
+        ExportColumn(SysJobLog.job_kwargs, '关键字参数'),
+        ExportColumn(SysJobLog.job_trigger, '任务触发器'),
+        ExportColumn(SysJobLog.job_message, '日志信息'),
+        ExportColumn(SysJobLog.status, '执行状态', options={'0': '正常'}, default_label='暂停'),
+        ExportColumn(SysJobLog.exception_info, '异常信息'),
+        ExportColumn(SysJobLog.create_time, '创建时间'),
+    ]
+
     @classmethod
     async def get_job_log_list_services(
         cls, query_db: AsyncSession, query_object: JobLogPageQueryModel, is_page: bool = False
@@ -30,25 +44,6 @@ class JobLogService:
 
         return job_log_list_result
 
-    @classmethod
-    def add_job_log_services(cls, query_db: Session, page_object: JobLogModel):
-        """
-        新增定时任务日志信息service
-
-        :param query_db: orm对象
-        :param page_object: 新增定时任务日志对象
-        :return: 新增定时任务日志校验结果
-        """
-        try:
-            JobLogDao.add_job_log_dao(query_db, page_object)
-            query_db.commit()
-            result = dict(is_success=True, message='新增成功')
-        except Exception as e:
-            query_db.rollback()
-            result = dict(is_success=False, message=str(e))
-
-        return CrudResponseModel(**result)
-
     @classmethod
     async def delete_job_log_services(cls, query_db: AsyncSession, page_object: DeleteJobLogModel):
         """
@@ -90,57 +85,18 @@ class JobLogService:
 
         return CrudResponseModel(**result)
 
-    @staticmethod
-    async def export_job_log_list_services(request: Request, job_log_list: List):
+    @classmethod
+    async def export_job_log_list_services(
+        cls, request: Request, query_object: JobLogPageQueryModel, file_format: Literal['xlsx', 'csv'] = 'xlsx'
+    ):
         """
         导出定时任务日志信息service
 
         :param request: Request对象
-        :param job_log_list: 定时任务日志信息列表
-        :return: 定时任务日志信息对应excel的二进制数据
+        :param query_object: 查询参数对象
+        :param file_format: 导出文件格式
+        :return: 定时任务日志信息对应导出文件的二进制数据流
         """
-        # 创建一个映射字典，将英文键映射到中文键
-        mapping_dict = {
-            'jobLogId': '任务日志编码',
-            'jobName': '任务名称',
-            'jobGroup': '任务组名',
-            'jobExecutor': '任务执行器',
-            'invokeTarget': '调用目标字符串',
-            'jobArgs': '位置参数',
-            'jobKwargs': '关键字参数',
-            'jobTrigger': '任务触发器',
-            'jobMessage': '日志信息',
-            'status': '执行状态',
-            'exceptionInfo': '异常信息',
-            'createTime': '创建时间',
-        }
-
-        data = job_log_list
-        job_group_list = await DictDataService.query_dict_data_list_from_cache_services(
-            request.app.state.redis, dict_type='sys_job_group'
-        )
-        job_group_option = [dict(label=item.get('dictLabel'), value=item.get('dictValue')) for item in job_group_list]
-        job_group_option_dict = {item.get('value'): item for item in job_group_option}
-        job_executor_list = await DictDataService.query_dict_data_list_from_cache_services(
-            request.app.state.redis, dict_type='sys_job_executor'
+        return await ExportUtil.stream_export(
+            request.app.state.redis, JobLogDao.get_job_log_list_query(query_object), cls.EXPORT_COLUMNS, file_format
         )
-        job_executor_option = [
-            dict(label=item.get('dictLabel'), value=item.get('dictValue')) for item in job_executor_list
-        ]
-        job_executor_option_dict = {item.get('value'): item for item in job_executor_option}
-
-        for item in data:
-            if item.get('status') == '0':
-                item['status'] = '正常'
-            else:
-                item['status'] = '暂停'
-            if str(item.get('jobGroup')) in job_group_option_dict.keys():
-                item['jobGroup'] = job_group_option_dict.get(str(item.get('jobGroup'))).get('label')
-            if str(item.get('jobExecutor')) in job_executor_option_dict.keys():
-                item['jobExecutor'] = job_executor_option_dict.get(str(item.get('jobExecutor'))).get('label')
-        new_data = [
-            {mapping_dict.get(key): value for key, value in item.items() if mapping_dict.get(key)} for item in data
-        ]
-        binary_data = export_list2excel(new_data)
-
-        return binary_data
@@ -0,0 +1,115 @@
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional, Sequence, Tuple
+from config.get_scheduler import MyCronTrigger, SchedulerUtil
+from module_admin.dao.job_dao import JobDao
+from module_admin.entity.do.job_do import SysJob
+from module_admin.entity.vo.job_vo import JobCollisionModel, JobPlanModel, JobPlanQueryModel
+
+
+class JobPlanService:
+    """
+    定时任务触发计划分析模块服务层
+
+    大量任务使用相同的整点Cron表达式时会在同一秒集中触发，对数据库及CPU造成瞬时压力；
+    分析时先按(Cron表达式, 错峰延后秒数)对任务分组，每组只计算一次触发时间，再按秒汇总各组的任务数得到触发冲突，
+    计算量与不同触发计划的数量成正比，与任务数无关
+    """
+
+    MAX_HOURS = 24 * 7
+    MAX_FIRE_COUNT = 1000
+    MAX_JOB_NAMES = 20
+
+    @classmethod
+    async def get_job_plan_services(cls, query_db: AsyncSession, plan_query: JobPlanQueryModel):
+        """
+        获取在用定时任务的触发计划分析结果service
+
+        :param query_db: orm对象
+        :param plan_query: 触发计划分析查询参数对象
+        :return: 触发计划分析结果
+        """
+        job_list = await JobDao.get_job_list_for_scheduler(query_db)
+
+        return await asyncio.to_thread(cls.analyze_job_plan, job_list, plan_query)
+
+    @classmethod
+    def analyze_job_plan(
+        cls, job_list: Sequence[SysJob], plan_query: JobPlanQueryModel, start_time: Optional[datetime] = None
+    ):
+        """
+        计算任务列表在分析范围内的触发时间并汇总触发冲突
+
+        :param job_list: 任务列表
+        :param plan_query: 触发计划分析查询参数对象
+        :param start_time: 分析的开始时间，为None时从当前时间开始
+        :return: 触发计划分析结果
+        """
+        hours = min(max(plan_query.hours, 1), cls.MAX_HOURS)
+        fire_count = min(max(plan_query.fire_count, 1), cls.MAX_FIRE_COUNT)
+        schedule_jobs: Dict[Tuple[str, int], List[SysJob]] = defaultdict(list)
+        for job in job_list:
+            schedule_jobs[(job.cron_expression, SchedulerUtil.get_job_offset(job))].append(job)
+        fire_jobs: Dict[datetime, List[Tuple[str, int]]] = defaultdict(list)
+        invalid_jobs = []
+        total_fire_count = 0
+        for schedule, jobs in schedule_jobs.items():
+            try:
+                trigger = MyCronTrigger.from_crontab(schedule[0], offset=schedule[1])
+            except Exception:
+                invalid_jobs.extend(job.job_name for job in jobs)
+                continue
+            for fire_time in cls.__get_fire_times(trigger, start_time, hours, fire_count):
+                fire_jobs[fire_time].append(schedule)
+                total_fire_count += len(jobs)
+        collisions = []
+        peak_job_count = 0
+        for fire_time, schedules in fire_jobs.items():
+            job_count = sum(len(schedule_jobs[schedule]) for schedule in schedules)
+            peak_job_count = max(peak_job_count, job_count)
+            if job_count >= plan_query.min_job_count:
+                collisions.append((job_count, fire_time, schedules))
+        collisions.sort(key=lambda item: (-item[0], item[1]))
+
+        return JobPlanModel(
+            jobCount=len(job_list),
+            scheduleCount=len(schedule_jobs),
+            fireCount=total_fire_count,
+            peakJobCount=peak_job_count,
+            collisionCount=len(collisions),
+            collisions=[
+                JobCollisionModel(
+                    fireTime=fire_time,
+                    jobCount=job_count,
+                    jobNames=[
+                        job.job_name for schedule in schedules for job in schedule_jobs[schedule]
+                    ][: cls.MAX_JOB_NAMES],
+                )
+                for job_count, fire_time, schedules in collisions[: max(plan_query.top, 0)]
+            ],
+            invalidJobs=invalid_jobs,
+        )
+
+    @classmethod
+    def __get_fire_times(cls, trigger: MyCronTrigger, start_time: Optional[datetime], hours: int, fire_count: int):
+        """
+        工具方法：计算触发器在分析范围内的触发时间
+
+        :param trigger: 触发器
+        :param start_time: 分析的开始时间，为None时从当前时间开始
+        :param hours: 分析的时间范围（单位：小时）
+        :param fire_count: 最多计算的触发次数
+        :return: 触发时间生成器
+        """
+        now = start_time.astimezone(trigger.timezone) if start_time else datetime.now(trigger.timezone)
+        end_time = now + timedelta(hours=hours)
+        previous_fire_time = None
+        for _ in range(fire_count):
+            fire_time = trigger.get_next_fire_time(previous_fire_time, now)
+            if fire_time is None or fire_time > end_time:
+                return
+            yield fire_time
+            previous_fire_time = fire_time
+            now = fire_time + timedelta(microseconds=1)
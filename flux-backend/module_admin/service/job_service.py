@@ -1,15 +1,16 @@
 from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Literal
 from config.constant import CommonConstant, JobConstant
-from config.get_scheduler import SchedulerUtil
+from config.get_scheduler import SchedulerLeaderUtil, SchedulerUtil
 from exceptions.exception import ServiceException
 from module_admin.dao.job_dao import JobDao
+from module_admin.entity.do.job_do import SysJob
 from module_admin.entity.vo.common_vo import CrudResponseModel
 from module_admin.entity.vo.job_vo import DeleteJobModel, EditJobModel, JobModel, JobPageQueryModel
-from module_admin.service.dict_service import DictDataService
-from utils.common_util import CamelCaseUtil, export_list2excel
+from utils.common_util import CamelCaseUtil
 from utils.cron_util import CronUtil
+from utils.export_util import ExportColumn, ExportUtil
 from utils.string_util import StringUtil
 
 
@@ -18,6 +19,27 @@ class JobService:
     定时任务管理模块服务层
     """
 
+    EXPORT_COLUMNS = [
+        ExportColumn(SysJob.job_id, '任务编码'),
+        ExportColumn(SysJob.job_name, '任务名称'),
+        ExportColumn(SysJob.job_group, '任务组名', dict_type='sys_job_group'),
+        ExportColumn(SysJob.job_executor, '任务执行器', dict_type='sys_job_executor'),
+        ExportColumn(SysJob.invoke_target, '调用目标字符串'),
+        ExportColumn(SysJob.job_args, '位置参数'),
+        ExportColumn(SysJob.job_kwargs, '关键字参数'),
+        ExportColumn(SysJob.cron_expression, 'cron执行表达式'),
+        ExportColumn(
+            SysJob.misfire_policy, '计划执行错误策略', options={'1': '立即执行', '2': '执行一次'}, default_label='放弃执行'
+        ),
+        ExportColumn(SysJob.concurrent, '是否并发执行', options={'0': '允许'}, default_label='禁止'),
+        ExportColumn(SysJob.status, '状态', options={'0': '正常'}, default_label='暂停'),
+        ExportColumn(SysJob.create_by, '创建者'),
+        ExportColumn(SysJob.create_time, '创建时间'),
+        ExportColumn(SysJob.update_by, '更新者'),
+        ExportColumn(SysJob.update_time, '更新时间'),
+        ExportColumn(SysJob.remark, '备注'),
+    ]
+
     @classmethod
     async def get_job_list_services(
         cls, query_db: AsyncSession, query_object: JobPageQueryModel, is_page: bool = False
@@ -81,12 +103,13 @@ class JobService:
                 add_job = await JobDao.add_job_dao(query_db, page_object)
                 job_info = await cls.job_detail_services(query_db, add_job.job_id)
                 if job_info.status == '0':
-                    SchedulerUtil.add_scheduler_job(job_info=job_info)
+                    SchedulerUtil.check_scheduler_job(job_info=job_info)
                 await query_db.commit()
                 result = dict(is_success=True, message='新增成功')
             except Exception as e:
                 await query_db.rollback()
                 raise e
+            await SchedulerLeaderUtil.send_scheduler_command('sync', add_job.job_id)
 
         return CrudResponseModel(**result)
 
@@ -129,15 +152,15 @@ class JobService:
                     raise ServiceException(message=f'修改定时任务{page_object.job_name}失败，定时任务已存在')
             try:
                 await JobDao.edit_job_dao(query_db, edit_job)
-                SchedulerUtil.remove_scheduler_job(job_id=edit_job.get('job_id'))
                 if edit_job.get('status') == '0':
                     job_info = await cls.job_detail_services(query_db, edit_job.get('job_id'))
-                    SchedulerUtil.add_scheduler_job(job_info=job_info)
+                    SchedulerUtil.check_scheduler_job(job_info=job_info)
                 await query_db.commit()
-                return CrudResponseModel(is_success=True, message='更新成功')
             except Exception as e:
                 await query_db.rollback()
                 raise e
+            await SchedulerLeaderUtil.send_scheduler_command('sync', edit_job.get('job_id'))
+            return CrudResponseModel(is_success=True, message='更新成功')
         else:
             raise ServiceException(message='定时任务不存在')
 
@@ -150,10 +173,9 @@ class JobService:
         :param page_object: 定时任务对象
         :return: 执行一次定时任务结果
         """
-        SchedulerUtil.remove_scheduler_job(job_id=page_object.job_id)
         job_info = await cls.job_detail_services(query_db, page_object.job_id)
-        if job_info:
-            SchedulerUtil.execute_scheduler_job_once(job_info=job_info)
+        if job_info.job_id is not None:
+            await SchedulerLeaderUtil.send_scheduler_command('run_once', job_info.job_id)
             return CrudResponseModel(is_success=True, message='执行成功')
         else:
             raise ServiceException(message='定时任务不存在')
@@ -172,12 +194,13 @@ class JobService:
             try:
                 for job_id in job_id_list:
                     await JobDao.delete_job_dao(query_db, JobModel(jobId=job_id))
-                    SchedulerUtil.remove_scheduler_job(job_id=job_id)
                 await query_db.commit()
-                return CrudResponseModel(is_success=True, message='删除成功')
             except Exception as e:
                 await query_db.rollback()
                 raise e
+            for job_id in job_id_list:
+                await SchedulerLeaderUtil.send_scheduler_command('sync', job_id)
+            return CrudResponseModel(is_success=True, message='删除成功')
         else:
             raise ServiceException(message='传入定时任务id为空')
 
@@ -198,71 +221,18 @@ class JobService:
 
         return result
 
-    @staticmethod
-    async def export_job_list_services(request: Request, job_list: List):
+    @classmethod
+    async def export_job_list_services(
+        cls, request: Request, query_object: JobPageQueryModel, file_format: Literal['xlsx', 'csv'] = 'xlsx'
+    ):
         """
         导出定时任务信息service
 
         :param request: Request对象
-        :param job_list: 定时任务信息列表
-        :return: 定时任务信息对应excel的二进制数据
+        :param query_object: 查询参数对象
+        :param file_format: 导出文件格式
+        :return: 定时任务信息对应导出文件的二进制数据流
         """
-        # 创建一个映射字典，将英文键映射到中文键
-        mapping_dict = {
-            'jobId': '任务编码',
-            'jobName': '任务名称',
-            'jobGroup': '任务组名',
-            'jobExecutor': '任务执行器',
-            'invokeTarget': '调用目标字符串',
-            'jobArgs': '位置参数',
-            'jobKwargs': '关键字参数',
-            'cronExpression': 'cron执行表达式',
-            'misfirePolicy': '计划执行错误策略',
-            'concurrent': '是否并发执行',
-            'status': '状态',
-            'createBy': '创建者',
-            'createTime': '创建时间',
-            'updateBy': '更新者',
-            'updateTime': '更新时间',
-            'remark': '备注',
-        }
-
-        data = job_list
-        job_group_list = await DictDataService.query_dict_data_list_from_cache_services(
-            request.app.state.redis, dict_type='sys_job_group'
-        )
-        job_group_option = [dict(label=item.get('dictLabel'), value=item.get('dictValue')) for item in job_group_list]
-        job_group_option_dict = {item.get('value'): item for item in job_group_option}
-        job_executor_list = await DictDataService.query_dict_data_list_from_cache_services(
-            request.app.state.redis, dict_type='sys_job_executor'
+        return await ExportUtil.stream_export(
+            request.app.state.redis, JobDao.get_job_list_query(query_object), cls.EXPORT_COLUMNS, file_format
         )
-        job_executor_option = [
-            dict(label=item.get('dictLabel'), value=item.get('dictValue')) for item in job_executor_list
-        ]
-        job_executor_option_dict = {item.get('value'): item for item in job_executor_option}
-
-        for item in data:
-            if item.get('status') == '0':
-                item['status'] = '正常'
-            else:
-                item['status'] = '暂停'
-            if str(item.get('jobGroup')) in job_group_option_dict.keys():
-                item['jobGroup'] = job_group_option_dict.get(str(item.get('jobGroup'))).get('label')
-            if str(item.get('jobExecutor')) in job_executor_option_dict.keys():
-                item['jobExecutor'] = job_executor_option_dict.get(str(item.get('jobExecutor'))).get('label')
-            if item.get('misfirePolicy') == '1':
-                item['misfirePolicy'] = '立即执行'
-            elif item.get('misfirePolicy') == '2':
-                item['misfirePolicy'] = '执行一次'
-            else:
-                item['misfirePolicy'] = '放弃执行'
-            if item.get('concurrent') == '0':
-                item['concurrent'] = '允许'
-            else:
-                item['concurrent'] = '禁止'
-        new_data = [
-            {mapping_dict.get(key): value for key, value in item.items() if mapping_dict.get(key)} for item in data
-        ]
-        binary_data = export_list2excel(new_data)
-
-        return binary_data
@@ -1,8 +1,9 @@
 from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Literal
 from exceptions.exception import ServiceException
 from module_admin.dao.log_dao import LoginLogDao, OperationLogDao
+from module_admin.entity.do.log_do import SysLogininfor, SysOperLog
 from module_admin.entity.vo.common_vo import CrudResponseModel
 from module_admin.entity.vo.log_vo import (
     DeleteLoginLogModel,
@@ -13,8 +14,7 @@ from module_admin.entity.vo.log_vo import (
     OperLogPageQueryModel,
     UnlockUser,
 )
-from module_admin.service.dict_service import DictDataService
-from utils.common_util import export_list2excel
+from utils.export_util import ExportColumn, ExportUtil
 
 
 class OperationLogService:
@@ -22,6 +22,25 @@ class OperationLogService:
     操作日志管理模块服务层
     """
 
+    EXPORT_COLUMNS = [
+        ExportColumn(SysOperLog.oper_id, '日志编号'),
+        ExportColumn(SysOperLog.title, '系统模块'),
+        ExportColumn(SysOperLog.business_type, '操作类型', dict_type='sys_oper_type'),
+        ExportColumn(SysOperLog.method, '方法名称'),
+        ExportColumn(SysOperLog.request_method, '请求方式'),
+        ExportColumn(SysOperLog.oper_name, '操作人员'),
+        ExportColumn(SysOperLog.dept_name, '部门名称'),
+        ExportColumn(SysOperLog.oper_url, '请求URL'),
+        ExportColumn(SysOperLog.oper_ip, '操作地址'),
+        ExportColumn(SysOperLog.oper_location, '操作地点'),
+        ExportColumn(SysOperLog.oper_param, '请求参数'),
+        ExportColumn(SysOperLog.json_result, '返回参数'),
+        ExportColumn(SysOperLog.status, '操作状态', options={'0': '成功'}, default_label='失败'),
+        ExportColumn(SysOperLog.error_msg, '错误消息'),
+        ExportColumn(SysOperLog.oper_time, '操作日期'),
+        ExportColumn(SysOperLog.cost_time, '消耗时间（毫秒）'),
+    ]
+
     @classmethod
     async def get_operation_log_list_services(
         cls, query_db: AsyncSession, query_object: OperLogPageQueryModel, is_page: bool = False
@@ -94,57 +113,23 @@ class OperationLogService:
             raise e
 
     @classmethod
-    async def export_operation_log_list_services(cls, request: Request, operation_log_list: List):
+    async def export_operation_log_list_services(
+        cls, request: Request, query_object: OperLogPageQueryModel, file_format: Literal['xlsx', 'csv'] = 'xlsx'
+    ):
         """
         导出操作日志信息service
 
         :param request: Request对象
-        :param operation_log_list: 操作日志信息列表
-        :return: 操作日志信息对应excel的二进制数据
-        """
-        # 创建一个映射字典，将英文键映射到中文键
-        mapping_dict = {
-            'operId': '日志编号',
-            'title': '系统模块',
-            'businessType': '操作类型',
-            'method': '方法名称',
-            'requestMethod': '请求方式',
-            'operName': '操作人员',
-            'deptName': '部门名称',
-            'operUrl': '请求URL',
-            'operIp': '操作地址',
-            'operLocation': '操作地点',
-            'operParam': '请求参数',
-            'jsonResult': '返回参数',
-            'status': '操作状态',
-            'error_msg': '错误消息',
-            'operTime': '操作日期',
-            'costTime': '消耗时间（毫秒）',
-        }
-
-        data = operation_log_list
-        operation_type_list = await DictDataService.query_dict_data_list_from_cache_services(
-            request.app.state.redis, dict_type='sys_oper_type'
+        :param query_object: 查询参数对象
+        :param file_format: 导出文件格式
+        :return: 操作日志信息对应导出文件的二进制数据流
+        """
+        return await ExportUtil.stream_export(
+            request.app.state.redis,
+            OperationLogDao.get_operation_log_list_query(query_object),
+            cls.EXPORT_COLUMNS,
+            file_format,
         )
-        operation_type_option = [
-            dict(label=item.get('dictLabel'), value=item.get('dictValue')) for item in operation_type_list
-        ]
-        operation_type_option_dict = {item.get('value'): item for item in operation_type_option}
-
-        for item in data:
-            if item.get('status') == 0:
-                item['status'] = '成功'
-            else:
-                item['status'] = '失败'
-            if str(item.get('businessType')) in operation_type_option_dict.keys():
-                item['businessType'] = operation_type_option_dict.get(str(item.get('businessType'))).get('label')
-
-        new_data = [
-            {mapping_dict.get(key): value for key, value in item.items() if mapping_dict.get(key)} for item in data
-        ]
-        binary_data = export_list2excel(new_data)
-
-        return binary_data
 
 
 class LoginLogService:
@@ -152,6 +137,18 @@ class LoginLogService:
     登录日志管理模块服务层
     """
 
+    EXPORT_COLUMNS = [
+        ExportColumn(SysLogininfor.info_id, '访问编号'),
+        ExportColumn(SysLogininfor.user_name, '用户名称'),
+        ExportColumn(SysLogininfor.ipaddr, '登录地址'),
+        ExportColumn(SysLogininfor.login_location, '登录地点'),
+        ExportColumn(SysLogininfor.browser, '浏览器'),
+        ExportColumn(SysLogininfor.os, '操作系统'),
+        ExportColumn(SysLogininfor.status, '登录状态', options={'0': '成功'}, default_label='失败'),
+        ExportColumn(SysLogininfor.msg, '操作信息'),
+        ExportColumn(SysLogininfor.login_time, '登录日期'),
+    ]
+
     @classmethod
     async def get_login_log_list_services(
         cls, query_db: AsyncSession, query_object: LoginLogPageQueryModel, is_page: bool = False
@@ -232,37 +229,18 @@ class LoginLogService:
         else:
             raise ServiceException(message='该用户未锁定')
 
-    @staticmethod
-    async def export_login_log_list_services(login_log_list: List):
+    @classmethod
+    async def export_login_log_list_services(
+        cls, request: Request, query_object: LoginLogPageQueryModel, file_format: Literal['xlsx', 'csv'] = 'xlsx'
+    ):
         """
         导出登录日志信息service
 
-        :param login_log_list: 登录日志信息列表
-        :return: 登录日志信息对应excel的二进制数据
+        :param request: Request对象
+        :param query_object: 查询参数对象
+        :param file_format: 导出文件格式
+        :return: 登录日志信息对应导出文件的二进制数据流
         """
-        # 创建一个映射字典，将英文键映射到中文键
-        mapping_dict = {
-            'infoId': '访问编号',
-            'userName': '用户名称',
-            'ipaddr': '登录地址',
-            'loginLocation': '登录地点',
-            'browser': '浏览器',
-            'os': '操作系统',
-            'status': '登录状态',
-            'msg': '操作信息',
-            'loginTime': '登录日期',
-        }
-
-        data = login_log_list
-
-        for item in data:
-            if item.get('status') == '0':
-                item['status'] = '成功'
-            else:
-                item['status'] = '失败'
-        new_data = [
-            {mapping_dict.get(key): value for key, value in item.items() if mapping_dict.get(key)} for item in data
-        ]
-        binary_data = export_list2excel(new_data)
-
-        return binary_data
+        return await ExportUtil.stream_export(
+            request.app.state.redis, LoginLogDao.get_login_log_list_query(query_object), cls.EXPORT_COLUMNS, file_format
+        )
@@ -0,0 +1,194 @@
+import asyncio
+import json
+import time
+from typing import Literal, Optional, Union
+from config.database import AsyncSessionLocal
+from config.env import AppConfig
+from module_admin.dao.job_log_dao import JobLogDao
+from module_admin.dao.log_dao import LoginLogDao, OperationLogDao
+from module_admin.entity.vo.job_vo import JobLogModel
+from module_admin.entity.vo.log_vo import LogininforModel, OperLogModel
+from utils.ip_location_util import IpLocationUtil, UNKNOWN_IP_LOCATION
+from utils.log_util import logger
+
+
+class LogSinkService:
+    """
+    日志异步写入模块服务层
+
+    日志装饰器将日志放入有界队列后立即返回，后台任务按批次合并为多行INSERT写入操作日志表及登录日志表，
+    请求耗时不再包含日志落库时间；定时任务执行日志同样经由该队列写入定时任务日志表；队列已满时丢弃新日志并计入丢弃数量
+    """
+
+    redis = None
+    queue: Optional[asyncio.Queue] = None
+    consumer_task: Optional[asyncio.Task] = None
+    metrics = dict(
+        enqueued=0,
+        dropped=0,
+        written=0,
+        failed=0,
+        batches=0,
+        max_queue_size=0,
+        last_batch_size=0,
+        last_batch_cost_ms=0.0,
+    )
+
+    @classmethod
+    async def start_log_sink_services(cls, redis):
+        """
+        应用启动时启动日志异步写入任务service
+
+        :param redis: redis对象，用于查询ip归属区域缓存
+        :return:
+        """
+        cls.redis = redis
+        if cls.consumer_task is not None and not cls.consumer_task.done():
+            return
+        cls.queue = asyncio.Queue(maxsize=AppConfig.app_log_queue_max_size)
+        cls.consumer_task = asyncio.create_task(cls.__consume())
+
+    @classmethod
+    async def stop_log_sink_services(cls, timeout: float = 10):
+        """
+        应用关闭时写入队列中剩余的日志并停止日志异步写入任务service
+
+        :param timeout: 等待剩余日志写入的最长时间（单位：秒）
+        :return:
+        """
+        if cls.consumer_task is None:
+            return
+        try:
+            await asyncio.wait_for(cls.queue.put(None), timeout)
+            await asyncio.wait_for(cls.consumer_task, timeout)
+        except asyncio.TimeoutError:
+            cls.consumer_task.cancel()
+            logger.warning(f'日志异步写入任务关闭超时，剩余{cls.queue.qsize()}条日志未写入')
+        cls.consumer_task = None
+
+    @classmethod
+    def put_log_services(
+        cls,
+        log_type: Literal['login', 'operation', 'job'],
+        log_info: dict,
+        result: Union[bytes, dict, None],
+    ):
+        """
+        将日志放入异步写入队列service，仅可在事件循环所在线程中调用
+
+        :param log_type: 日志类型（login表示登录日志，operation表示为操作日志，job表示定时任务日志）
+        :param log_info: 日志信息字典，键名为驼峰形式
+        :param result: 原始响应体或响应结果字典，用于在后台解析操作状态及提示消息，定时任务日志传入None
+        :return: 是否成功放入队列
+        """
+        if cls.queue is None:
+            cls.metrics['dropped'] += 1
+            logger.warning('日志异步写入任务未启动，日志已丢弃')
+            return False
+        try:
+            cls.queue.put_nowait((log_type, log_info, result))
+        except asyncio.QueueFull:
+            cls.metrics['dropped'] += 1
+            logger.warning(f'日志异步写入队列已满，日志已丢弃，累计丢弃{cls.metrics["dropped"]}条')
+            return False
+        cls.metrics['enqueued'] += 1
+        cls.metrics['max_queue_size'] = max(cls.metrics['max_queue_size'], cls.queue.qsize())
+
+        return True
+
+    @classmethod
+    def get_log_sink_metrics_services(cls):
+        """
+        获取日志异步写入队列的运行指标service
+
+        :return: 运行指标字典
+        """
+        return dict(
+            **cls.metrics,
+            queue_size=cls.queue.qsize() if cls.queue is not None else 0,
+            queue_max_size=AppConfig.app_log_queue_max_size,
+            running=cls.consumer_task is not None and not cls.consumer_task.done(),
+        )
+
+    @classmethod
+    async def __consume(cls):
+        """
+        后台任务：从队列中批量取出日志并写入数据库
+
+        :return:
+        """
+        stopping = False
+        while not stopping:
+            record = await cls.queue.get()
+            if record is None:
+                break
+            batch = [record]
+            while len(batch) < AppConfig.app_log_batch_size and not cls.queue.empty():
+                record = cls.queue.get_nowait()
+                if record is None:
+                    stopping = True
+                    break
+                batch.append(record)
+            await cls.__write_batch(batch)
+
+    @classmethod
+    async def __write_batch(cls, batch: list):
+        """
+        将一批日志按类型合并为多行INSERT写入数据库
+
+        :param batch: 日志列表
+        :return:
+        """
+        start_time = time.perf_counter()
+        # 日志装饰器未能从缓存中获取到归属区域的操作日志在此处查询
+        unresolved_log_list = [
+            log_info
+            for log_type, log_info, _ in batch
+            if log_type == 'operation' and log_info.get('operLocation') is None
+        ]
+        if unresolved_log_list:
+            location_list = await asyncio.gather(
+                *[IpLocationUtil.get_ip_location(cls.redis, item.get('operIp')) for item in unresolved_log_list],
+                return_exceptions=True,
+            )
+            for log_info, location in zip(unresolved_log_list, location_list):
+                log_info['operLocation'] = location if isinstance(location, str) else UNKNOWN_IP_LOCATION
+        operation_log_list = []
+        login_log_list = []
+        job_log_list = []
+        for log_type, log_info, result in batch:
+            try:
+                if log_type == 'job':
+                    job_log_list.append(JobLogModel(**log_info).model_dump(exclude={'job_log_id'}))
+                    continue
+                result_dict = json.loads(str(result, 'utf-8')) if isinstance(result, (bytes, bytearray)) else result
+                status = 0 if result_dict.get('code') == 200 else 1
+                if log_type == 'login':
+                    log_info.update(status=str(status), msg=result_dict.get('msg'))
+                    login_log_list.append(LogininforModel(**log_info).model_dump(exclude={'info_id'}))
+                else:
+                    log_info.update(
+                        jsonResult=json.dumps(result_dict, ensure_ascii=False),
+                        status=status,
+                        errorMsg='' if status == 0 else result_dict.get('msg'),
+                    )
+                    operation_log_list.append(OperLogModel(**log_info).model_dump(exclude={'oper_id'}))
+            except Exception as e:
+                cls.metrics['failed'] += 1
+                logger.error(f'日志解析失败，详细错误信息：{e}')
+        try:
+            async with AsyncSessionLocal() as session:
+                if operation_log_list:
+                    await OperationLogDao.batch_add_operation_log_dao(session, operation_log_list)
+                if login_log_list:
+                    await LoginLogDao.batch_add_login_log_dao(session, login_log_list)
+                if job_log_list:
+                    await JobLogDao.batch_add_job_log_dao(session, job_log_list)
+                await session.commit()
+            cls.metrics['written'] += len(operation_log_list) + len(login_log_list) + len(job_log_list)
+        except Exception as e:
+            cls.metrics['failed'] += len(operation_log_list) + len(login_log_list) + len(job_log_list)
+            logger.error(f'日志批量写入失败，详细错误信息：{e}')
+        cls.metrics['batches'] += 1
+        cls.metrics['last_batch_size'] = len(batch)
+        cls.metrics['last_batch_cost_ms'] = round((time.perf_counter() - start_time) * 1000, 2)
@@ -13,16 +13,22 @@ from config.env import AppConfig, JwtConfig
 from config.get_db import get_db
 from exceptions.exception import LoginException, AuthException, ServiceException
 from module_admin.dao.login_dao import login_by_account
+from module_admin.dao.menu_dao import MenuDao
 from module_admin.dao.user_dao import UserDao
 from module_admin.entity.do.menu_do import SysMenu
 from module_admin.entity.vo.common_vo import CrudResponseModel
 from module_admin.entity.vo.login_vo import MenuTreeModel, MetaModel, RouterModel, SmsCode, UserLogin, UserRegister
 from module_admin.entity.vo.user_vo import AddUserModel, CurrentUserModel, ResetUserModel, TokenData, UserInfoModel
+from module_admin.service.config_service import ConfigService
+from module_admin.service.user_cache_service import UserCacheService
 from module_admin.service.user_service import UserService
 from utils.common_util import CamelCaseUtil
+from utils.ip_filter_util import IpFilterUtil
 from utils.log_util import logger
 from utils.message_util import message_service
 from utils.pwd_util import PwdUtil
+from utils.redis_key_util import RedisKeyUtil
+from utils.tree_util import TreeUtil
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='login')
 
@@ -97,7 +103,7 @@ class LoginService:
         if not user:
             logger.warning('用户不存在')
             raise LoginException(data='', message='用户不存在')
-        if not PwdUtil.verify_password(login_user.password, user[0].password):
+        if not await PwdUtil.async_verify_password(login_user.password, user[0].password):
             cache_password_error_count = await request.app.state.redis.get(
                 f'{RedisInitKeyConfig.PASSWORD_ERROR_COUNT.key}:{login_user.user_name}'
             )
@@ -132,14 +138,16 @@ class LoginService:
     @classmethod
     async def __check_login_ip(cls, request: Request):
         """
-        校验用户登录ip是否在黑名单内
+        校验用户登录ip是否在黑名单内，黑名单支持单个IP、CIDR网段、地址范围及通配，编译结果随参数配置变更自动更新
 
         :param request: Request对象
         :return: 校验结果
         """
-        black_ip_value = await request.app.state.redis.get(f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.login.blackIPList')
-        black_ip_list = black_ip_value.split(',') if black_ip_value else []
-        if request.headers.get('X-Forwarded-For') in black_ip_list:
+        black_ip_value = await ConfigService.query_config_list_from_cache_services(
+            request.app.state.redis, 'sys.login.blackIPList'
+        )
+        login_ip = request.headers.get('X-Forwarded-For') or (request.client.host if request.client else None)
+        if IpFilterUtil.get_filter(black_ip_value).match(login_ip):
             logger.warning('当前IP禁止登录')
             raise LoginException(data='', message='当前IP禁止登录')
         return True
@@ -209,104 +217,109 @@ class LoginService:
         except InvalidTokenError:
             logger.warning('用户token已失效，请重新登录')
             raise AuthException(data='', message='用户token已失效，请重新登录')
-        query_user = await UserDao.get_user_by_id(query_db, user_id=token_data.user_id)
-        if query_user.get('user_basic_info') is None:
-            logger.warning('用户token不合法')
-            raise AuthException(data='', message='用户token不合法')
         if AppConfig.app_same_time_login:
-            redis_token = await request.app.state.redis.get(f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}')
+            token_key = f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}'
         else:
             # 此方法可实现同一账号同一时间只能登录一次
-            redis_token = await request.app.state.redis.get(
-                f"{RedisInitKeyConfig.ACCESS_TOKEN.key}:{query_user.get('user_basic_info').user_id}"
+            token_key = f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{token_data.user_id}'
+        # 先读取权限版本号再读取用户信息，保证写入缓存的用户信息不会比其版本号更旧
+        redis_token, permission_epoch = await request.app.state.redis.mget(
+            token_key, UserCacheService.get_permission_epoch_key()
+        )
+        if token != redis_token:
+            logger.warning('用户token已失效，请重新登录')
+            raise AuthException(data='', message='用户token已失效，请重新登录')
+        current_user = await UserCacheService.get_current_user_cache_services(
+            request.app.state.redis, token_data.user_id, permission_epoch
+        )
+        if current_user is None:
+            query_user = await UserDao.get_user_by_id(query_db, user_id=token_data.user_id)
+            if query_user.get('user_basic_info') is None:
+                logger.warning('用户token不合法')
+                raise AuthException(data='', message='用户token不合法')
+            current_user = cls.__generate_current_user(query_user)
+            await UserCacheService.set_current_user_cache_services(
+                request.app.state.redis, token_data.user_id, permission_epoch, current_user
             )
-        if token == redis_token:
-            if AppConfig.app_same_time_login:
-                await request.app.state.redis.set(
-                    f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}',
-                    redis_token,
-                    ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
-                )
-            else:
-                await request.app.state.redis.set(
-                    f"{RedisInitKeyConfig.ACCESS_TOKEN.key}:{query_user.get('user_basic_info').user_id}",
-                    redis_token,
-                    ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
-                )
+        # 令牌键名已在登录时写入索引，此处仅续期令牌
+        await request.app.state.redis.expire(token_key, timedelta(minutes=JwtConfig.jwt_redis_expire_minutes))
 
-            role_id_list = [item.role_id for item in query_user.get('user_role_info')]
-            if 1 in role_id_list:
-                permissions = ['*:*:*']
-            else:
-                permissions = [row.perms for row in query_user.get('user_menu_info')]
-            post_ids = ','.join([str(row.post_id) for row in query_user.get('user_post_info')])
-            role_ids = ','.join([str(row.role_id) for row in query_user.get('user_role_info')])
-            roles = [row.role_key for row in query_user.get('user_role_info')]
-
-            current_user = CurrentUserModel(
-                permissions=permissions,
-                roles=roles,
-                user=UserInfoModel(
-                    **CamelCaseUtil.transform_result(query_user.get('user_basic_info')),
-                    postIds=post_ids,
-                    roleIds=role_ids,
-                    dept=CamelCaseUtil.transform_result(query_user.get('user_dept_info')),
-                    role=CamelCaseUtil.transform_result(query_user.get('user_role_info')),
-                ),
-            )
-            return current_user
+        return current_user
+
+    @classmethod
+    def __generate_current_user(cls, query_user: dict):
+        """
+        工具方法：根据用户信息查询结果生成当前用户信息对象
+
+        :param query_user: 用户信息查询结果
+        :return: 当前用户信息对象
+        """
+        role_id_list = [item.role_id for item in query_user.get('user_role_info')]
+        if 1 in role_id_list:
+            permissions = ['*:*:*']
         else:
-            logger.warning('用户token已失效，请重新登录')
-            raise AuthException(data='', message='用户token已失效，请重新登录')
+            permissions = [row.perms for row in query_user.get('user_menu_info')]
+        post_ids = ','.join([str(row.post_id) for row in query_user.get('user_post_info')])
+        role_ids = ','.join([str(row.role_id) for row in query_user.get('user_role_info')])
+        roles = [row.role_key for row in query_user.get('user_role_info')]
+
+        return CurrentUserModel(
+            permissions=permissions,
+            roles=roles,
+            user=UserInfoModel(
+                **CamelCaseUtil.transform_result(query_user.get('user_basic_info')),
+                postIds=post_ids,
+                roleIds=role_ids,
+                dept=CamelCaseUtil.transform_result(query_user.get('user_dept_info')),
+                role=CamelCaseUtil.transform_result(query_user.get('user_role_info')),
+            ),
+        )
 
     @classmethod
-    async def get_current_user_routers(cls, user_id: int, query_db: AsyncSession):
+    async def get_current_user_routers(cls, request: Request, current_user: CurrentUserModel, query_db: AsyncSession):
         """
-        根据用户id获取当前用户路由信息
+        获取当前用户路由信息，路由树按角色组合及权限版本号缓存，菜单或角色菜单变更后自动失效
 
-        :param user_id: 用户id
+        :param request: Request对象
+        :param current_user: 当前用户对象
         :param query_db: orm对象
         :return: 当前用户路由信息对象
         """
-        query_user = await UserDao.get_user_by_id(query_db, user_id=user_id)
-        user_router_menu = sorted(
-            [
-                row
-                for row in query_user.get('user_menu_info')
-                if row.menu_type in [MenuConstant.TYPE_DIR, MenuConstant.TYPE_MENU]
-            ],
-            key=lambda x: x.order_num,
-        )
-        menus = cls.__generate_menus(0, user_router_menu)
-        user_router = cls.__generate_user_router_menu(menus)
-        return [router.model_dump(exclude_unset=True, by_alias=True) for router in user_router]
+        redis = request.app.state.redis
+        role_id_list = [role.role_id for role in current_user.user.role if role is not None]
+        role_set_key = UserCacheService.get_role_set_key(role_id_list)
+        # 先读取权限版本号再查询菜单，保证写入缓存的路由树不会比其版本号更旧
+        permission_epoch = await redis.get(UserCacheService.get_permission_epoch_key())
+        user_router = await UserCacheService.get_router_cache_services(redis, role_set_key, permission_epoch)
+        if user_router is None:
+            user_router_menu = await MenuDao.get_menu_list_by_role_ids(
+                query_db, role_id_list, [MenuConstant.TYPE_DIR, MenuConstant.TYPE_MENU]
+            )
+            user_router = cls.generate_router_tree(user_router_menu)
+            await UserCacheService.set_router_cache_services(redis, role_set_key, permission_epoch, user_router)
+
+        return user_router
 
     @classmethod
-    def __generate_menus(cls, pid: int, permission_list: List[SysMenu]):
+    def generate_router_tree(cls, menu_list: List[SysMenu]):
         """
-        工具方法：根据菜单信息生成菜单信息树形嵌套数据
+        根据菜单列表信息生成路由信息树形嵌套数据，先按父级id建立索引，再自根节点生成路由，时间复杂度为O(n)
 
-        :param pid: 菜单id
-        :param permission_list: 菜单列表信息
-        :return: 菜单信息树形嵌套数据
+        :param menu_list: 按显示顺序排序的菜单列表信息
+        :return: 路由信息树形嵌套数据
         """
-        menu_list: List[MenuTreeModel] = []
-        for permission in permission_list:
-            if permission.parent_id == pid:
-                children = cls.__generate_menus(permission.menu_id, permission_list)
-                menu_list_data = MenuTreeModel(**CamelCaseUtil.transform_result(permission))
-                if children:
-                    menu_list_data.children = children
-                menu_list.append(menu_list_data)
+        children_mapping = TreeUtil.get_children_mapping(menu_list, lambda menu: menu.parent_id)
+        user_router = cls.__generate_user_router_menu(children_mapping.get(0, []), children_mapping)
 
-        return menu_list
+        return [router.model_dump(exclude_unset=True, by_alias=True) for router in user_router]
 
     @classmethod
-    def __generate_user_router_menu(cls, permission_list: List[MenuTreeModel]):
+    def __generate_user_router_menu(cls, permission_list: List[SysMenu], children_mapping: Dict[int, List[SysMenu]]):
         """
-        工具方法：根据菜单树信息生成路由信息树形嵌套数据
+        工具方法：根据菜单信息及父级索引生成路由信息树形嵌套数据
 
-        :param permission_list: 菜单树列表信息
+        :param permission_list: 同一父级下的菜单列表信息
+        :param children_mapping: 父级id与子菜单列表的映射
         :return: 路由信息树形嵌套数据
         """
         router_list: List[RouterModel] = []
@@ -324,11 +337,11 @@ class LoginService:
                     link=permission.path if RouterUtil.is_http(permission.path) else None,
                 ),
             )
-            c_menus = permission.children
+            c_menus = children_mapping.get(permission.menu_id)
             if c_menus and permission.menu_type == MenuConstant.TYPE_DIR:
                 router.always_show = True
                 router.redirect = 'noRedirect'
-                router.children = cls.__generate_user_router_menu(c_menus)
+                router.children = cls.__generate_user_router_menu(c_menus, children_mapping)
             elif RouterUtil.is_menu_frame(permission):
                 router.meta = None
                 children_list: List[RouterModel] = []
@@ -379,16 +392,16 @@ class LoginService:
         :return: 注册结果
         """
         register_enabled = (
-            True
-            if await request.app.state.redis.get(f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.registerUser')
+            await ConfigService.query_config_list_from_cache_services(
+                request.app.state.redis, 'sys.account.registerUser'
+            )
             == 'true'
-            else False
         )
         captcha_enabled = (
-            True
-            if await request.app.state.redis.get(f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.captchaEnabled')
+            await ConfigService.query_config_list_from_cache_services(
+                request.app.state.redis, 'sys.account.captchaEnabled'
+            )
             == 'true'
-            else False
         )
         if user_register.password == user_register.confirm_password:
             if register_enabled:
@@ -403,7 +416,7 @@ class LoginService:
                 add_user = AddUserModel(
                     userName=user_register.username,
                     nickName=user_register.username,
-                    password=PwdUtil.get_password_hash(user_register.password),
+                    password=await PwdUtil.async_get_password_hash(user_register.password),
                 )
                 result = await UserService.add_user_services(query_db, add_user)
                 return result
@@ -453,7 +466,7 @@ class LoginService:
             f'{RedisInitKeyConfig.SMS_CODE.key}:{forget_user.session_id}'
         )
         if forget_user.sms_code == redis_sms_result:
-            forget_user.password = PwdUtil.get_password_hash(forget_user.password)
+            forget_user.password = await PwdUtil.async_get_password_hash(forget_user.password)
             forget_user.user_id = (await UserDao.get_user_by_name(query_db, forget_user.user_name)).user_id
             edit_result = await UserService.reset_user_services(query_db, forget_user)
             result = edit_result.dict()
@@ -474,7 +487,11 @@ class LoginService:
         :param session_id: 会话编号
         :return: 退出登录结果
         """
-        await request.app.state.redis.delete(f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}')
+        await RedisKeyUtil.delete(
+            request.app.state.redis,
+            f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}',
+            f'{RedisInitKeyConfig.ONLINE_SESSION.key}:{session_id}',
+        )
         # await request.app.state.redis.delete(f'{current_user.user.user_id}_access_token')
         # await request.app.state.redis.delete(f'{current_user.user.user_id}_session_id')
 
@@ -487,7 +504,7 @@ class RouterUtil:
     """
 
     @classmethod
-    def get_router_name(cls, menu: MenuTreeModel):
+    def get_router_name(cls, menu: Union[MenuTreeModel, SysMenu]):
         """
         获取路由名称
 
@@ -514,7 +531,7 @@ class RouterUtil:
 
 
     @classmethod
-    def get_router_path(cls, menu: MenuTreeModel):
+    def get_router_path(cls, menu: Union[MenuTreeModel, SysMenu]):
         """
         获取路由地址
 
@@ -534,7 +551,7 @@ class RouterUtil:
         return router_path
 
     @classmethod
-    def get_component(cls, menu: MenuTreeModel):
+    def get_component(cls, menu: Union[MenuTreeModel, SysMenu]):
         """
         获取组件信息
 
@@ -551,7 +568,7 @@ class RouterUtil:
         return component
 
     @classmethod
-    def is_menu_frame(cls, menu: MenuTreeModel):
+    def is_menu_frame(cls, menu: Union[MenuTreeModel, SysMenu]):
         """
         判断是否为菜单内部跳转
 
@@ -563,7 +580,7 @@ class RouterUtil:
         )
 
     @classmethod
-    def is_inner_link(cls, menu: MenuTreeModel):
+    def is_inner_link(cls, menu: Union[MenuTreeModel, SysMenu]):
         """
         判断是否为内链组件
 
@@ -573,7 +590,7 @@ class RouterUtil:
         return menu.is_frame == MenuConstant.NO_FRAME and cls.is_http(menu.path)
 
     @classmethod
-    def is_parent_view(cls, menu: MenuTreeModel):
+    def is_parent_view(cls, menu: Union[MenuTreeModel, SysMenu]):
         """
         判断是否为parent_view组件
 
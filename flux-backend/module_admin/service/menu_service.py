@@ -10,6 +10,7 @@ from module_admin.entity.vo.role_vo import RoleMenuQueryModel
 from module_admin.entity.vo.user_vo import CurrentUserModel
 from utils.common_util import CamelCaseUtil
 from utils.string_util import StringUtil
+from utils.tree_util import TreeUtil
 
 
 class MenuService:
@@ -194,22 +195,5 @@ class MenuService:
         permission_list = [
             dict(id=item.menu_id, label=item.menu_name, parentId=item.parent_id) for item in permission_list
         ]
-        # 转成id为key的字典
-        mapping: dict = dict(zip([i['id'] for i in permission_list], permission_list))
 
-        # 树容器
-        container: list = []
-
-        for d in permission_list:
-            # 如果找不到父级项，则是根节点
-            parent: dict = mapping.get(d['parentId'])
-            if parent is None:
-                container.append(d)
-            else:
-                children: list = parent.get('children')
-                if not children:
-                    children = []
-                children.append(d)
-                parent.update({'children': children})
-
-        return container
+        return TreeUtil.list_to_tree(permission_list)
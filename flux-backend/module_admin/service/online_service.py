@@ -1,62 +1,159 @@
 import jwt
+from datetime import timedelta
 from fastapi import Request
+from typing import Dict, List, Optional
 from config.enums import RedisInitKeyConfig
 from config.env import JwtConfig
 from exceptions.exception import ServiceException
 from module_admin.entity.vo.common_vo import CrudResponseModel
-from module_admin.entity.vo.online_vo import DeleteOnlineModel, OnlineQueryModel
+from module_admin.entity.vo.online_vo import DeleteOnlineModel, OnlinePageQueryModel
 from utils.common_util import CamelCaseUtil
+from utils.log_util import logger
+from utils.page_util import PageUtil
+from utils.redis_key_util import RedisKeyUtil
 
 
 class OnlineService:
     """
     在线用户管理模块服务层
+
+    登录时除令牌外另行写入在线会话信息哈希online_session:{会话编号}，在线用户列表以令牌索引为准，
+    分批流水线读取会话信息哈希后在内存中筛选及分页，不再逐个读取并解析令牌
     """
 
+    FETCH_BATCH_SIZE = 1000
+    SESSION_FIELDS = ('user_name', 'dept_name', 'ipaddr', 'login_location', 'browser', 'os', 'login_time')
+
+    @classmethod
+    def get_online_session_key(cls, token_id: str):
+        """
+        获取在线会话信息对应的键名
+
+        :param token_id: 会话编号
+        :return: 在线会话信息键名
+        """
+        return f'{RedisInitKeyConfig.ONLINE_SESSION.key}:{token_id}'
+
+    @classmethod
+    async def set_online_session_services(
+        cls, redis, token_id: str, access_token: str, user_name: str, dept_name: Optional[str], login_info: dict
+    ):
+        """
+        登录成功后写入令牌及在线会话信息service
+
+        :param redis: redis对象
+        :param token_id: 会话编号，与令牌键名后缀一致
+        :param access_token: 令牌
+        :param user_name: 登录名称
+        :param dept_name: 所属部门
+        :param login_info: 登录信息
+        :return:
+        """
+        login_info = login_info or {}
+        session_info = dict(
+            user_name=user_name,
+            dept_name=dept_name,
+            ipaddr=login_info.get('ipaddr'),
+            login_location=login_info.get('loginLocation'),
+            browser=login_info.get('browser'),
+            os=login_info.get('os'),
+            login_time=login_info.get('loginTime'),
+        )
+        # 令牌在jwt过期后即失效，会话信息及令牌键名索引以二者中较长的时间过期，无需随令牌续期
+        session_expire = timedelta(minutes=max(JwtConfig.jwt_expire_minutes, JwtConfig.jwt_redis_expire_minutes))
+        await RedisKeyUtil.set(
+            redis,
+            f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{token_id}',
+            access_token,
+            ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
+            index_ex=session_expire,
+        )
+        session_key = cls.get_online_session_key(token_id)
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.delete(session_key)
+            pipe.hset(
+                session_key, mapping={key: '' if value is None else str(value) for key, value in session_info.items()}
+            )
+            pipe.expire(session_key, session_expire)
+            await pipe.execute()
+
     @classmethod
-    async def get_online_list_services(cls, request: Request, query_object: OnlineQueryModel):
+    async def get_online_list_services(cls, request: Request, query_object: OnlinePageQueryModel):
         """
         获取在线用户表信息service
 
         :param request: Request对象
         :param query_object: 查询参数对象
-        :return: 在线用户列表信息
+        :return: 在线用户分页列表信息
         """
-        access_token_keys = await request.app.state.redis.keys(f'{RedisInitKeyConfig.ACCESS_TOKEN.key}*')
-        if not access_token_keys:
-            access_token_keys = []
-        access_token_values_list = [await request.app.state.redis.get(key) for key in access_token_keys]
+        redis = request.app.state.redis
+        access_token_keys = await RedisKeyUtil.get_keys(redis, RedisInitKeyConfig.ACCESS_TOKEN.key)
         online_info_list = []
-        for item in access_token_values_list:
-            payload = jwt.decode(item, JwtConfig.jwt_secret_key, algorithms=[JwtConfig.jwt_algorithm])
-            online_dict = dict(
-                token_id=payload.get('session_id'),
-                user_name=payload.get('user_name'),
-                dept_name=payload.get('dept_name'),
-                ipaddr=payload.get('login_info').get('ipaddr'),
-                login_location=payload.get('login_info').get('loginLocation'),
-                browser=payload.get('login_info').get('browser'),
-                os=payload.get('login_info').get('os'),
-                login_time=payload.get('login_info').get('loginTime'),
+        legacy_token_keys = []
+        for index in range(0, len(access_token_keys), cls.FETCH_BATCH_SIZE):
+            batch_keys = access_token_keys[index : index + cls.FETCH_BATCH_SIZE]
+            async with redis.pipeline(transaction=False) as pipe:
+                for token_key in batch_keys:
+                    pipe.exists(token_key)
+                    pipe.hgetall(cls.get_online_session_key(token_key.split(':', 1)[1]))
+                results = await pipe.execute()
+            # 索引保留至会话信息过期，期间令牌可能已因长时间未访问而过期
+            for token_key, token_exists, session_info in zip(batch_keys, results[::2], results[1::2]):
+                if not token_exists:
+                    continue
+                if session_info:
+                    online_info_list.append(dict(token_id=token_key.split(':', 1)[1], **session_info))
+                else:
+                    legacy_token_keys.append(token_key)
+        if legacy_token_keys:
+            online_info_list.extend(await cls.__get_legacy_online_list(redis, legacy_token_keys))
+        online_info_list = [
+            item
+            for item in online_info_list
+            if (not query_object.user_name or item.get('user_name') == query_object.user_name)
+            and (not query_object.ipaddr or item.get('ipaddr') == query_object.ipaddr)
+        ]
+        online_info_list.sort(key=lambda item: (item.get('login_time') or '', item.get('token_id')), reverse=True)
+        online_page = PageUtil.get_page_obj(online_info_list, query_object.page_num, query_object.page_size)
+        online_page.rows = CamelCaseUtil.transform_result(
+            [{key: item.get(key) or None for key in ('token_id', *cls.SESSION_FIELDS)} for item in online_page.rows]
+        )
+
+        return online_page
+
+    @classmethod
+    async def __get_legacy_online_list(cls, redis, token_keys: List[str]) -> List[Dict]:
+        """
+        工具方法：解析未写入在线会话信息的令牌（升级前登录的会话）获取在线用户信息
+
+        :param redis: redis对象
+        :param token_keys: 令牌键名列表
+        :return: 在线用户信息列表
+        """
+        online_info_list = []
+        for token_key, token in zip(token_keys, await redis.mget(token_keys)):
+            if token is None:
+                continue
+            try:
+                payload = jwt.decode(token, JwtConfig.jwt_secret_key, algorithms=[JwtConfig.jwt_algorithm])
+            except jwt.InvalidTokenError as e:
+                logger.warning(f'在线用户令牌{token_key}解析失败，详细错误信息：{e}')
+                continue
+            login_info = payload.get('login_info') or {}
+            online_info_list.append(
+                dict(
+                    token_id=token_key.split(':', 1)[1],
+                    user_name=payload.get('user_name'),
+                    dept_name=payload.get('dept_name'),
+                    ipaddr=login_info.get('ipaddr'),
+                    login_location=login_info.get('loginLocation'),
+                    browser=login_info.get('browser'),
+                    os=login_info.get('os'),
+                    login_time=login_info.get('loginTime'),
+                )
             )
-            if query_object.user_name and not query_object.ipaddr:
-                if query_object.user_name == payload.get('user_name'):
-                    online_info_list = [online_dict]
-                    break
-            elif not query_object.user_name and query_object.ipaddr:
-                if query_object.ipaddr == payload.get('login_info').get('ipaddr'):
-                    online_info_list = [online_dict]
-                    break
-            elif query_object.user_name and query_object.ipaddr:
-                if query_object.user_name == payload.get('user_name') and query_object.ipaddr == payload.get(
-                    'login_info'
-                ).get('ipaddr'):
-                    online_info_list = [online_dict]
-                    break
-            else:
-                online_info_list.append(online_dict)
-
-        return CamelCaseUtil.transform_result(online_info_list)
+
+        return online_info_list
 
     @classmethod
     async def delete_online_services(cls, request: Request, page_object: DeleteOnlineModel):
@@ -69,8 +166,11 @@ class OnlineService:
         """
         if page_object.token_ids:
             token_id_list = page_object.token_ids.split(',')
-            for token_id in token_id_list:
-                await request.app.state.redis.delete(f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{token_id}')
+            await RedisKeyUtil.delete(
+                request.app.state.redis,
+                *[f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{token_id}' for token_id in token_id_list],
+                *[cls.get_online_session_key(token_id) for token_id in token_id_list],
+            )
             return CrudResponseModel(is_success=True, message='强退成功')
         else:
             raise ServiceException(message='传入session_id为空')
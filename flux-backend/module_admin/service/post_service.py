@@ -1,11 +1,14 @@
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Literal
 from config.constant import CommonConstant
 from exceptions.exception import ServiceException
 from module_admin.dao.post_dao import PostDao
+from module_admin.entity.do.post_do import SysPost
 from module_admin.entity.vo.common_vo import CrudResponseModel
 from module_admin.entity.vo.post_vo import DeletePostModel, PostModel, PostPageQueryModel
-from utils.common_util import CamelCaseUtil, export_list2excel
+from utils.common_util import CamelCaseUtil
+from utils.export_util import ExportColumn, ExportUtil
 
 
 class PostService:
@@ -13,6 +16,19 @@ class PostService:
     岗位管理模块服务层
     """
 
+    EXPORT_COLUMNS = [
+        ExportColumn(SysPost.post_id, '岗位编号'),
+        ExportColumn(SysPost.post_code, '岗位编码'),
+        ExportColumn(SysPost.post_name, '岗位名称'),
+        ExportColumn(SysPost.post_sort, '显示顺序'),
+        ExportColumn(SysPost.status, '状态', options={'0': '正常'}, default_label='停用'),
+        ExportColumn(SysPost.create_by, '创建者'),
+        ExportColumn(SysPost.create_time, '创建时间'),
+        ExportColumn(SysPost.update_by, '更新者'),
+        ExportColumn(SysPost.update_time, '更新时间'),
+        ExportColumn(SysPost.remark, '备注'),
+    ]
+
     @classmethod
     async def get_post_list_services(
         cls, query_db: AsyncSession, query_object: PostPageQueryModel, is_page: bool = False
@@ -150,38 +166,18 @@ class PostService:
 
         return result
 
-    @staticmethod
-    async def export_post_list_services(post_list: List):
+    @classmethod
+    async def export_post_list_services(
+        cls, request: Request, query_object: PostPageQueryModel, file_format: Literal['xlsx', 'csv'] = 'xlsx'
+    ):
         """
         导出岗位信息service
 
-        :param post_list: 岗位信息列表
-        :return: 岗位信息对应excel的二进制数据
-        """
-        # 创建一个映射字典，将英文键映射到中文键
-        mapping_dict = {
-            'postId': '岗位编号',
-            'postCode': '岗位编码',
-            'postName': '岗位名称',
-            'postSort': '显示顺序',
-            'status': '状态',
-            'createBy': '创建者',
-            'createTime': '创建时间',
-            'updateBy': '更新者',
-            'updateTime': '更新时间',
-            'remark': '备注',
-        }
-
-        data = post_list
-
-        for item in data:
-            if item.get('status') == '0':
-                item['status'] = '正常'
-            else:
-                item['status'] = '停用'
-        new_data = [
-            {mapping_dict.get(key): value for key, value in item.items() if mapping_dict.get(key)} for item in data
-        ]
-        binary_data = export_list2excel(new_data)
-
-        return binary_data
+        :param request: Request对象
+        :param query_object: 查询参数对象
+        :param file_format: 导出文件格式
+        :return: 岗位信息对应导出文件的二进制数据流
+        """
+        return await ExportUtil.stream_export(
+            request.app.state.redis, PostDao.get_post_list_query(query_object), cls.EXPORT_COLUMNS, file_format
+        )
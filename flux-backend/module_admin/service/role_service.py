@@ -1,5 +1,7 @@
+from fastapi import Request
+from sqlalchemy import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Literal
 from config.constant import CommonConstant
 from exceptions.exception import ServiceException
 from module_admin.entity.vo.common_vo import CrudResponseModel
@@ -14,8 +16,10 @@ from module_admin.entity.vo.role_vo import (
 )
 from module_admin.entity.vo.user_vo import UserInfoModel, UserRolePageQueryModel, CurrentUserModel
 from module_admin.dao.role_dao import RoleDao
+from module_admin.entity.do.role_do import SysRole
 from module_admin.dao.user_dao import UserDao
-from utils.common_util import CamelCaseUtil, export_list2excel
+from utils.common_util import CamelCaseUtil
+from utils.export_util import ExportColumn, ExportUtil
 from utils.page_util import PageResponseModel
 
 
@@ -24,6 +28,19 @@ class RoleService:
     角色管理模块服务层
     """
 
+    EXPORT_COLUMNS = [
+        ExportColumn(SysRole.role_id, '角色编号'),
+        ExportColumn(SysRole.role_name, '角色名称'),
+        ExportColumn(SysRole.role_key, '权限字符'),
+        ExportColumn(SysRole.role_sort, '显示顺序'),
+        ExportColumn(SysRole.status, '状态', options={'0': '正常'}, default_label='停用'),
+        ExportColumn(SysRole.create_by, '创建者'),
+        ExportColumn(SysRole.create_time, '创建时间'),
+        ExportColumn(SysRole.update_by, '更新者'),
+        ExportColumn(SysRole.update_time, '更新时间'),
+        ExportColumn(SysRole.remark, '备注'),
+    ]
+
     @classmethod
     async def get_role_select_option_services(cls, query_db: AsyncSession):
         """
@@ -54,7 +71,7 @@ class RoleService:
 
     @classmethod
     async def get_role_list_services(
-        cls, query_db: AsyncSession, query_object: RolePageQueryModel, data_scope_sql: str, is_page: bool = False
+        cls, query_db: AsyncSession, query_object: RolePageQueryModel, data_scope_sql: ColumnElement, is_page: bool = False
     ):
         """
         获取角色列表信息service
@@ -83,7 +100,7 @@ class RoleService:
             return CrudResponseModel(is_success=True, message='校验通过')
 
     @classmethod
-    async def check_role_data_scope_services(cls, query_db: AsyncSession, role_ids: str, data_scope_sql: str):
+    async def check_role_data_scope_services(cls, query_db: AsyncSession, role_ids: str, data_scope_sql: ColumnElement):
         """
         校验角色是否有数据权限service
 
@@ -273,45 +290,33 @@ class RoleService:
 
         return result
 
-    @staticmethod
-    async def export_role_list_services(role_list: List):
+    @classmethod
+    async def export_role_list_services(
+        cls,
+        request: Request,
+        query_object: RolePageQueryModel,
+        data_scope_sql: ColumnElement,
+        file_format: Literal['xlsx', 'csv'] = 'xlsx',
+    ):
         """
         导出角色列表信息service
 
-        :param role_list: 角色信息列表
-        :return: 角色列表信息对象
+        :param request: Request对象
+        :param query_object: 查询参数对象
+        :param data_scope_sql: 数据权限对应的查询sql语句
+        :param file_format: 导出文件格式
+        :return: 角色列表信息对应导出文件的二进制数据流
         """
-        # 创建一个映射字典，将英文键映射到中文键
-        mapping_dict = {
-            'roleId': '角色编号',
-            'roleName': '角色名称',
-            'roleKey': '权限字符',
-            'roleSort': '显示顺序',
-            'status': '状态',
-            'createBy': '创建者',
-            'createTime': '创建时间',
-            'updateBy': '更新者',
-            'updateTime': '更新时间',
-            'remark': '备注',
-        }
-
-        data = role_list
-
-        for item in data:
-            if item.get('status') == '0':
-                item['status'] = '正常'
-            else:
-                item['status'] = '停用'
-        new_data = [
-            {mapping_dict.get(key): value for key, value in item.items() if mapping_dict.get(key)} for item in data
-        ]
-        binary_data = export_list2excel(new_data)
-
-        return binary_data
+        return await ExportUtil.stream_export(
+            request.app.state.redis,
+            RoleDao.get_role_list_query(query_object, data_scope_sql),
+            cls.EXPORT_COLUMNS,
+            file_format,
+        )
 
     @classmethod
     async def get_role_user_allocated_list_services(
-        cls, query_db: AsyncSession, page_object: UserRolePageQueryModel, data_scope_sql: str, is_page: bool = False
+        cls, query_db: AsyncSession, page_object: UserRolePageQueryModel, data_scope_sql: ColumnElement, is_page: bool = False
     ):
         """
         根据角色id获取已分配用户列表
@@ -336,7 +341,7 @@ class RoleService:
 
     @classmethod
     async def get_role_user_unallocated_list_services(
-        cls, query_db: AsyncSession, page_object: UserRolePageQueryModel, data_scope_sql: str, is_page: bool = False
+        cls, query_db: AsyncSession, page_object: UserRolePageQueryModel, data_scope_sql: ColumnElement, is_page: bool = False
     ):
         """
         根据角色id获取未分配用户列表
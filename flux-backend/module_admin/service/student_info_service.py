@@ -1,8 +1,11 @@
 # -*- coding:utf-8 -*-
 
-from typing import List
+from fastapi import Request
+from typing import AsyncIterator, List, Literal
+from sqlalchemy import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
-from utils.common_util import CamelCaseUtil, export_list2excel
+from utils.common_util import CamelCaseUtil, SnakeCaseUtil
+from utils.export_util import ExportColumn, ExportUtil
 from module_admin.entity.vo.sys_table_vo import SysTablePageModel
 from module_admin.service.sys_table_service import SysTableService
 from utils.page_util import PageResponseModel
@@ -17,7 +20,7 @@ class StudentInfoService:
     """
 
     @classmethod
-    async def get_student_info_list(cls, query_db: AsyncSession, query_object: StudentInfoPageModel, data_scope_sql: str) -> [list | PageResponseModel]:
+    async def get_student_info_list(cls, query_db: AsyncSession, query_object: StudentInfoPageModel, data_scope_sql: ColumnElement) -> [list | PageResponseModel]:
         student_info_list = await StudentInfoDao.get_student_info_list(query_db, query_object, data_scope_sql, is_page=True)
         return student_info_list
 
@@ -48,16 +51,13 @@ class StudentInfoService:
 
 
     @classmethod
-    async def export_student_info_list(cls, query_db: AsyncSession, query_object: StudentInfoPageModel, data_scope_sql) -> bytes:
-        student_info_list = await StudentInfoDao.get_student_info_list(query_db, query_object, data_scope_sql, is_page=False)
+    async def export_student_info_list(cls, request: Request, query_db: AsyncSession, query_object: StudentInfoPageModel, data_scope_sql, file_format: Literal['xlsx', 'csv'] = 'xlsx') -> AsyncIterator[bytes]:
         filed_list = await SysTableService.get_sys_table_list(query_db, SysTablePageModel(tableName='student_info'), is_page=False)
         filtered_filed = sorted(filter(lambda x: x["show"] == '1', filed_list), key=lambda x: x["sequence"])
-        new_data = []
-        for item in student_info_list:
-            mapping_dict = {}
-            for fild in filtered_filed:
-                if fild["prop"] in item:
-                    mapping_dict[fild["label"]] = item[fild["prop"]]
-            new_data.append(mapping_dict)
-        binary_data = export_list2excel(new_data)
-        return binary_data
\ No newline at end of file
+        export_columns = [
+            ExportColumn(getattr(StudentInfo, SnakeCaseUtil.camel_to_snake(fild["prop"])), fild["label"])
+            for fild in filtered_filed
+            if hasattr(StudentInfo, SnakeCaseUtil.camel_to_snake(fild["prop"]))
+        ]
+        query = StudentInfoDao.get_student_info_list_query(query_object, data_scope_sql)
+        return await ExportUtil.stream_export(request.app.state.redis, query, export_columns, file_format)
\ No newline at end of file
@@ -0,0 +1,151 @@
+import asyncio
+import json
+from typing import Any, Callable, Optional
+from config.enums import RedisInitKeyConfig
+from config.env import AppConfig
+from module_admin.service.user_cache_service import UserCacheService
+from utils.cache_util import LocalCache
+from utils.count_cache_util import CountCacheUtil
+from utils.schema_catalog_util import SchemaCatalogUtil
+from utils.log_util import logger
+
+
+class SysCacheService:
+    """
+    字典及参数配置进程内缓存模块服务层
+
+    在redis缓存之前增加进程内一级缓存，字典数据及参数配置的读取优先命中进程内缓存，不再每次访问redis并解析json；
+    字典或参数配置变更后通过redis发布订阅频道广播失效消息，各工作进程收到后删除对应的进程内缓存，
+    进程内缓存的过期时间用于兜底订阅连接中断期间丢失的消息；数据库表结构元数据、分页总记录数及单个用户信息缓存的失效消息同样经由该频道广播
+    """
+
+    CHANNEL = 'sys_cache_invalidate'
+    NAMESPACES = (RedisInitKeyConfig.SYS_DICT.key, RedisInitKeyConfig.SYS_CONFIG.key)
+    RECONNECT_INTERVAL = 5
+
+    local_cache = LocalCache(max_size=4096, ttl=AppConfig.app_sys_local_cache_expire_seconds)
+    # 每次失效时递增，读取redis前后版本号不一致时不写入进程内缓存，避免读取期间到达的失效消息被覆盖
+    generation = 0
+    subscriber_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def get_cache_value_services(
+        cls, redis, cache_key: str, parser: Optional[Callable[[Optional[str]], Any]] = None
+    ):
+        """
+        获取缓存值service，优先读取进程内缓存，未命中时读取redis并写入进程内缓存
+
+        :param redis: redis对象
+        :param cache_key: redis缓存键名
+        :param parser: redis缓存值的解析方法，解析结果写入进程内缓存，为None时缓存原值
+        :return: 缓存值或其解析结果
+        """
+        cached = cls.local_cache.get(cache_key)
+        if cached is not None:
+            return cached[0]
+        generation = cls.generation
+        value = await redis.get(cache_key)
+        if parser is not None:
+            value = parser(value)
+        if generation == cls.generation:
+            cls.local_cache.set(cache_key, (value,))
+
+        return value
+
+    @classmethod
+    async def publish_invalidate_services(cls, redis, *cache_keys: str):
+        """
+        删除当前进程的进程内缓存并向其他工作进程广播失效消息service
+
+        :param redis: redis对象
+        :param cache_keys: 失效的redis缓存键名，传入命名空间（如sys_dict）时使该命名空间下所有缓存失效，
+                           传入schema_catalog时使数据库表结构元数据缓存失效，传入count_cache:表名时递增该表的写入版本号，
+                           传入user_info:用户id时删除该用户的进程内用户信息缓存
+        :return:
+        """
+        if not cache_keys:
+            return
+        cls.__invalidate(list(cache_keys))
+        try:
+            await redis.publish(cls.CHANNEL, json.dumps(list(cache_keys), ensure_ascii=False))
+        except Exception as e:
+            logger.error(f'进程内缓存失效消息发布失败，详细错误信息：{e}')
+
+    @classmethod
+    async def start_cache_subscriber_services(cls, redis):
+        """
+        应用启动时启动缓存失效消息订阅任务service
+
+        :param redis: redis对象
+        :return:
+        """
+        if cls.subscriber_task is not None and not cls.subscriber_task.done():
+            return
+        cls.subscriber_task = asyncio.create_task(cls.__subscribe(redis))
+        CountCacheUtil.set_invalidate_publisher(lambda *cache_keys: cls.publish_invalidate_services(redis, *cache_keys))
+
+    @classmethod
+    async def stop_cache_subscriber_services(cls):
+        """
+        应用关闭时停止缓存失效消息订阅任务service
+
+        :return:
+        """
+        CountCacheUtil.set_invalidate_publisher(None)
+        if cls.subscriber_task is None:
+            return
+        cls.subscriber_task.cancel()
+        try:
+            await cls.subscriber_task
+        except asyncio.CancelledError:
+            pass
+        cls.subscriber_task = None
+
+    @classmethod
+    async def __subscribe(cls, redis):
+        """
+        后台任务：订阅缓存失效频道并删除对应的进程内缓存，连接中断后自动重新订阅
+
+        :param redis: redis对象
+        :return:
+        """
+        while True:
+            pubsub = redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(cls.CHANNEL)
+                # 订阅建立之前的失效消息无法收到，重新订阅后清空进程内缓存
+                cls.__invalidate([*cls.NAMESPACES, SchemaCatalogUtil.CACHE_KEY, CountCacheUtil.CACHE_KEY])
+                async for message in pubsub.listen():
+                    try:
+                        cls.__invalidate(json.loads(message.get('data')))
+                    except (TypeError, ValueError) as e:
+                        logger.warning(f'进程内缓存失效消息解析失败，详细错误信息：{e}')
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f'进程内缓存失效消息订阅中断，{cls.RECONNECT_INTERVAL}秒后重新订阅，详细错误信息：{e}')
+                cls.__invalidate([*cls.NAMESPACES, SchemaCatalogUtil.CACHE_KEY, CountCacheUtil.CACHE_KEY])
+                await asyncio.sleep(cls.RECONNECT_INTERVAL)
+            finally:
+                await pubsub.aclose()
+
+    @classmethod
+    def __invalidate(cls, cache_keys: list):
+        """
+        工具方法：删除进程内缓存
+
+        :param cache_keys: 失效的redis缓存键名或命名空间列表
+        :return:
+        """
+        if SchemaCatalogUtil.CACHE_KEY in cache_keys:
+            SchemaCatalogUtil.invalidate()
+        for cache_key in cache_keys:
+            CountCacheUtil.invalidate(cache_key)
+            if cache_key.startswith(f'{RedisInitKeyConfig.USER_INFO.key}:'):
+                UserCacheService.evict_local_user_cache(cache_key)
+        cls.generation += 1
+        if any(cache_key in cls.NAMESPACES for cache_key in cache_keys):
+            cls.local_cache.clear()
+            return
+        for cache_key in cache_keys:
+            cls.local_cache.delete(cache_key)
@@ -1,6 +1,7 @@
 # -*- coding:utf-8 -*-
 
 from typing import List
+from sqlalchemy import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 from utils.common_util import CamelCaseUtil, export_list2excel
 from utils.page_util import PageResponseModel
@@ -15,7 +16,7 @@ class SysFormService:
     """
 
     @classmethod
-    async def get_sys_form_list(cls, query_db: AsyncSession, query_object: SysFormPageModel, data_scope_sql: str) -> [list | PageResponseModel]:
+    async def get_sys_form_list(cls, query_db: AsyncSession, query_object: SysFormPageModel, data_scope_sql: ColumnElement) -> [list | PageResponseModel]:
         sys_form_list = await SysFormDao.get_sys_form_list(query_db, query_object, data_scope_sql, is_page=True)
         return sys_form_list
 
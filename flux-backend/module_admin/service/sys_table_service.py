@@ -45,10 +45,14 @@ class SysTableService:
     async def import_sys_table(cls, query_db: AsyncSession, tables: [str]):
 
         tables = await SysTableDao.select_db_table_list_by_names(query_db, tables)
+        # 一次查询全部表的列信息
+        table_columns = await GenTableColumnDao.select_db_table_columns_by_names(
+            query_db, [table.table_name for table in tables]
+        )
         for table in tables:
 
             # 查询表列信息
-            columns = await GenTableColumnDao.select_db_table_columns_by_name(query_db, table.table_name)
+            columns = table_columns.get(table.table_name, [])
             # 添加列信息
             for i, column in enumerate(columns):
                 sys_table = SysTableModel()
@@ -0,0 +1,194 @@
+import json
+from datetime import timedelta
+from typing import List, Optional, Union
+from config.enums import RedisInitKeyConfig
+from config.env import AppConfig
+from module_admin.entity.vo.user_vo import CurrentUserModel
+from utils.cache_util import LocalCache
+from utils.log_util import logger
+
+
+class UserCacheService:
+    """
+    当前用户信息缓存模块服务层
+
+    缓存按用户id及权限版本号存储，进程内缓存作为一级缓存，redis缓存作为二级缓存；
+    路由树按角色组合及权限版本号以同样的方式缓存，拥有相同角色的用户共享同一份路由树；
+    用户、角色、菜单、部门、岗位数据变更时递增权限版本号，使所有已缓存的用户信息及路由树失效；
+    用户修改个人信息、头像、密码时只删除其本人的用户信息缓存
+    """
+
+    local_cache = LocalCache(max_size=4096, ttl=AppConfig.app_user_local_cache_expire_seconds)
+    router_local_cache = LocalCache(max_size=256, ttl=AppConfig.app_user_local_cache_expire_seconds)
+
+    @classmethod
+    def get_permission_epoch_key(cls):
+        """
+        获取权限版本号对应的redis键名
+
+        :return: 权限版本号键名
+        """
+        return RedisInitKeyConfig.PERMISSION_EPOCH.key
+
+    @classmethod
+    def get_user_info_key(cls, user_id: int):
+        """
+        获取用户信息缓存对应的redis键名
+
+        :param user_id: 用户id
+        :return: 用户信息缓存键名
+        """
+        return f'{RedisInitKeyConfig.USER_INFO.key}:{user_id}'
+
+    @classmethod
+    async def get_current_user_cache_services(
+        cls, redis, user_id: int, epoch: Optional[str]
+    ) -> Union[CurrentUserModel, None]:
+        """
+        根据用户id及权限版本号获取缓存的当前用户信息service
+
+        :param redis: redis对象
+        :param user_id: 用户id
+        :param epoch: 权限版本号
+        :return: 当前用户信息对象，缓存不存在或已失效时返回None
+        """
+        epoch = epoch or '0'
+        local_cache_result = cls.local_cache.get(user_id)
+        if local_cache_result and local_cache_result[0] == epoch:
+            return local_cache_result[1]
+        redis_cache_result = await redis.get(cls.get_user_info_key(user_id))
+        if redis_cache_result:
+            try:
+                cache_dict = json.loads(redis_cache_result)
+                if cache_dict.get('epoch') == epoch:
+                    current_user = CurrentUserModel.model_validate(cache_dict.get('data'))
+                    cls.local_cache.set(user_id, (epoch, current_user))
+                    return current_user
+            except Exception as e:
+                logger.warning(f'用户信息缓存解析失败，详细错误信息：{e}')
+
+        return None
+
+    @classmethod
+    async def set_current_user_cache_services(
+        cls, redis, user_id: int, epoch: Optional[str], current_user: CurrentUserModel
+    ):
+        """
+        缓存当前用户信息service
+
+        :param redis: redis对象
+        :param user_id: 用户id
+        :param epoch: 读取用户信息前获取到的权限版本号
+        :param current_user: 当前用户信息对象
+        :return:
+        """
+        epoch = epoch or '0'
+        cls.local_cache.set(user_id, (epoch, current_user))
+        await redis.set(
+            cls.get_user_info_key(user_id),
+            json.dumps(
+                dict(
+                    epoch=epoch,
+                    data=current_user.model_dump(mode='json', by_alias=True, exclude={'user': {'password'}}),
+                ),
+                ensure_ascii=False,
+            ),
+            ex=timedelta(seconds=AppConfig.app_user_cache_expire_seconds),
+        )
+
+    @classmethod
+    async def evict_current_user_cache_services(cls, redis, user_id: int):
+        """
+        删除指定用户的用户信息缓存service，其他进程的进程内缓存需另行广播失效消息
+
+        :param redis: redis对象
+        :param user_id: 用户id
+        :return:
+        """
+        await redis.delete(cls.get_user_info_key(user_id))
+        cls.local_cache.delete(user_id)
+
+    @classmethod
+    def evict_local_user_cache(cls, user_info_key: str):
+        """
+        根据用户信息缓存键名删除当前进程的进程内缓存
+
+        :param user_info_key: 用户信息缓存键名，格式为user_info:{用户id}
+        :return:
+        """
+        user_id = user_info_key.split(':', 1)[1]
+        if user_id.isdigit():
+            cls.local_cache.delete(int(user_id))
+
+    @classmethod
+    def get_role_set_key(cls, role_id_list: List[int]):
+        """
+        获取角色组合对应的缓存键，超级管理员拥有全部菜单，包含超级管理员角色的组合统一使用超级管理员角色id
+
+        :param role_id_list: 角色id列表
+        :return: 角色组合缓存键
+        """
+        if 1 in role_id_list:
+            return '1'
+
+        return ','.join(str(role_id) for role_id in sorted(set(role_id_list)))
+
+    @classmethod
+    async def get_router_cache_services(cls, redis, role_set_key: str, epoch: Optional[str]) -> Union[List, None]:
+        """
+        根据角色组合及权限版本号获取缓存的路由树service
+
+        :param redis: redis对象
+        :param role_set_key: 角色组合缓存键
+        :param epoch: 权限版本号
+        :return: 路由树，缓存不存在或已失效时返回None
+        """
+        epoch = epoch or '0'
+        local_cache_result = cls.router_local_cache.get(role_set_key)
+        if local_cache_result and local_cache_result[0] == epoch:
+            return local_cache_result[1]
+        redis_cache_result = await redis.get(f'{RedisInitKeyConfig.ROUTER_TREE.key}:{role_set_key}')
+        if redis_cache_result:
+            try:
+                cache_dict = json.loads(redis_cache_result)
+                if cache_dict.get('epoch') == epoch:
+                    user_router = cache_dict.get('data')
+                    cls.router_local_cache.set(role_set_key, (epoch, user_router))
+                    return user_router
+            except Exception as e:
+                logger.warning(f'路由树缓存解析失败，详细错误信息：{e}')
+
+        return None
+
+    @classmethod
+    async def set_router_cache_services(cls, redis, role_set_key: str, epoch: Optional[str], user_router: List):
+        """
+        缓存角色组合的路由树service
+
+        :param redis: redis对象
+        :param role_set_key: 角色组合缓存键
+        :param epoch: 查询菜单前获取到的权限版本号
+        :param user_router: 路由树
+        :return:
+        """
+        epoch = epoch or '0'
+        cls.router_local_cache.set(role_set_key, (epoch, user_router))
+        await redis.set(
+            f'{RedisInitKeyConfig.ROUTER_TREE.key}:{role_set_key}',
+            json.dumps(dict(epoch=epoch, data=user_router), ensure_ascii=False),
+            ex=timedelta(seconds=AppConfig.app_user_cache_expire_seconds),
+        )
+
+    @classmethod
+    async def refresh_permission_epoch_services(cls, redis):
+        """
+        递增权限版本号，使所有进程中已缓存的当前用户信息及路由树失效service
+
+        :param redis: redis对象
+        :return: 新的权限版本号
+        """
+        epoch = await redis.incr(cls.get_permission_epoch_key())
+        cls.local_cache.clear()
+        cls.router_local_cache.clear()
+
+        return str(epoch)
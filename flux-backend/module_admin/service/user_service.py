@@ -1,12 +1,17 @@
+import asyncio
 import io
-import pandas as pd
 from datetime import datetime
 from fastapi import Request, UploadFile
+from openpyxl import load_workbook
+from sqlalchemy import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Union
+from typing import Literal, Union
 from config.constant import CommonConstant
 from exceptions.exception import ServiceException
+from module_admin.dao.dept_dao import DeptDao
 from module_admin.dao.user_dao import UserDao
+from module_admin.entity.do.dept_do import SysDept
+from module_admin.entity.do.user_do import SysUser
 from module_admin.entity.vo.common_vo import CrudResponseModel
 from module_admin.entity.vo.post_vo import PostPageQueryModel
 from module_admin.entity.vo.user_vo import (
@@ -28,10 +33,10 @@ from module_admin.entity.vo.user_vo import (
     UserRoleResponseModel,
 )
 from module_admin.service.config_service import ConfigService
-from module_admin.service.dept_service import DeptService
 from module_admin.service.post_service import PostService
 from module_admin.service.role_service import RoleService
-from utils.common_util import CamelCaseUtil, export_list2excel, get_excel_template
+from utils.common_util import CamelCaseUtil, get_excel_template
+from utils.export_util import ExportColumn, ExportUtil
 from utils.page_util import PageResponseModel
 from utils.pwd_util import PwdUtil
 
@@ -41,9 +46,38 @@ class UserService:
     用户管理模块服务层
     """
 
+    IMPORT_BATCH_SIZE = 500
+    IMPORT_HEADER_DICT = {
+        '部门编号': 'dept_id',
+        '登录名称': 'user_name',
+        '用户名称': 'nick_name',
+        '用户邮箱': 'email',
+        '手机号码': 'phonenumber',
+        '用户性别': 'sex',
+        '帐号状态': 'status',
+    }
+    IMPORT_SEX_DICT = {'男': '0', '女': '1', '未知': '2'}
+    IMPORT_STATUS_DICT = {'正常': '0', '停用': '1'}
+
+    EXPORT_COLUMNS = [
+        ExportColumn(SysUser.user_id, '用户编号'),
+        ExportColumn(SysUser.user_name, '用户名称'),
+        ExportColumn(SysUser.nick_name, '用户昵称'),
+        ExportColumn(SysDept.dept_name, '部门'),
+        ExportColumn(SysUser.email, '邮箱地址'),
+        ExportColumn(SysUser.phonenumber, '手机号码'),
+        ExportColumn(SysUser.sex, '性别', options={'0': '男', '1': '女'}, default_label='未知'),
+        ExportColumn(SysUser.status, '状态', options={'0': '正常'}, default_label='停用'),
+        ExportColumn(SysUser.create_by, '创建者'),
+        ExportColumn(SysUser.create_time, '创建时间'),
+        ExportColumn(SysUser.update_by, '更新者'),
+        ExportColumn(SysUser.update_time, '更新时间'),
+        ExportColumn(SysUser.remark, '备注'),
+    ]
+
     @classmethod
     async def get_user_list_services(
-        cls, query_db: AsyncSession, query_object: UserPageQueryModel, data_scope_sql: str, is_page: bool = False
+        cls, query_db: AsyncSession, query_object: UserPageQueryModel, data_scope_sql: ColumnElement, is_page: bool = False
     ):
         """
         获取用户列表信息service
@@ -83,7 +117,7 @@ class UserService:
             return CrudResponseModel(is_success=True, message='校验通过')
 
     @classmethod
-    async def check_user_data_scope_services(cls, query_db: AsyncSession, user_id: int, data_scope_sql: str):
+    async def check_user_data_scope_services(cls, query_db: AsyncSession, user_id: int, data_scope_sql: ColumnElement):
         """
         校验用户数据权限service
 
@@ -323,9 +357,9 @@ class UserService:
         reset_user = page_object.model_dump(exclude_unset=True, exclude={'admin'})
         if page_object.old_password:
             user = (await UserDao.get_user_detail_by_id(query_db, user_id=page_object.user_id)).get('user_basic_info')
-            if not PwdUtil.verify_password(page_object.old_password, user.password):
+            if not await PwdUtil.async_verify_password(page_object.old_password, user.password):
                 raise ServiceException(message='修改密码失败，旧密码错误')
-            elif PwdUtil.verify_password(page_object.password, user.password):
+            elif await PwdUtil.async_verify_password(page_object.password, user.password):
                 raise ServiceException(message='新密码不能与旧密码相同')
             else:
                 del reset_user['old_password']
@@ -333,7 +367,7 @@ class UserService:
             del reset_user['sms_code']
             del reset_user['session_id']
         try:
-            reset_user['password'] = PwdUtil.get_password_hash(page_object.password)
+            reset_user['password'] = await PwdUtil.async_get_password_hash(page_object.password)
             await UserDao.edit_user_dao(query_db, reset_user)
             await query_db.commit()
             return CrudResponseModel(is_success=True, message='重置成功')
@@ -349,12 +383,15 @@ class UserService:
         file: UploadFile,
         update_support: bool,
         current_user: CurrentUserModel,
-        user_data_scope_sql: str,
-        dept_data_scope_sql: str,
+        user_data_scope_sql: ColumnElement,
+        dept_data_scope_sql: ColumnElement,
     ):
         """
         批量导入用户service
 
+        按用户账号一次性预取已存在的用户，部门及用户数据权限一次性查询后在内存中校验，新用户密码并发提交至密码计算线程池，
+        最后按批次多行写入，校验未通过的行不影响其他行的导入，并在结果中逐行返回失败原因
+
         :param request: Request对象
         :param query_db: orm对象
         :param file: 用户导入文件对象
@@ -362,94 +399,165 @@ class UserService:
         :param current_user: 当前用户对象
         :param user_data_scope_sql: 用户数据权限sql
         :param dept_data_scope_sql: 部门数据权限sql
-        :return: 批量导入用户结果
-        """
-        header_dict = {
-            '部门编号': 'dept_id',
-            '登录名称': 'user_name',
-            '用户名称': 'nick_name',
-            '用户邮箱': 'email',
-            '手机号码': 'phonenumber',
-            '用户性别': 'sex',
-            '帐号状态': 'status',
-        }
+        :return: 批量导入用户结果，result中包含新增数量、更新数量及失败行列表
+        """
         contents = await file.read()
-        df = pd.read_excel(io.BytesIO(contents))
         await file.close()
-        df.rename(columns=header_dict, inplace=True)
-        add_error_result = []
-        count = 0
-        try:
-            for index, row in df.iterrows():
-                count = count + 1
-                if row['sex'] == '男':
-                    row['sex'] = '0'
-                if row['sex'] == '女':
-                    row['sex'] = '1'
-                if row['sex'] == '未知':
-                    row['sex'] = '2'
-                if row['status'] == '正常':
-                    row['status'] = '0'
-                if row['status'] == '停用':
-                    row['status'] = '1'
-                add_user = UserModel(
-                    deptId=row['dept_id'],
-                    userName=row['user_name'],
-                    password=PwdUtil.get_password_hash(
-                        await ConfigService.query_config_list_from_cache_services(
-                            request.app.state.redis, 'sys.user.initPassword'
-                        )
-                    ),
-                    nickName=row['nick_name'],
-                    email=row['email'],
-                    phonenumber=str(row['phonenumber']),
-                    sex=row['sex'],
-                    status=row['status'],
-                    createBy=current_user.user.user_name,
-                    createTime=datetime.now(),
-                    updateBy=current_user.user.user_name,
-                    updateTime=datetime.now(),
+        row_list = await asyncio.to_thread(cls.__read_import_rows, contents)
+        error_list = []
+        import_user_list = []
+        user_name_set = set()
+        for row_number, row in row_list:
+            user_name = cls.__cell_to_str(row.get('user_name'))
+            try:
+                import_user = UserModel(
+                    deptId=row.get('dept_id'),
+                    userName=user_name,
+                    nickName=cls.__cell_to_str(row.get('nick_name')),
+                    email=cls.__cell_to_str(row.get('email')),
+                    phonenumber=cls.__cell_to_str(row.get('phonenumber')),
+                    sex=cls.IMPORT_SEX_DICT.get(row.get('sex'), row.get('sex')),
+                    status=cls.IMPORT_STATUS_DICT.get(row.get('status'), row.get('status')),
                 )
-                user_info = await UserDao.get_user_by_info(query_db, UserModel(userName=row['user_name']))
-                if user_info:
-                    if update_support:
-                        edit_user_model = UserModel(
-                            userId=user_info.user_id,
-                            deptId=row['dept_id'],
-                            userName=row['user_name'],
-                            nickName=row['nick_name'],
-                            email=row['email'],
-                            phonenumber=str(row['phonenumber']),
-                            sex=row['sex'],
-                            status=row['status'],
-                            updateBy=current_user.user.user_name,
-                            updateTime=datetime.now(),
-                        )
-                        edit_user_model.validate_fields()
-                        await cls.check_user_allowed_services(edit_user_model)
-                        if not current_user.user.admin:
-                            await cls.check_user_data_scope_services(
-                                query_db, edit_user_model.user_id, user_data_scope_sql
-                            )
-                            await DeptService.check_dept_data_scope_services(
-                                query_db, edit_user_model.dept_id, dept_data_scope_sql
-                            )
-                        edit_user = edit_user_model.model_dump(exclude_unset=True)
-                        await UserDao.edit_user_dao(query_db, edit_user)
-                    else:
-                        add_error_result.append(f"{count}.用户账号{row['user_name']}已存在")
-                else:
-                    add_user.validate_fields()
-                    if not current_user.user.admin:
-                        await DeptService.check_dept_data_scope_services(
-                            query_db, add_user.dept_id, dept_data_scope_sql
-                        )
-                    await UserDao.add_user_dao(query_db, add_user)
+                import_user.validate_fields()
+            except Exception as e:
+                error_list.append(dict(row=row_number, user_name=user_name, message=getattr(e, 'message', str(e))))
+                continue
+            if user_name in user_name_set:
+                error_list.append(dict(row=row_number, user_name=user_name, message='用户账号在导入文件中重复'))
+                continue
+            user_name_set.add(user_name)
+            import_user_list.append((row_number, import_user))
+        existing_user_id_dict = {
+            user.user_name: user.user_id
+            for user in await UserDao.get_user_list_by_user_names(query_db, list(user_name_set))
+        }
+        allowed_dept_id_set = set()
+        allowed_user_id_set = set()
+        if not current_user.user.admin:
+            allowed_dept_id_set = set(
+                await DeptDao.get_dept_id_list_by_data_scope(
+                    query_db,
+                    list({user.dept_id for _, user in import_user_list if user.dept_id is not None}),
+                    dept_data_scope_sql,
+                )
+            )
+            if update_support:
+                allowed_user_id_set = set(
+                    await UserDao.get_user_id_list_by_data_scope(
+                        query_db, list(existing_user_id_dict.values()), user_data_scope_sql
+                    )
+                )
+        # 预查询结束后提交只读事务归还数据库连接，计算密码哈希期间不占用连接
+        await query_db.commit()
+        now = datetime.now()
+        add_user_list = []
+        edit_user_list = []
+        for row_number, import_user in import_user_list:
+            existing_user_id = existing_user_id_dict.get(import_user.user_name)
+            error_message = None
+            if existing_user_id and not update_support:
+                error_message = '用户账号已存在'
+            elif existing_user_id and UserModel(userId=existing_user_id).admin:
+                error_message = '不允许操作超级管理员用户'
+            elif not current_user.user.admin and existing_user_id and existing_user_id not in allowed_user_id_set:
+                error_message = '没有权限访问用户数据'
+            elif (
+                not current_user.user.admin
+                and import_user.dept_id is not None
+                and import_user.dept_id not in allowed_dept_id_set
+            ):
+                error_message = '没有权限访问部门数据'
+            if error_message:
+                error_list.append(dict(row=row_number, user_name=import_user.user_name, message=error_message))
+                continue
+            user_dict = dict(
+                dept_id=import_user.dept_id,
+                user_name=import_user.user_name,
+                nick_name=import_user.nick_name,
+                email=import_user.email,
+                phonenumber=import_user.phonenumber,
+                sex=import_user.sex,
+                status=import_user.status,
+                update_by=current_user.user.user_name,
+                update_time=now,
+            )
+            if existing_user_id:
+                edit_user_list.append(dict(user_id=existing_user_id, **user_dict))
+            else:
+                add_user_list.append(user_dict)
+        if add_user_list:
+            init_password = await ConfigService.query_config_list_from_cache_services(
+                request.app.state.redis, 'sys.user.initPassword'
+            )
+            # 新增用户的初始密码相同，每次导入只计算一次哈希，避免大批量哈希任务占满密码计算线程池阻塞登录
+            password = await PwdUtil.async_get_password_hash(init_password)
+            for user_dict in add_user_list:
+                user_dict.update(
+                    password=password, del_flag='0', create_by=current_user.user.user_name, create_time=now
+                )
+        try:
+            for index in range(0, len(add_user_list), cls.IMPORT_BATCH_SIZE):
+                await UserDao.batch_add_user_dao(query_db, add_user_list[index : index + cls.IMPORT_BATCH_SIZE])
+            for index in range(0, len(edit_user_list), cls.IMPORT_BATCH_SIZE):
+                await UserDao.batch_edit_user_dao(query_db, edit_user_list[index : index + cls.IMPORT_BATCH_SIZE])
             await query_db.commit()
-            return CrudResponseModel(is_success=True, message='\n'.join(add_error_result))
         except Exception as e:
             await query_db.rollback()
             raise e
+        error_list.sort(key=lambda item: item.get('row'))
+        message = f'导入完成，新增{len(add_user_list)}条，更新{len(edit_user_list)}条，失败{len(error_list)}条'
+        if error_list:
+            message += '<br/>' + '<br/>'.join(
+                f"第{item.get('row')}行：用户账号{item.get('user_name')}{item.get('message')}" for item in error_list
+            )
+
+        return CrudResponseModel(
+            is_success=True,
+            message=message,
+            result=dict(
+                add_count=len(add_user_list),
+                update_count=len(edit_user_list),
+                error_list=CamelCaseUtil.transform_result(error_list),
+            ),
+        )
+
+    @classmethod
+    def __read_import_rows(cls, contents: bytes):
+        """
+        工具方法：以只读模式读取用户导入文件的数据行
+
+        :param contents: 用户导入文件内容
+        :return: (Excel行号, 以字段名为键的行数据)列表，已跳过空行
+        """
+        workbook = load_workbook(io.BytesIO(contents), read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = [
+                cls.IMPORT_HEADER_DICT.get(str(cell).strip()) if cell is not None else None for cell in next(rows, ())
+            ]
+            row_list = []
+            for row_number, row in enumerate(rows, start=2):
+                if all(cell is None for cell in row):
+                    continue
+                row_list.append((row_number, {key: value for key, value in zip(header, row) if key}))
+        finally:
+            workbook.close()
+
+        return row_list
+
+    @classmethod
+    def __cell_to_str(cls, value):
+        """
+        工具方法：将单元格的值转换为字符串
+
+        :param value: 单元格的值
+        :return: 字符串或None
+        """
+        if value is None:
+            return None
+
+        return str(value).strip()
 
     @staticmethod
     async def get_user_import_template_services():
@@ -467,50 +575,29 @@ class UserService:
 
         return binary_data
 
-    @staticmethod
-    async def export_user_list_services(user_list: List):
+    @classmethod
+    async def export_user_list_services(
+        cls,
+        request: Request,
+        query_object: UserPageQueryModel,
+        data_scope_sql: ColumnElement,
+        file_format: Literal['xlsx', 'csv'] = 'xlsx',
+    ):
         """
         导出用户信息service
 
-        :param user_list: 用户信息列表
-        :return: 用户信息对应excel的二进制数据
-        """
-        # 创建一个映射字典，将英文键映射到中文键
-        mapping_dict = {
-            'userId': '用户编号',
-            'userName': '用户名称',
-            'nickName': '用户昵称',
-            'deptName': '部门',
-            'email': '邮箱地址',
-            'phonenumber': '手机号码',
-            'sex': '性别',
-            'status': '状态',
-            'createBy': '创建者',
-            'createTime': '创建时间',
-            'updateBy': '更新者',
-            'updateTime': '更新时间',
-            'remark': '备注',
-        }
-
-        data = user_list
-
-        for item in data:
-            if item.get('status') == '0':
-                item['status'] = '正常'
-            else:
-                item['status'] = '停用'
-            if item.get('sex') == '0':
-                item['sex'] = '男'
-            elif item.get('sex') == '1':
-                item['sex'] = '女'
-            else:
-                item['sex'] = '未知'
-        new_data = [
-            {mapping_dict.get(key): value for key, value in item.items() if mapping_dict.get(key)} for item in data
-        ]
-        binary_data = export_list2excel(new_data)
-
-        return binary_data
+        :param request: Request对象
+        :param query_object: 查询参数对象
+        :param data_scope_sql: 数据权限对应的查询sql语句
+        :param file_format: 导出文件格式
+        :return: 用户信息对应导出文件的二进制数据流
+        """
+        return await ExportUtil.stream_export(
+            request.app.state.redis,
+            UserDao.get_user_list_query(query_object, data_scope_sql),
+            cls.EXPORT_COLUMNS,
+            file_format,
+        )
 
     @classmethod
     async def get_user_role_allocated_list_services(cls, query_db: AsyncSession, page_object: UserRoleQueryModel):
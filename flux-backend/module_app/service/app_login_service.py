@@ -7,7 +7,6 @@ from redis import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.requests import Request
 
-from config.enums import RedisInitKeyConfig
 from module_admin.entity.do.user_do import SysUser, UserWechat
 from module_admin.service.user_service import UserService
 from utils.common_util import SqlalchemyUtil
@@ -20,6 +19,7 @@ from module_admin.entity.vo.log_vo import WxMiniPhoneNumberCode, WxMiniLoginCode
 from module_admin.entity.vo.login_vo import UserLogin
 from module_admin.entity.vo.user_vo import UserModel, UserWechatModel, CurrentUserModel, EditUserModel
 from module_admin.service.login_service import LoginService
+from module_admin.service.online_service import OnlineService
 from module_app.entity.vo.WxLogin import AppLoginModelResp
 from utils.pwd_util import PwdUtil
 
@@ -76,7 +76,7 @@ class WxLoginService:
                 sys_user = await UserDao.add_user_dao(db, UserModel(phonenumber=phone_number,
                                                                     userName=phone_number,
                                                                     nickName=phone_number,
-                                                                    password=PwdUtil.get_password_hash(phone_number),
+                                                                    password=await PwdUtil.async_get_password_hash(phone_number),
                                                                     # 手机号作为密码
                                                                     sex='2'))
                 await db.commit()
@@ -134,19 +134,15 @@ class WxLoginService:
             expires_delta=access_token_expires
         )
         # 保存redis Token
-        if AppConfig.app_same_time_login:
-            await req.app.state.redis.set(
-                f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}',
-                access_token,
-                ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
-            )
-        else:
-            # 此方法可实现同一账号同一时间只能登录一次
-            await req.app.state.redis.set(
-                f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{result[0].user_id}',
-                access_token,
-                ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
-            )
+        token_id = session_id if AppConfig.app_same_time_login else str(result[0].user_id)
+        await OnlineService.set_online_session_services(
+            req.app.state.redis,
+            token_id,
+            access_token,
+            result[0].user_name,
+            result[1].dept_name if result[1] else None,
+            user.login_info,
+        )
 
         login_model_resp = AppLoginModelResp(
             token=access_token,
@@ -1,13 +1,14 @@
 # -*- coding:utf-8 -*-
 
 from datetime import datetime, time
-from typing import List
+from typing import Dict, List
 
-from sqlalchemy import and_, delete, desc, func, or_, select, update, text, case, asc
+from sqlalchemy import ColumnElement, and_, delete, desc, func, or_, select, update, case, asc
 from sqlalchemy.ext.asyncio import AsyncSession
 from module_gen.entity.do.gen_table_column_do import GenTableColumn
 from module_gen.entity.vo.gen_table_column_vo import GenTableColumnPageModel, GenTableColumnModel
 from utils.page_util import PageUtil, PageResponseModel
+from utils.schema_catalog_util import SchemaCatalogUtil
 
 
 class GenTableColumnDao:
@@ -22,13 +23,28 @@ class GenTableColumnDao:
                        .first())
         return gen_table_column
 
+    @classmethod
+    async def get_by_table_ids(cls, db: AsyncSession, table_ids: List[int],
+                               data_scope_sql: ColumnElement = None) -> List[GenTableColumn]:
+        """根据业务表主键列表一次获取所有关联列，数据权限及排序与get_gen_table_column_list一致"""
+        if not table_ids:
+            return []
+        gen_table_column_list = (await db.execute(
+                            select(GenTableColumn)
+                            .where(GenTableColumn.table_id.in_(table_ids),
+                                   data_scope_sql if data_scope_sql is not None else True)
+                            .order_by(asc(GenTableColumn.column_name))
+                            # 数据权限条件引用部门表时会与部门表做笛卡尔积，去重避免同一列重复返回
+                            .distinct())).scalars().all()
+        return gen_table_column_list
+
     """
     查询
     """
     @classmethod
     async def get_gen_table_column_list(cls, db: AsyncSession,
                              query_object: GenTableColumnPageModel,
-                             data_scope_sql: str = None,
+                             data_scope_sql: ColumnElement = None,
                              is_page: bool = False) -> PageResponseModel|list:
 
         query = (
@@ -79,7 +95,7 @@ class GenTableColumnDao:
                 
                 GenTableColumn.update_time == query_object.update_time if query_object.update_time else True,
                 
-                eval(data_scope_sql) if data_scope_sql else True,
+                data_scope_sql if data_scope_sql is not None else True,
             )
             .order_by(asc(GenTableColumn.column_name))
             .distinct()
@@ -149,34 +165,30 @@ class GenTableColumnDao:
         if not table_name:
             raise ValueError("Table name cannot be empty.")
 
-        # 基础查询
-        query = text("""
-                    SELECT column_name,
-                           (CASE WHEN (is_nullable = 'no' AND column_key != 'PRI') THEN '1' ELSE '0' END) AS is_required,
-                           (CASE WHEN column_key = 'PRI' THEN '1' ELSE '0' END) AS is_pk,
-                           ordinal_position AS sort,
-                           column_comment,
-                           (CASE WHEN extra = 'auto_increment' THEN '1' ELSE '0' END) AS is_increment,
-                           column_type
-                    FROM information_schema.columns
-                    WHERE table_schema = (SELECT DATABASE())
-                    AND table_name = :table_name
-                    ORDER BY ordinal_position
-                """)
-
-        # 执行查询并传递参数
-        result = await session.execute(query, {"table_name": table_name})
-        rows = result.fetchall()
-        # 将结果映射到 GenTableColumnResult 对象
-        return [
-            GenTableColumnModel(
-                columnName=row[0],
-                isRequired=row[1],
-                isPk=row[2],
-                sort=row[3],
-                columnComment=row[4],
-                isIncrement=row[5],
-                columnType=row[6]
-            )
-            for row in rows
-        ]
+        return (await cls.select_db_table_columns_by_names(session, [table_name])).get(table_name, [])
+
+    @classmethod
+    async def select_db_table_columns_by_names(cls, session: AsyncSession,
+                                               table_names: List[str]) -> Dict[str, List[GenTableColumnModel]]:
+        """
+        从数据库表结构元数据缓存中一次查询多个表的列信息。
+        :param session: AsyncSession 数据库会话
+        :param table_names: 表名列表
+        :return: 表名与列信息对象列表的映射，不存在的表不出现在结果中
+        """
+        table_columns = await SchemaCatalogUtil.get_table_columns(session, table_names)
+        return {
+            table_name: [
+                GenTableColumnModel(
+                    columnName=column['column_name'],
+                    isRequired=column['is_required'],
+                    isPk=column['is_pk'],
+                    sort=column['sort'],
+                    columnComment=column['column_comment'],
+                    isIncrement=column['is_increment'],
+                    columnType=column['column_type']
+                )
+                for column in columns
+            ]
+            for table_name, columns in table_columns.items()
+        }
@@ -3,13 +3,14 @@
 from datetime import datetime, time
 from typing import List
 
-from sqlalchemy import and_, delete, desc, func, or_, select, update, MetaData, text, not_, Table, Column, String, \
+from sqlalchemy import ColumnElement, delete, desc, func, or_, select, update, MetaData, text, not_, Table, Column, String, \
     DateTime
 from sqlalchemy.ext.asyncio import AsyncSession
 from module_gen.entity.do.gen_table_do import GenTable
 from module_gen.entity.vo.gen_table_vo import GenTablePageModel, GenTableModel
 from utils.common_util import CamelCaseUtil
 from utils.page_util import PageUtil, PageResponseModel
+from utils.schema_catalog_util import SchemaCatalogUtil
 
 
 class GenTableDao:
@@ -34,13 +35,23 @@ class GenTableDao:
                        .first())
         return gen_table
 
+    @classmethod
+    async def get_by_ids(cls, db: AsyncSession, gen_table_ids: List[int]) -> List[GenTable]:
+        """根据主键列表一次获取多条记录"""
+        if not gen_table_ids:
+            return []
+        gen_table_list = (await db.execute(
+                            select(GenTable)
+                            .where(GenTable.table_id.in_(gen_table_ids)))).scalars().all()
+        return gen_table_list
+
     """
     查询
     """
     @classmethod
     async def get_gen_table_list(cls, db: AsyncSession,
                              query_object: GenTablePageModel,
-                             data_scope_sql: str,
+                             data_scope_sql: ColumnElement,
                              is_page: bool = False) -> PageResponseModel:
 
         query = (
@@ -89,7 +100,7 @@ class GenTableDao:
                 
                 GenTable.remark.like(f"%{query_object.remark}%") if query_object.remark else True,
                 
-                eval(data_scope_sql),
+                data_scope_sql,
             )
             .order_by(desc(GenTable.create_time))
             .distinct()
@@ -152,72 +163,33 @@ class GenTableDao:
         """
         查询数据库中的表信息，根据 GenTable 入参动态添加过滤条件。
         """
-        """查询数据库表列表"""
-        query = (
-            select(
-                text("table_name"),
-                text("table_comment"),
-                text("create_time"),
-                text("update_time"),
-            )
-            .select_from(text("information_schema.tables"))
-            .where(
-                and_(
-                    text("table_schema = (select database())"),
-                    text("table_name NOT LIKE 'qrtz\\_%'"),
-                    text("table_name NOT LIKE 'gen\\_%'"),
-                    text("table_name NOT IN (select table_name from gen_table)"),
-                )
-            )
+        """查询数据库表列表，表信息从数据库表结构元数据缓存中读取"""
+        exclude_names = set((await session.execute(select(GenTable.table_name))).scalars().all())
+        tables = await SchemaCatalogUtil.query_tables(
+            session,
+            exclude_prefixes=('qrtz_', 'gen_'),
+            exclude_names=exclude_names,
+            table_name=gen_table.table_name,
+            table_comment=gen_table.table_comment,
         )
-        # 动态条件构造
-        if gen_table.table_name:
-            query = query.where(
-                text("lower(table_name) like lower(:table_name)")
-            )
-        if gen_table.table_comment:
-            query = query.where(
-                text("lower(table_comment) like lower(:table_comment)")
-            )
-        # 排序
-        query = query.order_by(text("create_time DESC"))
-        # 参数绑定
-        params = {}
-        if gen_table.table_name:
-            params["table_name"] = f"%{gen_table.table_name}%"
-        if gen_table.table_comment:
-            params["table_comment"] = f"%{gen_table.table_comment}%"
-
-        rows = await PageUtil.paginate(session, query.params(**params), gen_table.page_num, gen_table.page_size, is_page)
+        rows = CamelCaseUtil.transform_result(tables)
+        if is_page:
+            return PageUtil.get_page_obj(rows, gen_table.page_num, gen_table.page_size)
         return rows
 
 
     @classmethod
     async def select_db_table_list_by_names(cls, session: AsyncSession, table_names: List[str]):
         """根据表名称查询数据库表信息"""
-        table_str = ",".join([f"'{item}'" for item in table_names])
         if not table_names:
             return []
-        query = select(
-            text("table_name"),
-            text("table_comment"),
-            text("create_time"),
-            text("update_time"),
-        ).select_from(text('information_schema.tables')).where(
-            and_(
-                text("table_name NOT LIKE 'qrtz\\_%'"),
-                text("table_name NOT LIKE 'gen\\_%'"),
-                text("table_name NOT IN (select table_name from gen_table)"),
-                text(f"table_name IN ({ table_str })"),
-                text("table_schema = (select database())")
-            )
+        exclude_names = set((await session.execute(select(GenTable.table_name))).scalars().all())
+        tables = await SchemaCatalogUtil.query_tables(
+            session, exclude_prefixes=('qrtz_', 'gen_'), exclude_names=exclude_names, table_names=set(table_names)
         )
-
-        result = await session.execute(query)
-        rows = result.fetchall()
-        # return CamelCaseUtil.transform_result(rows)
         return [
-            GenTableModel(tableName=row[0], tableComment=row[1], createTime=row[2], updateTime=row[3]) for row in rows
+            GenTableModel(tableName=table['table_name'], tableComment=table['table_comment'],
+                          createTime=table['create_time'], updateTime=table['update_time']) for table in tables
         ]
 
     @classmethod
@@ -1,12 +1,18 @@
+import asyncio
 import io
 import json
+import os
 import zipfile
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from io import BytesIO
 from math import trunc
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict, Tuple
 
 from watchfiles import awatch
 
+from exceptions.exception import ServiceException
+from module_admin.service.sys_cache_service import SysCacheService
 from module_gen.dao.gen_table_dao import GenTableDao
 from module_gen.dao.gen_table_column_dao import GenTableColumnDao
 from module_gen.entity.do.gen_table_column_do import GenTableColumn
@@ -18,11 +24,15 @@ from module_gen.utils.velocity_utils import VelocityUtils
 from module_gen.entity.vo.gen_table_column_vo import GenTableColumnModel, GenTableColumnPageModel
 from utils.common_util import CamelCaseUtil, SnakeCaseUtil
 from utils.page_util import PageResponseModel
+from utils.schema_catalog_util import SchemaCatalogUtil
 
 
 class GenTableService:
     """代码生成 服务层实现"""
 
+    # 批量生成代码时并行渲染模板的线程数
+    RENDER_WORKERS = min(8, os.cpu_count() or 1)
+
     @classmethod
     async def select_gen_table_list(cls, gen_table: GenTablePageModel, query_db, data_scope_sql) -> PageResponseModel:
         """查询业务信息"""
@@ -76,13 +86,17 @@ class GenTableService:
     async def import_gen_table(cls, table_list: List[str], query_db) -> None:
         """导入表结构"""
         tables = await GenTableService.select_db_table_list_by_names(table_list, query_db)
+        # 一次查询全部表的列信息
+        table_columns = await GenTableColumnDao.select_db_table_columns_by_names(
+            query_db, [table.table_name for table in tables]
+        )
         for table in tables:
             gen_table = GenTableModel()
             gen_table.table_name = table.table_name
             gen_table.table_comment = table.table_comment
             
             # 查询表列信息
-            columns = await GenTableColumnDao.select_db_table_columns_by_name(query_db, table.table_name)
+            columns = table_columns.get(table.table_name, [])
             
             GenUtils.init_table(gen_table, columns)
             # 添加表信息
@@ -146,7 +160,9 @@ class GenTableService:
 
 
     @classmethod
-    async def sync_db(cls, query_db, table_name: str, data_scope_sql) -> None:
+    async def sync_db(cls, query_db, table_name: str, data_scope_sql, redis=None) -> None:
+        # 表结构可能已在外部修改，同步前使表结构元数据缓存失效
+        await cls.invalidate_schema_catalog(redis)
 
         table = await GenTableDao.get_by_table_name(query_db, table_name)
         table_columns_dicts = await GenTableColumnDao.get_gen_table_column_list(query_db,
@@ -178,33 +194,87 @@ class GenTableService:
         await query_db.commit()
 
 
+    @classmethod
+    async def select_gen_tables_for_render(
+            cls, query_db, table_ids: List[int], data_scope_sql=None
+    ) -> List[Tuple[GenTableModel, Dict[str, Any]]]:
+        """一次查询业务表及其全部关联列（按数据权限过滤）并生成模板变量，结果与传入的业务表主键顺序一致，不存在的业务表忽略"""
+        table_ids = list(dict.fromkeys(table_ids))
+        gen_tables = {gen_table.table_id: gen_table for gen_table in await GenTableDao.get_by_ids(query_db, table_ids)}
+        table_columns = defaultdict(list)
+        for column in await GenTableColumnDao.get_by_table_ids(query_db, list(gen_tables), data_scope_sql):
+            table_columns[column.table_id].append(CamelCaseUtil.transform_result(column))
+        render_tables = []
+        for table_id in table_ids:
+            if table_id not in gen_tables:
+                continue
+            table = GenTableModel(**CamelCaseUtil.transform_result(gen_tables[table_id]))
+            if table.options:
+                table_options = GenTableOptionModel(**json.loads(table.options))
+                table.parent_menu_id = table_options.parent_menu_id
+            table.columns = table_columns[table_id]
+            columns = [GenTableColumnModel(**column) for column in table.columns]
+            render_tables.append((table, VelocityUtils.build_render_params(table, columns)))
+        return render_tables
+
     @classmethod
     async def preview_code(cls, query_db, table_id: int, data_scope_sql) -> (Dict[str, str], GenTableModel):
         """预览模板代码"""
-        table = await cls.select_gen_table_by_id(table_id, query_db, data_scope_sql)
-        render_params = await VelocityUtils.get_render_params(table, query_db)
+        render_tables = await cls.select_gen_tables_for_render(query_db, [table_id], data_scope_sql)
+        if not render_tables:
+            raise ServiceException(message='业务表不存在')
+        table, render_params = render_tables[0]
         templates = GenUtils.get_template_path(table.tpl_category)
-        preview_result = {}
-        for template_name, template_path in templates.items():
-            template = VelocityUtils.get_template(template_path)
-            content = template.render(**render_params)
-            preview_result[template_name] = content
+        preview_result = await asyncio.to_thread(VelocityUtils.render_templates, templates, render_params)
         return preview_result, table
 
     @classmethod
     async def batch_generate_code(cls,  query_db, data_scope_sql, table_id_array:List[str]) -> BytesIO:
-        """批量下载生成代码"""
+        """批量下载生成代码，业务表及列信息两次查询全部取出，模板渲染及zip压缩不占用事件循环"""
+        render_tables = await cls.select_gen_tables_for_render(
+            query_db, [int(table_id) for table_id in table_id_array], data_scope_sql
+        )
+        return await asyncio.to_thread(cls.__write_code_zip, render_tables)
+
+    @classmethod
+    def __write_code_zip(cls, render_tables: List[Tuple[GenTableModel, Dict[str, Any]]]) -> BytesIO:
+        """
+        在线程池中并行渲染各业务表的模板，按业务表顺序将已完成的渲染结果逐个写入zip，
+        同时渲染中及待写入的业务表不超过线程数的两倍，写入后即释放渲染结果，未写入的渲染结果占用的内存不随业务表数量增长
+        """
         zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-            for i, table_id in enumerate(table_id_array):
-                preview_result, table = await cls.preview_code(query_db, int(table_id), data_scope_sql)
-                for filename, content in preview_result.items():
-                    target_file_name = GenUtils.get_file_name(filename, table)
-                    zip_file.writestr(target_file_name, content)
+        with ThreadPoolExecutor(max_workers=cls.RENDER_WORKERS) as executor, \
+                zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            pending = deque()
+            for table, params in render_tables:
+                if len(pending) >= cls.RENDER_WORKERS * 2:
+                    cls.__write_rendered(zip_file, *pending.popleft())
+                pending.append((table, executor.submit(
+                    VelocityUtils.render_templates, GenUtils.get_template_path(table.tpl_category), params)))
+            while pending:
+                cls.__write_rendered(zip_file, *pending.popleft())
         zip_buffer.seek(0)
         return zip_buffer
 
     @classmethod
-    async def create_table(cls, query_db, sql) -> bool:
+    def __write_rendered(cls, zip_file: zipfile.ZipFile, table: GenTableModel, future: Future) -> None:
+        """等待业务表的模板渲染完成并写入zip"""
+        for filename, content in future.result().items():
+            target_file_name = GenUtils.get_file_name(filename, table)
+            zip_file.writestr(target_file_name, content)
+
+    @classmethod
+    async def create_table(cls, query_db, sql, redis=None) -> bool:
         """数据库表创建"""
-        return await GenTableDao.create_table(query_db, sql)
\ No newline at end of file
+        success = await GenTableDao.create_table(query_db, sql)
+        if success:
+            await cls.invalidate_schema_catalog(redis)
+        return success
+
+    @classmethod
+    async def invalidate_schema_catalog(cls, redis=None) -> None:
+        """使数据库表结构元数据缓存失效，传入redis对象时同时通知其他工作进程"""
+        if redis is None:
+            SchemaCatalogUtil.invalidate()
+        else:
+            await SysCacheService.publish_invalidate_services(redis, SchemaCatalogUtil.CACHE_KEY)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
 import os
 
 from module_gen.utils.jinja2_tools import snake_to_pascal_case, snake_to_camel, snake_2_colon, is_base_column, \
@@ -16,12 +16,13 @@ class VelocityInitializer:
             template_dir = os.path.abspath(os.path.join(os.getcwd(), 'module_gen/templates'))
             loader = FileSystemLoader(template_dir)
             
-            # 创建Jinja2环境
+            # 创建Jinja2环境，模板编译结果写入字节码缓存，进程重启后无需重新编译模板
             env = Environment(
                 loader=loader,
                 autoescape=select_autoescape(['html', 'xml']),
                 trim_blocks=True,
-                lstrip_blocks=True
+                lstrip_blocks=True,
+                bytecode_cache=FileSystemBytecodeCache(),
             )
             
             # 添加自定义过滤器
@@ -50,6 +50,11 @@ class VelocityUtils:
         # 设置主键列信息
         table_columns_dicts = await GenTableColumnDao.get_gen_table_column_list(query_db, GenTableColumnPageModel(tableId=gen_table.table_id))
         table_columns = [GenTableColumnModel(**tcd) for tcd in table_columns_dicts]
+        return cls.build_render_params(gen_table, table_columns)
+
+    @classmethod
+    def build_render_params(cls, gen_table: GenTableModel, table_columns: List[GenTableColumnModel]) -> Dict[str, Any]:
+        """根据已查询的业务表及列信息设置模板变量信息，不访问数据库"""
         pk_column = None
         for column in table_columns:
             if column.is_pk == "1":
@@ -122,6 +127,14 @@ class VelocityUtils:
         #     })
         
         return context
+
+    @classmethod
+    def render_templates(cls, templates: Dict[str, str], render_params: Dict[str, Any]) -> Dict[str, str]:
+        """渲染业务表的全部模板，返回模板名称与渲染结果的映射"""
+        return {
+            template_name: cls.get_template(template_path).render(**render_params)
+            for template_name, template_path in templates.items()
+        }
     
     @classmethod
     def get_permission_prefix(cls, module_name: str, business_name: str) -> str:
@@ -0,0 +1,111 @@
+import asyncio
+from functools import wraps
+from inspect import iscoroutinefunction
+from typing import Callable, Dict, Literal, Optional
+
+
+class JobDefinition:
+    """
+    定时任务定义，记录任务键对应的可调用对象及调度参数
+    """
+
+    def __init__(
+        self,
+        key: str,
+        func: Callable,
+        executor: Optional[Literal['default', 'processpool']] = None,
+        timeout: Optional[float] = None,
+        max_instances: Optional[int] = None,
+        spread_seconds: Optional[int] = None,
+    ):
+        """
+        定时任务定义
+
+        :param key: 任务键，即任务管理中填写的调用目标字符串
+        :param func: 任务的可调用对象
+        :param executor: 优先使用的执行器，为None时使用任务管理中配置的执行器，异步任务始终使用default执行器
+        :param timeout: 异步任务的超时时间（单位：秒），超时后取消任务，为None时不限制
+        :param max_instances: 允许并发执行时的最大运行实例数，为None时使用默认值
+        :param spread_seconds: 错峰窗口（单位：秒），各任务按任务id在窗口内取固定的延后秒数
+        """
+        self.key = key
+        self.func = func
+        self.is_async = iscoroutinefunction(func)
+        self.executor = 'default' if self.is_async else executor
+        self.timeout = timeout
+        self.max_instances = max_instances
+        self.spread_seconds = spread_seconds
+
+
+class JobRegistry:
+    """
+    定时任务注册表
+
+    module_task下的任务函数通过register装饰器在导入时注册，添加任务时按调用目标字符串直接查找，无需eval；
+    装饰器返回模块级函数本身（异步任务为同名的超时包装函数），进程池执行器序列化任务时可按模块路径引用到该函数
+    """
+
+    jobs: Dict[str, JobDefinition] = {}
+
+    @classmethod
+    def register(
+        cls,
+        key: Optional[str] = None,
+        executor: Optional[Literal['default', 'processpool']] = None,
+        timeout: Optional[float] = None,
+        max_instances: Optional[int] = None,
+        spread_seconds: Optional[int] = None,
+    ):
+        """
+        注册定时任务的装饰器
+
+        :param key: 任务键，为None时使用函数的模块路径，如module_task.scheduler_test.job
+        :param executor: 优先使用的执行器，CPU密集型的同步任务可指定processpool
+        :param timeout: 异步任务的超时时间（单位：秒），超时后取消任务
+        :param max_instances: 允许并发执行时的最大运行实例数
+        :param spread_seconds: 错峰窗口（单位：秒），同一时刻触发的大量任务可在窗口内按任务id错开执行
+        :return: 装饰器
+        """
+
+        def decorator(func: Callable):
+            job_func = func
+            if timeout is not None and iscoroutinefunction(func):
+                job_func = cls.__wrap_timeout(func, timeout)
+            job_key = key or f'{func.__module__}.{func.__qualname__}'
+            if job_key in cls.jobs and cls.jobs[job_key].func is not job_func:
+                raise ValueError(f'定时任务{job_key}重复注册')
+            cls.jobs[job_key] = JobDefinition(job_key, job_func, executor, timeout, max_instances, spread_seconds)
+
+            return job_func
+
+        return decorator
+
+    @classmethod
+    def get_job(cls, invoke_target: Optional[str]) -> Optional[JobDefinition]:
+        """
+        根据调用目标字符串获取定时任务定义，兼容module:function形式的写法
+
+        :param invoke_target: 调用目标字符串
+        :return: 定时任务定义，未注册时返回None
+        """
+        if not invoke_target:
+            return None
+        invoke_target = invoke_target.strip()
+
+        return cls.jobs.get(invoke_target) or cls.jobs.get(invoke_target.replace(':', '.'))
+
+    @classmethod
+    def __wrap_timeout(cls, func: Callable, timeout: float):
+        """
+        工具方法：为异步任务增加超时控制，超时后取消任务并抛出asyncio.TimeoutError
+
+        :param func: 异步任务函数
+        :param timeout: 超时时间（单位：秒）
+        :return: 包装后的异步任务函数
+        """
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await asyncio.wait_for(func(*args, **kwargs), timeout=timeout)
+
+        return wrapper
@@ -7,8 +7,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from config.get_db import get_db
 from module_task.Ali_QWen import get_article
+from module_task.job_registry import JobRegistry
 
 
+@JobRegistry.register()
 def job(*args, **kwargs):
     """
     定时任务执行同步函数示例
@@ -18,6 +20,7 @@ def job(*args, **kwargs):
     print(f'{datetime.now()}同步函数执行了')
 
 
+@JobRegistry.register()
 async def async_job(*args, **kwargs):
     """
     定时任务执行异步函数示例
@@ -27,6 +30,7 @@ async def async_job(*args, **kwargs):
     print(f'{datetime.now()}异步函数执行了')
 
 
+@JobRegistry.register(timeout=600)
 async def gen_article_job(*args, **kwargs):
     print("执行任务gen_article_job")
     async for query_db in get_db():
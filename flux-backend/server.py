@@ -3,16 +3,20 @@ from fastapi import FastAPI, HTTPException
 from starlette.responses import JSONResponse
 
 from config.env import AppConfig
-from config.get_db import init_create_table
+from config.get_db import init_create_table, init_dept_closure
 from config.get_redis import RedisUtil
-from config.get_scheduler import SchedulerUtil
+from config.get_scheduler import SchedulerLeaderUtil
 from exceptions.handle import handle_exception
+from module_admin.service.log_sink_service import LogSinkService
+from module_admin.service.sys_cache_service import SysCacheService
 from middlewares.handle import handle_middleware
 from router import router_manager
 
 from sub_applications.handle import handle_sub_applications
 from utils.common_util import worship
+from utils.ip_location_util import IpLocationUtil
 from utils.log_util import logger
+from utils.redis_key_util import RedisKeyUtil
 from fastapi import FastAPI, Request
 
 from utils.response_util import ResponseUtil
@@ -24,14 +28,24 @@ async def lifespan(app: FastAPI):
     logger.info(f'{AppConfig.app_name}开始启动')
     worship()
     await init_create_table()
+    await init_dept_closure()
     app.state.redis = await RedisUtil.create_redis_pool()
+    await RedisKeyUtil.init_key_index(app.state.redis)
     await RedisUtil.init_sys_dict(app.state.redis)
     await RedisUtil.init_sys_config(app.state.redis)
-    await SchedulerUtil.init_system_scheduler()
+    await SysCacheService.start_cache_subscriber_services(app.state.redis)
+    IpLocationUtil.init_backends()
+    # 定时任务日志经由日志异步写入队列写入，需先于定时任务启动
+    await LogSinkService.start_log_sink_services(app.state.redis)
+    # 多个工作进程竞争调度主节点租约，仅主节点运行定时任务调度器
+    await SchedulerLeaderUtil.start_leader_election(app.state.redis)
     logger.info(f'{AppConfig.app_name}启动成功')
     yield
+    await SchedulerLeaderUtil.stop_leader_election()
+    await LogSinkService.stop_log_sink_services()
+    await SysCacheService.stop_cache_subscriber_services()
+    await IpLocationUtil.close_backends()
     await RedisUtil.close_redis_pool(app)
-    await SchedulerUtil.close_system_scheduler()
 
 
 # 初始化FastAPI对象
@@ -300,6 +300,22 @@ INSERT INTO `sys_dept` VALUES (100,0,'0','集团总公司',0,'年糕','158888888
 /*!40000 ALTER TABLE `sys_dept` ENABLE KEYS */;
 UNLOCK TABLES;
 
+--
+-- Table structure for table `sys_dept_closure`
+--
+
+DROP TABLE IF EXISTS `sys_dept_closure`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `sys_dept_closure` (
+  `ancestor_id` bigint NOT NULL COMMENT '祖先部门id',
+  `descendant_id` bigint NOT NULL COMMENT '后代部门id',
+  `depth` int NOT NULL DEFAULT '0' COMMENT '层级距离（0代表部门自身）',
+  PRIMARY KEY (`ancestor_id`,`descendant_id`) USING BTREE,
+  KEY `ix_sys_dept_closure_descendant_id` (`descendant_id`) USING BTREE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci COMMENT='部门祖先关系闭包表';
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Table structure for table `sys_dict_data`
 --
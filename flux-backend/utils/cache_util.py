@@ -0,0 +1,82 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+_MISSING = object()
+
+
+class LocalCache:
+    """
+    进程内缓存工具类，支持过期时间及容量上限（超出容量时淘汰最久未使用的键）
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        """
+        进程内缓存工具类
+
+        :param max_size: 最大缓存键数量
+        :param ttl: 默认过期时间（单位：秒），为None时表示不过期
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None):
+        """
+        获取缓存值
+
+        :param key: 缓存键
+        :param default: 缓存不存在或已过期时的默认值
+        :return: 缓存值
+        """
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expire_at, value = item
+        if expire_at is not None and expire_at < time.monotonic():
+            self._data.pop(key, None)
+            return default
+        self._data.move_to_end(key)
+
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        设置缓存值
+
+        :param key: 缓存键
+        :param value: 缓存值
+        :param ttl: 过期时间（单位：秒），为None时使用默认过期时间
+        :return:
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expire_at = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (expire_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        """
+        删除缓存值
+
+        :param key: 缓存键
+        :return:
+        """
+        self._data.pop(key, None)
+
+    def clear(self):
+        """
+        清空缓存
+
+        :return:
+        """
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key: Hashable):
+        return self.get(key, _MISSING) is not _MISSING
+
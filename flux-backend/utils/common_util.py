@@ -6,8 +6,10 @@ from openpyxl import Workbook
 from openpyxl.styles import Alignment, PatternFill
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.datavalidation import DataValidation
+from functools import lru_cache
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.engine.row import Row
-from typing import Any, Dict, List, Literal, Union
+from typing import Any, Callable, Dict, List, Literal, Tuple, Union
 from config.database import Base
 from config.env import CachePathConfig
 
@@ -28,8 +30,13 @@ def worship():
 class SqlalchemyUtil:
     """
     sqlalchemy工具类
+
+    模型对象按(模型类, 转换形式)编译序列化函数并缓存，字段名与转换后键名的映射只计算一次，
+    列字段直接从对象属性字典取值，仅对已加载的关联关系递归序列化
     """
 
+    serializer_cache: Dict[Tuple[type, str], Callable[[Base], dict]] = {}
+
     @classmethod
     def base_to_dict(
             cls, obj: Union[Base, Dict],
@@ -42,48 +49,89 @@ class SqlalchemyUtil:
         :param transform_case: 转换得到的结果形式，可选的有'no_case'(不转换)、'snake_to_camel'(下划线转小驼峰)、'camel_to_snake'(小驼峰转下划线)，默认为'no_case'
         :return: 字典结果
         """
-        global base_dict
         if isinstance(obj, Base):
-            base_dict = obj.__dict__.copy()
-            base_dict.pop('_sa_instance_state', None)
+            return cls.get_serializer(type(obj), transform_case)(obj)
         elif isinstance(obj, dict):
-            base_dict = obj.copy()
+            return cls.__dict_to_dict(obj, transform_case)
+
+        return obj
+
+    @classmethod
+    def get_serializer(
+        cls, model: type, transform_case: Literal['no_case', 'snake_to_camel', 'camel_to_snake'] = 'no_case'
+    ) -> Callable[[Base], dict]:
+        """
+        获取sqlalchemy模型对应的序列化函数，首次获取时编译并缓存
+
+        :param model: sqlalchemy模型类
+        :param transform_case: 转换得到的结果形式，可选的有'no_case'(不转换)、'snake_to_camel'(下划线转小驼峰)、'camel_to_snake'(小驼峰转下划线)，默认为'no_case'
+        :return: 序列化函数，入参为模型对象，返回字典结果
+        """
+        serializer = cls.serializer_cache.get((model, transform_case))
+        if serializer is None:
+            serializer = cls.__compile_serializer(model, transform_case)
+            cls.serializer_cache[(model, transform_case)] = serializer
+
+        return serializer
+
+    @classmethod
+    def __compile_serializer(cls, model: type, transform_case: str) -> Callable[[Base], dict]:
+        """
+        工具方法：编译sqlalchemy模型对应的序列化函数
+
+        :param model: sqlalchemy模型类
+        :param transform_case: 转换得到的结果形式
+        :return: 序列化函数
+        """
+        mapper = sa_inspect(model)
+        column_items = tuple((attr.key, transform_key(attr.key, transform_case)) for attr in mapper.column_attrs)
+        relation_items = tuple((attr.key, transform_key(attr.key, transform_case)) for attr in mapper.relationships)
+        known_keys = frozenset(key for key, _ in column_items + relation_items) | {'_sa_instance_state'}
+        # 不转换键名时关联对象保持原样，与原有行为一致
+        if transform_case == 'no_case':
+            def convert_value(value):
+                return value
         else:
-            return obj
-        if transform_case == 'snake_to_camel':
-            temp_dict: dict = {}
-            for k, v in base_dict.items():
-                if isinstance(v, Base):
-                    temp_v = cls.base_to_dict(v, transform_case)
-                    temp_dict[CamelCaseUtil.snake_to_camel(k)] = temp_v
-                elif isinstance(v, dict):
-                    temp_v = cls.base_to_dict(v, transform_case)
-                    temp_dict[CamelCaseUtil.snake_to_camel(k)] = temp_v
-                elif isinstance(v, list):
-                    temp_v = [cls.base_to_dict(v_item, transform_case) for v_item in v]
-                    temp_dict[CamelCaseUtil.snake_to_camel(k)] = temp_v
-                else:
-                    temp_dict[CamelCaseUtil.snake_to_camel(k)] = v
-            return temp_dict
-            # return {CamelCaseUtil.snake_to_camel(k): v for k, v in base_dict.items()}
-        elif transform_case == 'camel_to_snake':
-            temp_dict: dict = {}
-            for k, v in base_dict.items():
-                if isinstance(v, Base):
-                    temp_v = cls.base_to_dict(v, transform_case)
-                    temp_dict[SnakeCaseUtil.camel_to_snake(k)] = temp_v
-                elif isinstance(v, dict):
-                    temp_v = cls.base_to_dict(v, transform_case)
-                    temp_dict[SnakeCaseUtil.camel_to_snake(k)] = temp_v
-                elif isinstance(v, list):
-                    temp_v = [cls.base_to_dict(v_item, transform_case) for v_item in v]
-                    temp_dict[SnakeCaseUtil.camel_to_snake(k)] = temp_v
-                else:
-                    temp_dict[SnakeCaseUtil.camel_to_snake(k)] = v
-            return temp_dict
-            # return {SnakeCaseUtil.camel_to_snake(k): v for k, v in base_dict.items()}
-
-        return base_dict
+            def convert_value(value):
+                return cls.serialize_result(value, transform_case)
+
+        def serializer(obj: Base) -> dict:
+            obj_dict = obj.__dict__
+            # 未加载的列（延迟加载或已过期）不在属性字典中，与原有行为一致不输出
+            result = {result_key: obj_dict[key] for key, result_key in column_items if key in obj_dict}
+            loaded_count = len(result) + 1
+            for key, result_key in relation_items:
+                if key in obj_dict:
+                    result[result_key] = convert_value(obj_dict[key])
+                    loaded_count += 1
+            if len(obj_dict) > loaded_count:
+                # 运行时额外设置的非映射属性
+                for key, value in obj_dict.items():
+                    if key not in known_keys:
+                        result[transform_key(key, transform_case)] = convert_value(value)
+
+            return result
+
+        return serializer
+
+    @classmethod
+    def __dict_to_dict(cls, obj: dict, transform_case: str) -> dict:
+        """
+        工具方法：转换普通字典的键名并递归序列化其中的模型对象、字典及列表
+
+        :param obj: 普通字典
+        :param transform_case: 转换得到的结果形式
+        :return: 字典结果
+        """
+        if transform_case == 'no_case':
+            return obj.copy()
+        result = {}
+        for key, value in obj.items():
+            if isinstance(value, (Base, dict, list)):
+                value = cls.serialize_result(value, transform_case)
+            result[transform_key(key, transform_case)] = value
+
+        return result
 
     @classmethod
     def serialize_result(
@@ -96,22 +144,28 @@ class SqlalchemyUtil:
         :param transform_case: 转换得到的结果形式，可选的有'no_case'(不转换)、'snake_to_camel'(下划线转小驼峰)、'camel_to_snake'(小驼峰转下划线)，默认为'no_case'
         :return: 序列化结果
         """
-        if isinstance(result, (Base, dict)):
-            return cls.base_to_dict(result, transform_case)
+        if isinstance(result, Base):
+            return cls.get_serializer(type(result), transform_case)(result)
+        elif isinstance(result, dict):
+            return cls.__dict_to_dict(result, transform_case)
         elif isinstance(result, list):
+            if result and isinstance(result[0], Base):
+                # 同一查询结果列表中的模型对象通常属于同一模型，复用序列化函数
+                model = type(result[0])
+                serializer = cls.get_serializer(model, transform_case)
+                return [
+                    serializer(row) if type(row) is model else cls.serialize_result(row, transform_case)
+                    for row in result
+                ]
             return [cls.serialize_result(row, transform_case) for row in result]
         elif isinstance(result, Row):
-            if all([isinstance(row, Base) for row in result]):
-                return [cls.base_to_dict(row, transform_case) for row in result]
-            elif any([isinstance(row, Base) for row in result]):
+            if any(isinstance(row, Base) for row in result):
                 return [cls.serialize_result(row, transform_case) for row in result]
             else:
                 result_dict = result._asdict()
-                if transform_case == 'snake_to_camel':
-                    return {CamelCaseUtil.snake_to_camel(k): v for k, v in result_dict.items()}
-                elif transform_case == 'camel_to_snake':
-                    return {SnakeCaseUtil.camel_to_snake(k): v for k, v in result_dict.items()}
-                return result_dict
+                if transform_case == 'no_case':
+                    return result_dict
+                return {transform_key(k, transform_case): v for k, v in result_dict.items()}
         return result
 
 
@@ -181,6 +235,23 @@ class SnakeCaseUtil:
         return SqlalchemyUtil.serialize_result(result=result, transform_case='camel_to_snake')
 
 
+@lru_cache(maxsize=4096)
+def transform_key(key: str, transform_case: Literal['no_case', 'snake_to_camel', 'camel_to_snake']):
+    """
+    按转换形式转换字段名，结果缓存以避免对每一行重复转换
+
+    :param key: 字段名
+    :param transform_case: 转换得到的结果形式，可选的有'no_case'(不转换)、'snake_to_camel'(下划线转小驼峰)、'camel_to_snake'(小驼峰转下划线)
+    :return: 转换后的字段名
+    """
+    if transform_case == 'snake_to_camel':
+        return CamelCaseUtil.snake_to_camel(key)
+    elif transform_case == 'camel_to_snake':
+        return SnakeCaseUtil.camel_to_snake(key)
+
+    return key
+
+
 def bytes2human(n, format_str='%(value).1f%(symbol)s'):
     """Used by various scripts. See:
     http://goo.gl/zeJZl
@@ -0,0 +1,226 @@
+import asyncio
+from collections import defaultdict
+from sqlalchemy import event, func, select, Select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import True_
+from sqlalchemy.sql.util import find_tables
+from typing import Awaitable, Callable, Collection, Dict, Optional, Set, Tuple
+from config.env import AppConfig
+from utils.cache_util import LocalCache
+from utils.log_util import logger
+
+
+class CountCacheUtil:
+    """
+    分页总记录数缓存工具类
+
+    以去除分页及排序后的计数语句（包含数据权限条件）及其参数作为缓存键，并附带所涉及各表的写入版本号；
+    会话中对某表执行新增、修改、删除时以及事务提交后递增该表版本号，使相关缓存自然失效。事务提交后写入的表名经由
+    缓存失效频道广播，其他工作进程收到后递增本进程内的版本号。允许估算的查询仅在无筛选条件且使用表统计信息估算行数时
+    不附带版本号，按过期时间刷新，其余情况仍按写入版本号失效
+    """
+
+    CACHE_KEY = 'count_cache'
+
+    count_cache = LocalCache(max_size=2048, ttl=AppConfig.app_page_count_cache_expire_seconds)
+    table_versions: Dict[str, int] = defaultdict(int)
+    invalidate_publisher: Optional[Callable[..., Awaitable]] = None
+    publish_tasks: Set[asyncio.Task] = set()
+
+    @classmethod
+    def bump_table_version(cls, table_name: str):
+        """
+        递增表的写入版本号，使该表相关的总记录数缓存失效
+
+        :param table_name: 表名
+        :return:
+        """
+        cls.table_versions[table_name] += 1
+
+    @classmethod
+    def set_invalidate_publisher(cls, publisher: Optional[Callable[..., Awaitable]]):
+        """
+        设置向其他工作进程广播失效消息的方法
+
+        :param publisher: 以失效的缓存键名为参数的异步方法，为None时不广播
+        :return:
+        """
+        cls.invalidate_publisher = publisher
+
+    @classmethod
+    def get_table_cache_key(cls, table_name: str):
+        """
+        获取表写入版本号在缓存失效频道中的键名
+
+        :param table_name: 表名
+        :return: 键名，如count_cache:sys_user
+        """
+        return f'{cls.CACHE_KEY}:{table_name}'
+
+    @classmethod
+    def invalidate(cls, cache_key: str):
+        """
+        处理其他工作进程广播的失效消息
+
+        :param cache_key: 失效的缓存键名，为count_cache时清空全部总记录数缓存
+        :return:
+        """
+        if cache_key == cls.CACHE_KEY:
+            cls.count_cache.clear()
+        elif cache_key.startswith(f'{cls.CACHE_KEY}:'):
+            cls.bump_table_version(cache_key[len(cls.CACHE_KEY) + 1 :])
+
+    @classmethod
+    def publish_table_versions(cls, table_names: Collection[str]):
+        """
+        向其他工作进程广播表写入版本号的变更，不在事件循环中执行时（如进程池中的任务）依赖缓存过期时间兜底
+
+        :param table_names: 写入的表名
+        :return:
+        """
+        if not table_names or cls.invalidate_publisher is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(
+            cls.invalidate_publisher(*(cls.get_table_cache_key(table_name) for table_name in table_names))
+        )
+        # 持有任务引用直至完成，避免任务在执行前被回收
+        cls.publish_tasks.add(task)
+        task.add_done_callback(cls.__on_publish_done)
+
+    @classmethod
+    async def get_count(cls, db: AsyncSession, query: Select, approximate: bool = False) -> Tuple[int, bool]:
+        """
+        获取查询语句的总记录数，优先读取缓存
+
+        :param db: orm对象
+        :param query: sqlalchemy查询语句
+        :param approximate: 是否允许估算，允许时无筛选条件的大表使用表统计信息中的估算行数，估算值缓存不随写入失效
+        :return: (总记录数, 是否为估算值)
+        """
+        count_query = select(func.count('*')).select_from(query.order_by(None).limit(None).offset(None).subquery())
+        table_names = sorted({table.name for table in find_tables(query, include_joins=True, include_aliases=True)})
+        compiled = count_query.compile()
+        statement_key = (str(compiled), repr(sorted(compiled.params.items())))
+        if approximate and len(table_names) == 1 and cls.__is_unfiltered(query):
+            # 表统计信息本身不随每次写入更新，估算行数仅按过期时间刷新
+            estimate_key = (*statement_key, 'estimate')
+            cached = cls.count_cache.get(estimate_key)
+            if cached is None:
+                cached = (await cls.__get_estimated_total(db, table_names[0]),)
+                cls.count_cache.set(estimate_key, cached)
+            if cached[0] is not None and cached[0] >= AppConfig.app_page_approximate_count_threshold:
+                return cached[0], True
+        cache_key = (
+            *statement_key,
+            tuple((table_name, cls.table_versions[table_name]) for table_name in table_names),
+        )
+        cached = cls.count_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        result = ((await db.execute(count_query)).scalar(), False)
+        cls.count_cache.set(cache_key, result)
+
+        return result
+
+    @classmethod
+    def __is_unfiltered(cls, query: Select):
+        """
+        工具方法：判断查询语句是否没有任何筛选条件（未传入的筛选条件在dao中以True占位）
+
+        :param query: sqlalchemy查询语句
+        :return: 是否没有筛选条件
+        """
+        where_clause = query.whereclause
+
+        return where_clause is None or isinstance(where_clause, True_)
+
+    @classmethod
+    async def __get_estimated_total(cls, db: AsyncSession, table_name: str) -> Optional[int]:
+        """
+        工具方法：从数据库表统计信息中读取估算行数
+
+        :param db: orm对象
+        :param table_name: 表名
+        :return: 估算行数，不支持的数据库返回None
+        """
+        dialect_name = db.bind.dialect.name
+        if dialect_name == 'mysql':
+            statement = text(
+                'SELECT TABLE_ROWS FROM information_schema.TABLES '
+                'WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name'
+            )
+        elif dialect_name == 'postgresql':
+            statement = text('SELECT reltuples::bigint FROM pg_class WHERE relname = :table_name')
+        else:
+            return None
+        estimated_total = (await db.execute(statement, {'table_name': table_name})).scalar()
+
+        return int(estimated_total) if estimated_total is not None and estimated_total >= 0 else None
+
+    @classmethod
+    def __on_publish_done(cls, task: asyncio.Task):
+        """
+        工具方法：广播任务完成后释放引用并记录异常
+
+        :param task: 广播任务
+        :return:
+        """
+        cls.publish_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f'总记录数缓存失效消息发布失败，详细错误信息：{task.exception()}')
+
+
+WRITTEN_TABLES_KEY = 'count_cache_written_tables'
+
+
+def mark_tables_written(session: Session, table_names):
+    """
+    递增写入表的版本号并记录于会话中，待事务提交后再次递增，避免提交前读取到的旧总记录数被缓存
+    """
+    written_tables = session.info.setdefault(WRITTEN_TABLES_KEY, set())
+    for table_name in table_names:
+        CountCacheUtil.bump_table_version(table_name)
+        written_tables.add(table_name)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def bump_table_version_on_execute(orm_execute_state):
+    """
+    会话执行批量新增、修改、删除语句时递增对应表的写入版本号
+    """
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        if table is not None and getattr(table, 'name', None):
+            mark_tables_written(orm_execute_state.session, [table.name])
+
+
+@event.listens_for(Session, 'after_flush')
+def bump_table_version_on_flush(session, flush_context):
+    """
+    会话刷新新增、修改、删除的模型对象时递增对应表的写入版本号
+    """
+    mark_tables_written(session, {obj.__table__.name for obj in (*session.new, *session.dirty, *session.deleted)})
+
+
+@event.listens_for(Session, 'after_commit')
+def bump_table_version_on_commit(session):
+    """
+    事务提交后再次递增本事务写入表的版本号，并广播给其他工作进程
+    """
+    written_tables = session.info.pop(WRITTEN_TABLES_KEY, ())
+    for table_name in written_tables:
+        CountCacheUtil.bump_table_version(table_name)
+    CountCacheUtil.publish_table_versions(written_tables)
+
+
+@event.listens_for(Session, 'after_rollback')
+def clear_written_tables_on_rollback(session):
+    """
+    事务回滚后清除本事务写入表的记录
+    """
+    session.info.pop(WRITTEN_TABLES_KEY, None)
@@ -0,0 +1,283 @@
+import asyncio
+import csv
+import io
+import json
+import tempfile
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from sqlalchemy import ColumnElement, inspect, Select, UnaryExpression
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
+from config.database import AsyncSessionLocal
+from config.enums import RedisInitKeyConfig
+from utils.log_util import logger
+
+
+class ExportColumn:
+    """
+    导出列定义，各模块声明一次即可复用于全部导出格式
+    """
+
+    def __init__(
+        self,
+        column: Any,
+        label: str,
+        options: Optional[Dict[str, str]] = None,
+        default_label: Optional[str] = None,
+        dict_type: Optional[str] = None,
+    ):
+        """
+        导出列定义
+
+        :param column: 导出字段对应的sqlalchemy模型字段
+        :param label: 导出文件中的列名
+        :param options: 取值与显示文本的映射，键为取值的字符串形式
+        :param default_label: 取值不在映射中时的显示文本，为None时显示原值
+        :param dict_type: 字典类型，导出时从字典缓存中读取取值与字典标签的映射并合并到options
+        """
+        self.column = column
+        self.label = label
+        self.options = options or {}
+        self.default_label = default_label
+        self.dict_type = dict_type
+
+
+class ExportRowConverter:
+    """
+    导出行转换器，按导出列定义将查询结果行转换为导出值
+    """
+
+    def __init__(self, columns: List[ExportColumn], dict_options: Dict[str, Dict[str, str]]):
+        """
+        导出行转换器
+
+        :param columns: 导出列定义列表
+        :param dict_options: 字典类型与取值显示文本映射的对应关系
+        """
+        self.converters = []
+        for column in columns:
+            options = {**dict_options.get(column.dict_type, {}), **column.options} if column.dict_type else column.options
+            self.converters.append((options, column.default_label) if options or column.default_label else None)
+
+    def convert(self, row) -> list:
+        """
+        转换一行查询结果
+
+        :param row: 查询结果行
+        :return: 导出值列表
+        """
+        values = []
+        for value, converter in zip(row, self.converters):
+            if converter is not None:
+                options, default_label = converter
+                label = options.get(str(value))
+                if label is not None:
+                    value = label
+                elif default_label is not None:
+                    value = default_label
+            values.append(value)
+
+        return values
+
+
+class XlsxExportWriter:
+    """
+    xlsx导出写入器，使用openpyxl只写模式，行数据写入临时文件，内存占用与导出行数无关
+    """
+
+    media_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+    def __init__(self, headers: List[str]):
+        self.workbook = Workbook(write_only=True)
+        self.worksheet = self.workbook.create_sheet()
+        self.worksheet.append(headers)
+        self.output = None
+
+    def write_rows(self, rows: List[list]) -> bytes:
+        for row in rows:
+            self.worksheet.append(
+                [ILLEGAL_CHARACTERS_RE.sub('', value) if isinstance(value, str) else value for value in row]
+            )
+
+        return b''
+
+    def finish(self):
+        self.output = tempfile.TemporaryFile()
+        self.workbook.save(self.output)
+        self.output.seek(0)
+
+        return self.output
+
+    def close(self):
+        if self.output is not None:
+            self.output.close()
+
+
+class CsvExportWriter:
+    """
+    csv导出写入器，每批数据直接编码为字节块输出，带BOM以便Excel正确识别utf-8编码
+    """
+
+    media_type = 'text/csv'
+
+    def __init__(self, headers: List[str]):
+        self.headers = headers
+        self.header_written = False
+
+    def write_rows(self, rows: List[list]) -> bytes:
+        buffer = io.StringIO()
+        if not self.header_written:
+            buffer.write('\ufeff')
+            csv.writer(buffer).writerow(self.headers)
+            self.header_written = True
+        csv.writer(buffer).writerows(rows)
+
+        return buffer.getvalue().encode('utf-8')
+
+    def finish(self):
+        return None
+
+    def close(self):
+        pass
+
+
+class ExportUtil:
+    """
+    流式导出工具类
+
+    通过服务端游标分批读取查询结果，在工作线程中转换并写入xlsx只写工作簿或csv，以分块流的形式返回，
+    导出期间内存占用恒定且不阻塞事件循环
+    """
+
+    BATCH_SIZE = 1000
+    CHUNK_SIZE = 64 * 1024
+
+    @classmethod
+    def get_media_type(cls, file_format: Literal['xlsx', 'csv'] = 'xlsx'):
+        """
+        获取导出文件格式对应的响应内容类型
+
+        :param file_format: 导出文件格式
+        :return: 响应内容类型
+        """
+        return CsvExportWriter.media_type if file_format == 'csv' else XlsxExportWriter.media_type
+
+    @classmethod
+    async def stream_export(
+        cls,
+        redis,
+        query: Select,
+        columns: List[ExportColumn],
+        file_format: Literal['xlsx', 'csv'] = 'xlsx',
+    ) -> AsyncIterator[bytes]:
+        """
+        按导出列定义流式导出查询结果
+
+        :param redis: redis对象，用于读取字典缓存
+        :param query: 列表查询语句，查询条件及排序保持不变，查询列替换为导出列，并在末尾补充主键及排序字段
+        :param columns: 导出列定义列表
+        :param file_format: 导出文件格式，可选的有'xlsx'、'csv'，默认为'xlsx'
+        :return: 导出文件的二进制数据流
+        """
+        dict_options = {}
+        for dict_type in {column.dict_type for column in columns if column.dict_type}:
+            dict_options[dict_type] = await cls.__get_dict_options(redis, dict_type)
+        converter = ExportRowConverter(columns, dict_options)
+        export_query = query.with_only_columns(
+            *[column.column for column in columns], *cls.__get_extra_columns(query, columns)
+        ).execution_options(yield_per=cls.BATCH_SIZE)
+        headers = [column.label for column in columns]
+        writer = CsvExportWriter(headers) if file_format == 'csv' else XlsxExportWriter(headers)
+
+        return cls.__stream(export_query, converter, writer)
+
+    @classmethod
+    def __get_extra_columns(cls, query: Select, columns: List[ExportColumn]) -> List[Any]:
+        """
+        工具方法：获取导出列之外需要补充查询的主键及排序字段
+
+        列表查询通常带有distinct及排序，仅查询导出列时，distinct会合并导出列取值相同的不同记录，
+        MySQL也不允许按未查询的字段排序；补充的字段位于导出列之后，转换导出行时按导出列数量截断
+
+        :param query: 列表查询语句
+        :param columns: 导出列定义列表
+        :return: 需要补充查询的字段列表
+        """
+        extra_columns = []
+        entity = query.column_descriptions[0].get('entity') if query.column_descriptions else None
+        if entity is not None:
+            extra_columns.extend(inspect(entity).primary_key)
+        for clause in query._order_by_clauses:
+            element = clause.element if isinstance(clause, UnaryExpression) else clause
+            if isinstance(element, ColumnElement):
+                extra_columns.append(element)
+        selected_keys = {
+            (getattr(column.column, 'table', None), getattr(column.column, 'key', None)) for column in columns
+        }
+        result = []
+        for column in extra_columns:
+            column_key = (getattr(column, 'table', None), getattr(column, 'key', None))
+            if column_key not in selected_keys:
+                selected_keys.add(column_key)
+                result.append(column)
+
+        return result
+
+    @classmethod
+    async def __stream(cls, query: Select, converter: ExportRowConverter, writer) -> AsyncIterator[bytes]:
+        """
+        工具方法：分批读取查询结果并生成导出文件数据块
+
+        :param query: 导出查询语句
+        :param converter: 导出行转换器
+        :param writer: 导出写入器
+        :return: 导出文件的二进制数据流
+        """
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await session.stream(query)
+                async for partition in result.partitions(cls.BATCH_SIZE):
+                    chunk = await asyncio.to_thread(cls.__write_partition, converter, writer, partition)
+                    if chunk:
+                        yield chunk
+            # csv未查询到数据时仍需输出表头
+            chunk = await asyncio.to_thread(writer.write_rows, []) if isinstance(writer, CsvExportWriter) else b''
+            if chunk:
+                yield chunk
+            output = await asyncio.to_thread(writer.finish)
+            if output is not None:
+                while chunk := await asyncio.to_thread(output.read, cls.CHUNK_SIZE):
+                    yield chunk
+        except Exception as e:
+            logger.exception(f'流式导出失败，详细错误信息：{e}')
+            raise e
+        finally:
+            writer.close()
+
+    @classmethod
+    def __write_partition(cls, converter: ExportRowConverter, writer, partition) -> bytes:
+        """
+        工具方法：在工作线程中转换并写入一批查询结果
+
+        :param converter: 导出行转换器
+        :param writer: 导出写入器
+        :param partition: 一批查询结果
+        :return: 本批次产生的数据块
+        """
+        return writer.write_rows([converter.convert(row) for row in partition])
+
+    @classmethod
+    async def __get_dict_options(cls, redis, dict_type: str) -> Dict[str, str]:
+        """
+        工具方法：从字典缓存中读取取值与字典标签的映射
+
+        :param redis: redis对象
+        :param dict_type: 字典类型
+        :return: 取值与字典标签的映射
+        """
+        if redis is None:
+            return {}
+        dict_data_list = await redis.get(f'{RedisInitKeyConfig.SYS_DICT.key}:{dict_type}')
+        if not dict_data_list:
+            return {}
+
+        return {str(item.get('dictValue')): item.get('dictLabel') for item in json.loads(dict_data_list)}
@@ -0,0 +1,186 @@
+import ipaddress
+import re
+from bisect import bisect_right
+from typing import List, Optional, Tuple, Union
+from utils.log_util import logger
+
+
+IpAddress = Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
+
+
+class IpFilter:
+    """
+    编译后的IP过滤规则，IPv4及IPv6规则分别转换为按起始地址排序且互不重叠的区间，匹配时二分查找，时间复杂度为O(log n)
+    """
+
+    def __init__(self, intervals: List[Tuple[int, int, int]]):
+        """
+        编译后的IP过滤规则
+
+        :param intervals: (IP版本, 起始地址, 结束地址)列表
+        """
+        self.starts = {4: [], 6: []}
+        self.ends = {4: [], 6: []}
+        for version in (4, 6):
+            for start, end in self.__merge(sorted((s, e) for v, s, e in intervals if v == version)):
+                self.starts[version].append(start)
+                self.ends[version].append(end)
+
+    def __len__(self):
+        return len(self.starts[4]) + len(self.starts[6])
+
+    def match(self, ip: Optional[str]) -> bool:
+        """
+        判断IP是否命中过滤规则
+
+        :param ip: IP地址
+        :return: 是否命中
+        """
+        address = IpFilterUtil.parse_ip(ip)
+        if address is None:
+            return False
+        starts = self.starts[address.version]
+        index = bisect_right(starts, int(address)) - 1
+
+        return index >= 0 and int(address) <= self.ends[address.version][index]
+
+    @staticmethod
+    def __merge(intervals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """
+        工具方法：合并已排序的重叠或相邻区间
+
+        :param intervals: 按起始地址排序的区间列表
+        :return: 合并后的区间列表
+        """
+        merged = []
+        for start, end in intervals:
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+
+        return merged
+
+
+class IpFilterUtil:
+    """
+    IP过滤规则工具类
+
+    规则之间以逗号、分号或空白分隔，支持单个IP、CIDR网段（如10.0.0.0/8、2001:db8::/32）、
+    地址范围（如10.0.0.1-10.0.0.100）及IPv4末尾通配（如192.168.1.*、10.*）；
+    编译结果按规则原文缓存，参数配置变更后首次匹配时重新编译
+    """
+
+    SEPARATOR_RE = re.compile(r'[\s,;]+')
+    compiled: Optional[Tuple[str, IpFilter]] = None
+
+    @classmethod
+    def get_filter(cls, rules: Optional[str]) -> IpFilter:
+        """
+        获取规则原文对应的编译结果，规则未变化时直接返回缓存的编译结果
+
+        :param rules: 规则原文
+        :return: 编译后的IP过滤规则
+        """
+        rules = rules or ''
+        compiled = cls.compiled
+        if compiled is not None and compiled[0] is rules:
+            return compiled[1]
+        ip_filter = compiled[1] if compiled is not None and compiled[0] == rules else cls.compile(rules)
+        # 记录本次的规则原文对象，规则未变化时后续只需比较对象是否相同
+        cls.compiled = (rules, ip_filter)
+
+        return ip_filter
+
+    @classmethod
+    def compile(cls, rules: Optional[str]) -> IpFilter:
+        """
+        编译IP过滤规则，无法解析的规则记录警告后忽略
+
+        :param rules: 规则原文
+        :return: 编译后的IP过滤规则
+        """
+        intervals = []
+        for rule in cls.SEPARATOR_RE.split(rules or ''):
+            if not rule:
+                continue
+            interval = cls.__parse_rule(rule)
+            if interval is None:
+                logger.warning(f'IP过滤规则{rule}格式不正确，已忽略')
+            else:
+                intervals.append(interval)
+
+        return IpFilter(intervals)
+
+    @classmethod
+    def parse_ip(cls, ip: Optional[str]) -> Optional[IpAddress]:
+        """
+        解析IP地址，IPv4映射的IPv6地址转换为IPv4地址
+
+        :param ip: IP地址，可以为X-Forwarded-For格式
+        :return: IP地址对象，无法解析时返回None
+        """
+        ip = ip.split(',')[0].strip() if ip else ''
+        if not ip:
+            return None
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return None
+        if address.version == 6 and address.ipv4_mapped is not None:
+            return address.ipv4_mapped
+
+        return address
+
+    @classmethod
+    def __parse_rule(cls, rule: str) -> Optional[Tuple[int, int, int]]:
+        """
+        工具方法：将单条规则解析为(IP版本, 起始地址, 结束地址)
+
+        :param rule: 单条规则
+        :return: 规则对应的区间，无法解析时返回None
+        """
+        if '*' in rule:
+            return cls.__parse_wildcard(rule)
+        if '/' in rule:
+            try:
+                network = ipaddress.ip_network(rule, strict=False)
+            except ValueError:
+                return None
+            return network.version, int(network.network_address), int(network.broadcast_address)
+        if '-' in rule:
+            start, _, end = rule.partition('-')
+            start_address, end_address = cls.parse_ip(start), cls.parse_ip(end)
+            if start_address is None or end_address is None or start_address.version != end_address.version:
+                return None
+            return start_address.version, *sorted((int(start_address), int(end_address)))
+        address = cls.parse_ip(rule)
+        if address is None:
+            return None
+
+        return address.version, int(address), int(address)
+
+    @classmethod
+    def __parse_wildcard(cls, rule: str) -> Optional[Tuple[int, int, int]]:
+        """
+        工具方法：解析IPv4末尾通配规则，如192.168.1.*、10.*
+
+        :param rule: 通配规则
+        :return: 规则对应的区间，通配符不在末尾等无法解析时返回None
+        """
+        parts = rule.split('.')
+        if len(parts) > 4:
+            return None
+        parts.extend(['*'] * (4 - len(parts)))
+        prefix = []
+        for index, part in enumerate(parts):
+            if part == '*':
+                if any(item != '*' for item in parts[index:]):
+                    return None
+                break
+            if not part.isdigit() or int(part) > 255:
+                return None
+            prefix.append(part)
+        network = ipaddress.ip_network(f"{'.'.join(prefix + ['0'] * (4 - len(prefix)))}/{len(prefix) * 8}")
+
+        return 4, int(network.network_address), int(network.broadcast_address)
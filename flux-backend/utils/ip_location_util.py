@@ -0,0 +1,349 @@
+import asyncio
+import httpx
+import ipaddress
+import mmap
+import os
+import struct
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Tuple
+from config.enums import RedisInitKeyConfig
+from config.env import AppConfig
+from utils.cache_util import LocalCache
+from utils.log_util import logger
+
+
+INNER_IP_LOCATION = '内网IP'
+UNKNOWN_IP_LOCATION = '未知'
+
+
+class IpLocationBackend(ABC):
+    """
+    IP归属区域查询后端基类
+    """
+
+    name = 'base'
+
+    @abstractmethod
+    async def lookup(self, ip: str) -> Optional[str]:
+        """
+        查询ip归属区域
+
+        :param ip: 需要查询的ip
+        :return: ip归属区域，查询不到时返回None
+        """
+
+    async def close(self):
+        """
+        释放后端占用的资源
+
+        :return:
+        """
+        pass
+
+
+class OfflineIpLocationBackend(IpLocationBackend):
+    """
+    IP归属区域离线库查询后端
+
+    离线库为按起始ip升序排列的二进制区间文件，通过内存映射读取并二分查找，文件格式：
+    文件头（8字节魔数 + 4字节区间数量）、区间记录（起始ip、结束ip、归属区域偏移量，各4字节）、
+    归属区域字符串池（2字节长度 + utf-8内容），
+    均为大端字节序，可使用build_ip_range_file由(起始ip, 结束ip, 归属区域)列表生成
+    """
+
+    name = 'offline'
+    MAGIC = b'FLXIPDB1'
+    HEADER = struct.Struct('>8sI')
+    RECORD = struct.Struct('>III')
+    LENGTH = struct.Struct('>H')
+
+    def __init__(self, file_path: str):
+        """
+        IP归属区域离线库查询后端
+
+        :param file_path: 离线库文件路径
+        """
+        self.file_path = file_path
+        with open(file_path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = self.HEADER.unpack_from(self.mm, 0)
+        if magic != self.MAGIC:
+            self.mm.close()
+            raise ValueError(f'IP归属区域离线库文件{file_path}格式不正确')
+        self.pool_offset = self.HEADER.size + self.count * self.RECORD.size
+
+    def search(self, ip: str) -> Optional[str]:
+        """
+        在离线库中二分查找ip所在区间的归属区域
+
+        :param ip: 需要查询的ip
+        :return: ip归属区域，查询不到时返回None
+        """
+        try:
+            ip_address = ipaddress.ip_address(ip)
+        except ValueError:
+            return None
+        if ip_address.version != 4:
+            return None
+        ip_value = int(ip_address)
+        low, high = 0, self.count - 1
+        while low <= high:
+            middle = (low + high) // 2
+            start_ip, end_ip, location_offset = self.RECORD.unpack_from(
+                self.mm, self.HEADER.size + middle * self.RECORD.size
+            )
+            if ip_value < start_ip:
+                high = middle - 1
+            elif ip_value > end_ip:
+                low = middle + 1
+            else:
+                offset = self.pool_offset + location_offset
+                (length,) = self.LENGTH.unpack_from(self.mm, offset)
+                start = offset + self.LENGTH.size
+                return self.mm[start : start + length].decode('utf-8')
+
+        return None
+
+    async def lookup(self, ip: str) -> Optional[str]:
+        return self.search(ip)
+
+    async def close(self):
+        self.mm.close()
+
+
+class HttpIpLocationBackend(IpLocationBackend):
+    """
+    IP归属区域在线接口查询后端
+    """
+
+    name = 'network'
+
+    def __init__(self, api_url: str, timeout: float):
+        """
+        IP归属区域在线接口查询后端
+
+        :param api_url: 查询接口地址，使用{ip}作为ip占位符
+        :param timeout: 查询超时时间（单位：秒）
+        """
+        self.api_url = api_url
+        self.client = httpx.AsyncClient(timeout=timeout)
+
+    async def lookup(self, ip: str) -> Optional[str]:
+        ip_result = await self.client.get(self.api_url.format(ip=ip))
+        if ip_result.status_code == 200:
+            data = ip_result.json().get('data') or {}
+            prov = data.get('prov')
+            city = data.get('city')
+            if prov or city:
+                return f'{prov}-{city}'
+
+        return None
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class IpLocationUtil:
+    """
+    IP归属区域查询工具类
+
+    依次查询进程内缓存、redis缓存及已注册的查询后端（默认为离线库、在线接口），查询结果写回两级缓存
+    """
+
+    local_cache = LocalCache(max_size=10000, ttl=600)
+    backends: List[IpLocationBackend] = []
+    pending_tasks: Dict[str, asyncio.Task] = {}
+    initialized = False
+
+    @classmethod
+    def register_backend(cls, backend: IpLocationBackend):
+        """
+        注册IP归属区域查询后端，按注册顺序依次查询
+
+        :param backend: 查询后端对象
+        :return:
+        """
+        cls.backends.append(backend)
+
+    @classmethod
+    def init_backends(cls):
+        """
+        根据应用配置初始化默认的查询后端
+
+        :return:
+        """
+        if cls.initialized:
+            return
+        cls.initialized = True
+        if AppConfig.app_ip_location_offline_path:
+            if os.path.exists(AppConfig.app_ip_location_offline_path):
+                cls.register_backend(OfflineIpLocationBackend(AppConfig.app_ip_location_offline_path))
+            else:
+                logger.warning(f'IP归属区域离线库文件{AppConfig.app_ip_location_offline_path}不存在')
+        if AppConfig.app_ip_location_api_url:
+            cls.register_backend(
+                HttpIpLocationBackend(AppConfig.app_ip_location_api_url, AppConfig.app_ip_location_timeout)
+            )
+
+    @classmethod
+    async def close_backends(cls):
+        """
+        应用关闭时释放查询后端占用的资源
+
+        :return:
+        """
+        for task in cls.pending_tasks.values():
+            task.cancel()
+        for backend in cls.backends:
+            await backend.close()
+        cls.backends = []
+        cls.initialized = False
+
+    @classmethod
+    def parse_ip(cls, ip: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """
+        解析ip，内网ip或无法解析的ip直接返回对应的归属区域
+
+        :param ip: 原始ip，可以为X-Forwarded-For格式
+        :return: (需要查询的ip, 无需查询时的归属区域)
+        """
+        ip = ip.split(',')[0].strip() if ip else ''
+        if ip == 'localhost':
+            return None, INNER_IP_LOCATION
+        try:
+            ip_address = ipaddress.ip_address(ip)
+        except ValueError:
+            return None, UNKNOWN_IP_LOCATION
+        if ip_address.is_private or ip_address.is_loopback:
+            return None, INNER_IP_LOCATION
+
+        return ip, None
+
+    @classmethod
+    async def get_cached_ip_location(cls, redis, ip: str) -> Optional[str]:
+        """
+        依次从进程内缓存、离线库及redis缓存查询ip归属区域
+
+        :param redis: redis对象
+        :param ip: 需要查询的ip
+        :return: ip归属区域，未命中时返回None
+        """
+        location = cls.local_cache.get(ip)
+        if location is None:
+            for backend in cls.backends:
+                if isinstance(backend, OfflineIpLocationBackend):
+                    location = backend.search(ip)
+                    if location is not None:
+                        break
+            if location is None and redis is not None:
+                location = await redis.get(f'{RedisInitKeyConfig.IP_LOCATION.key}:{ip}')
+            if location is not None:
+                cls.local_cache.set(ip, location)
+
+        return location
+
+    @classmethod
+    async def get_ip_location(cls, redis, oper_ip: Optional[str]) -> str:
+        """
+        查询ip归属区域，缓存未命中时依次查询各查询后端
+
+        :param redis: redis对象
+        :param oper_ip: 需要查询的ip
+        :return: ip归属区域
+        """
+        ip, location = cls.parse_ip(oper_ip)
+        if location is not None:
+            return location
+        location = await cls.get_cached_ip_location(redis, ip)
+        if location is not None:
+            return location
+        task = cls.pending_tasks.get(ip)
+        if task is None:
+            task = asyncio.create_task(cls.__resolve(redis, ip))
+            cls.pending_tasks[ip] = task
+            task.add_done_callback(lambda _: cls.pending_tasks.pop(ip, None))
+
+        return await asyncio.shield(task)
+
+    @classmethod
+    async def get_ip_location_nowait(cls, redis, oper_ip: Optional[str]) -> Optional[str]:
+        """
+        仅从缓存及离线库查询ip归属区域，未命中时在后台查询并写入缓存，不阻塞当前请求
+
+        :param redis: redis对象
+        :param oper_ip: 需要查询的ip
+        :return: ip归属区域，未命中时返回None
+        """
+        ip, location = cls.parse_ip(oper_ip)
+        if location is not None:
+            return location
+        location = await cls.get_cached_ip_location(redis, ip)
+        if location is None and ip not in cls.pending_tasks:
+            task = asyncio.create_task(cls.__resolve(redis, ip))
+            cls.pending_tasks[ip] = task
+            task.add_done_callback(lambda _: cls.pending_tasks.pop(ip, None))
+
+        return location
+
+    @classmethod
+    async def __resolve(cls, redis, ip: str) -> str:
+        """
+        依次查询各查询后端并写入缓存
+
+        :param redis: redis对象
+        :param ip: 需要查询的ip
+        :return: ip归属区域
+        """
+        location = None
+        for backend in cls.backends:
+            try:
+                location = await backend.lookup(ip)
+            except Exception as e:
+                logger.warning(f'IP归属区域查询后端{backend.name}查询{ip}失败，详细错误信息：{e}')
+            if location is not None:
+                break
+        if location is None:
+            # 查询失败时短暂缓存于进程内，避免重复请求查询后端
+            cls.local_cache.set(ip, UNKNOWN_IP_LOCATION, ttl=60)
+            return UNKNOWN_IP_LOCATION
+        cls.local_cache.set(ip, location)
+        if redis is not None:
+            try:
+                await redis.set(
+                    f'{RedisInitKeyConfig.IP_LOCATION.key}:{ip}',
+                    location,
+                    ex=AppConfig.app_ip_location_cache_expire_seconds,
+                )
+            except Exception as e:
+                logger.warning(f'IP归属区域缓存写入失败，详细错误信息：{e}')
+
+        return location
+
+
+def build_ip_range_file(ip_ranges: Iterable[Tuple[str, str, str]], output_path: str):
+    """
+    根据ip区间列表生成IP归属区域离线库文件
+
+    :param ip_ranges: (起始ip, 结束ip, 归属区域)列表，仅支持ipv4
+    :param output_path: 离线库文件输出路径
+    :return: 写入的区间数量
+    """
+    range_list = sorted(
+        (int(ipaddress.IPv4Address(start_ip)), int(ipaddress.IPv4Address(end_ip)), location)
+        for start_ip, end_ip, location in ip_ranges
+    )
+    location_offsets: Dict[str, int] = {}
+    pool = bytearray()
+    records = bytearray()
+    for start_ip, end_ip, location in range_list:
+        if location not in location_offsets:
+            location_offsets[location] = len(pool)
+            location_bytes = location.encode('utf-8')
+            pool += OfflineIpLocationBackend.LENGTH.pack(len(location_bytes)) + location_bytes
+        records += OfflineIpLocationBackend.RECORD.pack(start_ip, end_ip, location_offsets[location])
+    with open(output_path, 'wb') as f:
+        f.write(OfflineIpLocationBackend.HEADER.pack(OfflineIpLocationBackend.MAGIC, len(range_list)))
+        f.write(records)
+        f.write(pool)
+
+    return len(range_list)
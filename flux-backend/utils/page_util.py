@@ -1,10 +1,18 @@
+import base64
+import json
 import math
+from datetime import date, datetime
+from decimal import Decimal
 from pydantic import BaseModel, ConfigDict
 from pydantic.alias_generators import to_camel
-from sqlalchemy import func, select, Select
+from sqlalchemy import and_, false, inspect, or_, Select, UnaryExpression
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional, List
+from sqlalchemy.sql import operators
+from typing import Any, List, Optional, Tuple
+from config.database import Base
+from exceptions.exception import ServiceException
 from utils.common_util import CamelCaseUtil
+from utils.count_cache_util import CountCacheUtil
 
 
 class PageResponseModel(BaseModel):
@@ -17,8 +25,10 @@ class PageResponseModel(BaseModel):
     rows: List = []
     page_num: Optional[int] = None
     page_size: Optional[int] = None
-    total: int
+    total: Optional[int] = None
+    total_approximate: Optional[bool] = None
     has_next: Optional[bool] = None
+    next_cursor: Optional[str] = None
 
 
 class PageUtil:
@@ -51,7 +61,17 @@ class PageUtil:
         return result
 
     @classmethod
-    async def paginate(cls, db: AsyncSession, query: Select, page_num: int, page_size: int, is_page: bool = False):
+    async def paginate(
+        cls,
+        db: AsyncSession,
+        query: Select,
+        page_num: int,
+        page_size: int,
+        is_page: bool = False,
+        cursor: Optional[str] = None,
+        skip_total: bool = False,
+        approximate_total: bool = False,
+    ):
         """
         输入查询语句和分页信息，返回分页数据列表结果
 
@@ -60,37 +80,236 @@ class PageUtil:
         :param page_num: 当前页码
         :param page_size: 当前页面数据量
         :param is_page: 是否开启分页
+        :param cursor: 游标分页的游标，为None时使用页码分页，为空字符串时表示游标分页的第一页
+        :param skip_total: 是否跳过总记录数查询，跳过时返回的总记录数为None
+        :param approximate_total: 是否允许总记录数为估算值，适用于持续写入的大表
         :return: 分页数据对象
         """
         if is_page:
-            total = (await db.execute(select(func.count('*')).select_from(query.subquery()))).scalar()
-            query_result = await db.execute(query.offset((page_num - 1) * page_size).limit(page_size))
-            paginated_data = []
-            for row in query_result:
-                if row and len(row) == 1:
-                    paginated_data.append(row[0])
-                else:
-                    paginated_data.append(row)
-            has_next = math.ceil(total / page_size) > page_num
+            if cursor is not None:
+                return await cls.__cursor_paginate(
+                    db, query, page_num, page_size, cursor, skip_total, approximate_total
+                )
+            total, total_approximate = (
+                (None, None) if skip_total else await CountCacheUtil.get_count(db, query, approximate_total)
+            )
+            # 多查询一条记录用于判断是否存在下一页，跳过总记录数查询时依然可以得到是否存在下一页
+            query_result = await db.execute(query.offset((page_num - 1) * page_size).limit(page_size + 1))
+            paginated_data = [cls.__unwrap_row(row) for row in query_result]
+            has_next = len(paginated_data) > page_size
             result = PageResponseModel(
-                rows=CamelCaseUtil.transform_result(paginated_data),
+                rows=CamelCaseUtil.transform_result(paginated_data[:page_size]),
                 pageNum=page_num,
                 pageSize=page_size,
                 total=total,
+                totalApproximate=total_approximate,
                 hasNext=has_next,
             )
         else:
             query_result = await db.execute(query)
-            no_paginated_data = []
-            for row in query_result:
-                if row and len(row) == 1:
-                    no_paginated_data.append(row[0])
-                else:
-                    no_paginated_data.append(row)
+            no_paginated_data = [cls.__unwrap_row(row) for row in query_result]
             result = CamelCaseUtil.transform_result(no_paginated_data)
 
         return result
 
+    @classmethod
+    async def __cursor_paginate(
+        cls,
+        db: AsyncSession,
+        query: Select,
+        page_num: int,
+        page_size: int,
+        cursor: str,
+        skip_total: bool,
+        approximate_total: bool,
+    ):
+        """
+        工具方法：按排序字段进行游标分页，任意一页均通过排序字段上的范围条件定位，查询代价与第一页相同
+
+        :param db: orm对象
+        :param query: sqlalchemy查询语句，必须包含排序条件
+        :param page_num: 当前页码，仅用于原样返回
+        :param page_size: 当前页面数据量
+        :param cursor: 游标，为空字符串时表示第一页
+        :param skip_total: 是否跳过总记录数查询
+        :param approximate_total: 是否允许总记录数为估算值
+        :return: 分页数据对象
+        """
+        order_list = cls.__get_keyset_order(query)
+        signature = cls.__get_order_signature(order_list)
+        total, total_approximate = (
+            (None, None) if skip_total else await CountCacheUtil.get_count(db, query, approximate_total)
+        )
+        keyset_query = query.order_by(None).order_by(
+            *[column.desc() if is_desc else column.asc() for column, is_desc in order_list]
+        )
+        if cursor:
+            cursor_values = cls.decode_cursor(cursor, signature)
+            keyset_query = keyset_query.where(cls.__get_keyset_condition(order_list, cursor_values))
+        # 将排序字段追加到查询列中，用于生成下一页游标
+        keyset_query = keyset_query.add_columns(
+            *[column.label(f'_cursor_{index}') for index, (column, _) in enumerate(order_list)]
+        )
+        query_result = (await db.execute(keyset_query.limit(page_size + 1))).all()
+        has_next = len(query_result) > page_size
+        query_result = query_result[:page_size]
+        cursor_length = len(order_list)
+        paginated_data = [cls.__unwrap_row(row, cursor_length) for row in query_result]
+        next_cursor = (
+            cls.encode_cursor(signature, list(query_result[-1][-cursor_length:])) if has_next and query_result else None
+        )
+
+        return PageResponseModel(
+            rows=CamelCaseUtil.transform_result(paginated_data),
+            pageNum=page_num,
+            pageSize=page_size,
+            total=total,
+            totalApproximate=total_approximate,
+            hasNext=has_next,
+            nextCursor=next_cursor,
+        )
+
+    @classmethod
+    def __get_keyset_order(cls, query: Select) -> List[Tuple[Any, bool]]:
+        """
+        工具方法：获取查询语句的排序字段及排序方向，并在末尾补充主查询模型的主键以保证排序唯一
+
+        :param query: sqlalchemy查询语句
+        :return: (排序字段, 是否降序)列表
+        """
+        order_list = []
+        for clause in query._order_by_clauses:
+            if isinstance(clause, UnaryExpression) and clause.modifier in (operators.desc_op, operators.asc_op):
+                order_list.append((clause.element, clause.modifier is operators.desc_op))
+            else:
+                order_list.append((clause, False))
+        entity = query.column_descriptions[0].get('entity') if query.column_descriptions else None
+        if entity is not None:
+            last_desc = order_list[-1][1] if order_list else False
+            order_columns = [(getattr(column, 'table', None), getattr(column, 'key', None)) for column, _ in order_list]
+            for pk_column in inspect(entity).primary_key:
+                if (pk_column.table, pk_column.key) not in order_columns:
+                    order_list.append((pk_column, last_desc))
+        if not order_list:
+            raise ServiceException(message='游标分页查询必须指定排序字段')
+
+        return order_list
+
+    @classmethod
+    def __get_order_signature(cls, order_list: List[Tuple[Any, bool]]) -> str:
+        """
+        工具方法：根据排序字段生成签名，用于校验游标与当前查询的排序是否一致
+
+        :param order_list: (排序字段, 是否降序)列表
+        :return: 排序签名
+        """
+        return ','.join(
+            f'{getattr(column, "key", str(column))}:{"d" if is_desc else "a"}' for column, is_desc in order_list
+        )
+
+    @classmethod
+    def __get_keyset_condition(cls, order_list: List[Tuple[Any, bool]], values: List[Any]):
+        """
+        工具方法：生成定位到游标之后记录的范围条件，mysql中空值排序最小
+
+        :param order_list: (排序字段, 是否降序)列表
+        :param values: 游标中记录的上一页最后一条记录的排序字段值
+        :return: 范围条件
+        """
+        condition_list = []
+        equal_list = []
+        for (column, is_desc), value in zip(order_list, values):
+            if value is None:
+                after = false() if is_desc else column.is_not(None)
+                equal = column.is_(None)
+            else:
+                after = or_(column < value, column.is_(None)) if is_desc else column > value
+                equal = column == value
+            condition_list.append(and_(*equal_list, after))
+            equal_list.append(equal)
+
+        return or_(*condition_list)
+
+    @classmethod
+    def encode_cursor(cls, signature: str, values: List[Any]) -> str:
+        """
+        将排序签名及排序字段值编码为不透明的游标
+
+        :param signature: 排序签名
+        :param values: 排序字段值列表
+        :return: 游标
+        """
+        payload = json.dumps([signature, [cls.__encode_value(value) for value in values]], separators=(',', ':'))
+
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    @classmethod
+    def decode_cursor(cls, cursor: str, signature: str) -> List[Any]:
+        """
+        解码游标并校验排序签名
+
+        :param cursor: 游标
+        :param signature: 当前查询的排序签名
+        :return: 排序字段值列表
+        """
+        try:
+            payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            cursor_signature, values = json.loads(payload)
+        except (ValueError, TypeError):
+            raise ServiceException(message='分页游标无效')
+        if cursor_signature != signature:
+            raise ServiceException(message='分页游标与当前排序方式不一致，请从第一页重新查询')
+
+        return [cls.__decode_value(value) for value in values]
+
+    @classmethod
+    def __encode_value(cls, value: Any):
+        """
+        工具方法：将排序字段值转换为可json序列化的形式
+        """
+        if isinstance(value, datetime):
+            return {'dt': value.isoformat()}
+        if isinstance(value, date):
+            return {'d': value.isoformat()}
+        if isinstance(value, Decimal):
+            return {'dec': str(value)}
+
+        return value
+
+    @classmethod
+    def __decode_value(cls, value: Any):
+        """
+        工具方法：还原排序字段值
+        """
+        if isinstance(value, dict):
+            if 'dt' in value:
+                return datetime.fromisoformat(value['dt'])
+            if 'd' in value:
+                return date.fromisoformat(value['d'])
+            if 'dec' in value:
+                return Decimal(value['dec'])
+
+        return value
+
+    @classmethod
+    def __unwrap_row(cls, row, cursor_length: int = 0):
+        """
+        工具方法：将查询结果行转换为待序列化的数据，单列结果取出其值，并去除末尾追加的游标字段
+
+        :param row: 查询结果行
+        :param cursor_length: 末尾追加的游标字段数量
+        :return: 待序列化的数据
+        """
+        if not cursor_length:
+            return row[0] if row and len(row) == 1 else row
+        values = row[:-cursor_length]
+        if len(values) == 1:
+            return values[0]
+        if any(isinstance(value, Base) for value in values):
+            return list(values)
+
+        return dict(zip(row._fields[:-cursor_length], values))
+
 
 def get_page_obj(data_list: List, page_num: int, page_size: int):
     """
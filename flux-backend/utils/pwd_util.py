@@ -1,11 +1,19 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
+from config.env import AppConfig
 
 pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
+pwd_executor = ThreadPoolExecutor(max_workers=AppConfig.app_pwd_hash_max_workers, thread_name_prefix='pwd-hash')
+pwd_metrics = dict(pending=0, completed=0, total_wait_ms=0.0, max_wait_ms=0.0)
 
 
 class PwdUtil:
     """
     密码工具类
+
+    bcrypt计算耗时较长，异步方法将其放入有界线程池执行以避免阻塞事件循环，线程数即并发上限
     """
 
     @classmethod
@@ -29,6 +37,68 @@ class PwdUtil:
         """
         return pwd_context.hash(input_password)
 
+    @classmethod
+    async def async_verify_password(cls, plain_password, hashed_password):
+        """
+        工具方法：在密码计算线程池中校验当前输入的密码与数据库存储的密码是否一致
+
+        :param plain_password: 当前输入的密码
+        :param hashed_password: 数据库存储的密码
+        :return: 校验结果
+        """
+        return await cls.__run_in_executor(pwd_context.verify, plain_password, hashed_password)
+
+    @classmethod
+    async def async_get_password_hash(cls, input_password):
+        """
+        工具方法：在密码计算线程池中对当前输入的密码进行加密
+
+        :param input_password: 输入的密码
+        :return: 加密成功的密码
+        """
+        return await cls.__run_in_executor(pwd_context.hash, input_password)
+
+    @classmethod
+    def get_pwd_executor_metrics(cls):
+        """
+        工具方法：获取密码计算线程池的运行指标
+
+        :return: 运行指标字典，耗时单位为毫秒
+        """
+        metrics = dict(pwd_metrics)
+        metrics['avg_wait_ms'] = (
+            round(metrics['total_wait_ms'] / metrics['completed'], 2) if metrics['completed'] else 0
+        )
+        metrics['max_workers'] = AppConfig.app_pwd_hash_max_workers
+
+        return metrics
+
+    @classmethod
+    async def __run_in_executor(cls, func, *args):
+        """
+        在密码计算线程池中执行函数，并记录排队等待时间
+
+        :param func: 需要执行的函数
+        :param args: 函数参数
+        :return: 函数执行结果
+        """
+        submit_time = time.perf_counter()
+
+        def task():
+            return time.perf_counter(), func(*args)
+
+        pwd_metrics['pending'] += 1
+        try:
+            start_time, result = await asyncio.get_running_loop().run_in_executor(pwd_executor, task)
+        finally:
+            pwd_metrics['pending'] -= 1
+        wait_ms = (start_time - submit_time) * 1000
+        pwd_metrics['completed'] += 1
+        pwd_metrics['total_wait_ms'] += wait_ms
+        pwd_metrics['max_wait_ms'] = max(pwd_metrics['max_wait_ms'], wait_ms)
+
+        return result
+
 
 if __name__ == '__main__':
     print(PwdUtil.get_password_hash("admin123"))
@@ -0,0 +1,166 @@
+import time
+from datetime import timedelta
+from typing import List, Optional, Union
+from config.enums import RedisInitKeyConfig
+
+
+class RedisKeyUtil:
+    """
+    Redis键名索引工具类
+
+    开启索引的命名空间（RedisInitKeyConfig中indexed为True）通过有序集合key_index:{命名空间}记录其全部键名，
+    分值为键的过期时间戳（不过期为+inf），列举及清除时只读取索引而不再使用阻塞的KEYS命令；
+    未开启索引的命名空间使用游标SCAN遍历
+    """
+
+    INDEX_KEY_PREFIX = 'key_index'
+    SCAN_COUNT = 500
+    DELETE_BATCH_SIZE = 500
+
+    @classmethod
+    def get_index_key(cls, namespace: str):
+        """
+        获取命名空间对应的索引键名
+
+        :param namespace: 命名空间
+        :return: 索引键名
+        """
+        return f'{cls.INDEX_KEY_PREFIX}:{namespace}'
+
+    @classmethod
+    def is_indexed(cls, namespace: str):
+        """
+        判断命名空间是否开启了索引
+
+        :param namespace: 命名空间
+        :return: 是否开启了索引
+        """
+        return any(key_config.indexed and key_config.key == namespace for key_config in RedisInitKeyConfig)
+
+    @classmethod
+    async def set(
+        cls,
+        redis,
+        key: str,
+        value,
+        ex: Optional[Union[int, timedelta]] = None,
+        index_ex: Optional[Union[int, timedelta]] = None,
+    ):
+        """
+        设置键值并同步更新命名空间索引
+
+        :param redis: redis对象
+        :param key: 完整键名，格式为{命名空间}:{键}
+        :param value: 键值
+        :param ex: 过期时间，为None时表示不过期
+        :param index_ex: 键名在索引中的保留时间，为None时与过期时间一致；之后仅以EXPIRE续期的键需传入其最长存活时间
+        :return:
+        """
+        namespace = key.split(':', 1)[0]
+        if not cls.is_indexed(namespace):
+            await redis.set(key, value, ex=ex)
+            return
+        now = time.time()
+        index_ex = ex if index_ex is None else index_ex
+        expire_seconds = index_ex.total_seconds() if isinstance(index_ex, timedelta) else index_ex
+        score = now + expire_seconds if expire_seconds is not None else float('inf')
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.set(key, value, ex=ex)
+            pipe.zadd(cls.get_index_key(namespace), {key: score})
+            if expire_seconds is not None:
+                # 顺带清理索引中已过期的键名，避免索引无限增长
+                pipe.zremrangebyscore(cls.get_index_key(namespace), '-inf', f'({now}')
+            await pipe.execute()
+
+    @classmethod
+    async def delete(cls, redis, *keys: str):
+        """
+        删除键并同步更新命名空间索引
+
+        :param redis: redis对象
+        :param keys: 完整键名列表
+        :return:
+        """
+        if not keys:
+            return
+        async with redis.pipeline(transaction=False) as pipe:
+            for index in range(0, len(keys), cls.DELETE_BATCH_SIZE):
+                batch_keys = keys[index : index + cls.DELETE_BATCH_SIZE]
+                pipe.delete(*batch_keys)
+                for key in batch_keys:
+                    namespace = key.split(':', 1)[0]
+                    if cls.is_indexed(namespace):
+                        pipe.zrem(cls.get_index_key(namespace), key)
+            await pipe.execute()
+
+    @classmethod
+    async def get_keys(cls, redis, namespace: str) -> List[str]:
+        """
+        获取命名空间下的全部键名，开启索引的命名空间读取索引，否则使用SCAN遍历
+
+        :param redis: redis对象
+        :param namespace: 命名空间
+        :return: 完整键名列表
+        """
+        if cls.is_indexed(namespace):
+            index_key = cls.get_index_key(namespace)
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.zremrangebyscore(index_key, '-inf', f'({time.time()}')
+                pipe.zrange(index_key, 0, -1)
+                _, keys = await pipe.execute()
+            return keys
+
+        return await cls.scan_keys(redis, f'{namespace}:*')
+
+    @classmethod
+    async def scan_keys(cls, redis, match: str) -> List[str]:
+        """
+        使用游标SCAN遍历匹配的键名，不阻塞redis
+
+        :param redis: redis对象
+        :param match: 匹配模式
+        :return: 完整键名列表
+        """
+        return [key async for key in redis.scan_iter(match=match, count=cls.SCAN_COUNT)]
+
+    @classmethod
+    async def clear_namespace(cls, redis, namespace: str):
+        """
+        清除命名空间下的全部键及其索引
+
+        :param redis: redis对象
+        :param namespace: 命名空间
+        :return: 清除的键数量
+        """
+        keys = await cls.get_keys(redis, namespace)
+        if keys:
+            await cls.delete(redis, *keys)
+        if cls.is_indexed(namespace):
+            await redis.delete(cls.get_index_key(namespace))
+
+        return len(keys)
+
+    @classmethod
+    async def init_key_index(cls, redis):
+        """
+        应用启动时为尚未建立索引的命名空间根据现有键建立索引
+
+        :param redis: redis对象
+        :return:
+        """
+        for key_config in RedisInitKeyConfig:
+            if not key_config.indexed or await redis.exists(cls.get_index_key(key_config.key)):
+                continue
+            keys = await cls.scan_keys(redis, f'{key_config.key}:*')
+            if not keys:
+                continue
+            async with redis.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.ttl(key)
+                ttl_list = await pipe.execute()
+            now = time.time()
+            mapping = {
+                key: now + ttl if ttl >= 0 else float('inf') for key, ttl in zip(keys, ttl_list) if ttl != -2
+            }
+            if mapping:
+                await redis.zadd(cls.get_index_key(key_config.key), mapping)
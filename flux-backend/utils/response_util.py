@@ -1,4 +1,6 @@
+import orjson
 from datetime import datetime
+from decimal import Decimal
 from fastapi import status
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse, Response, StreamingResponse
@@ -7,6 +9,38 @@ from typing import Any, Dict, Optional
 from config.constant import HttpStatusConstant
 
 
+def orjson_default(obj: Any):
+    """
+    orjson无法直接序列化的类型的转换方法，转换结果与jsonable_encoder保持一致
+
+    :param obj: 待转换对象
+    :return: 可序列化的对象
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode='json', by_alias=True)
+    if isinstance(obj, Decimal):
+        # 与fastapi的decimal_encoder一致：无小数部分时转换为整数，否则转换为浮点数
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.decode()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+
+    return jsonable_encoder(obj)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    基于orjson的json响应类
+
+    直接序列化字典、列表、pydantic模型、日期时间及Decimal等类型，不再预先使用jsonable_encoder递归转换，
+    输出与JSONResponse（紧凑分隔符、不转义非ascii字符）一致
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
 class ResponseUtil:
     """
     响应工具类
@@ -44,7 +78,7 @@ class ResponseUtil:
 
         result.update({'success': True, 'time': datetime.now()})
 
-        return JSONResponse(status_code=status.HTTP_200_OK, content=jsonable_encoder(result))
+        return FastJSONResponse(status_code=status.HTTP_200_OK, content=result)
 
     @classmethod
     def failure(
@@ -78,7 +112,7 @@ class ResponseUtil:
 
         result.update({'success': False, 'time': datetime.now()})
 
-        return JSONResponse(status_code=status.HTTP_200_OK, content=jsonable_encoder(result))
+        return FastJSONResponse(status_code=status.HTTP_200_OK, content=result)
 
     @classmethod
     def unauthorized(
@@ -112,7 +146,7 @@ class ResponseUtil:
 
         result.update({'success': False, 'time': datetime.now()})
 
-        return JSONResponse(status_code=status.HTTP_200_OK, content=jsonable_encoder(result))
+        return FastJSONResponse(status_code=status.HTTP_200_OK, content=result)
 
     @classmethod
     def forbidden(
@@ -146,7 +180,7 @@ class ResponseUtil:
 
         result.update({'success': False, 'time': datetime.now()})
 
-        return JSONResponse(status_code=status.HTTP_200_OK, content=jsonable_encoder(result))
+        return FastJSONResponse(status_code=status.HTTP_200_OK, content=result)
 
     @classmethod
     def error(
@@ -180,14 +214,15 @@ class ResponseUtil:
 
         result.update({'success': False, 'time': datetime.now()})
 
-        return JSONResponse(status_code=status.HTTP_200_OK, content=jsonable_encoder(result))
+        return FastJSONResponse(status_code=status.HTTP_200_OK, content=result)
 
     @classmethod
-    def streaming(cls, *, data: Any = None):
+    def streaming(cls, *, data: Any = None, media_type: Optional[str] = None):
         """
         流式响应方法
 
         :param data: 流式传输的内容
+        :param media_type: 响应内容类型，默认为None
         :return: 流式响应结果
         """
-        return StreamingResponse(status_code=status.HTTP_200_OK, content=data)
+        return StreamingResponse(status_code=status.HTTP_200_OK, content=data, media_type=media_type)
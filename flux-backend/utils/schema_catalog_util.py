@@ -0,0 +1,188 @@
+import asyncio
+from datetime import datetime
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Collection, Dict, List, Optional, Tuple
+from config.env import AppConfig
+from utils.cache_util import LocalCache
+
+
+class SchemaCatalog:
+    """
+    当前数据库的表及列元数据快照
+    """
+
+    def __init__(self, tables: List[dict], columns: Dict[str, List[dict]]):
+        """
+        当前数据库的表及列元数据快照
+
+        :param tables: 表信息列表，键为table_name、table_comment、create_time、update_time
+        :param columns: 表名与按字段顺序排列的列信息列表的映射
+        """
+        self.tables = tables
+        self.columns = columns
+
+
+class SchemaCatalogUtil:
+    """
+    数据库表结构元数据缓存工具类
+
+    information_schema在库表较多的MySQL实例上查询很慢，代码生成、表格配置、Excel导入等功能改为从元数据快照中读取：
+    快照以两次查询分别取出当前数据库全部表及全部列的信息，缓存于进程内并附带结构版本号；
+    建表、同步表结构时调用invalidate递增版本号，并通过缓存失效频道通知其他工作进程，过期时间用于兜底外部执行的DDL
+    """
+
+    CACHE_KEY = 'schema_catalog'
+    TABLE_SQL = text(
+        'SELECT table_name, table_comment, create_time, update_time FROM information_schema.tables '
+        'WHERE table_schema = (SELECT DATABASE())'
+    )
+    COLUMN_SQL = text(
+        """
+        SELECT table_name,
+               column_name,
+               (CASE WHEN (is_nullable = 'no' AND column_key != 'PRI') THEN '1' ELSE '0' END) AS is_required,
+               (CASE WHEN column_key = 'PRI' THEN '1' ELSE '0' END) AS is_pk,
+               ordinal_position AS sort,
+               column_comment,
+               (CASE WHEN extra = 'auto_increment' THEN '1' ELSE '0' END) AS is_increment,
+               column_type
+        FROM information_schema.columns
+        WHERE table_schema = (SELECT DATABASE())
+        ORDER BY table_name, ordinal_position
+        """
+    )
+
+    catalog_cache = LocalCache(max_size=16, ttl=AppConfig.app_schema_catalog_expire_seconds)
+    version = 0
+    load_lock = asyncio.Lock()
+
+    @classmethod
+    def invalidate(cls):
+        """
+        递增结构版本号，使当前进程的元数据快照失效
+
+        :return:
+        """
+        cls.version += 1
+        cls.catalog_cache.clear()
+
+    @classmethod
+    async def get_catalog(cls, db: AsyncSession) -> SchemaCatalog:
+        """
+        获取当前数据库的元数据快照，未缓存或结构版本号变化时重新加载，并发请求只加载一次
+
+        :param db: orm对象
+        :return: 元数据快照
+        """
+        cache_key = db.bind.url.database
+        catalog = cls.__get_cached(cache_key)
+        if catalog is not None:
+            return catalog
+        async with cls.load_lock:
+            catalog = cls.__get_cached(cache_key)
+            if catalog is not None:
+                return catalog
+            version = cls.version
+            tables = [cls.__lower_keys(row) for row in await db.execute(cls.TABLE_SQL)]
+            columns: Dict[str, List[dict]] = {}
+            for row in await db.execute(cls.COLUMN_SQL):
+                column = cls.__lower_keys(row)
+                columns.setdefault(column.pop('table_name'), []).append(column)
+            catalog = SchemaCatalog(tables, columns)
+            # 加载期间结构版本号发生变化时不缓存本次结果
+            if version == cls.version:
+                cls.catalog_cache.set(cache_key, (version, catalog))
+
+        return catalog
+
+    @classmethod
+    async def get_tables(cls, db: AsyncSession) -> List[dict]:
+        """
+        获取当前数据库全部表的信息
+
+        :param db: orm对象
+        :return: 表信息列表的副本
+        """
+        return [dict(table) for table in (await cls.get_catalog(db)).tables]
+
+    @classmethod
+    async def query_tables(
+        cls,
+        db: AsyncSession,
+        exclude_prefixes: Tuple[str, ...] = (),
+        exclude_names: Collection[str] = (),
+        table_names: Optional[Collection[str]] = None,
+        table_name: Optional[str] = None,
+        table_comment: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        按条件筛选当前数据库的表信息，结果按创建时间倒序排列
+
+        :param db: orm对象
+        :param exclude_prefixes: 需要排除的表名前缀
+        :param exclude_names: 需要排除的表名
+        :param table_names: 仅保留的表名，为None时不限制
+        :param table_name: 表名模糊匹配条件，不区分大小写
+        :param table_comment: 表描述模糊匹配条件，不区分大小写
+        :return: 表信息列表的副本
+        """
+        table_name = table_name.lower() if table_name else None
+        table_comment = table_comment.lower() if table_comment else None
+        tables = [
+            table
+            for table in await cls.get_tables(db)
+            if not table['table_name'].startswith(exclude_prefixes)
+            and table['table_name'] not in exclude_names
+            and (table_names is None or table['table_name'] in table_names)
+            and (table_name is None or table_name in table['table_name'].lower())
+            and (table_comment is None or table_comment in (table['table_comment'] or '').lower())
+        ]
+        tables.sort(key=lambda table: table['create_time'] or datetime.min, reverse=True)
+
+        return tables
+
+    @classmethod
+    async def get_table_columns(
+        cls, db: AsyncSession, table_names: Optional[List[str]] = None
+    ) -> Dict[str, List[dict]]:
+        """
+        获取指定表的列信息
+
+        :param db: orm对象
+        :param table_names: 表名列表，为None时返回全部表
+        :return: 表名与列信息列表副本的映射，不存在的表不出现在结果中
+        """
+        columns = (await cls.get_catalog(db)).columns
+        if table_names is None:
+            table_names = list(columns)
+
+        return {
+            table_name: [dict(column) for column in columns[table_name]]
+            for table_name in table_names
+            if table_name in columns
+        }
+
+    @classmethod
+    def __get_cached(cls, cache_key: str) -> Optional[SchemaCatalog]:
+        """
+        工具方法：获取与当前结构版本号一致的缓存快照
+
+        :param cache_key: 缓存键
+        :return: 元数据快照，不存在或已失效时返回None
+        """
+        cached = cls.catalog_cache.get(cache_key)
+        if cached is None or cached[0] != cls.version:
+            return None
+
+        return cached[1]
+
+    @classmethod
+    def __lower_keys(cls, row) -> dict:
+        """
+        工具方法：将查询结果行转换为字典，MySQL 8返回的information_schema列名为大写，统一转换为小写
+
+        :param row: 查询结果行
+        :return: 键名为小写的字典
+        """
+        return {key.lower(): value for key, value in row._mapping.items()}
@@ -0,0 +1,53 @@
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+class TreeUtil:
+    """
+    树形结构工具类，通过父级索引一次遍历构建树形数据，时间复杂度为O(n)
+    """
+
+    @classmethod
+    def get_children_mapping(cls, node_list: List[Any], get_parent_id: Callable[[Any], Hashable]) -> Dict[Any, List]:
+        """
+        根据节点列表生成父级id与子节点列表的映射，子节点保持在原列表中的顺序
+
+        :param node_list: 节点列表
+        :param get_parent_id: 获取节点父级id的方法
+        :return: 父级id与子节点列表的映射
+        """
+        children_mapping = defaultdict(list)
+        for node in node_list:
+            children_mapping[get_parent_id(node)].append(node)
+
+        return children_mapping
+
+    @classmethod
+    def list_to_tree(
+        cls,
+        node_list: List[dict],
+        id_key: str = 'id',
+        parent_key: str = 'parentId',
+        children_key: str = 'children',
+        root_id: Optional[Hashable] = None,
+    ) -> List[dict]:
+        """
+        根据字典节点列表生成树形嵌套数据，没有子节点的节点不设置子节点键
+
+        :param node_list: 字典节点列表
+        :param id_key: 节点id的键名
+        :param parent_key: 节点父级id的键名
+        :param children_key: 子节点列表的键名
+        :param root_id: 根节点的父级id，为None时找不到父级节点的节点均作为根节点
+        :return: 树形嵌套数据
+        """
+        node_ids = {node[id_key] for node in node_list}
+        children_mapping = cls.get_children_mapping(node_list, lambda node: node.get(parent_key))
+        for node in node_list:
+            children = children_mapping.get(node[id_key])
+            if children:
+                node[children_key] = children
+        if root_id is not None:
+            return children_mapping.get(root_id, [])
+
+        return [node for node in node_list if node.get(parent_key) not in node_ids]
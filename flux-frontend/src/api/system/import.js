@@ -0,0 +1,37 @@
+import request from '@/utils/request'
+
+// 查询导入任务进度
+export function getImportTask(taskId) {
+  return request({
+    url: '/import/task/' + taskId,
+    method: 'get'
+  })
+}
+
+// 取消导入任务
+export function cancelImportTask(taskId) {
+  return request({
+    url: '/import/task/' + taskId + '/cancel',
+    method: 'put'
+  })
+}
+
+// 轮询导入任务进度直至任务结束
+export function waitImportTask(taskId, onProgress, interval = 1000) {
+  return new Promise((resolve, reject) => {
+    const poll = () => {
+      getImportTask(taskId).then(res => {
+        const task = res.data
+        if (onProgress) {
+          onProgress(task)
+        }
+        if (task.status === 'pending' || task.status === 'running') {
+          setTimeout(poll, interval)
+        } else {
+          resolve(task)
+        }
+      }).catch(reject)
+    }
+    poll()
+  })
+}